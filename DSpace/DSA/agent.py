@@ -16,6 +16,7 @@ from DSpace.i18n import _
 from DSpace.service import ServiceBase
 from DSpace.tools.log_file import LogFile as LogFileTool
 from DSpace.tools.service import Service as ServiceTool
+from DSpace.utils.profile import StartupProfile
 
 logger = logging.getLogger(__name__)
 
@@ -84,5 +85,7 @@ class AgentService(ServiceBase):
     service_name = "agent"
 
     def __init__(self, *args, **kwargs):
-        self.handler = AgentHandler()
+        profile = StartupProfile()
+        self.handler = profile.construct(AgentHandler)
+        logger.info("Handler init profile:\n%s", profile.report())
         super(AgentService, self).__init__(*args, **kwargs)
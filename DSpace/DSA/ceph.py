@@ -11,6 +11,7 @@ import six
 
 from DSpace import exception
 from DSpace.DSA.base import AgentBaseHandler
+from DSpace.tools.admin_socket import AdminSocket
 from DSpace.tools.ceph import CephTool
 from DSpace.tools.ceph_config import CephConfigTool
 from DSpace.tools.disk import DiskTool as DiskTool
@@ -242,9 +243,23 @@ class CephHandler(AgentBaseHandler):
         return res
 
     def ceph_slow_request(self, ctxt, osds):
-        client = self._get_ssh_executor()
-        ceph_tool = CephTool(client)
-        res = ceph_tool.slow_request_get(osds)
+        osds = [osd for osd in osds if osd.osd_id]
+        asok = AdminSocket(self._get_executor())
+        ops = asok.dump_historic_slow_ops(
+            ["osd.{}".format(osd.osd_id) for osd in osds])
+        res = []
+        for osd in osds:
+            r = ops.get("osd.{}".format(osd.osd_id))
+            if r is None or isinstance(r, exception.AdminSocketError):
+                continue
+            res.append({
+                "id": osd.id,
+                "osd_id": osd.osd_id,
+                "osd_name": osd.osd_name,
+                "node_id": osd.node_id,
+                "hostname": osd.node.hostname,
+                "ops": r.get("Ops")
+            })
         return res
 
     def _data_clear(self, client, partition_name):
@@ -410,10 +425,18 @@ class CephHandler(AgentBaseHandler):
 
     def get_osds_status(self, ctxt, osds):
         logger.debug("Check osd status")
+        # a running osd answers on its admin socket, all at the same time
+        asok = AdminSocket(self._get_executor())
+        names = ["osd.{}".format(osd.osd_id) for osd in osds]
+        osd_status = {name: "up"
+                      for name, r in asok.status(names).items()
+                      if not isinstance(r, exception.AdminSocketError)}
+        # not answered, ask systemd
         ssh_client = self._get_ssh_executor()
         service_tool = ServiceTool(ssh_client)
-        osd_status = {}
         for osd in osds:
+            if "osd.{}".format(osd.osd_id) in osd_status:
+                continue
             try:
                 name = "ceph-osd@{}".format(osd.osd_id)
                 if service_tool.status(name=name):
@@ -50,6 +50,16 @@ class AgentClientManager(object):
         self._nodes.pop(node.id, None)
         self._clients.pop(node.id, None)
 
+    def sync_nodes(self, nodes):
+        """Keep clients of the nodes only"""
+        node_ids = set(node.id for node in nodes)
+        for node_id in list(self._nodes):
+            if node_id not in node_ids:
+                self.del_node(self._nodes[node_id])
+        for node in nodes:
+            if node.id not in self._nodes:
+                self.add_node(node)
+
     def get_client(self, node_id):
         if node_id not in self._nodes:
             logger.warning("node %s not add", node_id)
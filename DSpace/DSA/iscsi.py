@@ -38,6 +38,7 @@ class IscsiHandler(AgentBaseHandler):
             except Exception as e:
                 logger.exception("restore iscsi config error: %s", e)
 
+    @iscsi.transactional
     def mount_bgw(self, context, access_path, node):
         logger.debug("will create iscsi target for access_path: %s",
                      access_path.name)
@@ -46,6 +47,7 @@ class IscsiHandler(AgentBaseHandler):
         iscsi.create_portal(iqn_target)
         iscsi.enable_tpg(iqn_target, True)
 
+    @iscsi.transactional
     def unmount_bgw(self, context, access_path):
         logger.debug("will delete iscsi target for access_path: %s",
                      access_path.name)
@@ -59,6 +61,7 @@ class IscsiHandler(AgentBaseHandler):
         else:
             iscsi.chap_disable(iqn_target)
 
+    @iscsi.transactional
     def bgw_set_chap(self, context, node, access_path, chap_enable,
                      username, password):
         logger.debug("iscsi target set chap, enable: {}, username: {}"
@@ -66,6 +69,7 @@ class IscsiHandler(AgentBaseHandler):
         iqn_target = access_path.iqn
         self._update_chap(iqn_target, chap_enable, username, password)
 
+    @iscsi.transactional
     def bgw_create_mapping(self, context, node, access_path,
                            volume_client, volumes):
         iqn_target = access_path.iqn
@@ -80,6 +84,7 @@ class IscsiHandler(AgentBaseHandler):
                           access_path.chap_username,
                           access_path.chap_password)
 
+    @iscsi.transactional
     def bgw_remove_mapping(self, context, node, access_path,
                            volume_client, volumes):
         iqn_target = access_path.iqn
@@ -111,6 +116,7 @@ class IscsiHandler(AgentBaseHandler):
                         lun, volume.volume_name)
         iscsi.create_mapped_lun(iqn_target, iqn_initiator, lun)
 
+    @iscsi.transactional
     def bgw_add_volume(self, context, node, access_path,
                        volume_client, volumes):
         iqn_target = access_path.iqn
@@ -123,6 +129,7 @@ class IscsiHandler(AgentBaseHandler):
         for vol in volumes:
             self._create_acl_mapped_lun(iqn_target, iqn_initiator, vol)
 
+    @iscsi.transactional
     def bgw_remove_volume(self, context, node, access_path,
                           volume_client, volumes):
         iqn_target = access_path.iqn
@@ -137,6 +144,7 @@ class IscsiHandler(AgentBaseHandler):
             iscsi.remove_acl_mapped_lun(iqn_target, iqn_initiator,
                                         vol.volume_name)
 
+    @iscsi.transactional
     def bgw_change_client_group(self, context, access_path, volumes,
                                 volume_clients, new_client_group):
         iqn_target = access_path.iqn
@@ -172,6 +180,7 @@ class IscsiHandler(AgentBaseHandler):
             iscsi.set_acl_mutual_chap(
                 iqn_target, iqn_initiator, "", "")
 
+    @iscsi.transactional
     def bgw_set_mutual_chap(self, ctxt, access_path, volume_clients,
                             mutual_chap_enable, mutual_username,
                             mutual_password):
@@ -182,6 +191,7 @@ class IscsiHandler(AgentBaseHandler):
                 iqn_target, iqn_initiator, mutual_chap_enable,
                 mutual_username, mutual_password)
 
+    @iscsi.transactional
     def bgw_clear_all(self, ctxt):
         logger.info("clear all block gateway configs")
         iscsi.clear_all()
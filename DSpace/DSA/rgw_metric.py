@@ -2,8 +2,8 @@ import logging
 
 from DSpace.DSA.base import AgentBaseHandler
 from DSpace.tools.docker import DockerSocket as DockerSockTool
-from DSpace.tools.radosgw import RadosgwTool
 from DSpace.tools.radosgw_admin import RadosgwAdmin
+from DSpace.tools.sampler import ResourceSampler
 
 logger = logging.getLogger(__name__)
 
@@ -115,27 +115,54 @@ class RgwMetricHandler(AgentBaseHandler):
         return datas
 
     def get_rgw_gateway_cpu_memory(self, ctxt, rgw_names):
-        rgw_tool = RadosgwTool(self._get_ssh_executor())
-        results = rgw_tool.get_rgw_gateway_cpu_and_memory(rgw_names)
+        sampler = ResourceSampler(self._get_executor())
+        usages = sampler.sample(processes=rgw_names)["processes"]
+        results = []
+        for name in rgw_names:
+            if name not in usages:
+                logger.error('get gateway: %s cpu_memory metrics error: '
+                             'process not found', name)
+                continue
+            results.append({
+                'ceph_daemon': name,
+                'cpu_percent': round(usages[name]['cpu_percent'], 2),
+                'memory_percent': round(usages[name]['memory_percent'], 2)
+            })
         logger.debug('get_rgw_gateways_cpu_memory:%s', results)
         return results
 
+    def _router_usage(self, name, usages, sys_memory_kb):
+        usage = usages.get(name)
+        if not usage:
+            logger.error('get_rgw_router_cpu_memory %s not found', name)
+            return None
+        return {
+            'cpu_usage_rate_percent': '{:.2f}'.format(usage['cpu_percent']),
+            'memory_used_bytes': usage['memory_bytes'],
+            'sys_memory_kb': sys_memory_kb,
+            'memory_rate_percent': '{:.2f}'.format(usage['memory_percent']),
+            'container_name': name
+        }
+
     def get_rgw_router_cpu_memory(self, ctxt):
-        docket_socket_tool = DockerSockTool(self._get_executor())
         container_keepalived = '{}_radosgw_keepalived'.format(
             self.container_prefix)
         container_haproxy = '{}_radosgw_haproxy'.format(self.container_prefix)
         try:
-            result_keep = docket_socket_tool.stats(container_keepalived)
-        except Exception as e:
-            logger.exception('get_rgw_router_cpu_memory keepalived error:%s',
-                             e)
-            result_keep = None
-        try:
-            result_ha = docket_socket_tool.stats(container_haproxy)
+            ids = DockerSockTool(self._get_executor()).container_ids()
+            names = [container_keepalived, container_haproxy]
+            sampler = ResourceSampler(self._get_executor())
+            usages = sampler.sample(
+                containers={name: ids[name] for name in names
+                            if name in ids})["containers"]
+            sys_memory_kb = sampler.memory_total() // 1024
         except Exception as e:
-            logger.exception('get_rgw_router_cpu_memory haproxy error:%s', e)
-            result_ha = None
+            logger.exception('get_rgw_router_cpu_memory error:%s', e)
+            return None, None
+        result_keep = self._router_usage(
+            container_keepalived, usages, sys_memory_kb)
+        result_ha = self._router_usage(
+            container_haproxy, usages, sys_memory_kb)
         logger.debug('get rgw_router_cpu_memory, haproxy:%s, keepalived:%s'
                      % (result_ha, result_keep))
         return result_keep, result_ha
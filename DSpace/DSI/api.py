@@ -1,8 +1,11 @@
 import six
 import socketio
 import tornado.ioloop
+import tornado.netutil
+import tornado.process
 import tornado.web
 from oslo_log import log as logging
+from tornado.httpserver import HTTPServer
 from tornado_swagger.setup import setup_swagger
 
 from DSpace import objects
@@ -10,7 +13,13 @@ from DSpace.common.config import CONF
 from DSpace.DSI import auth
 from DSpace.DSI import handlers
 from DSpace.DSI.handlers import URLRegistry
+from DSpace.DSI.session import RedisSession
+from DSpace.DSI.session import get_redis_client
+from DSpace.DSI.session import get_session
+from DSpace.DSI.websocket import MessageQueue
+from DSpace.DSI.websocket import WebSocketBroadcaster
 from DSpace.service import ServiceBase
+from DSpace.utils.config_cache import CONFIG_CACHE
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +30,14 @@ def wapper_api_route(routes):
 
 
 class WebSocketHandler(object):
-    def __init__(self, ioloop, sio):
+    def __init__(self, ioloop, sio, broadcaster=None, queue=None):
         self.ioloop = ioloop
         self.sio = sio
+        if not broadcaster:
+            broadcaster = WebSocketBroadcaster(ioloop, sio)
+            broadcaster.register()
+        self.broadcaster = broadcaster
+        self.queue = queue
 
     def send_message(self, ctxt, obj, op_type, msg, resource_type=None):
         """Send WebSocket Message"""
@@ -36,26 +50,62 @@ class WebSocketHandler(object):
                 resource_type if resource_type else obj.obj_name(),
             'operation_type': op_type
         }
-        logger.info("websocket send message: %s", objects.Json.dumps(message))
-        self.ioloop.add_callback(lambda: self.sio.emit("ASYNC_RESPONSE",
-                                                       message))
+        logger.debug("websocket send message: op_type(%s) "
+                     "resource_type(%s) msg(%s)", op_type,
+                     message['resource_type'], msg)
+        if self.queue:
+            # to the browsers of all workers
+            self.queue.publish(message)
+        else:
+            self.broadcaster.send(message)
 
 
 class WebSocketService(ServiceBase):
     service_name = "websocket"
 
     def __init__(self, ioloop, sio, *args, **kwargs):
-        self.handler = WebSocketHandler(ioloop, sio)
+        broadcaster = kwargs.pop("broadcaster", None)
+        queue = kwargs.pop("queue", None)
+        self.handler = WebSocketHandler(ioloop, sio, broadcaster=broadcaster,
+                                        queue=queue)
         super(WebSocketService, self).__init__(*args, **kwargs)
 
 
+def _api_workers():
+    workers = CONF.api_workers
+    if workers == 1:
+        return 1
+    # sessions and websocket messages are shared by redis
+    if get_session() is not RedisSession:
+        logger.error("api_workers %s needs a redis session_url, "
+                     "run 1 worker", workers)
+        return 1
+    return workers
+
+
 def service():
     logger.info("api server run on %d", CONF.api_port)
     auth.register_all()
     handlers.register_all()
 
+    workers = _api_workers()
+    sockets = tornado.netutil.bind_sockets(CONF.api_port, CONF.my_ip)
+    task_id = None
+    if workers != 1:
+        # returns in every worker, the parent restarts dead workers
+        task_id = tornado.process.fork_processes(workers)
+        logger.info("api worker %s started", task_id)
+    # the etcd watch thread and channel do not survive the fork, every
+    # worker watches by itself
+    CONFIG_CACHE.start()
+
+    sio_kwargs = {}
+    if task_id is not None:
+        # a browser connection must stay in a worker, long polling
+        # requests would be spread to all of them
+        sio_kwargs['transports'] = ['websocket']
     sio = socketio.AsyncServer(async_mode='tornado', cors_allowed_origins='*',
-                               json=objects.Json)
+                               json=objects.Json, **sio_kwargs)
     URLRegistry.register(r"/ws/")(socketio.get_tornado_handler(sio))
     routers = wapper_api_route(URLRegistry().routes())
     setup_swagger(routers)
@@ -64,9 +114,27 @@ def service():
         "debug": CONF.debug,
     }
     application = tornado.web.Application(routers, **settings)
-    application.listen(CONF.api_port, CONF.my_ip)
+    server = HTTPServer(application)
+    server.add_sockets(sockets)
     ioloop = tornado.ioloop.IOLoop.current()
-    websocket = WebSocketService(ioloop, sio, CONF.my_ip, CONF.websocket_port)
-    websocket.start()
-    tornado.ioloop.IOLoop.current().start()
-    websocket.stop()
+    if task_id is None:
+        websocket = WebSocketService(ioloop, sio, CONF.my_ip,
+                                     CONF.websocket_port)
+    else:
+        # the websocket rpc is served by the first worker, messages are
+        # forwarded to all workers
+        broadcaster = WebSocketBroadcaster(ioloop, sio)
+        broadcaster.register()
+        queue = MessageQueue(get_redis_client(CONF.session_url),
+                             broadcaster)
+        queue.start()
+        websocket = None
+        if task_id == 0:
+            websocket = WebSocketService(
+                ioloop, sio, CONF.my_ip, CONF.websocket_port,
+                broadcaster=broadcaster, queue=queue)
+    if websocket:
+        websocket.start()
+    ioloop.start()
+    if websocket:
+        websocket.stop()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import hashlib
 import logging
 import time
 
@@ -9,6 +10,7 @@ from oslo_config import cfg
 from DSpace import objects
 from DSpace.DSI.auth import AuthBackend
 from DSpace.DSI.auth import AuthRegistry
+from DSpace.DSI.handlers.base import CONTEXT_CACHE
 from DSpace.exception import NotFound
 from DSpace.objects.fields import UserOriginType
 
@@ -106,6 +108,11 @@ class HciSSOAuth(AuthBackend):
         logger.debug('hci_user is: %s' % user_name)
         return user
 
+    def _cookies_key(self, handler):
+        cookies = sorted((k, v.value) for k, v in handler.cookies.items())
+        return ("hci", hashlib.sha1(
+            repr(cookies).encode("utf-8")).hexdigest())
+
     def validate(self, ctxt, handler):
         begin_time = time.time()
         if not handler.cookies:
@@ -115,6 +122,12 @@ class HciSSOAuth(AuthBackend):
             handler.redirect_url(redirect_url)
             # 认证未通过，validate函数结束
             return
+        # cookies validated recently are not validated again
+        key = self._cookies_key(handler)
+        user = CONTEXT_CACHE.get(key)
+        if user:
+            handler.current_user = user
+            return
         user_name = self._hci_validate(handler)
         end_time = time.time()
         verify_time = end_time - begin_time
@@ -123,4 +136,5 @@ class HciSSOAuth(AuthBackend):
             # 认证未通过，validate函数结束
             return
         user = self._get_or_create_hci_user(ctxt, user_name)
+        CONTEXT_CACHE.set(key, user)
         handler.current_user = user
@@ -13,6 +13,7 @@ from DSpace.context import RequestContext
 from DSpace.DSI.auth import AuthBackend
 from DSpace.DSI.auth import AuthRegistry
 from DSpace.DSI.handlers import URLRegistry
+from DSpace.DSI.handlers.base import CONTEXT_CACHE
 from DSpace.DSI.handlers.base import BaseAPIHandler
 from DSpace.exception import NotAuthorized
 from DSpace.exception import NotFound
@@ -99,10 +100,15 @@ class TencentTicket(AuthBackend):
         raise exception.UserNotFound(user_id=username)
 
     def validate(self, ctxt, handler):
-        if not self._exist_session(handler):
+        ticket = self._exist_session(handler)
+        if not ticket:
             raise NotAuthorized
-        data = self._validate_session(handler)
-        user = self._get_user_by_name(ctxt, data['user_name'])
+        # a ticket validated recently is not validated again
+        user = CONTEXT_CACHE.get(("tencent", ticket))
+        if not user:
+            data = self._validate_session(handler)
+            user = self._get_user_by_name(ctxt, data['user_name'])
+            CONTEXT_CACHE.set(("tencent", ticket), user)
         handler.current_user = user
 
 
@@ -196,6 +202,7 @@ class UserLogoutHandler(BaseAPIHandler):
           description: successful operation
         """
         self.get_context()
+        CONTEXT_CACHE.pop(("tencent", self.session['ticket']))
         self.session['username'] = None
         self.session['ticket'] = None
 
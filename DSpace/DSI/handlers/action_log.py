@@ -86,6 +86,12 @@ class ActionLogListHandler(ClusterAPIHandler):
             type: integer
             format: int32
           required: false
+        - in: request
+          name: cursor
+          description: next_cursor of the previous page
+          schema:
+            type: string
+          required: false
         responses:
         "200":
           description: successful operation
@@ -93,15 +99,15 @@ class ActionLogListHandler(ClusterAPIHandler):
         ctxt = self.get_context()
         client = self.get_admin_client(ctxt)
         filters = self.filters_query()
-        page_args = self.get_paginated_args()
+        page_args = self.get_cursor_paginated_args()
         action_logs = yield client.action_log_get_all(
             ctxt, filters=filters, expected_attrs=['user'], **page_args)
-        action_log_count = yield client.action_log_get_count(ctxt,
-                                                             filters=filters)
-        self.write(objects.json_encode({
-            "action_logs": action_logs,
-            "total": action_log_count
-        }))
+        action_log_count = yield client.action_log_get_count(
+            ctxt, filters=filters, approximate=True)
+        res = {"action_logs": action_logs}
+        res.update(self.get_cursor_page_info(
+            action_logs, page_args, action_log_count))
+        self.write(objects.json_encode(res))
 
 
 @URLRegistry.register(r"/action_logs/([0-9]*)/")
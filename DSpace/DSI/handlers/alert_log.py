@@ -139,23 +139,29 @@ class AlertLogListHandler(ClusterAPIHandler):
           required: false
           schema:
             type: str
+        - in: request
+          name: cursor
+          description: next_cursor of the previous page
+          required: false
+          schema:
+            type: str
         responses:
         "200":
           description: successful operation
         """
         ctxt = self.get_context()
         client = self.get_admin_client(ctxt)
-        page_args = self.get_paginated_args()
+        page_args = self.get_cursor_paginated_args()
         filters = self._filter_query()
         expected_attrs = ['alert_rule']
         alert_logs = yield client.alert_log_get_all(
             ctxt, filters=filters, expected_attrs=expected_attrs, **page_args)
-        alert_log_count = yield client.alert_log_get_count(ctxt,
-                                                           filters=filters)
-        self.write(objects.json_encode({
-            "alert_logs": alert_logs,
-            "total": alert_log_count
-        }))
+        alert_log_count = yield client.alert_log_get_count(
+            ctxt, filters=filters, approximate=True)
+        res = {"alert_logs": alert_logs}
+        res.update(self.get_cursor_page_info(
+            alert_logs, page_args, alert_log_count))
+        self.write(objects.json_encode(res))
 
 
 @URLRegistry.register(r"/alert_logs/([0-9]*)/")
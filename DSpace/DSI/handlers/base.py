@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 import json
 import logging
+import threading
 import traceback
+from concurrent import futures
 
 from jsonschema.exceptions import ValidationError
+from tornado import gen
+from tornado.ioloop import IOLoop
 from tornado.web import RequestHandler
 
 from DSpace import context
@@ -14,12 +18,32 @@ from DSpace.common.config import CONF
 from DSpace.context import RequestContext
 from DSpace.context import get_context
 from DSpace.DSI.auth import AuthRegistry
+from DSpace.DSI.session import TTLCache
 from DSpace.DSI.session import get_session
 from DSpace.DSM.client import AdminClientManager
 from DSpace.i18n import _
+from DSpace.objects import base as objects_base
+from DSpace.utils import pagination
 
 logger = logging.getLogger(__name__)
 
+# validated tickets and existing clusters, keys are (kind, value)
+CONTEXT_CACHE = TTLCache('api_context_cache_ttl', 'api_context_cache_size')
+
+_context_executor = None
+_context_executor_lock = threading.Lock()
+
+
+def get_context_executor():
+    global _context_executor
+    if not CONF.api_context_workers:
+        return None
+    with _context_executor_lock:
+        if _context_executor is None:
+            _context_executor = futures.ThreadPoolExecutor(
+                max_workers=CONF.api_context_workers)
+    return _context_executor
+
 
 class AnonymousHandler(RequestHandler):
 
@@ -54,7 +78,10 @@ class AnonymousHandler(RequestHandler):
                 async_support=True
             ).get_client()
             setattr(context, 'dsm_client', dsm_client)
-        return getattr(context, 'dsm_client')
+        dsm_client = getattr(context, 'dsm_client')
+        if self.request.method == "GET" and CONF.rpc_coalesce_enabled:
+            return dsm_client.coalesced()
+        return dsm_client
 
     def write_error(self, status_code, **kwargs):
         """Override to implement custom error pages.
@@ -110,6 +137,8 @@ class AnonymousHandler(RequestHandler):
 class BaseAPIHandler(AnonymousHandler):
     ctxt = None
     auth = None
+    # redirects asked while the context is built out of the ioloop
+    _redirects = None
 
     def initialize(self):
         session_cls = get_session()
@@ -121,9 +150,23 @@ class BaseAPIHandler(AnonymousHandler):
             registry = AuthRegistry()
             self.auth = registry.auth_cls()
 
+    @gen.coroutine
     def prepare(self):
         if self.request.method != "OPTIONS":
-            self.ctxt = self.get_context()
+            # auth (db, sso) and cluster lookups may block, they are done
+            # by the context executor, not on the ioloop
+            executor = get_context_executor()
+            if executor:
+                self._redirects = []
+                try:
+                    self.ctxt = yield IOLoop.current().run_in_executor(
+                        executor, self.get_context)
+                finally:
+                    redirects, self._redirects = self._redirects, None
+                    for url in redirects:
+                        self.redirect_url(url)
+            else:
+                self.ctxt = self.get_context()
         logger.info("uri(%s), method(%s), body(%s)",
                     self.request.uri, self.request.method, self.request.body)
 
@@ -145,8 +188,9 @@ class BaseAPIHandler(AnonymousHandler):
                      self.request.remote_ip)
         ctxt.client_ip = client_ip
         cluster_id = self.get_cluster_id()
-        if cluster_id:
+        if cluster_id and not CONTEXT_CACHE.get(("cluster", cluster_id)):
             objects.Cluster.get_by_id(ctxt, cluster_id)
+            CONTEXT_CACHE.set(("cluster", cluster_id), True)
         ctxt.cluster_id = cluster_id
         self.ctxt = ctxt
         return self.ctxt
@@ -165,6 +209,54 @@ class BaseAPIHandler(AnonymousHandler):
             "offset": offset
         }
 
+    def get_fields_args(self, obj_cls):
+        """Fields of the objects of a list, by the fields argument
+
+        fields=id,hostname,status returns objects with these fields only,
+        id and created_at are always returned.
+
+        :return: fields, None for all fields
+        """
+        fields = self.get_query_argument('fields', default=None)
+        if not fields:
+            return None
+        fields = [f.strip() for f in fields.split(',') if f.strip()]
+        invalid = set(fields) - set(obj_cls.fields)
+        if invalid:
+            raise exception.InvalidInput(
+                reason=_("invalid fields: %s") % ", ".join(sorted(invalid)))
+        return objects_base.projection(fields)
+
+    def get_cursor_paginated_args(self):
+        """Paginated args of the list APIs support keyset pagination
+
+        cursor is the next_cursor of the previous page, with it the db seeks
+        directly to the next page, so marker, offset and sort_key are
+        ignored.
+        """
+        page_args = self.get_paginated_args()
+        cursor = self.get_query_argument('cursor', default=None) or None
+        if cursor:
+            page_args.update({
+                "marker": None,
+                "sort_keys": None,
+                "offset": None
+            })
+        page_args['cursor'] = cursor
+        return page_args
+
+    def get_cursor_page_info(self, items, page_args, total):
+        next_cursor = None
+        # cursor only follows the default (created_at, id) order
+        if not page_args.get('sort_keys'):
+            next_cursor = pagination.next_cursor(items, page_args['limit'])
+        count_limit = CONF.pagination_count_limit
+        return {
+            "total": total,
+            "total_approximate": bool(count_limit and total > count_limit),
+            "next_cursor": next_cursor
+        }
+
     def get_metrics_history_args(self):
         start = self.get_query_argument('start', default=None)
         end = self.get_query_argument('end', default=None)
@@ -201,6 +293,10 @@ class BaseAPIHandler(AnonymousHandler):
         return filters
 
     def redirect_url(self, url):
+        if self._redirects is not None:
+            # not on the ioloop, redirect after the context is built
+            self._redirects.append(url)
+            return
         logger.debug('redirect_url is:%s' % url)
         self.set_status(401)
         self.finish(objects.json_encode({
@@ -737,3 +737,35 @@ class ClusterStatus(ClusterAPIHandler):
         client = self.get_admin_client(ctxt)
         res = yield client.cluster_status(ctxt)
         self.write(json.dumps({"cluster": res}))
+
+
+@URLRegistry.register(r"/clusters/dashboard/")
+class ClusterDashboard(ClusterAPIHandler):
+    @gen.coroutine
+    def get(self):
+        """
+        ---
+        tags:
+        - cluster
+        summary: Cluster dashboard snapshot
+        description: Services, hosts, pools, osds, capacity, pg and cluster
+                     status in one call. Changed snapshots are pushed over
+                     websocket with resource_type dashboard.
+        operationId: clusters.api.dashboard
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        client = self.get_admin_client(ctxt)
+        snapshot = yield client.dashboard_snapshot_get(ctxt)
+        self.write(json.dumps({"dashboard": snapshot}))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+
+from jsonschema import draft7_format_checker
+from jsonschema import validate
+from tornado import gen
+from tornado.escape import json_decode
+
+from DSpace import objects
+from DSpace.DSI.handlers import URLRegistry
+from DSpace.DSI.handlers.base import ClusterAPIHandler
+
+logger = logging.getLogger(__name__)
+
+_log_policy_schema = {
+    "type": "object",
+    "properties": {
+        "max_age": {"type": "integer", "minimum": 0},
+        "max_count": {"type": "integer", "minimum": 0},
+    },
+    "additionalProperties": False
+}
+
+update_log_retention_schema = {
+    "type": "object",
+    "properties": {
+        "log_retention": {
+            "type": "object",
+            "properties": {
+                "action_log": _log_policy_schema,
+                "alert_log": _log_policy_schema,
+                "archive": {"type": "boolean"},
+            },
+            "additionalProperties": False
+        },
+    },
+    "required": ["log_retention"],
+    "additionalProperties": False
+}
+
+
+@URLRegistry.register(r"/log_retention/")
+class LogRetentionHandler(ClusterAPIHandler):
+    @gen.coroutine
+    def get(self):
+        """Retention policy of action_logs and alert_logs
+
+        ---
+        tags:
+        - log_retention
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        client = self.get_admin_client(ctxt)
+        log_retention = yield client.log_retention_get(ctxt)
+        self.write(objects.json_encode({
+            "log_retention": log_retention
+        }))
+
+    @gen.coroutine
+    def put(self):
+        """Update retention policy of action_logs and alert_logs
+
+        ---
+        tags:
+        - log_retention
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        - in: body
+          name: log_retention
+          description: max_age(days) and max_count of every log type,
+                       0 means unlimited
+          required: true
+          schema:
+            type: object
+            properties:
+              log_retention:
+                type: object
+                properties:
+                  action_log:
+                    type: object
+                  alert_log:
+                    type: object
+                  archive:
+                    type: boolean
+                    description: archive logs to compressed files
+                                 before purge
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        data = json_decode(self.request.body)
+        validate(data, schema=update_log_retention_schema,
+                 format_checker=draft7_format_checker)
+        client = self.get_admin_client(ctxt)
+        log_retention = yield client.log_retention_set(
+            ctxt, data.get('log_retention'))
+        self.write(objects.json_encode({
+            "log_retention": log_retention
+        }))
+
+
+@URLRegistry.register(r"/log_rollups/")
+class LogRollupListHandler(ClusterAPIHandler):
+    @gen.coroutine
+    def get(self):
+        """Daily counters of action_logs and alert_logs
+
+        ---
+        tags:
+        - log_retention
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        - in: request
+          name: log_type
+          description: action_log or alert_log
+          schema:
+            type: string
+          required: false
+        - in: request
+          name: resource_type
+          description: resource_type
+          schema:
+            type: string
+          required: false
+        - in: request
+          name: level
+          description: level of alert_log or status of action_log
+          schema:
+            type: string
+          required: false
+        - in: request
+          name: between_day
+          description: between_day, eg:2019-11-04,2019-11-11
+          schema:
+            type: string
+          required: false
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        client = self.get_admin_client(ctxt)
+        filters = self.get_support_filters(
+            exact_filters=['log_type', 'resource_type', 'level'])
+        days = self.get_query_argument('between_day', default=None)
+        if days:
+            days = days.split(',')
+            filters['day'] = [days[0], days[1]]
+        page_args = self.get_paginated_args()
+        log_rollups = yield client.log_rollup_get_all(
+            ctxt, filters=filters, **page_args)
+        self.write(objects.json_encode({
+            "log_rollups": log_rollups
+        }))
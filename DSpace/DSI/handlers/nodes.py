@@ -191,12 +191,19 @@ class NodeListHandler(ClusterAPIHandler):
             type: integer
             format: int32
           required: false
+        - in: request
+          name: fields
+          description: Comma separated fields of the objects
+          schema:
+            type: string
+          required: false
         responses:
         "200":
           description: successful operation
         """
         ctxt = self.get_context()
         page_args = self.get_paginated_args()
+        fields = self.get_fields_args(objects.Node)
         exact_filters = ['status', 'role_object_gateway', 'no_router']
         fuzzy_filters = ['hostname', 'ip_address']
         filters = self.get_support_filters(exact_filters, fuzzy_filters)
@@ -207,7 +214,7 @@ class NodeListHandler(ClusterAPIHandler):
 
         nodes = yield client.node_get_all(
             ctxt, tab=tab, expected_attrs=['disks', 'networks', 'osds'],
-            filters=filters, **page_args)
+            filters=filters, fields=fields, **page_args)
         if 'no_router' in filters:
             del(filters['no_router'])
         node_count = yield client.node_get_count(ctxt, filters=filters)
@@ -98,12 +98,19 @@ class OsdListHandler(ClusterAPIHandler):
             type: integer
             format: int32
           required: false
+        - in: request
+          name: fields
+          description: Comma separated fields of the objects
+          schema:
+            type: string
+          required: false
         responses:
         "200":
           description: successful operation
         """
         ctxt = self.get_context()
         page_args = self.get_paginated_args()
+        fields = self.get_fields_args(objects.Osd)
         client = self.get_admin_client(ctxt)
         expected_attrs = ['node', 'disk', 'pools', 'db_partition',
                           'wal_partition', 'cache_partition',
@@ -120,7 +127,7 @@ class OsdListHandler(ClusterAPIHandler):
 
         osds = yield client.osd_get_all(
             ctxt, tab=tab, filters=filters, expected_attrs=expected_attrs,
-            **page_args)
+            fields=fields, **page_args)
 
         osd_count = yield client.osd_get_count(ctxt, filters=filters)
         self.write(objects.json_encode({
@@ -261,36 +268,20 @@ class OsdListHandler(ClusterAPIHandler):
         elif 'osds' in data:
             datas = data.get('osds')
             client = self.get_admin_client(ctxt)
-            tasks = []
-            osds = []
             for data in datas:
                 self._osd_create_check(data)
-            for data in datas:
-                task = client.osd_create(ctxt, data)
-                tasks.append(task)
-            for task in tasks:
-                try:
-                    osd = yield task
-                    osds.append(osd)
-                except exception.ClusterNotHealth as e:
-                    self.api_log_exception("create osd", e)
-                    err_ms = str(e)
-                    wb_client = WebSocketClientManager(
-                        context=ctxt).get_client(CONF.my_ip)
-                    wb_client.send_message(
-                        ctxt, data, "CREATE_ERROR", err_ms,
-                        resource_type='Osd')
-                except Exception as e:
-                    self.api_log_exception("create osd", e)
-                    err_ms = str(e)
-                    wb_client = WebSocketClientManager(
-                        context=ctxt).get_client(CONF.my_ip)
-                    wb_client.send_message(
-                        ctxt, data, "CREATE_ERROR", err_ms,
-                        resource_type='Osd')
+            res = yield client.osds_create(ctxt, datas)
+            for error in res['errors']:
+                logger.error("create osd %s error: %s",
+                             error['data'], error['error'])
+                wb_client = WebSocketClientManager(
+                    context=ctxt).get_client(CONF.my_ip)
+                wb_client.send_message(
+                    ctxt, error['data'], "CREATE_ERROR", error['error'],
+                    resource_type='Osd')
 
             self.write(objects.json_encode({
-                "osds": osds
+                "osds": res['osds']
             }))
         else:
             raise ValueError("data not accept: %s", data)
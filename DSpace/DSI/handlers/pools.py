@@ -121,6 +121,33 @@ update_pool_disk_schema = {
     "additionalProperties": False
 }
 
+pool_crush_plan_schema = {
+    "type": "object",
+    "properties": {
+        "pool": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["increase_disk", "decrease_disk",
+                             "update_policy"]
+                },
+                "osds": {
+                    "type": "array",
+                    "items": {"type": "integer", "minimum": 1},
+                    "uniqueItems": True
+                },
+                "failure_domain_type": {
+                    "type": "string",
+                    "enum": ["osd", "host", "rack", "datacenter"]
+                },
+            }, "required": ["action"],
+        },
+    },
+    "required": ["pool"],
+    "additionalProperties": False
+}
+
 update_pool_security_policy_schema = {
     "type": "object",
     "properties": {
@@ -926,3 +953,75 @@ class PoolUndoHandler(ClusterAPIHandler):
             "pool": pool
         }))
         logger.info("get undo op accept")
+
+
+@URLRegistry.register(r"/pools/([0-9]*)/crush_plan/")
+class PoolCrushPlanHandler(ClusterAPIHandler):
+    @gen.coroutine
+    def post(self, pool_id):
+        """预览crush变更
+
+        {"pool":{"action":"increase_disk","osds":[1,2,3]}}
+        {"pool":{"action":"update_policy","failure_domain_type":"rack"}}
+
+        ---
+        tags:
+        - pool
+        summary: crush changes of a pool update
+        description: crush changes of adding or removing osds or updating
+          the security policy of the pool, nothing is applied.
+        operationId: pools.api.crushPlan
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        - in: url
+          name: id
+          description: Pool ID
+          schema:
+            type: integer
+            format: int32
+          required: true
+        - in: body
+          name: pool
+          description: planned update
+          required: true
+          schema:
+            type: object
+            properties:
+              pool:
+                type: object
+                properties:
+                  action:
+                    type: string
+                    description: increase_disk, decrease_disk or
+                      update_policy
+                  osds:
+                    type: array
+                    items:
+                      type: integer
+                      format: int32
+                      description: osd's ID
+                  failure_domain_type:
+                    type: string
+                    description: fault domain's Level
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        data = json_decode(self.request.body)
+        validate(data, schema=pool_crush_plan_schema,
+                 format_checker=draft7_format_checker)
+        data = data.get('pool')
+        logger.debug("crush plan: {}".format(data))
+        client = self.get_admin_client(ctxt)
+        changes = yield client.pool_crush_plan(ctxt, pool_id, data)
+        self.write(json.dumps({
+            "changes": changes
+        }))
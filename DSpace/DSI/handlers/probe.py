@@ -3,6 +3,8 @@
 
 import logging
 
+from jsonschema import draft7_format_checker
+from jsonschema import validate
 from tornado import gen
 from tornado.escape import json_decode
 
@@ -12,6 +14,40 @@ from DSpace.DSI.handlers.base import ClusterAPIHandler
 
 logger = logging.getLogger(__name__)
 
+PROBES = ["collect_nodes", "ceph_services", "ceph_osd", "ceph_config",
+          "ceph_keyring", "check_planning"]
+
+probe_nodes_schema = {
+    "type": "object",
+    "properties": {
+        "nodes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "ip": {"type": "string", "format": "ipv4"},
+                    "password": {"type": "string"},
+                },
+                "required": ["ip"],
+            },
+            "minItems": 1,
+        },
+        "probes": {
+            "type": "array",
+            "items": {"type": "string", "enum": PROBES},
+            "minItems": 1,
+            "uniqueItems": True,
+        },
+        "checks": {
+            "type": "array",
+            "items": {"type": "string"},
+            "uniqueItems": True,
+        },
+    },
+    "required": ["nodes", "probes"],
+    "additionalProperties": False
+}
+
 
 @URLRegistry.register(r"/probe_cluster_nodes/")
 class ProbeClusterNodesHandler(ClusterAPIHandler):
@@ -71,3 +107,70 @@ class ProbeClusterNodesHandler(ClusterAPIHandler):
         self.write(objects.json_encode({
             "info": info
         }))
+
+
+@URLRegistry.register(r"/probe_nodes/")
+class ProbeNodesHandler(ClusterAPIHandler):
+
+    @gen.coroutine
+    def post(self):
+        """
+        ---
+        tags:
+        - probe
+        summary: probe nodes concurrently
+        description: run probes on all nodes, every node runs all probes
+                     in one ssh command, progress is sent by websocket.
+        operationId: probe.api.nodes
+        produces:
+        - application/json
+        parameters:
+        - in: header
+          name: X-Cluster-Id
+          description: Cluster ID
+          schema:
+            type: string
+          required: true
+        - in: body
+          name: probe
+          description: nodes and probes
+          required: true
+          schema:
+            type: object
+            properties:
+              nodes:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    ip:
+                      type: string
+                      description: node's ip
+                    password:
+                      type: string
+                      description: node's password
+              probes:
+                type: array
+                items:
+                  type: string
+                description: collect_nodes, ceph_services, ceph_osd,
+                             ceph_config, ceph_keyring, check_planning
+              checks:
+                type: array
+                items:
+                  type: string
+                description: same as checks of node check
+        responses:
+        "200":
+          description: successful operation
+        """
+        ctxt = self.get_context()
+        data = json_decode(self.request.body)
+        validate(data, schema=probe_nodes_schema,
+                 format_checker=draft7_format_checker)
+        client = self.get_admin_client(ctxt)
+        infos = yield client.probe_nodes(ctxt, data['nodes'], data['probes'],
+                                         checks=data.get('checks'))
+        self.write(objects.json_encode({
+            "nodes": infos
+        }))
@@ -46,20 +46,25 @@ class TaskListHandler(ClusterAPIHandler):
             type: integer
             format: int32
           required: false
+        - in: request
+          name: cursor
+          description: next_cursor of the previous page
+          schema:
+            type: string
+          required: false
         responses:
         "200":
           description: successful operation
         """
         ctxt = self.get_context()
-        page_args = self.get_paginated_args()
+        page_args = self.get_cursor_paginated_args()
 
         client = self.get_admin_client(ctxt)
         tasks = yield client.task_get_all(ctxt, **page_args)
-        task_count = yield client.task_get_count(ctxt)
-        self.write(objects.json_encode({
-            "tasks": tasks,
-            "total": task_count
-        }))
+        task_count = yield client.task_get_count(ctxt, approximate=True)
+        res = {"tasks": tasks}
+        res.update(self.get_cursor_page_info(tasks, page_args, task_count))
+        self.write(objects.json_encode(res))
 
 
 @URLRegistry.register(r"/tasks/([0-9]*)/")
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import collections
 import hashlib
 import logging
+import threading
 import time
 from urllib.parse import parse_qs
 from urllib.parse import urlparse
@@ -16,6 +18,105 @@ logger = logging.getLogger(__name__)
 
 SESSION = {}
 
+# session_url -> redis client, a client owns a connection pool and is
+# shared by all requests
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _create_client(url):
+    kwargs = {}
+    option = urlparse(url)
+
+    kwargs['host'] = option.hostname
+    kwargs['port'] = option.port
+    kwargs['password'] = option.password
+
+    query = parse_qs(option.query)
+
+    socket_timeout = query.get("socket_timeout")
+
+    if socket_timeout:
+        kwargs['socket_timeout'] = int(socket_timeout[0])
+    else:
+        kwargs['socket_timeout'] = None
+
+    if 'sentinel' in query:
+        sentinel_name = query.get('sentinel')[0]
+        sentinel_hosts = [
+            tuple(fallback.split(':'))
+            for fallback in query.get('sentinel_fallback', [])
+        ]
+        sentinel_hosts.insert(0, (kwargs['host'], kwargs['port']))
+        sentinel_server = sentinel.Sentinel(
+            sentinel_hosts,
+            socket_timeout=kwargs['socket_timeout'])
+        master_client = sentinel_server.master_for(sentinel_name, **kwargs)
+        return master_client
+    return redis.StrictRedis(**kwargs)
+
+
+def get_redis_client(url):
+    """Redis client of the url, shared in the process"""
+    with _clients_lock:
+        if url not in _clients:
+            _clients[url] = _create_client(url)
+        return _clients[url]
+
+
+class TTLCache(object):
+    """Values recently read, shared by requests
+
+    :param ttl_opt: option of the seconds a value is kept, 0 to disable
+    :param size_opt: option of the max values kept
+    """
+
+    def __init__(self, ttl_opt, size_opt):
+        self.ttl_opt = ttl_opt
+        self.size_opt = size_opt
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if not item:
+                return None
+            expire, data = item
+            if expire < time.time():
+                self._data.pop(key)
+                return None
+            return data
+
+    def set(self, key, data):
+        ttl = getattr(CONF, self.ttl_opt)
+        if not ttl:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.time() + ttl, data)
+            while len(self._data) > getattr(CONF, self.size_opt):
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SessionCache(TTLCache):
+    """Sessions recently read from redis
+
+    A session changed by another DSI process is seen after at most
+    CONF.session_cache_ttl seconds.
+    """
+
+    def __init__(self):
+        super(SessionCache, self).__init__(
+            'session_cache_ttl', 'session_cache_size')
+
+
+SESSION_CACHE = SessionCache()
+
 
 class Session(object):
     def __init__(self, handler):
@@ -62,41 +163,23 @@ class Session(object):
 
 
 class RedisSession(Session):
+    """Session in a redis hash
+
+    All keys of a session are read by one HGETALL per request, or from
+    SESSION_CACHE if it was read recently. A login moves the session to a
+    new id.
+    """
+    login_keys = ("user_id", "username", "ticket")
+
     def __init__(self, handler):
         self.handler = handler
         self.random_index_str = None
         self.client = self.get_client(CONF.session_url)
+        self._data = None
+        self._new_id = False
 
     def get_client(self, url):
-        kwargs = {}
-        option = urlparse(CONF.session_url)
-
-        kwargs['host'] = option.hostname
-        kwargs['port'] = option.port
-        kwargs['password'] = option.password
-
-        query = parse_qs(option.query)
-
-        socket_timeout = query.get("socket_timeout")
-
-        if socket_timeout:
-            kwargs['socket_timeout'] = int(socket_timeout[0])
-        else:
-            kwargs['socket_timeout'] = None
-
-        if 'sentinel' in query:
-            sentinel_name = query.get('sentinel')[0]
-            sentinel_hosts = [
-                tuple(fallback.split(':'))
-                for fallback in query.get('sentinel_fallback', [])
-            ]
-            sentinel_hosts.insert(0, (kwargs['host'], kwargs['port']))
-            sentinel_server = sentinel.Sentinel(
-                sentinel_hosts,
-                socket_timeout=kwargs['socket_timeout'])
-            master_client = sentinel_server.master_for(sentinel_name, **kwargs)
-            return master_client
-        return redis.StrictRedis(**kwargs)
+        return get_redis_client(url)
 
     def __get_random_str(self):
         md = hashlib.md5()
@@ -104,53 +187,82 @@ class RedisSession(Session):
                         encoding='utf-8'))
         return md.hexdigest()
 
-    def __setitem__(self, key, value):
-        if not self.random_index_str:
-            random_index_str = self.handler.get_secure_cookie("__sson__", None)
-            if not random_index_str:
-                self.random_index_str = self.__get_random_str()
-                self.client.hset(self.random_index_str, "sessoin", "True")
+    def _load(self, sid):
+        """All keys of a session, {} if it doesn't exist"""
+        data = SESSION_CACHE.get(sid)
+        if data is not None:
+            return data
+        data = {
+            k.decode("utf-8") if isinstance(k, bytes) else k:
+            v.decode("utf-8") if isinstance(v, bytes) else v
+            for k, v in six.iteritems(self.client.hgetall(sid))
+        }
+        SESSION_CACHE.set(sid, data)
+        return data
+
+    def _get_data(self):
+        if self._data is None:
+            sid = self.handler.get_secure_cookie('__sson__', None)
+            if sid:
+                self.random_index_str = str(sid, encoding="utf-8")
+                self._data = self._load(self.random_index_str)
             else:
-                if self.client.hget(random_index_str, "sessoin") != "True":
-                    self.random_index_str = self.__get_random_str()
-                else:
-                    self.random_index_str = random_index_str
+                self._data = {}
+        return self._data
+
+    def __setitem__(self, key, value):
+        # cached dicts are shared by requests, never modify them
+        data = dict(self._get_data())
+        if data.get("sessoin") != "True":
+            self.random_index_str = self.__get_random_str()
+            self.client.hset(self.random_index_str, "sessoin", "True")
+            data = {"sessoin": "True"}
+            self._new_id = True
+        elif (key in self.login_keys and value is not None and
+                not self._new_id):
+            # against session fixation, keys set before login are kept
+            sid = self.__get_random_str()
+            SESSION_CACHE.pop(self.random_index_str)
+            try:
+                self.client.rename(self.random_index_str, sid)
+            except redis.ResponseError:
+                # expired in redis meanwhile
+                self.client.hset(sid, "sessoin", "True")
+                data = {"sessoin": "True"}
+            self.random_index_str = sid
+            self._new_id = True
 
         logger.debug("Session(%s) set(%s) value(%s)",
                      self.random_index_str, key, value)
         if value is None:
             self.client.hdel(self.random_index_str, key)
-        elif isinstance(value, six.text_type):
+            data.pop(key, None)
+        elif isinstance(value, (six.text_type, int)):
             value = str(value)
             self.client.hset(self.random_index_str, key, value)
-        elif isinstance(value, int):
-            self.client.hset(self.random_index_str, key, value)
+            data[key] = value
         else:
             raise ValueError("Type Error")
+        self._data = data
+        SESSION_CACHE.set(self.random_index_str, self._data)
 
         self.handler.set_secure_cookie('__sson__', self.random_index_str)
 
     def __getitem__(self, key):
-        self.random_index_str = self.handler.get_secure_cookie(
-            '__sson__', None)
-        logger.debug("Session(%s) get(%s)",
-                     self.random_index_str, key)
-        if not self.random_index_str:
-            return None
+        value = self._get_data().get(key)
+        logger.debug("Session(%s) get(%s) value(%s)",
+                     self.random_index_str, key, value)
+        return value
 
-        else:
-            self.random_index_str = str(self.random_index_str,
-                                        encoding="utf-8")
-            value = self.client.hget(self.random_index_str, key)
-            if isinstance(value, bytes):
-                value = value.decode("utf-8")
-            logger.debug("Session(%s) get(%s) value(%s)",
-                         self.random_index_str, key, value)
-            return value
+
+# scheme of session_url -> session class
+SESSION_BACKENDS = {
+    "redis": RedisSession,
+}
 
 
 def get_session():
-    if CONF.session_url:
-        return RedisSession
-    else:
+    if not CONF.session_url:
         return Session
+    scheme = urlparse(CONF.session_url).scheme
+    return SESSION_BACKENDS.get(scheme, RedisSession)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Websocket fan-out of DSM messages.
+
+Browsers subscribe to rooms of a cluster, optionally narrowed to resource
+types, by the query string of the connection
+(/ws/?cluster_id=<id>&resource_types=osd,pool) or by a "subscribe" event
+with the same keys. Messages of subscribed rooms are collected for
+websocket_batch_interval milliseconds and emitted as one
+ASYNC_RESPONSE_BATCH frame per room; repeated messages of the same object
+and operation in a frame are merged, and payloads of objects already
+sent to a room are trimmed to the changed fields (marked with "partial").
+A room gets full payloads again when it gains a member.
+
+Browsers without subscription get every message as ASYNC_RESPONSE, the
+same as before.
+
+With many DSI workers, the worker serving the websocket rpc publishes
+messages to a redis channel (MessageQueue), every worker sends them to
+its own browsers.
+"""
+import collections
+import inspect
+import threading
+import time
+
+import redis
+from oslo_log import log as logging
+from six.moves.urllib import parse
+
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.objects.base import StorObject
+
+logger = logging.getLogger(__name__)
+
+LEGACY_ROOM = "legacy"
+
+
+def cluster_room(cluster_id, resource_type=None):
+    return "cluster:{}:{}".format(cluster_id, resource_type or "*")
+
+
+def _rooms(cluster_id, resource_types):
+    if not resource_types or "*" in resource_types:
+        return set([cluster_room(cluster_id)])
+    return set(cluster_room(cluster_id, t) for t in resource_types)
+
+
+class WebSocketBroadcaster(object):
+
+    def __init__(self, ioloop, sio):
+        self.ioloop = ioloop
+        self.sio = sio
+        # room -> OrderedDict of merge key -> message
+        self._pending = {}
+        self._flush_handle = None
+        # sid -> rooms and room -> number of sids, rooms without
+        # members are skipped
+        self._subscriptions = {}
+        self._members = collections.Counter()
+        # room -> OrderedDict of (resource_type, id) -> last full payload
+        # sent to the room
+        self._last_payloads = {}
+
+    def register(self):
+        self.sio.on("connect", self._connect)
+        self.sio.on("subscribe", self._subscribe)
+        self.sio.on("disconnect", self._disconnect)
+
+    async def _call(self, fun, *args):
+        # enter_room/leave_room are coroutines in newer python-socketio
+        r = fun(*args)
+        if inspect.isawaitable(r):
+            await r
+
+    def _track(self, sid, rooms):
+        joined = set(rooms or ()) - set(self._subscriptions.get(sid, ()))
+        self._members.subtract(self._subscriptions.pop(sid, ()))
+        if rooms:
+            self._subscriptions[sid] = rooms
+            self._members.update(rooms)
+        # drop rooms without members
+        self._members += collections.Counter()
+        # new members have nothing to apply partial payloads to
+        for room in joined:
+            self._last_payloads.pop(room, None)
+        for room in list(self._last_payloads):
+            if not self._members[room]:
+                self._last_payloads.pop(room)
+
+    async def _join(self, sid, rooms):
+        self._track(sid, rooms)
+        for room in self.sio.rooms(sid):
+            if room != sid and room not in rooms:
+                await self._call(self.sio.leave_room, sid, room)
+        for room in rooms:
+            await self._call(self.sio.enter_room, sid, room)
+
+    async def _connect(self, sid, environ, auth=None):
+        query = parse.parse_qs(environ.get("QUERY_STRING", ""))
+        cluster_id = query.get("cluster_id", [None])[0]
+        if not cluster_id:
+            await self._join(sid, set([LEGACY_ROOM]))
+            return
+        resource_types = ",".join(query.get("resource_types", []))
+        await self._join(sid, _rooms(
+            cluster_id, [t for t in resource_types.split(",") if t]))
+
+    async def _disconnect(self, sid):
+        self._track(sid, None)
+
+    async def _subscribe(self, sid, data):
+        data = data or {}
+        cluster_id = data.get("cluster_id")
+        if not cluster_id:
+            await self._join(sid, set([LEGACY_ROOM]))
+            return
+        await self._join(sid, _rooms(cluster_id,
+                                     data.get("resource_types")))
+
+    def send(self, message):
+        """Thread safe, the message is emitted by the ioloop"""
+        self.ioloop.add_callback(self._enqueue, message)
+
+    def _merge_key(self, message):
+        payload = message.get('payload')
+        obj_id = None
+        if isinstance(payload, StorObject):
+            if payload.obj_attr_is_set('id'):
+                obj_id = payload.id
+        elif isinstance(payload, dict):
+            obj_id = payload.get('id')
+        if obj_id is None:
+            # never merged
+            return object()
+        return (message['resource_type'], obj_id, message['operation_type'])
+
+    def _enqueue(self, message):
+        if self._members[LEGACY_ROOM]:
+            self.ioloop.add_callback(
+                lambda: self.sio.emit("ASYNC_RESPONSE", message,
+                                      room=LEGACY_ROOM))
+        key = self._merge_key(message)
+        for room in (cluster_room(message['cluster_id']),
+                     cluster_room(message['cluster_id'],
+                                  message['resource_type'])):
+            if not self._members[room]:
+                continue
+            pending = self._pending.setdefault(
+                room, collections.OrderedDict())
+            # the latest message of an object and operation wins
+            pending[key] = message
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = self.ioloop.call_later(
+                CONF.websocket_batch_interval / 1000.0, self._flush)
+
+    def _plain(self, message):
+        # plain dict of the payload, shared by all rooms of the frame
+        payload = objects.Json.loads(objects.Json.dumps(message['payload']))
+        return dict(message, payload=payload)
+
+    def _trim(self, room, message):
+        payload = message['payload']
+        if not isinstance(payload, dict) or payload.get('id') is None:
+            return message
+        key = (message['resource_type'], payload['id'])
+        last_payloads = self._last_payloads.setdefault(
+            room, collections.OrderedDict())
+        last = last_payloads.pop(key, None)
+        last_payloads[key] = payload
+        while len(last_payloads) > CONF.websocket_payload_cache_size:
+            last_payloads.popitem(last=False)
+        if last is None:
+            return message
+        message = dict(message)
+        changed = {k: v for k, v in payload.items() if last.get(k) != v}
+        changed['id'] = payload['id']
+        message.update(payload=changed, partial=True)
+        return message
+
+    async def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        plain = {}
+        for room, messages in pending.items():
+            frame = []
+            for message in messages.values():
+                # a message is in two rooms, serialize it once
+                if id(message) not in plain:
+                    plain[id(message)] = self._plain(message)
+                frame.append(self._trim(room, plain[id(message)]))
+            try:
+                await self.sio.emit("ASYNC_RESPONSE_BATCH",
+                                    {"messages": frame}, room=room)
+            except Exception as e:
+                logger.warning("websocket emit to %s error: %s", room, e)
+
+
+class MessageQueue(object):
+    """Forwards messages to the broadcasters of all DSI workers"""
+
+    CHANNEL = "dspace:websocket"
+
+    def __init__(self, client, broadcaster):
+        self.client = client
+        self.broadcaster = broadcaster
+
+    def publish(self, message):
+        self.client.publish(self.CHANNEL, objects.Json.dumps(message))
+
+    def start(self):
+        thread = threading.Thread(target=self._listen,
+                                  name="websocket-queue")
+        thread.daemon = True
+        thread.start()
+
+    def _consume(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.CHANNEL)
+        for item in pubsub.listen():
+            if item.get('type') != 'message':
+                continue
+            self.broadcaster.send(objects.Json.loads(item['data']))
+
+    def _listen(self):
+        while True:
+            try:
+                self._consume()
+            except redis.RedisError as e:
+                logger.warning("websocket queue error: %s", e)
+                time.sleep(1)
@@ -1,6 +1,10 @@
 from __future__ import print_function
 
+import copy
 import sys
+import threading
+import time
+from concurrent import futures
 
 from oslo_log import log as logging
 
@@ -8,12 +12,15 @@ from DSpace import objects
 from DSpace import version
 from DSpace.common.config import CONF
 from DSpace.context import RequestContext
+from DSpace.objects import base as objects_base
 from DSpace.service import BaseClientManager
 from DSpace.service import RPCClient
 from DSpace.utils import no_exception
 
 logger = logging.getLogger(__name__)
 
+_serializer = objects_base.StorObjectSerializer()
+
 
 class WebSocketClient(RPCClient):
 
@@ -30,34 +37,56 @@ class WebSocketClientManager(BaseClientManager):
     service_name = "websocket"
     client_cls = WebSocketClient
     clients = {}
+    # one sender thread per DSI keeps messages in order, DSIs are sent
+    # to in parallel and callers never wait
+    senders = {}
+    _lock = threading.Lock()
     _ws_ips = None
+    _ws_ips_time = 0
 
     def ws_ips(self, ctxt):
-        if not self._ws_ips:
+        cls = WebSocketClientManager
+        if (cls._ws_ips is None or time.time() - cls._ws_ips_time >
+                CONF.websocket_client_refresh_interval):
             admin_nodes = objects.NodeList.get_all(
                 ctxt, filters={'role_admin': 1, 'cluster_id': '*'})
-            self._ws_ips = [str(n.ip_address) for n in admin_nodes]
-        return self._ws_ips
+            cls._ws_ips = [str(n.ip_address) for n in admin_nodes]
+            cls._ws_ips_time = time.time()
+        return cls._ws_ips
 
     def get_client(self, ws_ip):
-        if ws_ip not in self.clients:
-            endpoint = "{}:{}".format(ws_ip, CONF.websocket_port)
-            logger.info("init ws endpoint: %s", endpoint)
-            client = self.client_cls(endpoint,
-                                     async_support=self.async_support)
-            self.clients[ws_ip] = client
-        return self.clients[ws_ip]
+        with self._lock:
+            if ws_ip not in self.clients:
+                endpoint = "{}:{}".format(ws_ip, CONF.websocket_port)
+                logger.info("init ws endpoint: %s", endpoint)
+                client = self.client_cls(endpoint,
+                                         async_support=self.async_support)
+                self.clients[ws_ip] = client
+            return self.clients[ws_ip]
+
+    def get_sender(self, ws_ip):
+        with self._lock:
+            if ws_ip not in self.senders:
+                self.senders[ws_ip] = futures.ThreadPoolExecutor(
+                    max_workers=1)
+            return self.senders[ws_ip]
+
+    @no_exception
+    def _send(self, ws_ip, ctxt, obj, op_type, msg, resource_type):
+        client = self.get_client(ws_ip)
+        client.send_message(ctxt, obj, op_type, msg, resource_type)
 
     @no_exception
     def send_message(self, ctxt, obj, op_type, msg, resource_type=None):
-        ws_ip = ctxt.ws_ip
-        if ws_ip:
-            client = self.get_client(ws_ip)
-            client.send_message(ctxt, obj, op_type, msg, resource_type)
-            return
-        for ws_ip in self.ws_ips(ctxt):
-            client = self.get_client(ws_ip)
-            client.send_message(ctxt, obj, op_type, msg, resource_type)
+        """Fire and forget, errors are logged only"""
+        ws_ips = [ctxt.ws_ip] if ctxt.ws_ip else self.ws_ips(ctxt)
+        # callers may change the context (e.g. cluster_id) and the object
+        # (e.g. status) after return, the message has their current state
+        ctxt = copy.copy(ctxt)
+        obj = _serializer.serialize_entity(ctxt, obj)
+        for ws_ip in ws_ips:
+            self.get_sender(ws_ip).submit(
+                self._send, ws_ip, ctxt, obj, op_type, msg, resource_type)
 
 
 if __name__ == '__main__':
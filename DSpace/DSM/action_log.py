@@ -5,26 +5,30 @@ from DSpace.DSM.base import AdminBaseHandler
 from DSpace.objects.fields import AllActionStatus
 from DSpace.objects.fields import AllResourceType
 from DSpace.objects.fields import ResourceAction
+from DSpace.service import read_only
 
 logger = logging.getLogger(__name__)
 
 
 class ActionLogHandler(AdminBaseHandler):
 
+    @read_only
     def action_log_get_all(self, ctxt, marker=None, limit=None,
                            sort_keys=None, sort_dirs=None, filters=None,
-                           offset=None, expected_attrs=None):
+                           offset=None, expected_attrs=None, cursor=None):
         return objects.ActionLogList.get_all(
             ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
             sort_dirs=sort_dirs, filters=filters, offset=offset,
-            expected_attrs=expected_attrs)
+            expected_attrs=expected_attrs, cursor=cursor)
 
+    @read_only
     def action_log_get(self, ctxt, action_log_id, expected_attrs=None):
         return objects.ActionLog.get_by_id(ctxt, action_log_id, expected_attrs)
 
-    def action_log_get_count(self, ctxt, filters=None):
+    @read_only
+    def action_log_get_count(self, ctxt, filters=None, approximate=False):
         return objects.ActionLogList.get_count(
-            ctxt, filters=filters)
+            ctxt, filters=filters, approximate=approximate)
 
     def resource_action(self, ctxt):
         resource_type = AllResourceType.ALL
@@ -16,6 +16,7 @@ from DSpace.DSM.disk import DiskHandler
 from DSpace.DSM.email_group import EmailGroupHandler
 from DSpace.DSM.license import LicenseHandler
 from DSpace.DSM.log_file import LogFileHandler
+from DSpace.DSM.log_retention import LogRetentionHandler
 from DSpace.DSM.mail import MailHandler
 from DSpace.DSM.metrics import MetricsHandler
 from DSpace.DSM.network import NetworkHandler
@@ -38,6 +39,7 @@ from DSpace.DSM.volume_access_path import VolumeAccessPathHandler
 from DSpace.DSM.volume_client_group import VolumeClientGroupHandler
 from DSpace.DSM.volume_snapshot import VolumeSnapshotHandler
 from DSpace.service import ServiceCell
+from DSpace.utils.profile import StartupProfile
 
 CONF = cfg.CONF
 
@@ -59,6 +61,7 @@ class AdminHandler(ActionLogHandler,
                    EmailGroupHandler,
                    LicenseHandler,
                    LogFileHandler,
+                   LogRetentionHandler,
                    MailHandler,
                    MetricsHandler,
                    NetworkHandler,
@@ -89,5 +92,7 @@ class AdminService(ServiceCell):
     service_name = "admin"
 
     def __init__(self, *args, **kwargs):
-        self.handler = AdminHandler()
+        profile = StartupProfile()
+        self.handler = profile.construct(AdminHandler)
+        logger.info("Handler init profile:\n%s", profile.report())
         super(AdminService, self).__init__(*args, **kwargs)
@@ -9,22 +9,26 @@ from DSpace import objects
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
+from DSpace.service import read_only
+from DSpace.utils.threadpool import Priority
 
 logger = logging.getLogger(__name__)
 
 
 class AlertLogHandler(AdminBaseHandler):
+    @read_only
     def alert_log_get_all(self, ctxt, marker=None, limit=None,
                           sort_keys=None, sort_dirs=None, filters=None,
-                          offset=None, expected_attrs=None):
+                          offset=None, expected_attrs=None, cursor=None):
         return objects.AlertLogList.get_all(
             ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
             sort_dirs=sort_dirs, filters=filters, offset=offset,
-            expected_attrs=expected_attrs)
+            expected_attrs=expected_attrs, cursor=cursor)
 
-    def alert_log_get_count(self, ctxt, filters=None):
+    @read_only
+    def alert_log_get_count(self, ctxt, filters=None, approximate=False):
         return objects.AlertLogList.get_count(
-            ctxt, filters=filters)
+            ctxt, filters=filters, approximate=approximate)
 
     def _send_alert_email(self, ctxt, to_datas):
         for to_data in to_datas:
@@ -162,6 +166,7 @@ class AlertLogHandler(AdminBaseHandler):
                 to_datas.append(per_data)
         return to_datas
 
+    @read_only
     def alert_log_get(self, ctxt, alert_log_id, expected_attrs=None):
         return objects.AlertLog.get_by_id(ctxt, alert_log_id, expected_attrs)
 
@@ -185,7 +190,8 @@ class AlertLogHandler(AdminBaseHandler):
         to_datas = self._receive_datas(ctxt, receive_datas)
         logger.debug('has handled to_datas:%s', to_datas)
         # 2. send_email
-        self.task_submit(self._send_alert_email, ctxt, to_datas)
+        self.task_submit(self._send_alert_email, ctxt, to_datas,
+                         priority=Priority.BACKGROUND)
         logger.info('send_email tasks has begin')
         return True
 
@@ -2,7 +2,6 @@ import abc
 import hashlib
 import json
 import re
-import time
 from datetime import datetime
 
 import six
@@ -626,12 +625,9 @@ class AlertWatcher(object):
         self._querys = {}
         self._notifys = {}
 
-    def check(self, interval):
-        """Loop for all query"""
-        while True:
-            for query in six.itervalues(self._querys):
-                query.check()
-            time.sleep(interval)
+    def check_once(self):
+        for query in list(six.itervalues(self._querys)):
+            query.check()
 
     def append_query(self, query):
         """Append a new query"""
@@ -687,15 +683,11 @@ class AlertRuleHandler(AdminBaseHandler):
         clusters = objects.ClusterList.get_all(self.ctxt)
         for cluster in clusters:
             self.update_notify_group(cluster.id)
-        self.task_submit(self._alert_watcher_check, permanent=True)
+        self.periodic_submit(self.alert_watcher.check_once,
+                             CONF.alert_rule_check_interval,
+                             name="alert_watcher_check")
         logger.info('alert_watcher_check task has begin')
 
-    def _alert_watcher_check(self):
-        self.wait_ready()
-        logger.debug("Start alert watcher check")
-        while True:
-            self.alert_watcher.check(CONF.alert_rule_check_interval)
-
     def get_cluster_prome_rules(self, cluster_id=None):
         rules = objects.AlertRuleList.get_all(
             self.ctxt, filters={
@@ -5,6 +5,7 @@ import oslo_db
 from oslo_log import log as logging
 from oslo_utils import strutils
 from oslo_utils import timeutils
+from tooz.coordination import LockAcquireFailed
 
 from DSpace import context
 from DSpace import exception as exc
@@ -32,15 +33,27 @@ logger = logging.getLogger(__name__)
 
 
 class AdminBaseMixin(TheadPoolMixin):
-
-    def __init__(self, *args, **kwargs):
-        super(AdminBaseMixin, self).__init__(*args, **kwargs)
-        ctxt = context.get_context(user_id="admin")
-        self.container_prefix = objects.sysconfig.sys_config_get(
-            ctxt, "container_prefix")
-        self.map_util = ServiceMap(self.container_prefix)
-        self.debug_mode = objects.sysconfig.sys_config_get(
-            ctxt, ConfigKey.DEBUG_MODE)
+    _container_prefix = None
+    _map_util = None
+
+    # loaded on first use, service helpers are created for every service
+    @property
+    def container_prefix(self):
+        if self._container_prefix is None:
+            self._container_prefix = objects.sysconfig.sys_config_get(
+                context.get_context(user_id="admin"), "container_prefix")
+        return self._container_prefix
+
+    @property
+    def map_util(self):
+        if self._map_util is None:
+            self._map_util = ServiceMap(self.container_prefix)
+        return self._map_util
+
+    @property
+    def debug_mode(self):
+        return objects.sysconfig.sys_config_get(
+            context.get_context(user_id="admin"), ConfigKey.DEBUG_MODE)
 
     def send_websocket(self, ctxt, obj, op_type, msg, resource_type=None):
         wb = WebSocketClientManager(context=ctxt)
@@ -149,6 +162,7 @@ class AdminBaseMixin(TheadPoolMixin):
 
 class AdminBaseHandler(AdminBaseMixin):
     slow_requests = {}
+    agent_manager = None
 
     def __init__(self):
         super(AdminBaseHandler, self).__init__()
@@ -160,16 +174,25 @@ class AdminBaseHandler(AdminBaseMixin):
     @retry(oslo_db.exception.DBConnectionError, retries=10)
     def bootstrap(self):
         logger.info("DSpace admin bootstrap")
-        ctxt = self.ctxt
-        CONF.package_ignore = self.package_ignore_get(ctxt)
-        self._setup_agent_manager(ctxt)
-        clusters = objects.ClusterList.get_all(ctxt)
+        # a hot standby has most of it loaded already
+        self.warm_up()
+        clusters = objects.ClusterList.get_all(self.ctxt)
         for cluster in clusters:
             ctxt = context.get_context(cluster.id, user_id="admin")
-            self._add_node_to_agent_manager(ctxt)
             self._gen_ceph_config(ctxt)
             self._clean_taskflow(ctxt)
 
+    def warm_up(self):
+        """Load the state read by rpc calls, without changing anything
+
+        Called by bootstrap, and periodically by a hot standby.
+        """
+        ctxt = self.ctxt
+        CONF.package_ignore = self.package_ignore_get(ctxt)
+        if not self.agent_manager:
+            self._setup_agent_manager(ctxt)
+        self._add_node_to_agent_manager(ctxt)
+
     def _gen_ceph_config(self, ctxt):
         ceph_client = CephTask(ctxt)
         ceph_client.gen_config()
@@ -182,12 +205,12 @@ class AdminBaseHandler(AdminBaseMixin):
         setattr(context, 'agent_manager', agent_manager)
 
     def _add_node_to_agent_manager(self, ctxt):
+        # alive nodes of all clusters
         nodes = objects.NodeList.get_all(
-            ctxt, filters={"status": s_fields.NodeStatus.ALIVE})
-        logger.info("Node get all %s", nodes)
-        for node in nodes:
-            logger.info("add node to agent manager %s", node)
-            self.agent_manager.add_node(node)
+            ctxt, filters={"status": s_fields.NodeStatus.ALIVE,
+                           "cluster_id": "*"})
+        logger.debug("Node get all %s", nodes)
+        self.agent_manager.sync_nodes(nodes)
 
     def _clean_taskflow(self, ctxt):
         task_manager.bootstrap(ctxt)
@@ -204,6 +227,24 @@ class AdminBaseHandler(AdminBaseMixin):
     def to_active(self):
         self.status = DSMStatus.ACTIVE
 
+    def periodic_submit(self, fun, interval, **kwargs):
+        """Periodic job which runs only after DSM is ready
+
+        Jobs locked by other DSM (synchronized with blocking=False) are
+        skipped silently.
+        """
+        def _job():
+            if not self.is_ready():
+                return
+            try:
+                fun()
+            except LockAcquireFailed as e:
+                logger.debug(e)
+
+        kwargs.setdefault('name', fun.__name__)
+        return super(AdminBaseHandler, self).periodic_submit(
+            _job, interval, **kwargs)
+
     def begin_action(self, ctxt, resource_type=None, action=None,
                      before_obj=None):
         logger.debug('begin action, resource_type:%s, action:%s',
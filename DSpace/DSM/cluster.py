@@ -1,8 +1,13 @@
+import hashlib
+import json
+
 import six
 from oslo_log import log as logging
 
+from DSpace import context
 from DSpace import exception as exc
 from DSpace import objects
+from DSpace.common.config import CONF
 from DSpace.DSM.alert_rule import AlertRuleInitMixin
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
@@ -11,6 +16,7 @@ from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
 from DSpace.objects.fields import CephVersion
 from DSpace.objects.fields import ConfigKey
+from DSpace.service import read_only
 from DSpace.taskflows.ceph import CephTask
 from DSpace.taskflows.cluster import cluster_delete_flow
 from DSpace.taskflows.node import NodeTask
@@ -18,12 +24,27 @@ from DSpace.taskflows.node import PrometheusTargetMixin
 from DSpace.tools.base import SSHExecutor
 from DSpace.tools.ceph import CephTool
 from DSpace.tools.prometheus import PrometheusTool
+from DSpace.utils.threadpool import Priority
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_SERVICES = ["NODE_EXPORTER", "PROMETHEUS", "MON", "DSM", "DSI",
+                      "DSA", "NGINX", "MARIADB", "ETCD"]
+
 
 class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
 
+    def __init__(self, *args, **kwargs):
+        super(ClusterHandler, self).__init__(*args, **kwargs)
+        # cluster_id -> (digest, snapshot), filled by dashboard_collect
+        self._dashboard_snapshots = {}
+
+    def bootstrap(self):
+        super(ClusterHandler, self).bootstrap()
+        self.periodic_submit(self.dashboard_collect,
+                             CONF.dashboard_snapshot_interval)
+
+    @read_only
     def cluster_get(self, ctxt, cluster_id):
         cluster = objects.Cluster.get_by_id(ctxt, cluster_id)
         return cluster
@@ -46,6 +67,7 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
                 c.capacity = self.cluster_capacity_status_get(ctxt)
         return clusters
 
+    @read_only
     def cluster_get_count(self, ctxt, filters=None):
         return objects.ClusterList.get_count(
             ctxt, filters=filters)
@@ -268,8 +290,10 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
         self.init_alert_rule(ctxt, cluster_id)
         pro_rules = self.get_cluster_prome_rules(cluster_id)
         logger.info('new_cluster_id:%s, pro_rules:%s', cluster, pro_rules)
-        self.task_submit(self.update_prometheus_que, pro_rules)
-        self.task_submit(self.update_notify_group, cluster_id)
+        self.task_submit(self.update_prometheus_que, pro_rules,
+                         priority=Priority.BACKGROUND)
+        self.task_submit(self.update_notify_group, cluster_id,
+                         priority=Priority.BACKGROUND)
         if not is_admin:
             # add an admin_cluster actions
             self.finish_action(admin_begin_action, cluster.id,
@@ -431,11 +455,13 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
                              'cluster_network': str(cluster_network)})
         return cluster_info
 
+    @read_only
     def service_status_get(self, ctxt, names):
         if not objects.NodeList.get_count(ctxt):
             return {}
         return objects.ServiceList.service_status_get(ctxt, names=names)
 
+    @read_only
     def cluster_host_status_get(self, ctxt):
         query_all = objects.NodeList.get_status(ctxt)
         status = {s_fields.NodeStatus.ACTIVE: 0,
@@ -451,6 +477,7 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
                 status["progress"] += v
         return status
 
+    @read_only
     def cluster_pool_status_get(self, ctxt):
         logger.info("try get pool status")
         query_all = objects.PoolList.get_status(ctxt)
@@ -476,6 +503,7 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
         logger.info("pool status: %s", status)
         return status
 
+    @read_only
     def cluster_osd_status_get(self, ctxt):
         query_all = objects.OsdList.get_status(ctxt)
         status = {s_fields.OsdStatus.ACTIVE: 0,
@@ -517,6 +545,58 @@ class ClusterHandler(AdminBaseHandler, AlertRuleInitMixin):
             logger.debug('Get pg state from cluster, %s', pg_state)
         return pg_state
 
+    def _dashboard_snapshot(self, ctxt):
+        parts = {
+            "services_status": lambda: self.service_status_get(
+                ctxt, names=DASHBOARD_SERVICES),
+            "host_status": lambda: self.cluster_host_status_get(ctxt),
+            "pool_status": lambda: self.cluster_pool_status_get(ctxt),
+            "osd_status": lambda: self.cluster_osd_status_get(ctxt),
+            "capacity_status": lambda: self.cluster_capacity_status_get(ctxt),
+            "pg_status": lambda: self.cluster_pg_status_get(ctxt, None),
+            "cluster": lambda: self.cluster_status(ctxt),
+        }
+        snapshot = {}
+        for name, fun in six.iteritems(parts):
+            # a failed part is None, the others are still shown
+            try:
+                snapshot[name] = fun()
+            except Exception as e:
+                logger.warning("cluster %s: get dashboard %s error: %s",
+                               ctxt.cluster_id, name, e)
+                snapshot[name] = None
+        return snapshot
+
+    def _dashboard_collect(self, ctxt):
+        snapshot = self._dashboard_snapshot(ctxt)
+        digest = hashlib.sha1(json.dumps(
+            snapshot, sort_keys=True, default=str).encode()).hexdigest()
+        last = self._dashboard_snapshots.get(ctxt.cluster_id)
+        self._dashboard_snapshots[ctxt.cluster_id] = (digest, snapshot)
+        if last and last[0] == digest:
+            return
+        self.send_websocket(ctxt, snapshot, "DASHBOARD_SNAPSHOT", "",
+                            resource_type="dashboard")
+
+    def dashboard_collect(self):
+        """Push dashboard snapshots of all clusters when they change"""
+        clusters = objects.ClusterList.get_all(self.ctxt)
+        for cluster in clusters:
+            ctxt = context.get_context(cluster_id=cluster.id,
+                                       user_id="admin")
+            try:
+                self._dashboard_collect(ctxt)
+            except Exception as e:
+                logger.warning("cluster %s: collect dashboard error: %s",
+                               cluster.id, e)
+
+    def dashboard_snapshot_get(self, ctxt):
+        last = self._dashboard_snapshots.get(ctxt.cluster_id)
+        if last:
+            return last[1]
+        # not collected yet
+        return self._dashboard_snapshot(ctxt)
+
     def cluster_switch(self, ctxt, cluster_id):
         user_id = ctxt.user_id
         user = objects.User.get_by_id(ctxt, user_id)
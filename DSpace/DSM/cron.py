@@ -1,11 +1,7 @@
 import logging
-import time
 from itertools import groupby
 from operator import itemgetter
 
-import six
-from tooz.coordination import LockAcquireFailed
-
 from DSpace import context as context_tool
 from DSpace import exception
 from DSpace import objects
@@ -13,26 +9,39 @@ from DSpace.common.config import CONF
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
+from DSpace.taskflows import osd_check
 from DSpace.taskflows.ceph import CephTask
 from DSpace.tools.base import SSHExecutor
 from DSpace.tools.ceph import CephTool
 from DSpace.utils.coordination import synchronized
+from DSpace.utils.threadpool import Priority
 
 logger = logging.getLogger(__name__)
 
 
 class CronHandler(AdminBaseHandler):
+    clusters = ()
+
     def __init__(self, *args, **kwargs):
         super(CronHandler, self).__init__(*args, **kwargs)
         self.ctxt = context_tool.get_context()
+
+    def warm_up(self):
+        super(CronHandler, self).warm_up()
         self.clusters = objects.ClusterList.get_all(self.ctxt)
 
     def bootstrap(self):
         super(CronHandler, self).bootstrap()
-        self.task_submit(self._check_ceph_cluster_status, permanent=True)
-        self.task_submit(self._osd_slow_requests_get_all, permanent=True)
-        self.task_submit(self._osd_tree_cron, permanent=True)
-        self.task_submit(self._node_check_cron, permanent=True)
+        self.periodic_submit(self._ceph_status_check,
+                             CONF.ceph_mon_check_interval)
+        self.periodic_submit(self._osd_slow_requests_get,
+                             CONF.slow_request_get_time_interval)
+        if CONF.osd_heartbeat_check and CONF.heartbeat_check:
+            self.periodic_submit(self.osd_check, CONF.osd_check_interval)
+        else:
+            logger.info("osd check not enable")
+        self.periodic_submit(self.node_services_check,
+                             CONF.node_check_interval)
 
     def _osd_slow_requests_get(self):
         for cluster in self.clusters:
@@ -82,33 +91,6 @@ class CronHandler(AdminBaseHandler):
                                          reverse=True)
             self.slow_requests.update({ctxt.cluster_id: res})
 
-    def _osd_slow_requests_get_all(self):
-        self.wait_ready()
-        logger.debug("Start ceph cluster check crontab")
-        while True:
-            try:
-                self._osd_slow_requests_get()
-            except Exception as e:
-                logger.warning("Osd slow request set Exception: %s", e)
-            time.sleep(CONF.slow_request_get_time_interval)
-
-    def _osd_tree_cron(self):
-        self.wait_ready()
-        logger.debug("Start osd check crontab")
-        if not CONF.osd_heartbeat_check or not CONF.heartbeat_check:
-            logger.info("osd check not enable")
-            return
-        while True:
-            try:
-                self.osd_check()
-            except LockAcquireFailed as e:
-                logger.debug(e)
-                time.sleep(CONF.osd_check_interval * 2)
-                continue
-            except Exception as e:
-                logger.warning("Osd check cron exception: %s", e)
-            time.sleep(CONF.osd_check_interval)
-
     def _check_restart(self, context):
         if not CONF.service_auto_restart:
             logger.info("Service check not enable")
@@ -150,138 +132,16 @@ class CronHandler(AdminBaseHandler):
             self.send_service_alert(context, osd, "osd_status", "Osd",
                                     "ERROR", msg, "OSD_OFFLINE")
 
-    def get_osd_status(self, context, osd_id, ceph_client):
-        osd_nodes = self._get_osd_tree(ceph_client)
-        osd_status = {}
-        for osd_node in osd_nodes:
-            if osd_node.get("id") == osd_id:
-                osd_status = osd_node
-                break
-            else:
-                continue
-        if not osd_status:
-            return ""
-        status = ""
-        # get in or out
-        if osd_status.get('reweight'):
-            status += "in&"
-        else:
-            status += "out&"
-        # get up or down
-        serice_status = self._check_ceph_osd_status(context, ceph_client)
-        if serice_status:
-            up_down = serice_status.get("osd.{}".format(osd_status.get('id')))
-        else:
-            up_down = osd_status.get('status')
-        if not up_down:
-            return ""
-        status += up_down
-        return status
-
-    def _set_osd_status(self, context, osd_status, ceph_client):
-        osd_id = osd_status.get('id')
-        if osd_id < 0:
-            return
-        osd = objects.OsdList.get_all(context, filters={"osd_id": osd_id})
-        if not osd:
-            return
-        osd = osd[0]
-        if osd.status in s_fields.OsdStatus.OSD_CHECK_IGNORE_STATUS:
-            return
-        status = self.get_osd_status(context, osd_id, ceph_client)
-        if not status:
-            return
-        node = objects.Node.get_by_id(context, osd.node_id)
-        if not self.if_service_alert(context, node=node):
-            return
-        try:
-            if status == "in&up":
-                err_status = [s_fields.OsdStatus.OFFLINE,
-                              s_fields.OsdStatus.RESTARTING,
-                              s_fields.OsdStatus.ERROR]
-                res = osd.conditional_update({
-                    "status": s_fields.OsdStatus.ACTIVE
-                }, expected_values={
-                    "status": err_status
-                })
-                if not res:
-                    return
-                msg = _("osd.{} is active").format(osd.osd_id)
-                self.send_service_alert(
-                    context, osd, "osd_status", "Osd", "INFO", msg,
-                    "OSD_ACTIVE")
-            elif status == "in&down":
-                if osd.status in [s_fields.OsdStatus.ACTIVE]:
-                    logger.warning("osd.%s status is %s", osd.osd_id, status)
-                    res = osd.conditional_update({
-                        "status": s_fields.OsdStatus.OFFLINE
-                    }, expected_values={
-                        "status": s_fields.OsdStatus.ACTIVE
-                    })
-                    if not res:
-                        return
-                    msg = _("osd.{} is offline").format(osd.osd_id)
-                    self.send_service_alert(
-                        context, osd, "osd_status", "Osd", "WARN", msg,
-                        "OSD_OFFLINE")
-                    res = osd.conditional_update({
-                        "status": s_fields.OsdStatus.RESTARTING
-                    }, expected_values={
-                        "status": s_fields.OsdStatus.OFFLINE
-                    })
-                    if not res:
-                        return
-                    self.task_submit(self._restart_osd, context, osd)
-            elif status == "out&up" or status == "out&down":
-                if osd.status in [s_fields.OsdStatus.OFFLINE,
-                                  s_fields.OsdStatus.RESTARTING,
-                                  s_fields.OsdStatus.ERROR]:
-                    return
-                res = osd.conditional_update({
-                    "status": s_fields.OsdStatus.OFFLINE
-                }, expected_values={
-                    "status": [s_fields.OsdStatus.ACTIVE,
-                               s_fields.OsdStatus.WARNING]
-                })
-                if not res:
-                    return
-                logger.warning("osd.%s status is %s", osd.osd_id, status)
-                msg = _("osd.{} is offline").format(osd.osd_id)
-                self.send_service_alert(context, osd, "osd_status", "Osd",
-                                        "WARN", msg, "OSD_OFFLINE")
-        except exception.OsdNotFound as e:
-            logger.warning(e)
-
-    def _get_osd_status_from_dsa(self, context):
-        osds = objects.OsdList.get_all(
-            context, expected_attrs=['node'])
-        osds.sort(key=itemgetter('node_id'))
-        osds = groupby(osds, itemgetter('node_id'))
-        osd_all = dict([(key, list(group)) for key, group in osds])
-        osds_status = {}
-        for node_id, osds in osd_all.items():
-            client = self.agent_manager.get_client(node_id=node_id)
-            try:
-                res = client.get_osds_status(context, osds)
-                osds_status.update(res)
-            except exception.StorException as e:
-                logger.error(e)
-                continue
-        return osds_status
+    def _get_osd_status_from_dsa(self, context, node_id, osds):
+        client = self.agent_manager.get_client(node_id=node_id)
+        return client.get_osds_status(context, osds)
 
-    def _check_ceph_osd_status(self, context, ceph_client):
+    def _osd_min_up_ratio(self, context):
         min_up_ratio = objects.CephConfig.get_by_key(
             context, group="*", key="mon_osd_min_up_ratio")
         if not min_up_ratio:
             min_up_ratio = 0.3
-        osd_stat = ceph_client.get_osd_stat()
-        num_osds = osd_stat.get("num_osds")
-        if not num_osds:
-            return {}
-        up_ratio = osd_stat.get("num_up_osds") / num_osds
-        if up_ratio <= min_up_ratio:
-            return self._get_osd_status_from_dsa(context)
-        return {}
+        return float(min_up_ratio)
 
     def _make_osd_list(self, context, osds):
         res = {}
@@ -292,56 +152,59 @@ class CronHandler(AdminBaseHandler):
             res.update({osd.osd_id: osd})
         return res
 
-    def _get_osd_tree(self, ceph_client):
-        osd_tree = ceph_client.get_osd_tree()
-        nodes = osd_tree.get("nodes") + osd_tree.get("stray")
-        return nodes
+    def _osd_apply(self, context, transition, osds):
+        osds = objects.OsdList.status_update(
+            context, osds, transition.status, transition.expected)
+        if transition.alert:
+            level, op_type = transition.alert
+            for osd in osds:
+                if transition is osd_check.ACTIVE:
+                    msg = _("osd.{} is active").format(osd.osd_id)
+                else:
+                    msg = _("osd.{} is offline").format(osd.osd_id)
+                self.send_service_alert(context, osd, "osd_status", "Osd",
+                                        level, msg, op_type)
+        return osds
+
+    def _osd_check(self, context):
+        osds = objects.OsdList.get_all(context, expected_attrs=['node'])
+        if not osds:
+            logger.debug("Cluster %s has no osd, ignore", context.cluster_id)
+            return
+        checker = osd_check.OsdChecker(
+            CephTask(context),
+            lambda node_id, node_osds: self._get_osd_status_from_dsa(
+                context, node_id, node_osds),
+            min_up_ratio=self._osd_min_up_ratio(context),
+            workers=CONF.probe_workers)
+        states = checker.osd_states(osds)
+        plan = checker.plan(self._make_osd_list(context, osds), states)
+        if not plan or not self.if_service_alert(context):
+            return
+        for transition in (osd_check.ACTIVE, osd_check.OUT,
+                           osd_check.MISSING):
+            if transition in plan:
+                self._osd_apply(context, transition, plan[transition])
+        if osd_check.DOWN in plan:
+            osds = self._osd_apply(context, osd_check.DOWN,
+                                   plan[osd_check.DOWN])
+            osds = objects.OsdList.status_update(
+                context, osds, osd_check.RESTART.status,
+                osd_check.RESTART.expected)
+            for osd in osds:
+                self.task_submit(self._restart_osd, context, osd,
+                                 priority=Priority.BACKGROUND)
 
-    # @synchronized('cron_osd_tree', blocking=False)
     def osd_check(self):
         for cluster in self.clusters:
             context = context_tool.get_context(cluster_id=cluster.id)
             if not self.get_ceph_cluster_status(context):
                 continue
-            ceph_client = CephTask(context)
-            osds = objects.OsdList.get_all(context)
-            if not osds:
-                logger.debug("Cluster %s has no osd, ignore", cluster.id)
-                continue
-            osds = self._make_osd_list(context, osds)
-            nodes = self._get_osd_tree(ceph_client)
-            for osd_status in nodes:
-                if osd_status.get('id') < 0:
-                    continue
-                osd_status_id = str(osd_status.get('id'))
-                if not osds.get(osd_status_id):
-                    continue
-                self._set_osd_status(context, osd_status, ceph_client)
-                if osds.get(osd_status_id):
-                    osds.pop(osd_status_id)
-            if osds:
-                for osd_id, osd in six.iteritems(osds):
-                    if osd.status in [s_fields.OsdStatus.DELETING,
-                                      s_fields.OsdStatus.CREATING]:
-                        continue
-                    # If osd is in db but not in ceph cluster, mark it to error
-                    logger.error("Osd.%s is not in cluster", osd_id)
-                    osd.status = s_fields.OsdStatus.ERROR
-                    osd.save()
-
-    def _node_check_cron(self):
-        self.wait_ready()
-        logger.debug("Start node check crontab")
-        while True:
             try:
-                self.node_services_check()
-            except LockAcquireFailed as e:
-                logger.debug(e)
-                time.sleep(CONF.dsa_check_interval * 2)
-                continue
-            except Exception as e:
-                logger.exception("Dsa check cron Exception: %s", e)
-            time.sleep(CONF.node_check_interval)
+                self._osd_check(context)
+            except exception.StorException as e:
+                logger.warning("cluster %s: osd check error: %s",
+                               cluster.id, e)
 
     @synchronized("cron_node_services_check", blocking=False)
     def node_services_check(self):
@@ -390,20 +253,6 @@ class CronHandler(AdminBaseHandler):
                     "status": s_fields.NodeStatus.ACTIVE
                 })
 
-    def _check_ceph_cluster_status(self):
-        self.wait_ready()
-        logger.debug("Start ceph cluster check crontab")
-        while True:
-            try:
-                self._ceph_status_check()
-            except LockAcquireFailed as e:
-                logger.debug(e)
-                time.sleep(CONF.ceph_mon_check_interval * 2)
-                continue
-            except Exception as e:
-                logger.exception("Ceph cluster check cron Exception: %s", e)
-            time.sleep(CONF.ceph_mon_check_interval)
-
     def _ceph_check_retry(self, ceph_client, cluster):
         # check ceph status
         ceph_client.ceph_status_check()
@@ -8,6 +8,7 @@ from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
+from DSpace.service import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ class DatacenterHandler(AdminBaseHandler):
                            datacenter)
         return datacenter
 
+    @read_only
     def datacenter_get(self, ctxt, datacenter_id):
         return objects.Datacenter.get_by_id(ctxt, datacenter_id)
 
@@ -39,6 +41,7 @@ class DatacenterHandler(AdminBaseHandler):
                            after_obj=datacenter)
         return datacenter
 
+    @read_only
     def datacenter_get_all(self, ctxt, marker=None, limit=None,
                            sort_keys=None, sort_dirs=None, filters=None,
                            offset=None):
@@ -9,19 +9,24 @@ from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
 from DSpace.objects.fields import ConfigKey
+from DSpace.service import read_only
 from DSpace.taskflows.node import NodeTask
 from DSpace.tools.prometheus import PrometheusTool
+from DSpace.utils.threadpool import Priority
+from DSpace.utils.threadpool import task_priority
 
 logger = logging.getLogger(__name__)
 
 
 class DiskHandler(AdminBaseHandler):
+    @read_only
     def disk_get(self, ctxt, disk_id):
         disk = objects.Disk.get_by_id(
             ctxt, disk_id, expected_attrs=['partition_used', 'node',
                                            'partitions'])
         return disk
 
+    @read_only
     def disk_get_all(self, ctxt, tab=None, marker=None, limit=None,
                      sort_keys=None, sort_dirs=None, filters=None,
                      offset=None):
@@ -48,6 +53,7 @@ class DiskHandler(AdminBaseHandler):
                         disk.accelerate_type = accelerate_role[0]
         return disks
 
+    @read_only
     def disk_get_count(self, ctxt, filters=None):
         return objects.DiskList.get_count(ctxt, filters=filters)
 
@@ -530,6 +536,7 @@ class DiskHandler(AdminBaseHandler):
             logger.warning("Remove partition %s", part.name)
             part.destroy()
 
+    @task_priority(Priority.BACKGROUND)
     def disk_reporter(self, ctxt, disks, node_id):
         node = objects.Node.get_by_id(ctxt, node_id)
         logger.info("receive disks report for node %s: %s",
@@ -0,0 +1,173 @@
+import datetime
+import gzip
+import json
+import os
+
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+from DSpace import context as context_tool
+from DSpace import exception as exc
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.DSM.base import AdminBaseHandler
+from DSpace.i18n import _
+from DSpace.objects.fields import AllActionType as Action
+from DSpace.objects.fields import AllResourceType as Resource
+from DSpace.objects.fields import ConfigKey
+from DSpace.utils.coordination import synchronized
+
+logger = logging.getLogger(__name__)
+
+# log type -> versioned object name
+RETENTION_LOG_TYPES = {
+    'action_log': 'ActionLog',
+    'alert_log': 'AlertLog',
+}
+
+
+class LogRetentionHandler(AdminBaseHandler):
+
+    def bootstrap(self):
+        super(LogRetentionHandler, self).bootstrap()
+        self.periodic_submit(self.log_retention_run,
+                             CONF.log_retention_interval)
+
+    def _default_retention_policy(self):
+        policy = {
+            log_type: {
+                "max_age": CONF.log_retention_max_age,
+                "max_count": CONF.log_retention_max_count,
+            } for log_type in RETENTION_LOG_TYPES
+        }
+        policy['archive'] = CONF.log_archive_enabled
+        return policy
+
+    def log_retention_get(self, ctxt):
+        policy = self._default_retention_policy()
+        custom = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.LOG_RETENTION, default={})
+        for key, value in custom.items():
+            if isinstance(value, dict) and key in policy:
+                policy[key].update(value)
+            else:
+                policy[key] = value
+        return policy
+
+    def _log_retention_check(self, policy):
+        for key, value in policy.items():
+            if key == 'archive':
+                if not isinstance(value, bool):
+                    raise exc.InvalidInput(_("archive must be a bool"))
+                continue
+            if key not in RETENTION_LOG_TYPES:
+                raise exc.InvalidInput(_("log type %s not exist") % key)
+            for limit in ('max_age', 'max_count'):
+                v = value.get(limit)
+                if v is None:
+                    continue
+                if not isinstance(v, int) or v < 0:
+                    raise exc.InvalidInput(
+                        _("%s must be a non-negative integer") % limit)
+
+    def log_retention_set(self, ctxt, policy):
+        self._log_retention_check(policy)
+        begin_action = self.begin_action(
+            ctxt, Resource.SYSCONFIG, Action.UPDATE)
+        custom = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.LOG_RETENTION, default={})
+        for key, value in policy.items():
+            if isinstance(value, dict):
+                custom.setdefault(key, {}).update(value)
+            else:
+                custom[key] = value
+        objects.sysconfig.sys_config_set(ctxt, ConfigKey.LOG_RETENTION,
+                                         custom)
+        self.finish_action(begin_action, resource_name='log_retention',
+                           after_obj=custom)
+        return self.log_retention_get(ctxt)
+
+    def log_rollup_get_all(self, ctxt, marker=None, limit=None,
+                           sort_keys=None, sort_dirs=None, filters=None,
+                           offset=None):
+        return objects.LogRollupList.get_all(
+            ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
+            sort_dirs=sort_dirs, filters=filters, offset=offset)
+
+    @synchronized("cron_log_retention", blocking=False)
+    def log_retention_run(self):
+        clusters = objects.ClusterList.get_all(self.ctxt)
+        for cluster in clusters:
+            ctxt = context_tool.get_context(cluster_id=cluster.id,
+                                            user_id="admin")
+            policy = self.log_retention_get(ctxt)
+            for log_type, obj_name in RETENTION_LOG_TYPES.items():
+                log_cls = getattr(objects, obj_name)
+                self._log_rollup(ctxt, log_type, log_cls)
+                self._log_purge(ctxt, log_type, log_cls, policy[log_type],
+                                policy['archive'])
+
+    def _log_rollup(self, ctxt, log_type, log_cls):
+        """Roll up every finished day which is not rolled up yet"""
+        today = timeutils.utcnow().date()
+        last_day = objects.LogRollupList.get_last_day(
+            ctxt, log_type, ctxt.cluster_id)
+        since = None
+        if last_day:
+            since = datetime.datetime.combine(
+                last_day + datetime.timedelta(days=1), datetime.time())
+        first = objects.log_rollup.log_first_created_get(
+            ctxt, log_cls, ctxt.cluster_id, since=since)
+        if not first:
+            return
+        day = first.date()
+        while day < today:
+            objects.LogRollupList.refresh(ctxt, log_cls, ctxt.cluster_id, day)
+            day += datetime.timedelta(days=1)
+
+    def _log_archive(self, ctxt, log_type, logs):
+        path = os.path.join(CONF.log_archive_dir, ctxt.cluster_id)
+        if not os.path.exists(path):
+            os.makedirs(path)
+        filename = os.path.join(path, "{}-{}.jsonl.gz".format(
+            log_type, timeutils.utcnow().strftime("%Y%m%d")))
+        # every chunk is a gzip member, gzip readers concatenate them
+        with gzip.open(filename, "at") as f:
+            for log in logs:
+                f.write(json.dumps(log.to_dict()) + "\n")
+
+    def _log_purge(self, ctxt, log_type, log_cls, policy, archive):
+        cluster_id = ctxt.cluster_id
+        now = timeutils.utcnow()
+        # logs of today are not rolled up, never purge them
+        today = datetime.datetime.combine(now.date(), datetime.time())
+        before = None
+        if policy.get('max_age'):
+            before = now - datetime.timedelta(days=policy['max_age'])
+        if policy.get('max_count'):
+            cutoff = objects.log_rollup.log_count_cutoff_get(
+                ctxt, log_cls, cluster_id, policy['max_count'])
+            if cutoff and (not before or cutoff > before):
+                before = cutoff
+        if before and before > today:
+            before = today
+        chunk_size = CONF.log_retention_chunk_size
+        total = 0
+        while True:
+            # every chunk is purged in a short transaction, so writers of
+            # new logs are never blocked for long
+            logs = objects.log_rollup.log_purge_get_all(
+                ctxt, log_cls, cluster_id, before, chunk_size,
+                deleted_before=today)
+            if not logs:
+                break
+            if archive:
+                self._log_archive(ctxt, log_type, logs)
+            total += objects.log_rollup.log_purge(
+                ctxt, log_cls, [log.id for log in logs])
+            if len(logs) < chunk_size:
+                break
+        if total:
+            logger.info("cluster %s: purge %s %s(s) before %s",
+                        cluster_id, total, log_type, before)
+        return total
@@ -1,5 +1,3 @@
-import time
-
 from oslo_log import log as logging
 
 from DSpace import objects
@@ -8,6 +6,7 @@ from DSpace.context import get_context
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.exception import RPCConnectError
 from DSpace.objects.fields import RouterServiceStatus
+from DSpace.utils.config_cache import CONFIG_CACHE
 from DSpace.utils.metrics import Metric
 
 logger = logging.getLogger(__name__)
@@ -37,6 +36,11 @@ class RgwMetricsKey(object):
     SYS_MEMORY = 'sys_total_memory_kb'
 
 
+class ConfigCacheMetricsKey(object):
+    HITS = 'config_cache_hits_total'
+    MISSES = 'config_cache_misses_total'
+
+
 class MetricsHandler(AdminBaseHandler):
     metrics_lock = None
     metrics = None
@@ -57,30 +61,37 @@ class MetricsHandler(AdminBaseHandler):
         # TODO must rgw_obj inited
         self.metrics = {}
         self.rgw_metrics_init_keys()
-        self.task_submit(self.collect_monitor_values)
+        self.periodic_submit(self.collect_monitor_values,
+                             CONF.collect_metrics_time)
 
     def collect_monitor_values(self):
-        self.wait_ready()
-        while True:
-            try:
-                self.clear_metrics_old_values()
-                self.collect_rgw_metrics_values()
-            except RPCConnectError as e:
-                logger.warning('collect_rgw_metrics_values Warning: %s', e)
-                time.sleep(2)
-                continue
-            except Exception as e:
-                logger.exception('collect_rgw_metrics_values Exception:%s', e)
-            time.sleep(CONF.collect_metrics_time)
+        try:
+            self.clear_metrics_old_values()
+            self.collect_rgw_metrics_values()
+        except RPCConnectError as e:
+            logger.warning('collect_rgw_metrics_values Warning: %s', e)
 
     def metrics_content(self, ctxt):
+        _metrics = [m.str_expfmt() for m in self.config_cache_metrics()]
+        _metrics.extend(m.str_expfmt() for m in self.scheduler.metrics())
+        _metrics.extend(m.str_expfmt() for m in self._executor.metrics())
         if not self.metrics:
-            logger.debug("has no metrics values, return ''")
-            return ""
+            logger.debug("has no metrics values, return internal only")
+            return ''.join(_metrics) + '\n'
         logger.debug('has sed metrics: %s', self.metrics.values())
-        _metrics = [m.str_expfmt() for m in self.metrics.values()]
+        _metrics.extend(m.str_expfmt() for m in self.metrics.values())
         return ''.join(_metrics) + '\n'
 
+    def config_cache_metrics(self):
+        hits = Metric('counter', ConfigCacheMetricsKey.HITS,
+                      'Config Cache Hits', ('table',))
+        misses = Metric('counter', ConfigCacheMetricsKey.MISSES,
+                        'Config Cache Misses', ('table',))
+        for table, stat in CONFIG_CACHE.stats().items():
+            hits.set(stat['hits'], (table,))
+            misses.set(stat['misses'], (table,))
+        return [hits, misses]
+
     def clear_metrics_old_values(self):
         # clear metrics before collect
         for k in self.metrics.keys():
@@ -4,11 +4,15 @@ from oslo_log import log as logging
 from DSpace import objects
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.objects import fields as s_fields
+from DSpace.service import read_only
+from DSpace.utils.threadpool import Priority
+from DSpace.utils.threadpool import task_priority
 
 logger = logging.getLogger(__name__)
 
 
 class NetworkHandler(AdminBaseHandler):
+    @read_only
     def network_get_all(self, ctxt, marker=None, limit=None, sort_keys=None,
                         sort_dirs=None, filters=None, offset=None,
                         expected_attrs=None):
@@ -19,9 +23,11 @@ class NetworkHandler(AdminBaseHandler):
         )
         return networks
 
+    @read_only
     def network_get_count(self, ctxt, filters=None):
         return objects.NetworkList.get_count(ctxt, filters=filters)
 
+    @task_priority(Priority.BACKGROUND)
     def network_reporter(self, ctxt, networks, node_id):
         all_net_objs = objects.NetworkList.get_all(
             ctxt, filters={'node_id': node_id})
@@ -13,10 +13,13 @@ from DSpace import exception as exc
 from DSpace import objects
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
+from DSpace.objects import base as objects_base
 from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
 from DSpace.objects.fields import ConfigKey
+from DSpace.service import read_only
+from DSpace.taskflows.artifact import ImageDistributor
 from DSpace.taskflows.ceph import CephTask
 from DSpace.taskflows.include import InclusionNodesCheck
 from DSpace.taskflows.include import include_clean_flow
@@ -29,6 +32,8 @@ from DSpace.taskflows.tcmu import TcmuTask
 from DSpace.tools.prometheus import PrometheusTool
 from DSpace.utils import cluster_config
 from DSpace.utils.coordination import synchronized
+from DSpace.utils.threadpool import Priority
+from DSpace.utils.threadpool import task_priority
 
 logger = logging.getLogger(__name__)
 
@@ -191,6 +196,7 @@ class NodeMixin(object):
 
 class NodeHandler(AdminBaseHandler, NodeMixin):
 
+    @read_only
     def node_get(self, ctxt, node_id, expected_attrs=None):
         node = objects.Node.get_by_id(
             ctxt, node_id, expected_attrs=expected_attrs)
@@ -364,23 +370,35 @@ class NodeHandler(AdminBaseHandler, NodeMixin):
                 n.append(node)
         return n
 
+    @read_only
     def node_get_all(self, ctxt, tab=None, marker=None, limit=None,
                      sort_keys=None, sort_dirs=None, filters=None,
-                     offset=None, expected_attrs=None):
+                     offset=None, expected_attrs=None, fields=None):
         if filters.get('role_object_gateway'):
             if expected_attrs:
                 expected_attrs.append('radosgws')
+        get_metrics = not fields or 'metrics' in fields
+        if fields:
+            required = []
+            if get_metrics:
+                # metrics are got by them
+                required.extend(['hostname', 'ip_address', 'status'])
+            if filters.get('role_object_gateway'):
+                required.extend(['networks', 'radosgws'])
+            fields = objects_base.projection(fields, required)
         no_router = 0
         if 'no_router' in filters:
             no_router = filters.pop('no_router')
         nodes = objects.NodeList.get_all(
             ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
             sort_dirs=sort_dirs, filters=filters, offset=offset,
-            expected_attrs=expected_attrs)
+            expected_attrs=expected_attrs, fields=fields)
         if filters.get('role_object_gateway'):
             self._filter_gateway_network(ctxt, nodes)
         if no_router:
             nodes = self._filter_by_routers(ctxt, nodes)
+        if not get_metrics:
+            return nodes
         # get metric from prometheus
         need_nodes = []
         for node in nodes:
@@ -400,6 +418,7 @@ class NodeHandler(AdminBaseHandler, NodeMixin):
 
         return nodes
 
+    @read_only
     def node_get_count(self, ctxt, filters=None):
         return objects.NodeList.get_count(ctxt, filters=filters)
 
@@ -1057,10 +1076,32 @@ class NodeHandler(AdminBaseHandler, NodeMixin):
             if len(roles):
                 self._add_node_task(
                     ctxt, node, s_fields.NodeStatus.UPDATING_ROLES)
-            self.task_submit(self._node_create, ctxt, node, roles)
             nodes.append(node)
+        self.task_submit(self._nodes_create, ctxt, nodes, roles)
         return nodes
 
+    def _nodes_image_distribute(self, distributor):
+        try:
+            distributor.distribute()
+        except Exception as e:
+            logger.warning("distribute image error, nodes will fetch it "
+                           "from the repo: %s", e)
+
+    def _nodes_create(self, ctxt, nodes, roles):
+        if len(nodes) > 1:
+            try:
+                distributor = ImageDistributor(
+                    ctxt, nodes,
+                    lambda node: NodeTask(ctxt, node).get_ssh_executor())
+                # installations wait for the copy of their node only
+                distributor.register()
+                self.task_submit(self._nodes_image_distribute, distributor)
+            except Exception as e:
+                logger.warning("distribute image error, nodes will fetch "
+                               "it from the repo: %s", e)
+        for node in nodes:
+            self.task_submit(self._node_create, ctxt, node, roles)
+
     def node_get_infos(self, ctxt, data):
         logger.debug("get node infos: {}".format(data.get('ip_address')))
 
@@ -1164,7 +1205,8 @@ class NodeHandler(AdminBaseHandler, NodeMixin):
             status=s_fields.TaskStatus.RUNNING,
         )
         t.create()
-        self.task_submit(self._nodes_inclusion, ctxt, t, datas, begin_action)
+        self.task_submit(self._nodes_inclusion, ctxt, t, datas, begin_action,
+                         priority=Priority.BULK)
         return t
 
     def _nodes_inclusion_clean_check(self, ctxt):
@@ -1224,6 +1266,7 @@ class NodeHandler(AdminBaseHandler, NodeMixin):
         res = checker.check(datas)
         return res
 
+    @task_priority(Priority.BACKGROUND)
     def node_reporter(self, ctxt, node_summary, node_id):
         logger.info("node_reporter: %s", node_summary)
         node = objects.Node.get_by_id(ctxt, node_id)
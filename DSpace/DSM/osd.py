@@ -8,12 +8,15 @@ from DSpace import objects
 from DSpace import taskflows
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
+from DSpace.objects import base as objects_base
 from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
 from DSpace.objects.fields import ConfigKey
+from DSpace.service import read_only
 from DSpace.taskflows.ceph import CephTask
 from DSpace.taskflows.node import NodeTask
+from DSpace.taskflows.osd import OsdBatchCreate
 from DSpace.tools.prometheus import PrometheusTool
 
 logger = logging.getLogger(__name__)
@@ -77,9 +80,17 @@ class OsdHandler(AdminBaseHandler):
         osds = [osd for osd in osds if osd not in not_found]
         return osds
 
+    @read_only
     def osd_get_all(self, ctxt, tab=None, marker=None, limit=None,
                     sort_keys=None, sort_dirs=None, filters=None, offset=None,
-                    expected_attrs=None):
+                    expected_attrs=None, fields=None):
+        get_metrics = not fields or 'metrics' in fields
+        if fields and get_metrics:
+            # metrics are got by them
+            required = ['osd_id', 'status']
+            if tab == "io":
+                required.extend(['node', 'disk'])
+            fields = objects_base.projection(fields, required)
         disk_id = filters.get('disk_id')
         if disk_id:
             osds = self._osds_get_by_accelerate_disk(
@@ -88,9 +99,9 @@ class OsdHandler(AdminBaseHandler):
             osds = objects.OsdList.get_all(
                 ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
                 sort_dirs=sort_dirs, filters=filters, offset=offset,
-                expected_attrs=expected_attrs)
+                expected_attrs=expected_attrs, fields=fields)
 
-        if not osds:
+        if not osds or not get_metrics:
             return osds
 
         prometheus = PrometheusTool(ctxt)
@@ -110,19 +121,24 @@ class OsdHandler(AdminBaseHandler):
 
         return osds
 
+    @read_only
     def osd_get_count(self, ctxt, filters=None):
         return objects.OsdList.get_count(
             ctxt, filters=filters)
 
+    @read_only
     def osd_get(self, ctxt, osd_id, expected_attrs=None):
         return objects.Osd.get_by_id(ctxt, osd_id,
                                      expected_attrs=expected_attrs)
 
-    def _osd_create(self, ctxt, node, osd, begin_action=None):
+    def _osd_create(self, ctxt, node, osd, begin_action=None, waiter=None):
         try:
             tf = taskflows.OsdCreateTaskflow(
                 ctxt, action_log_id=begin_action.id)
-            tf.run(osd=osd)
+            if waiter:
+                tf.run(osd=osd, waiter=waiter)
+            else:
+                tf.run(osd=osd)
             osd.status = s_fields.OsdStatus.ACTIVE
             osd.save()
             logger.info("osd.%s create success", osd.osd_id)
@@ -276,14 +292,7 @@ class OsdHandler(AdminBaseHandler):
             if not result['available']:
                 raise exception.InvalidInput(_("cluser size exceed quota"))
 
-    def osd_create(self, ctxt, data):
-        """Osd Create
-
-        check mon available
-        check dsa available
-        check node status
-        """
-        logger.info("Osd create with %s.", data)
+    def _osd_create_prepare(self, ctxt, data):
 
         # check mon available
         # osd num check
@@ -327,6 +336,17 @@ class OsdHandler(AdminBaseHandler):
         osd.create()
         osd = objects.Osd.get_by_id(ctxt, osd.id, joined_load=True)
         self._set_osd_partation_role(ctxt, osd)
+        return node, osd, begin_action
+
+    def osd_create(self, ctxt, data):
+        """Osd Create
+
+        check mon available
+        check dsa available
+        check node status
+        """
+        logger.info("Osd create with %s.", data)
+        node, osd, begin_action = self._osd_create_prepare(ctxt, data)
 
         # apply async
         self.task_submit(self._osd_create, ctxt, node, osd, begin_action)
@@ -334,6 +354,41 @@ class OsdHandler(AdminBaseHandler):
 
         return osd
 
+    def _osds_create(self, ctxt, creates):
+        actions = {osd.id: (node, begin_action)
+                   for node, osd, begin_action in creates}
+
+        def _create(osd, waiter):
+            node, begin_action = actions[osd.id]
+            self._osd_create(ctxt, node, osd, begin_action, waiter=waiter)
+
+        batch = OsdBatchCreate(ctxt)
+        batch.run([osd for _, osd, _ in creates], _create)
+
+    def osds_create(self, ctxt, datas):
+        """Create osds in batch
+
+        Osds passed the checks are created together, see OsdBatchCreate.
+
+        :return: {"osds": [Osd], "errors": [{"data": data, "error": msg}]}
+        """
+        logger.info("Osds create with %s.", datas)
+        creates = []
+        errors = []
+        for data in datas:
+            try:
+                creates.append(self._osd_create_prepare(ctxt, data))
+            except Exception as e:
+                logger.exception("osd create error: %s", e)
+                errors.append({"data": data, "error": str(e)})
+        if creates:
+            self.task_submit(self._osds_create, ctxt, creates)
+            logger.debug("Osds create task apply.")
+        return {
+            "osds": [osd for _, osd, _ in creates],
+            "errors": errors
+        }
+
     def _osd_delete(self, ctxt, node, osd, begin_action=None):
         res_name = osd.osd_name if osd.osd_id else osd.disk.name
         logger.info("trying to delete osd.%s", res_name)
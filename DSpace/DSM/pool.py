@@ -2,10 +2,13 @@ import json
 import re
 import uuid
 
+import six
 from oslo_log import log as logging
 
+from DSpace import context
 from DSpace import exception
 from DSpace import objects
+from DSpace.common.config import CONF
 from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
@@ -13,65 +16,120 @@ from DSpace.objects import utils as obj_utils
 from DSpace.objects.fields import AllActionType
 from DSpace.objects.fields import AllResourceType
 from DSpace.objects.fields import ConfigKey
+from DSpace.service import read_only
 from DSpace.taskflows.ceph import CephTask
 from DSpace.taskflows.crush import CrushContentGen
 from DSpace.tools.prometheus import PrometheusTool
+from DSpace.tools.prometheus import pg_state_summary
 
 logger = logging.getLogger(__name__)
 DEFAULT_REPLICATE_SIZE = 3
 
 
 class PoolHandler(AdminBaseHandler):
-    def _pool_update_metrics(self, ctxt, pool):
+    def __init__(self, *args, **kwargs):
+        super(PoolHandler, self).__init__(*args, **kwargs)
+        # cluster_id -> {pool.id: metrics}, filled by pool_status_collect
+        self._pool_metrics = {}
+
+    def bootstrap(self):
+        super(PoolHandler, self).bootstrap()
+        self.periodic_submit(self.pool_status_collect,
+                             CONF.pool_status_interval)
+
+    def _pool_status(self, pool, pg_state):
+        """Status derived from pg state, None if it should not change"""
+        if not pool.updated_at or not pg_state:
+            return None
+        if pool.status in [s_fields.PoolStatus.CREATING,
+                           s_fields.PoolStatus.DELETING,
+                           s_fields.PoolStatus.DELETED]:
+            return None
+        pg_unactive = pg_state.get("unactive")
+        pg_degraded = pg_state.get("degraded")
+        pg_recovering = pg_state.get("recovering")
+        pg_healthy = pg_state.get("healthy")
+        if pg_unactive and pg_unactive > 0:
+            return s_fields.PoolStatus.WARNING
+        elif pg_degraded and pg_degraded > 0:
+            return s_fields.PoolStatus.DEGRADED
+        elif pg_recovering and pg_recovering > 0:
+            return s_fields.PoolStatus.RECOVERING
+        elif pg_healthy and pg_healthy == 1:
+            return s_fields.PoolStatus.ACTIVE
+        else:
+            return s_fields.PoolStatus.WARNING
+
+    def _pool_status_collect(self, ctxt):
+        pools = [pool for pool in objects.PoolList.get_all(ctxt)
+                 if pool.need_metrics()]
+        if not pools:
+            self._pool_metrics.pop(ctxt.cluster_id, None)
+            return
+        prometheus = PrometheusTool(ctxt)
+        capacity = prometheus.pools_get_capacity()
+        pg_states = prometheus.pools_get_pg_state()
+        cluster_metrics = {}
+        for pool in pools:
+            pool_id = str(pool.pool_id)
+            metrics = {key: values.get(pool_id)
+                       for key, values in six.iteritems(capacity)}
+            # no pg of the cluster at all, the exporter is not ready
+            pg_state = None
+            if pg_states:
+                pg_state = pg_states.get(pool_id, pg_state_summary([]))
+            metrics['pg_state'] = pg_state
+            cluster_metrics[pool.id] = metrics
+            status = self._pool_status(pool, pg_state)
+            if not status or status == pool.status:
+                continue
+            # status changed by others (e.g. deleting) in the meantime wins
+            if pool.conditional_update({"status": status},
+                                       {"status": pool.status}):
+                logger.info("pool %s status: %s", pool.pool_name, status)
+        self._pool_metrics[ctxt.cluster_id] = cluster_metrics
+
+    def pool_status_collect(self):
+        clusters = objects.ClusterList.get_all(self.ctxt)
+        for cluster in clusters:
+            ctxt = context.get_context(cluster_id=cluster.id,
+                                       user_id="admin")
+            try:
+                self._pool_status_collect(ctxt)
+            except Exception as e:
+                logger.warning("cluster %s: collect pool status error: %s",
+                               cluster.id, e)
+
+    def _pool_get_metrics(self, ctxt, pool):
+        metrics = self._pool_metrics.get(ctxt.cluster_id, {}).get(pool.id)
+        if metrics is not None:
+            pool.metrics.update(metrics)
+            return
+        # not collected yet
         prometheus = PrometheusTool(ctxt)
         prometheus.pool_get_capacity(pool)
         prometheus.pool_get_pg_state(pool)
-        pg_state = pool.metrics.get("pg_state")
-        if pool.updated_at:
-            logger.info("pool %s, get metrics: %s",
-                        pool.pool_name, json.dumps(pool.metrics))
-            if pool.status not in [s_fields.PoolStatus.CREATING,
-                                   s_fields.PoolStatus.DELETING,
-                                   s_fields.PoolStatus.DELETED]:
-                if pg_state:
-                    pg_unactive = pg_state.get("unactive")
-                    pg_degraded = pg_state.get("degraded")
-                    pg_recovering = pg_state.get("recovering")
-                    pg_healthy = pg_state.get("healthy")
-                    if pg_unactive and pg_unactive > 0:
-                        pool.status = s_fields.PoolStatus.WARNING
-                    elif pg_degraded and pg_degraded > 0:
-                        pool.status = s_fields.PoolStatus.DEGRADED
-                    elif pg_recovering and pg_recovering > 0:
-                        pool.status = s_fields.PoolStatus.RECOVERING
-                    elif pg_healthy and pg_healthy == 1:
-                        pool.status = s_fields.PoolStatus.ACTIVE
-                    else:
-                        pool.status = s_fields.PoolStatus.WARNING
-                pool.save()
-
-    def _filter_by_role(self, pools):
-        ps = []
-        for pool in pools:
-            if pool.role != s_fields.PoolRole.OBJECT_META:
-                ps.append(pool)
-        return ps
 
+    def _pool_filters(self, filters):
+        filters = filters or {}
+        if "role" not in filters:
+            filters["role"] = objects.Pool.Not(s_fields.PoolRole.OBJECT_META)
+        return filters
+
+    @read_only
     def pool_get_all(self, ctxt, marker=None, limit=None, sort_keys=None,
                      sort_dirs=None, filters=None, offset=None,
                      expected_attrs=None, tab=None):
         pools = objects.PoolList.get_all(
             ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
-            sort_dirs=sort_dirs, filters=filters, offset=offset,
-            expected_attrs=expected_attrs)
-
-        pools = self._filter_by_role(pools)
+            sort_dirs=sort_dirs, filters=self._pool_filters(filters),
+            offset=offset, expected_attrs=expected_attrs)
 
         if tab == 'default':
             for pool in pools:
                 if not pool.need_metrics():
                     continue
-                self._pool_update_metrics(ctxt, pool)
+                self._pool_get_metrics(ctxt, pool)
         if tab == 'io':
             prometheus = PrometheusTool(ctxt)
             for pool in pools:
@@ -81,8 +139,10 @@ class PoolHandler(AdminBaseHandler):
 
         return pools
 
+    @read_only
     def pool_get_count(self, ctxt, filters=None):
-        return objects.PoolList.get_count(ctxt, filters=filters)
+        return objects.PoolList.get_count(
+            ctxt, filters=self._pool_filters(filters))
 
     def pool_get(self, ctxt, pool_id, expected_attrs=None):
         pool = objects.Pool.get_by_id(
@@ -324,6 +384,46 @@ class PoolHandler(AdminBaseHandler):
         self.task_submit(self._pool_delete, ctxt, pool, begin_action)
         return pool
 
+    def _crush_content(self, ctxt, crush, osds, fault_domain=None):
+        gen = CrushContentGen.from_content(
+            ctxt,
+            content=crush.content,
+            osds=osds,
+        )
+        if fault_domain:
+            gen.fault_domain = fault_domain
+        return gen.gen_content()
+
+    def pool_crush_plan(self, ctxt, id, data):
+        """Crush changes of a disk or policy update, nothing is applied
+
+        data: {"action": "increase_disk", "osds": [1, 2]}
+              {"action": "decrease_disk", "osds": [1, 2]}
+              {"action": "update_policy", "failure_domain_type": "rack"}
+        """
+        self.check_mon_host(ctxt)
+        pool = objects.Pool.get_by_id(ctxt, id)
+        crush = objects.CrushRule.get_by_id(ctxt, pool.crush_rule_id,
+                                            expected_attrs=["osds"])
+        action = data.get("action")
+        fault_domain = None
+        if action == "increase_disk":
+            osds = objects.OsdList.get_all(
+                ctxt, filters={"id": data.get("osds")})
+            new_osds = list(crush.osds) + list(osds)
+        elif action == "decrease_disk":
+            osds = objects.OsdList.get_all(
+                ctxt, filters={"id": data.get("osds")})
+            new_osds = [osd for osd in crush.osds if osd not in osds]
+        elif action == "update_policy":
+            new_osds = crush.osds
+            fault_domain = data.get("failure_domain_type")
+        else:
+            raise exception.InvalidInput(
+                _("unknown crush plan action: %s") % action)
+        content = self._crush_content(ctxt, crush, new_osds, fault_domain)
+        return CephTask(ctxt).crush_plan(content)
+
     def _pool_increase_disk(self, ctxt, pool, osd_db_ids, begin_action=None):
         try:
             crush = objects.CrushRule.get_by_id(ctxt, pool.crush_rule_id,
@@ -331,10 +431,7 @@ class PoolHandler(AdminBaseHandler):
             osds = objects.OsdList.get_all(ctxt, filters={"id": osd_db_ids})
             new_osds = list(crush.osds) + list(osds)
             logger.info("new osds: %s", new_osds)
-            gen = CrushContentGen.from_content(
-                ctxt, crush.content, new_osds
-            )
-            crush.content = gen.gen_content()
+            crush.content = self._crush_content(ctxt, crush, new_osds)
             crush.save()
             logger.debug("crush content: %s", json.dumps(crush.content))
             ceph_client = CephTask(ctxt)
@@ -391,13 +488,7 @@ class PoolHandler(AdminBaseHandler):
         osds = objects.OsdList.get_all(ctxt, filters={"id": osd_db_ids})
         new_osds = [osd for osd in crush.osds if osd not in osds]
         logger.info("new osds: %s", new_osds)
-
-        gen = CrushContentGen.from_content(
-            ctxt,
-            content=crush.content,
-            osds=new_osds,
-        )
-        crush.content = gen.gen_content()
+        crush.content = self._crush_content(ctxt, crush, new_osds)
         crush.save()
         logger.debug("crush content: %s", json.dumps(crush.content))
         ceph_client = CephTask(ctxt)
@@ -517,13 +608,8 @@ class PoolHandler(AdminBaseHandler):
                 expected_attrs=["osds"])
             osds = crush.osds
             logger.info("update crush osds: %s", osds)
-            gen = CrushContentGen.from_content(
-                ctxt,
-                content=crush.content,
-                osds=osds,
-            )
-            gen.fault_domain = pool.failure_domain_type
-            crush.content = gen.gen_content()
+            crush.content = self._crush_content(
+                ctxt, crush, osds, pool.failure_domain_type)
             crush.save()
             logger.debug("crush content: %s", json.dumps(crush.content))
             ceph_client = CephTask(ctxt)
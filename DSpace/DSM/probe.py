@@ -2,6 +2,8 @@ from oslo_log import log as logging
 
 from DSpace import objects
 from DSpace.DSM.base import AdminBaseHandler
+from DSpace.i18n import _
+from DSpace.taskflows.probe import ProbeEngine
 from DSpace.taskflows.probe import ProbeTask
 
 logger = logging.getLogger(__name__)
@@ -12,3 +14,40 @@ class ProbeHandler(AdminBaseHandler):
         node = objects.Node(ip_address=ip, password=password)
         node_task = ProbeTask(ctxt, node)
         return node_task.probe_cluster_nodes()
+
+    def probe_nodes(self, ctxt, nodes, probes, checks=None):
+        """Probe many nodes concurrently
+
+        Progress of every node is sent by websocket, the result is
+        returned after all nodes are done.
+        """
+        nodes = [objects.Node(ip_address=node['ip'],
+                              password=node.get('password'))
+                 for node in nodes]
+        total = len(nodes)
+        progress = {"done": 0}
+
+        def _on_result(node, result, err):
+            progress["done"] += 1
+            payload = {
+                "ip": str(node.ip_address),
+                "done": progress["done"],
+                "total": total,
+                "error": err,
+            }
+            if err:
+                op_status = "PROBE_NODE_ERROR"
+                msg = _("probe node {} error").format(node.ip_address)
+            else:
+                op_status = "PROBE_NODE_SUCCESS"
+                msg = _("probe node {} success").format(node.ip_address)
+            self.send_websocket(ctxt, payload, op_status, msg,
+                                resource_type="probe")
+
+        engine = ProbeEngine(ctxt, probes, checks=checks,
+                             on_result=_on_result)
+        return [{
+            "ip": str(node.ip_address),
+            "info": result,
+            "error": err,
+        } for node, result, err in engine.run(nodes)]
@@ -8,6 +8,7 @@ from DSpace.DSM.base import AdminBaseHandler
 from DSpace.i18n import _
 from DSpace.objects.fields import AllActionType as Action
 from DSpace.objects.fields import AllResourceType as Resource
+from DSpace.service import read_only
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,7 @@ class RackHandler(AdminBaseHandler):
                            objects.json_encode(rack))
         return rack
 
+    @read_only
     def rack_get(self, ctxt, rack_id, expected_attrs=None):
         return objects.Rack.get_by_id(ctxt, rack_id,
                                       expected_attrs=expected_attrs)
@@ -40,6 +42,7 @@ class RackHandler(AdminBaseHandler):
         self.finish_action(begin_action, rack_id, rack.name, rack)
         return rack
 
+    @read_only
     def rack_get_all(self, ctxt, marker=None, limit=None,
                      sort_keys=None, sort_dirs=None, filters=None,
                      offset=None):
@@ -1,5 +1,4 @@
 import json
-import time
 
 import six
 from oslo_log import log as logging
@@ -13,9 +12,11 @@ from DSpace.DSM.base import AdminBaseHandler
 from DSpace.DSM.base import AdminBaseMixin
 from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
+from DSpace.service import read_only
 from DSpace.tools.base import SSHExecutor
 from DSpace.tools.docker import Docker as DockerTool
 from DSpace.utils import retry
+from DSpace.utils.threadpool import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -135,7 +136,7 @@ class ServiceHelper(AdminBaseMixin):
             "status": self.status_field.INACTIVE
         })
         if res:
-            self.task_submit(self.do_restart)
+            self.task_submit(self.do_restart, priority=Priority.BACKGROUND)
 
     def _do_restart(self):
         pass
@@ -245,16 +246,32 @@ class ServiceManager(AdminBaseMixin):
     def __init__(self):
         super(ServiceManager, self).__init__()
         self.ctxt = context_tool.get_context()
+        self.reload()
+
+    def reload(self):
+        """Build the service map from the database"""
+        # services with their nodes in one query
+        services = [
+            service for service in objects.ServiceList.get_all(
+                self.ctxt, filters={'cluster_id': '*'},
+                expected_attrs=['node'])
+            if self._check_service_node(service)]
         self._services = {}
-        self.add_dsa_service_helper()
-        self._init_service_map()
-
-    def _init_service_map(self):
-        services = objects.ServiceList.get_all(
-            self.ctxt, filters={'cluster_id': '*'})
+        self.add_dsa_service_helper(services)
+        self._init_service_map(services)
+
+    def _check_service_node(self, service):
+        if service.node and not service.node.deleted:
+            return True
+        # the node is deleted
+        logger.warning("Node of service %s(id %s) not found, ignore",
+                       service.name, service.id)
+        return False
+
+    def _init_service_map(self, services):
         for service in services:
             ctxt = context_tool.get_context(cluster_id=service.cluster_id)
-            node = objects.Node.get_by_id(ctxt, service.node_id)
+            node = service.node
             logger.debug("Init service_map from db: %s, node %s(id %s)",
                          service.name, node.hostname, node.id)
             service_name = getattr(self.map_util, service.role)[service.name]
@@ -262,26 +279,24 @@ class ServiceManager(AdminBaseMixin):
                 ctxt, service, service_name, service.status, node)
             self.append(service.role, service_helper)
 
-    def add_dsa_service_helper(self):
-        dsas = objects.ServiceList.get_all(
-            self.ctxt, filters={'name': 'DSA', 'cluster_id': '*'})
-        for dsa in dsas:
+    def add_dsa_service_helper(self, services):
+        for dsa in services:
+            if dsa.name != 'DSA':
+                continue
             ctxt = context_tool.get_context(cluster_id=dsa.cluster_id)
-            node = objects.Node.get_by_id(ctxt, dsa.node_id)
             dsa_helper = ContainerHelper(
-                ctxt, dsa, self.container_prefix + "_dsa", dsa.status, node)
+                ctxt, dsa, self.container_prefix + "_dsa", dsa.status,
+                dsa.node)
             self.append("base", dsa_helper)
 
-    def loop(self):
-        while True:
-            for role in list(self._services.keys()):
-                service_list = self._services[role]
-                for service_id in list(service_list.keys()):
-                    try:
-                        self._check(role, service_list[service_id])
-                    except exception.StorException as e:
-                        logger.warning("Check status error: %s", e)
-            time.sleep(CONF.service_heartbeat_interval)
+    def check_all(self):
+        for role in list(self._services.keys()):
+            service_list = self._services[role]
+            for service_id in list(service_list.keys()):
+                try:
+                    self._check(role, service_list[service_id])
+                except exception.StorException as e:
+                    logger.warning("Check status error: %s", e)
 
     def _check_time_interval(self, helper):
         if helper.is_timeout:
@@ -382,15 +397,18 @@ class ServiceHandler(AdminBaseHandler):
         self.container_roles = self.map_util.container_roles
         self.service_manager = ServiceManager()
 
+    def warm_up(self):
+        super(ServiceHandler, self).warm_up()
+        self.service_manager.reload()
+
     def bootstrap(self):
         super(ServiceHandler, self).bootstrap()
         if CONF.heartbeat_check:
-            self.task_submit(self._service_check, permanent=True)
-
-    def _service_check(self):
-        self.wait_ready()
-        self.service_manager.loop()
+            self.periodic_submit(self.service_manager.check_all,
+                                 CONF.service_heartbeat_interval,
+                                 name="service_check")
 
+    @read_only
     def services_get_all(self, ctxt, marker=None, limit=None, sort_keys=None,
                          sort_dirs=None, filters=None, offset=None):
         services = objects.ServiceList.get_all(
@@ -398,6 +416,7 @@ class ServiceHandler(AdminBaseHandler):
             sort_dirs=sort_dirs, filters=filters, offset=offset)
         return services
 
+    @read_only
     def service_get_count(self, ctxt, filters=None):
         return objects.ServiceList.get_count(ctxt, filters=filters)
 
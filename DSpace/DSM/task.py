@@ -2,23 +2,29 @@ from oslo_log import log as logging
 
 from DSpace import objects
 from DSpace.DSM.base import AdminBaseHandler
+from DSpace.service import read_only
 
 logger = logging.getLogger(__name__)
 
 
 class TaskHandler(AdminBaseHandler):
+    @read_only
     def task_get_all(self, ctxt, tab=None, marker=None, limit=None,
                      sort_keys=None, sort_dirs=None, filters=None,
-                     offset=None):
+                     offset=None, cursor=None):
         tasks = objects.TaskList.get_all(
             ctxt, marker=marker, limit=limit, sort_keys=sort_keys,
-            sort_dirs=sort_dirs, filters=filters, offset=offset)
+            sort_dirs=sort_dirs, filters=filters, offset=offset,
+            cursor=cursor)
         return tasks
 
-    def task_get_count(self, ctxt, filters=None):
-        count = objects.TaskList.get_count(ctxt, filters=filters)
+    @read_only
+    def task_get_count(self, ctxt, filters=None, approximate=False):
+        count = objects.TaskList.get_count(ctxt, filters=filters,
+                                           approximate=approximate)
         return count
 
+    @read_only
     def task_get(self, ctxt, task_id):
         task = objects.Task.get_by_id(ctxt, task_id)
         return task
@@ -9,12 +9,14 @@ from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import AllActionType
 from DSpace.objects.fields import AllResourceType
+from DSpace.service import read_only
 from DSpace.taskflows.ceph import CephTask
 
 logger = logging.getLogger(__name__)
 
 
 class VolumeHandler(AdminBaseHandler):
+    @read_only
     def volume_get_all(self, ctxt, marker=None, limit=None, sort_keys=None,
                        sort_dirs=None, filters=None, offset=None,
                        expected_attrs=None):
@@ -23,6 +25,7 @@ class VolumeHandler(AdminBaseHandler):
             sort_dirs=sort_dirs, filters=filters, offset=offset,
             expected_attrs=expected_attrs)
 
+    @read_only
     def volume_get_count(self, ctxt, filters=None):
         return objects.VolumeList.get_count(ctxt, filters=filters)
 
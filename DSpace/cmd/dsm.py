@@ -9,6 +9,7 @@ from DSpace import version
 from DSpace.common.config import CONF
 from DSpace.DSM.admin import AdminService
 from DSpace.utils import run_loop
+from DSpace.utils.config_cache import CONFIG_CACHE
 from DSpace.utils.coordination import COORDINATOR
 
 
@@ -18,6 +19,7 @@ def main():
     logging.setup(CONF, "stor")
     objects.register_all()
     COORDINATOR.start()
+    CONFIG_CACHE.start()
     admin = AdminService(rpc_ip=CONF.my_ip, rpc_port=CONF.admin_port)
     admin.start()
     run_loop()
@@ -65,15 +65,74 @@ global_opts = [
     cfg.IntOpt('task_workers',
                default=200,
                help='Task worker number.'),
+    cfg.IntOpt('task_queue_size',
+               default=1000,
+               help='Max queued tasks of every priority, 0 is unlimited.'),
+    cfg.IntOpt('task_interactive_reserved',
+               default=20,
+               help='Task workers which only run interactive tasks.'),
+    cfg.IntOpt('periodic_workers',
+               default=10,
+               help='Worker number of periodic jobs, separated from '
+                    'task_workers.'),
     cfg.IntOpt('taskflow_max_workers',
                default=200,
                help='Taskflow max worker number.'),
+    cfg.BoolOpt('rpc_coalesce_enabled',
+                default=True,
+                help='DSI: Identical concurrent GET requests share one '
+                     'in-flight DSM call'),
+    cfg.IntOpt('rpc_decode_offload_size',
+               default=65536,
+               help='DSI: Responses larger than this (bytes) are decoded '
+                    'out of the ioloop thread'),
+    cfg.IntOpt('rpc_decode_workers',
+               default=4,
+               help='DSI: Threads decoding large responses'),
+    cfg.IntOpt('websocket_batch_interval',
+               default=200,
+               help='DSI: Milliseconds websocket messages of subscribed '
+                    'rooms are collected into one frame'),
+    cfg.IntOpt('websocket_payload_cache_size',
+               default=10000,
+               help='DSI: Number of objects per room whose last websocket '
+                    'payload is kept to send only changed fields'),
+    cfg.IntOpt('websocket_client_refresh_interval',
+               default=60,
+               help='DSM: Seconds the admin nodes receiving websocket '
+                    'messages are cached'),
     cfg.StrOpt('host_prefix',
                default="/host",
                help="Host prefix"),
     cfg.StrOpt('session_url',
                default=None,
                help="Session url"),
+    cfg.IntOpt('session_cache_ttl',
+               default=5,
+               help='DSI: Seconds a session read from redis is cached in '
+                    'process, 0 to disable'),
+    cfg.IntOpt('session_cache_size',
+               default=10000,
+               help='DSI: Max sessions cached in process'),
+    cfg.IntOpt('api_workers',
+               default=1,
+               help='DSI: Worker processes sharing the api port, 0 for '
+                    'one per cpu. More than one needs a redis '
+                    'session_url, websocket messages are forwarded to '
+                    'all workers by it, and browsers must connect '
+                    'socket.io with the websocket transport'),
+    cfg.IntOpt('api_context_workers',
+               default=16,
+               help='DSI: Threads building request contexts (auth and '
+                    'cluster lookups), 0 to build them on the ioloop'),
+    cfg.IntOpt('api_context_cache_ttl',
+               default=5,
+               help='DSI: Seconds validated tickets and clusters are '
+                    'cached in process, 0 to disable'),
+    cfg.IntOpt('api_context_cache_size',
+               default=10000,
+               help='DSI: Max validated tickets and clusters cached in '
+                    'process'),
     cfg.IntOpt('rgw_min_port',
                default=1,
                help='The minimum port number for rgw.'),
@@ -131,6 +190,48 @@ global_opts = [
     cfg.IntOpt('collect_metrics_time',
                default=15,
                help='DSM: MetricsHandler collect metrics time interval'),
+    cfg.IntOpt('probe_workers',
+               default=16,
+               help='DSM: Max nodes probed at the same time'),
+    cfg.DictOpt('install_stage_limits',
+                default={'package': 10, 'image_load': 5, 'agent': 20},
+                help='DSM: Max nodes in a stage of node installation at '
+                     'the same time, stages: package, image_load, agent'),
+    cfg.IntOpt('osd_create_node_concurrency',
+               default=4,
+               help='DSM: Max osds of a node prepared at the same time '
+                    'when osds are created in batch'),
+    cfg.IntOpt('osd_wait_up_interval',
+               default=2,
+               help='DSM: Seconds between osd tree polls of osds '
+                    'created in batch waiting up'),
+    cfg.IntOpt('osd_wait_up_timeout',
+               default=127,
+               help='DSM: Seconds osds created in batch wait up'),
+    cfg.IntOpt('artifact_seed_nodes',
+               default=2,
+               help='DSM: Number of nodes fetching the image from the repo, '
+                    'other nodes fetch it from peers'),
+    cfg.IntOpt('artifact_peer_fanout',
+               default=4,
+               help='DSM: Max nodes fetching the image from one peer at '
+                    'the same time'),
+    cfg.PortOpt('artifact_peer_port',
+                default=2090,
+                help='DSM: Port of the temporary http server sharing the '
+                     'image between nodes'),
+    cfg.IntOpt('artifact_copy_timeout',
+               default=1800,
+               help='DSM: Max seconds an installing node waits for its copy '
+                    'of the image, then it fetches the image from the repo'),
+    cfg.IntOpt('pool_status_interval',
+               default=30,
+               help='DSM: The interval of pool capacity and pg state '
+                    'collection'),
+    cfg.IntOpt('dashboard_snapshot_interval',
+               default=10,
+               help='DSM: The interval of dashboard snapshot collection, '
+                    'changed snapshots are pushed to browsers'),
     cfg.BoolOpt('package_ignore',
                 default=False,
                 help='is or not package_ignore'),
@@ -158,6 +259,63 @@ global_opts = [
     cfg.StrOpt('sudo_prefix',
                default="sudo",
                help='Prefix to run command with root permission'),
+    cfg.IntOpt('pagination_count_limit',
+               default=10000,
+               help='Stop counting rows of large log tables (action_logs, '
+                    'alert_logs, tasks) after this number, the total is '
+                    'reported as approximate. 0 means always count all.'),
+    cfg.IntOpt('log_retention_interval',
+               default=3600,
+               help='DSM: The interval of action/alert log retention'),
+    cfg.IntOpt('log_retention_max_age',
+               default=365,
+               help='DSM: Default days to keep action/alert logs, '
+                    '0 means forever'),
+    cfg.IntOpt('log_retention_max_count',
+               default=1000000,
+               help='DSM: Default max number of action/alert logs of a '
+                    'cluster, 0 means unlimited'),
+    cfg.IntOpt('log_retention_chunk_size',
+               default=1000,
+               help='DSM: Number of logs removed in one transaction'),
+    cfg.BoolOpt('log_archive_enabled',
+                default=False,
+                help='DSM: Archive logs to compressed files before purge'),
+    cfg.StrOpt('log_archive_dir',
+               default='/var/lib/dspace/log_archive',
+               help='DSM: Directory of archived logs'),
+    cfg.BoolOpt('config_cache_enabled',
+                default=True,
+                help='Cache sys_configs and ceph_configs in memory, '
+                     'invalidated through etcd'),
+    cfg.IntOpt('config_cache_ttl',
+               default=300,
+               help='Max seconds a cached sys_config/ceph_config is used, '
+                    'bounds staleness if etcd is unreachable'),
+    cfg.BoolOpt('ssh_pool_enabled',
+                default=True,
+                help='Share ssh connections between SSHExecutors'),
+    cfg.IntOpt('ssh_pool_idle_timeout',
+               default=300,
+               help='Seconds an unused pooled ssh connection is kept'),
+    cfg.IntOpt('ssh_pool_max_channels',
+               default=8,
+               help='Max concurrent commands on one ssh connection, '
+                    'must be less than MaxSessions of sshd'),
+    cfg.IntOpt('ssh_keepalive_interval',
+               default=30,
+               help='Seconds between ssh keepalive packets, 0 to disable'),
+    cfg.BoolOpt('dsm_hot_standby',
+                default=False,
+                help='DSM: Backups keep the service map and agent clients '
+                     'loaded and serve read-only rpc calls themselves'),
+    cfg.IntOpt('dsm_standby_refresh_interval',
+               default=10,
+               help='DSM: Seconds between state refreshes of a hot standby'),
+    cfg.BoolOpt('startup_profile_mixins',
+                default=False,
+                help='Debug: Break the handler startup profile down by '
+                     'mixin, patches the mixin classes while profiling'),
 ]
 
 etcd_opts = [
@@ -174,3 +174,67 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         query = query.offset(offset)
 
     return query
+
+
+def keyset_paginate_query(query, model, limit, cursor=None, sort_dir='desc'):
+    """Returns a query paginated by the (created_at, id) keyset.
+
+    Unlike paginate_query with offset, the position of the page is given by
+    the values of the last row of the previous page, so the database can seek
+    directly to it through the (created_at, id) index instead of scanning and
+    discarding every preceding row. Deep pages cost the same as the first.
+
+    :param query: the query object to which we should add paging/sorting
+    :param model: the ORM model class, must have created_at and id columns
+    :param limit: maximum number of items to return
+    :param cursor: dict with created_at and id of the last item of the
+                   previous page, None for the first page
+    :param sort_dir: direction in which results should be sorted (asc, desc)
+
+    :rtype: sqlalchemy.orm.query.Query
+    :return: The query with sorting/pagination added.
+    """
+    if sort_dir not in ('asc', 'desc'):
+        raise ValueError(_("Unknown sort direction, "
+                           "must be 'desc' or 'asc'"))
+    sort_dir_func = {
+        'asc': sqlalchemy.asc,
+        'desc': sqlalchemy.desc,
+    }[sort_dir]
+    query = query.order_by(sort_dir_func(model.created_at),
+                           sort_dir_func(model.id))
+
+    if cursor is not None:
+        created_at = cursor['created_at']
+        if created_at is None:
+            created_at = _get_default_column_value(model, 'created_at')
+        if sort_dir == 'desc':
+            f = sqlalchemy.sql.or_(
+                model.created_at < created_at,
+                sqlalchemy.sql.and_(model.created_at == created_at,
+                                    model.id < cursor['id']))
+        else:
+            f = sqlalchemy.sql.or_(
+                model.created_at > created_at,
+                sqlalchemy.sql.and_(model.created_at == created_at,
+                                    model.id > cursor['id']))
+        query = query.filter(f)
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query
+
+
+def bounded_count(query, limit):
+    """Count the rows of query, but stop counting after limit rows.
+
+    The count is capped to limit + 1, so a result greater than limit means
+    "more than limit" and the cost of counting huge log tables is bounded
+    like a single page read.
+    """
+    if not limit:
+        return query.count()
+    subquery = query.limit(limit + 1).subquery()
+    return query.session.query(
+        sqlalchemy.func.count()).select_from(subquery).scalar()
@@ -210,11 +210,11 @@ def node_get(context, node_id):
 
 def node_get_all(context, filters, marker, limit,
                  offset, sort_keys, sort_dirs,
-                 expected_attrs=None):
+                 expected_attrs=None, fields=None):
     return IMPL.node_get_all(
         context, marker=marker, limit=limit, sort_keys=sort_keys,
         sort_dirs=sort_dirs, filters=filters, offset=offset,
-        expected_attrs=expected_attrs)
+        expected_attrs=expected_attrs, fields=fields)
 
 
 def node_get_count(context, filters):
@@ -331,11 +331,11 @@ def osd_get_by_osd_id(context, osd_id, expected_attrs=None):
 
 def osd_get_all(context, filters, marker, limit,
                 offset, sort_keys, sort_dirs,
-                expected_attrs=None):
+                expected_attrs=None, fields=None):
     return IMPL.osd_get_all(
         context, marker=marker, limit=limit, sort_keys=sort_keys,
         sort_dirs=sort_dirs, filters=filters, offset=offset,
-        expected_attrs=expected_attrs)
+        expected_attrs=expected_attrs, fields=fields)
 
 
 def osd_get_count(context, filters):
@@ -346,6 +346,10 @@ def osd_update(context, osd_id, values):
     return IMPL.osd_update(context, osd_id, values)
 
 
+def osd_status_update(context, osd_ids, status, expected_status):
+    return IMPL.osd_status_update(context, osd_ids, status, expected_status)
+
+
 def osd_get_by_pool(context, pool_id, expected_attrs=None):
     return IMPL.osd_get_by_pool(
         context, pool_id, expected_attrs=expected_attrs)
@@ -822,8 +826,9 @@ def alert_log_destroy(context, alert_log_id):
     return IMPL.alert_log_destroy(context, alert_log_id)
 
 
-def alert_log_get_count(context, filters):
-    return IMPL.alert_log_get_count(context, filters=filters)
+def alert_log_get_count(context, filters, approximate=False):
+    return IMPL.alert_log_get_count(context, filters=filters,
+                                    approximate=approximate)
 
 
 def alert_log_batch_update(context, filters, updates):
@@ -892,10 +897,11 @@ def service_get(context, service_id):
 
 
 def service_get_all(context, filters, marker, limit,
-                    offset, sort_keys, sort_dirs):
+                    offset, sort_keys, sort_dirs, expected_attrs=None):
     return IMPL.service_get_all(
         context, marker=marker, limit=limit, sort_keys=sort_keys,
-        sort_dirs=sort_dirs, filters=filters, offset=offset)
+        sort_dirs=sort_dirs, filters=filters, offset=offset,
+        expected_attrs=expected_attrs)
 
 
 def service_get_count(context, filters):
@@ -987,8 +993,46 @@ def action_log_get_all(context, *args, **kwargs):
     return IMPL.action_log_get_all(context, *args, **kwargs)
 
 
-def action_log_get_count(context, filters):
-    return IMPL.action_log_get_count(context, filters=filters)
+def action_log_get_count(context, filters, approximate=False):
+    return IMPL.action_log_get_count(context, filters=filters,
+                                     approximate=approximate)
+
+
+###############
+
+
+def log_purge_get_all(context, model_name, cluster_id, before, limit,
+                      deleted_before=None):
+    return IMPL.log_purge_get_all(context, model_name, cluster_id, before,
+                                  limit, deleted_before=deleted_before)
+
+
+def log_purge(context, model_name, ids):
+    return IMPL.log_purge(context, model_name, ids)
+
+
+def log_count_cutoff_get(context, model_name, cluster_id, keep):
+    return IMPL.log_count_cutoff_get(context, model_name, cluster_id, keep)
+
+
+def log_first_created_get(context, model_name, cluster_id, since=None):
+    return IMPL.log_first_created_get(context, model_name, cluster_id,
+                                      since=since)
+
+
+def log_rollup_refresh(context, model_name, cluster_id, day):
+    return IMPL.log_rollup_refresh(context, model_name, cluster_id, day)
+
+
+def log_rollup_last_day_get(context, log_type, cluster_id):
+    return IMPL.log_rollup_last_day_get(context, log_type, cluster_id)
+
+
+def log_rollup_get_all(context, filters, marker, limit,
+                       offset, sort_keys, sort_dirs):
+    return IMPL.log_rollup_get_all(
+        context, marker=marker, limit=limit, sort_keys=sort_keys,
+        sort_dirs=sort_dirs, filters=filters, offset=offset)
 
 
 ###############
@@ -1072,15 +1116,16 @@ def task_get(context, task_id):
 
 def task_get_all(context, filters, marker, limit,
                  offset, sort_keys, sort_dirs,
-                 expected_attrs=None):
+                 expected_attrs=None, cursor=None):
     return IMPL.task_get_all(
         context, marker=marker, limit=limit, sort_keys=sort_keys,
         sort_dirs=sort_dirs, filters=filters, offset=offset,
-        expected_attrs=expected_attrs)
+        expected_attrs=expected_attrs, cursor=cursor)
 
 
-def task_get_count(context, filters):
-    return IMPL.task_get_count(context, filters=filters)
+def task_get_count(context, filters, approximate=False):
+    return IMPL.task_get_count(context, filters=filters,
+                               approximate=approximate)
 
 
 def task_update(context, task_id, values):
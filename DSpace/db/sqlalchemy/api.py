@@ -3,6 +3,8 @@ try:
 except ImportError:
     from collections import Iterable
 
+import collections
+import datetime
 import functools
 import itertools
 import re
@@ -22,7 +24,10 @@ from sqlalchemy import and_
 from sqlalchemy import case
 from sqlalchemy import or_
 from sqlalchemy import sql
+from sqlalchemy import true
 from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import load_only
 from sqlalchemy.sql import func
 from sqlalchemy.sql.expression import literal_column
 
@@ -32,6 +37,7 @@ from DSpace.common import sqlalchemyutils
 from DSpace.db.sqlalchemy import models
 from DSpace.i18n import _
 from DSpace.objects.fields import ServiceStatus
+from DSpace.utils import pagination
 
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
@@ -493,8 +499,25 @@ def volume_get_count(context, filters=None):
         return query.count()
 
 
+def _load_only(query, model, fields):
+    """Load the columns of the fields only
+
+    The id, created_at and foreign key columns are always loaded, objects
+    are identified and paged by them, and relations are loaded by them.
+    """
+    mapper = sqlalchemy.inspect(model)
+    columns = set(fields).intersection(mapper.columns.keys())
+    columns.update(['id', 'created_at'])
+    for relation in mapper.relationships:
+        columns.update(column.key for column in relation.local_columns
+                       if column.key in mapper.columns)
+    return query.options(load_only(
+        *[getattr(model, column) for column in sorted(columns)]))
+
+
 def _generate_paginate_query(context, session, model, marker, limit, sort_keys,
-                             sort_dirs, filters, offset=None):
+                             sort_dirs, filters, offset=None, cursor=None,
+                             fields=None):
     """Generate the query to include the filters and the paginate options.
 
     Returns a query with sorting / pagination criteria added or None
@@ -515,6 +538,10 @@ def _generate_paginate_query(context, session, model, marker, limit, sort_keys,
                     is used for other values, see _process_volume_filters
                     function for more information
     :param offset: number of items to skip
+    :param cursor: opaque cursor of the last item of the previous page, when
+                   given the query is paginated by the (created_at, id)
+                   keyset and marker, sort_keys and offset are ignored
+    :param fields: fields of the projection, only their columns are loaded
     :returns: updated query or None
     """
     get_query, process_filters, get = PAGINATION_HELPERS[model]
@@ -522,12 +549,20 @@ def _generate_paginate_query(context, session, model, marker, limit, sort_keys,
                                                sort_dirs,
                                                default_dir='desc')
     query = get_query(context, session=session)
+    if fields:
+        query = _load_only(query, model, fields)
 
     if filters:
         query = process_filters(query, filters)
         if query is None:
             return None
 
+    if cursor is not None:
+        sort_dir = sort_dirs[0] if sort_dirs else 'desc'
+        return sqlalchemyutils.keyset_paginate_query(
+            query, model, limit, pagination.decode_cursor(cursor),
+            sort_dir=sort_dir)
+
     marker_object = None
     if marker is not None:
         marker_object = get(context, marker, session)
@@ -974,7 +1009,7 @@ def node_get(context, node_id, expected_attrs=None):
 @require_context
 def node_get_all(context, marker=None, limit=None, sort_keys=None,
                  sort_dirs=None, filters=None, offset=None,
-                 expected_attrs=None):
+                 expected_attrs=None, fields=None):
     filters = filters or {}
     if filters.get("cluster_id") != "*":
         if "cluster_id" not in filters.keys():
@@ -987,7 +1022,7 @@ def node_get_all(context, marker=None, limit=None, sort_keys=None,
         query = _generate_paginate_query(
             context, session, models.Node, marker, limit,
             sort_keys, sort_dirs, filters,
-            offset)
+            offset, fields=fields)
         # No clusters would match, return empty list
         if query is None:
             return []
@@ -1292,7 +1327,7 @@ def osd_get_by_osd_id(context, osd_id, **kwargs):
 @require_context
 def osd_get_all(context, marker=None, limit=None, sort_keys=None,
                 sort_dirs=None, filters=None, offset=None,
-                expected_attrs=None):
+                expected_attrs=None, fields=None):
     session = get_session()
     filters = filters or {}
     if filters.get("cluster_id") != "*":
@@ -1305,7 +1340,7 @@ def osd_get_all(context, marker=None, limit=None, sort_keys=None,
         query = _generate_paginate_query(
             context, session, models.Osd, marker, limit,
             sort_keys, sort_dirs, filters,
-            offset)
+            offset, fields=fields)
         # No clusters would match, return empty list
         if query is None:
             return []
@@ -1341,6 +1376,33 @@ def osd_update(context, osd_id, values):
             raise exception.OsdNotFound(osd_id=osd_id)
 
 
+@require_context
+@oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
+def osd_status_update(context, osd_ids, status, expected_status):
+    """Set status of many osds whose status is one of expected_status
+
+    :return: ids of the updated osds
+    """
+    if not osd_ids:
+        return []
+    condition = expected_status
+    if not isinstance(condition, db.Condition):
+        condition = db.Condition(condition, 'status')
+    session = get_session()
+    with session.begin():
+        query = _osd_get_query(context, session).filter(
+            models.Osd.id.in_(osd_ids),
+            condition.get_filter(models.Osd, 'status'))
+        # lock the rows, ids updated are exactly the ones selected
+        ids = [osd.id for osd in
+               query.with_entities(models.Osd.id).with_for_update()]
+        if ids:
+            _osd_get_query(context, session).filter(
+                models.Osd.id.in_(ids)).update(
+                    {"status": status}, synchronize_session=False)
+    return ids
+
+
 ###############################
 
 
@@ -3384,7 +3446,7 @@ def _alert_log_load_attr(ctxt, alert_log, expected_attrs=None, session=None):
 @require_context
 def alert_log_get_all(context, marker=None, limit=None, sort_keys=None,
                       sort_dirs=None, filters=None, offset=None,
-                      expected_attrs=None):
+                      expected_attrs=None, cursor=None):
     filters = filters or {}
     if "cluster_id" not in filters.keys():
         filters['cluster_id'] = context.cluster_id
@@ -3394,7 +3456,7 @@ def alert_log_get_all(context, marker=None, limit=None, sort_keys=None,
         query = _generate_paginate_query(
             context, session, models.AlertLog,
             marker, limit,
-            sort_keys, sort_dirs, filters, offset)
+            sort_keys, sort_dirs, filters, offset, cursor=cursor)
         if query is None:
             return []
         alert_logs = query.all()
@@ -3404,7 +3466,7 @@ def alert_log_get_all(context, marker=None, limit=None, sort_keys=None,
 
 
 @require_context
-def alert_log_get_count(context, filters=None):
+def alert_log_get_count(context, filters=None, approximate=False):
     session = get_session()
     filters = filters or {}
     if "cluster_id" not in filters.keys():
@@ -3413,6 +3475,9 @@ def alert_log_get_count(context, filters=None):
         # Generate the query
         query = _alert_log_get_query(context, session)
         query = process_filters(models.AlertLog)(query, filters)
+        if approximate:
+            return sqlalchemyutils.bounded_count(
+                query, CONF.pagination_count_limit)
         return query.count()
 
 
@@ -3714,7 +3779,8 @@ def service_get(context, service_id, expected_attrs=None):
 
 @require_context
 def service_get_all(context, marker=None, limit=None, sort_keys=None,
-                    sort_dirs=None, filters=None, offset=None):
+                    sort_dirs=None, filters=None, offset=None,
+                    expected_attrs=None):
     filters = filters or {}
     if filters.get("cluster_id") != "*":
         if "cluster_id" not in filters.keys():
@@ -3731,7 +3797,15 @@ def service_get_all(context, marker=None, limit=None, sort_keys=None,
         # No clusters would match, return empty list
         if query is None:
             return []
-        return query.all()
+        expected_attrs = expected_attrs or []
+        if 'node' in expected_attrs:
+            # nodes of all services in the same query
+            query = query.options(joinedload(models.Service._node))
+        services = query.all()
+        if 'node' in expected_attrs:
+            for service in services:
+                service.node = service._node
+        return services
 
 
 @require_context
@@ -4095,7 +4169,7 @@ def _action_log_load_attr(ctxt, action_log, expected_attrs=None,
 @require_context
 def action_log_get_all(context, marker=None, limit=None, sort_keys=None,
                        sort_dirs=None, filters=None, offset=None,
-                       expected_attrs=None):
+                       expected_attrs=None, cursor=None):
     filters = filters or {}
     if "cluster_id" not in filters.keys():
         filters['cluster_id'] = context.cluster_id
@@ -4105,7 +4179,7 @@ def action_log_get_all(context, marker=None, limit=None, sort_keys=None,
         query = _generate_paginate_query(
             context, session, models.ActionLog,
             marker, limit,
-            sort_keys, sort_dirs, filters, offset)
+            sort_keys, sort_dirs, filters, offset, cursor=cursor)
         if query is None:
             return []
         action_logs = query.all()
@@ -4115,7 +4189,7 @@ def action_log_get_all(context, marker=None, limit=None, sort_keys=None,
 
 
 @require_context
-def action_log_get_count(context, filters=None):
+def action_log_get_count(context, filters=None, approximate=False):
     session = get_session()
     filters = filters or {}
     if "cluster_id" not in filters.keys():
@@ -4124,12 +4198,252 @@ def action_log_get_count(context, filters=None):
         # Generate the query
         query = _action_log_get_query(context, session)
         query = process_filters(models.ActionLog)(query, filters)
+        if approximate:
+            return sqlalchemyutils.bounded_count(
+                query, CONF.pagination_count_limit)
         return query.count()
 
 
 ###############################
 
 
+# column of the logs that is rolled up as level
+_LOG_ROLLUP_LEVELS = {
+    'ActionLog': 'status',
+    'AlertLog': 'level',
+}
+
+
+def _log_retention_query(context, model, cluster_id, session=None):
+    # retention works on every row, deleted ones included
+    return model_query(context, model, session=session,
+                       read_deleted='yes').filter_by(cluster_id=cluster_id)
+
+
+@require_context
+def log_purge_get_all(context, model_name, cluster_id, before, limit,
+                      deleted_before=None):
+    """Oldest logs created before `before`
+
+    Logs already (soft) deleted by user are returned if they are created
+    before deleted_before.
+    """
+    model = get_model_for_versioned_object(model_name)
+    session = get_session()
+    with session.begin():
+        query = _log_retention_query(context, model, cluster_id, session)
+        conditions = []
+        if before:
+            conditions.append(model.created_at < before)
+        if deleted_before:
+            conditions.append(and_(model.deleted == true(),
+                                   model.created_at < deleted_before))
+        if not conditions:
+            return []
+        query = query.filter(or_(*conditions))
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+        return query.limit(limit).all()
+
+
+@require_context
+@oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
+def log_purge(context, model_name, ids):
+    """Remove logs from db, returns the number of removed rows
+
+    Logs deleted by users are taken off the rollups of their day, so the
+    rollups keep counting the logs which are still there or purged by
+    age only, see log_count_cutoff_get.
+    """
+    if not ids:
+        return 0
+    model = get_model_for_versioned_object(model_name)
+    level = getattr(model, _LOG_ROLLUP_LEVELS[model_name])
+    log_type = model.__tablename__[:-1]
+    session = get_session()
+    with session.begin():
+        query = session.query(model).filter(model.id.in_(ids))
+        deleted = collections.Counter(
+            (cluster_id, created_at.date(), resource_type, level_value)
+            for cluster_id, created_at, resource_type, level_value in
+            query.filter(model.deleted == true()).with_entities(
+                model.cluster_id, model.created_at, model.resource_type,
+                level))
+        for (cluster_id, day, resource_type, level_value), count in \
+                six.iteritems(deleted):
+            session.query(models.LogRollup).filter_by(
+                cluster_id=cluster_id, log_type=log_type, day=day,
+                resource_type=resource_type, level=level_value
+            ).update({models.LogRollup.count: models.LogRollup.count - count},
+                     synchronize_session=False)
+        return query.delete(synchronize_session=False)
+
+
+@require_context
+def log_count_cutoff_get(context, model_name, cluster_id, keep):
+    """created_at of the oldest log in the newest `keep` logs
+
+    Days already rolled up are counted by their rollups, only the logs of
+    the days not rolled up yet and of the cutoff day are walked. Purges of
+    logs deleted by users lower the rollups, purges by age remove the
+    oldest days only, which are walked.
+    Returns None if there are less than `keep` logs.
+    """
+    model = get_model_for_versioned_object(model_name)
+    log_type = model.__tablename__[:-1]
+    session = get_session()
+    with session.begin():
+        query = _log_retention_query(context, model, cluster_id, session)
+        first = query.with_entities(func.min(model.created_at)).scalar()
+        if not first:
+            return None
+        days = _log_rollup_get_query(context, session).filter_by(
+            cluster_id=cluster_id, log_type=log_type
+        ).with_entities(
+            models.LogRollup.day, func.sum(models.LogRollup.count)
+        ).group_by(models.LogRollup.day).order_by(
+            models.LogRollup.day.desc()).all()
+        # (begin, end, count), newest first, count is None if not rolled up
+        since = None
+        if days:
+            since = datetime.datetime.combine(
+                days[0][0] + datetime.timedelta(days=1), datetime.time())
+        ranges = [(since, None, None)]
+        for day, count in days:
+            if day < first.date():
+                break
+            # the oldest day may be purged partly after its rollup
+            if day == first.date():
+                count = None
+            else:
+                count = int(count)
+            begin = datetime.datetime.combine(day, datetime.time())
+            ranges.append((begin, begin + datetime.timedelta(days=1), count))
+        remaining = keep
+        for begin, end, count in ranges:
+            if count is not None and count < remaining:
+                remaining -= count
+                continue
+            day_query = query
+            if begin:
+                day_query = day_query.filter(model.created_at >= begin)
+            if end:
+                day_query = day_query.filter(model.created_at < end)
+            row = day_query.with_entities(model.created_at).order_by(
+                model.created_at.desc(), model.id.desc()
+            ).offset(remaining - 1).first()
+            if row:
+                return row[0]
+            remaining -= day_query.count()
+        return None
+
+
+@require_context
+def log_first_created_get(context, model_name, cluster_id, since=None):
+    """created_at of the first log, or the first log created since `since`"""
+    model = get_model_for_versioned_object(model_name)
+    session = get_session()
+    with session.begin():
+        query = _log_retention_query(context, model, cluster_id, session)
+        if since:
+            query = query.filter(model.created_at >= since)
+        return query.with_entities(func.min(model.created_at)).scalar()
+
+
+@require_context
+@oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
+def log_rollup_refresh(context, model_name, cluster_id, day):
+    """(Re)build the rollups of one day of logs, returns rollup number"""
+    model = get_model_for_versioned_object(model_name)
+    level = getattr(model, _LOG_ROLLUP_LEVELS[model_name])
+    log_type = model.__tablename__[:-1]
+    begin = datetime.datetime.combine(day, datetime.time())
+    end = begin + datetime.timedelta(days=1)
+    session = get_session()
+    with session.begin():
+        query = _log_retention_query(context, model, cluster_id, session)
+        rows = query.with_entities(
+            model.resource_type, level, func.count(model.id)
+        ).filter(
+            model.created_at >= begin, model.created_at < end
+        ).group_by(model.resource_type, level).all()
+        session.query(models.LogRollup).filter_by(
+            cluster_id=cluster_id, log_type=log_type, day=day
+        ).delete(synchronize_session=False)
+        for resource_type, level_value, count in rows:
+            rollup_ref = models.LogRollup()
+            rollup_ref.update({
+                'log_type': log_type,
+                'day': day,
+                'resource_type': resource_type,
+                'level': level_value,
+                'count': count,
+                'cluster_id': cluster_id
+            })
+            rollup_ref.save(session)
+    return len(rows)
+
+
+def _process_log_rollup_filters(query, filters):
+    filters = filters.copy()
+    filter_dict = {}
+    for key, value in filters.items():
+        if key == 'day' and isinstance(value, (list, tuple)):
+            query = query.filter(models.LogRollup.day.between(
+                value[0], value[1]))
+        elif isinstance(value, (tuple, set, frozenset)):
+            column_attr = getattr(models.LogRollup, key)
+            query = query.filter(column_attr.in_(value))
+        else:
+            filter_dict[key] = value
+    if filter_dict:
+        query = query.filter_by(**filter_dict)
+    return query
+
+
+@require_context
+def _log_rollup_get_query(context, session=None):
+    return model_query(context, models.LogRollup, session=session)
+
+
+def _log_rollup_get(context, log_rollup_id, session=None):
+    result = _log_rollup_get_query(context, session=session)
+    result = result.filter_by(id=log_rollup_id).first()
+
+    if not result:
+        raise exception.LogRollupNotFound(log_rollup_id=log_rollup_id)
+
+    return result
+
+
+@require_context
+def log_rollup_last_day_get(context, log_type, cluster_id):
+    session = get_session()
+    with session.begin():
+        query = _log_rollup_get_query(context, session)
+        return query.filter_by(
+            cluster_id=cluster_id, log_type=log_type
+        ).with_entities(func.max(models.LogRollup.day)).scalar()
+
+
+@require_context
+def log_rollup_get_all(context, marker=None, limit=None, sort_keys=None,
+                       sort_dirs=None, filters=None, offset=None):
+    filters = filters or {}
+    if "cluster_id" not in filters.keys():
+        filters['cluster_id'] = context.cluster_id
+    session = get_session()
+    with session.begin():
+        query = _generate_paginate_query(
+            context, session, models.LogRollup, marker, limit,
+            sort_keys, sort_dirs, filters, offset)
+        if query is None:
+            return []
+        return query.all()
+
+
+###############################
+
+
 def _user_get_query(context, session=None):
     return model_query(context, models.User, session=session)
 
@@ -4340,7 +4654,7 @@ def task_get(context, task_id, expected_attrs=None):
 @require_context
 def task_get_all(context, marker=None, limit=None, sort_keys=None,
                  sort_dirs=None, filters=None, offset=None,
-                 expected_attrs=None):
+                 expected_attrs=None, cursor=None):
     filters = filters or {}
     if "cluster_id" not in filters.keys():
         filters['cluster_id'] = context.cluster_id
@@ -4350,7 +4664,7 @@ def task_get_all(context, marker=None, limit=None, sort_keys=None,
         query = _generate_paginate_query(
             context, session, models.Task, marker, limit,
             sort_keys, sort_dirs, filters,
-            offset)
+            offset, cursor=cursor)
         # No clusters would match, return empty list
         if query is None:
             return []
@@ -4369,12 +4683,15 @@ def task_update(context, task_id, values):
 
 
 @require_context
-def task_get_count(context, filters=None):
+def task_get_count(context, filters=None, approximate=False):
     session = get_session()
     with session.begin():
         # Generate the query
         query = _task_get_query(context, session)
         query = process_filters(models.Task)(query, filters)
+        if approximate:
+            return sqlalchemyutils.bounded_count(
+                query, CONF.pagination_count_limit)
         return query.count()
 
 
@@ -5515,6 +5832,9 @@ PAGINATION_HELPERS = {
     models.ActionLog: (_action_log_get_query,
                        _process_action_log_filters,
                        _action_log_get),
+    models.LogRollup: (_log_rollup_get_query,
+                       _process_log_rollup_filters,
+                       _log_rollup_get),
     models.User: (_user_get_query,
                   process_filters(models.User),
                   _user_get),
@@ -0,0 +1,19 @@
+from sqlalchemy import Index
+from sqlalchemy import MetaData
+from sqlalchemy import Table
+
+# keyset pagination of log tables seeks on (cluster_id, created_at, id)
+TABLES = ['action_logs', 'alert_logs', 'tasks']
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+    for name in TABLES:
+        table = Table(name, meta, autoload=True)
+        index_name = '%s_cluster_id_created_at_id_idx' % name
+        if index_name in [i.name for i in table.indexes]:
+            continue
+        index = Index(index_name, table.c.cluster_id, table.c.created_at,
+                      table.c.id)
+        index.create(migrate_engine)
@@ -0,0 +1,37 @@
+from sqlalchemy import Boolean
+from sqlalchemy import Column
+from sqlalchemy import Date
+from sqlalchemy import DateTime
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import Integer
+from sqlalchemy import MetaData
+from sqlalchemy import String
+from sqlalchemy import Table
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    Table('clusters', meta, autoload=True)
+    table = Table(
+        'log_rollups', meta,
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('deleted_at', DateTime),
+        Column('deleted', Boolean, index=True),
+        Column('id', Integer, primary_key=True, nullable=False),
+        Column('log_type', String(32)),
+        Column('day', Date),
+        Column('resource_type', String(32)),
+        Column('level', String(32)),
+        Column('count', Integer),
+        Column('cluster_id', String(36), ForeignKey('clusters.id')),
+        Index('log_rollups_cluster_id_log_type_day_idx',
+              'cluster_id', 'log_type', 'day'),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+
+    table.create()
@@ -5,8 +5,10 @@ from oslo_utils import timeutils
 from sqlalchemy import BigInteger
 from sqlalchemy import Boolean
 from sqlalchemy import Column
+from sqlalchemy import Date
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import LargeBinary
 from sqlalchemy import String
@@ -195,6 +197,7 @@ class Service(BASE, StorBase):
     role = Column(String(32))
     counter = Column(BigInteger, default=0)
     cluster_id = Column(String(36), ForeignKey('clusters.id'))
+    _node = relationship("Node", backref="_services")
 
 
 class Osd(BASE, StorBase):
@@ -502,6 +505,12 @@ class AlertLog(BASE, StorBase):
     alert_rule_id = Column(Integer, ForeignKey('alert_rules.id'))
     cluster_id = Column(String(36), ForeignKey('clusters.id'))
 
+    __table_args__ = (
+        Index('alert_logs_cluster_id_created_at_id_idx',
+              'cluster_id', 'created_at', 'id'),
+        StorBase.__table_args__
+    )
+
 
 class ActionLog(BASE, StorBase):
     """操作记录表"""
@@ -523,6 +532,31 @@ class ActionLog(BASE, StorBase):
     err_msg = Column(Text())
     cluster_id = Column(String(36), ForeignKey('clusters.id'))
 
+    __table_args__ = (
+        Index('action_logs_cluster_id_created_at_id_idx',
+              'cluster_id', 'created_at', 'id'),
+        StorBase.__table_args__
+    )
+
+
+class LogRollup(BASE, StorBase):
+    """操作/告警记录按天汇总表"""
+    __tablename__ = 'log_rollups'
+
+    id = Column(Integer, primary_key=True)
+    log_type = Column(String(32))  # action_log/alert_log
+    day = Column(Date)
+    resource_type = Column(String(32))
+    level = Column(String(32))  # alert_log: level, action_log: status
+    count = Column(Integer, default=0)
+    cluster_id = Column(String(36), ForeignKey('clusters.id'))
+
+    __table_args__ = (
+        Index('log_rollups_cluster_id_log_type_day_idx',
+              'cluster_id', 'log_type', 'day'),
+        StorBase.__table_args__
+    )
+
 
 class CrushRule(BASE, StorBase):
     __tablename__ = 'crush_rules'
@@ -570,6 +604,12 @@ class Task(BASE, StorBase):
     taskflow_id = Column(Integer, ForeignKey('taskflows.id'))
     cluster_id = Column(String(36), ForeignKey('clusters.id'))
 
+    __table_args__ = (
+        Index('tasks_cluster_id_created_at_id_idx',
+              'cluster_id', 'created_at', 'id'),
+        StorBase.__table_args__
+    )
+
 
 class Radosgw(BASE, StorBase):
     __tablename__ = 'radosgws'
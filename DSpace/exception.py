@@ -439,6 +439,10 @@ class ActionLogNotFound(NotFound):
     message = _("ActionLog %(action_log_id)s could not be found.")
 
 
+class LogRollupNotFound(NotFound):
+    message = _("LogRollup %(log_rollup_id)s could not be found.")
+
+
 class AccessPathExists(Duplicate):
     message = _("%(access_path)s could not be found.")
 
@@ -593,6 +597,14 @@ class RestartServiceFailed(StorException):
     message = _("Restart service %(service)s failed")
 
 
+class ProbeError(StorException):
+    message = _("Probe %(probe)s failed: %(reason)s")
+
+
+class AdminSocketError(StorException):
+    message = _("Admin socket %(path)s error: %(reason)s")
+
+
 class UserorPasswordError(StorException):
     message = _("User or Password error")
 
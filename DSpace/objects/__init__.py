@@ -3,6 +3,12 @@
 import json
 
 from DSpace.objects.base import JsonEncoder
+from DSpace.objects.base import json_default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def register_all():
@@ -22,6 +28,7 @@ def register_all():
     __import__('DSpace.objects.email_group')
     __import__('DSpace.objects.license')
     __import__('DSpace.objects.log_file')
+    __import__('DSpace.objects.log_rollup')
     __import__('DSpace.objects.logo')
     __import__('DSpace.objects.network')
     __import__('DSpace.objects.node')
@@ -55,10 +62,33 @@ def register_all():
 
 
 class _Json(object):
+    """json with orjson if it is installed
+
+    orjson is used without json options other than compact separators
+    (socket.io packets), datetimes are passed to the default like json.
+    Objects orjson can not encode, e.g. integers out of 64 bits, are encoded
+    by json.
+    """
+    if orjson:
+        OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
     def dumps(self, obj, *args, **kwargs):
+        if orjson and not args and (
+                not kwargs or kwargs == {"separators": (",", ":")}):
+            try:
+                return orjson.dumps(obj, default=json_default,
+                                    option=self.OPTIONS).decode("utf-8")
+            except TypeError:
+                pass
         return json.dumps(obj, cls=JsonEncoder, *args, **kwargs)
 
     def loads(self, obj, *args, **kwargs):
+        if orjson and not args and not kwargs:
+            try:
+                return orjson.loads(obj)
+            except ValueError:
+                # NaN and Infinity of json
+                pass
         return json.loads(obj, *args, **kwargs)
 
 
@@ -109,14 +109,16 @@ class ActionLogList(base.ObjectListBase, base.StorObject):
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
                 offset=None, sort_keys=None, sort_dirs=None,
-                expected_attrs=None):
+                expected_attrs=None, cursor=None):
         action_logs = db.action_log_get_all(context, marker, limit,
                                             sort_keys, sort_dirs, filters,
-                                            offset, expected_attrs)
+                                            offset, expected_attrs,
+                                            cursor=cursor)
         return base.obj_make_list(context, cls(context), objects.ActionLog,
                                   action_logs, expected_attrs=expected_attrs)
 
     @classmethod
-    def get_count(cls, context, filters=None):
-        count = db.action_log_get_count(context, filters)
+    def get_count(cls, context, filters=None, approximate=False):
+        count = db.action_log_get_count(context, filters,
+                                        approximate=approximate)
         return count
@@ -71,16 +71,18 @@ class AlertLogList(base.ObjectListBase, base.StorObject):
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
                 offset=None, sort_keys=None, sort_dirs=None,
-                expected_attrs=None):
+                expected_attrs=None, cursor=None):
         alert_logs = db.alert_log_get_all(context, marker, limit,
                                           sort_keys, sort_dirs, filters,
-                                          offset, expected_attrs)
+                                          offset, expected_attrs,
+                                          cursor=cursor)
         return base.obj_make_list(context, cls(context), objects.AlertLog,
                                   alert_logs, expected_attrs=expected_attrs)
 
     @classmethod
-    def get_count(cls, context, filters=None):
-        count = db.alert_log_get_count(context, filters)
+    def get_count(cls, context, filters=None, approximate=False):
+        count = db.alert_log_get_count(context, filters,
+                                       approximate=approximate)
         return count
 
     @classmethod
@@ -66,6 +66,107 @@ class StorObject(base.VersionedObject):
         return changes
 
 
+# fields of every projection, objects are identified and paged by them
+PROJECTION_FIELDS = ('id', 'created_at')
+
+
+def projection(fields, required=()):
+    """Fields to load of the objects of a list
+
+    :param fields: fields requested, None for all fields
+    :param required: fields the results are built with
+    :return: sorted fields, None for all fields
+    """
+    if not fields:
+        return None
+    return sorted(set(fields).union(required, PROJECTION_FIELDS))
+
+
+def projected_attrs(expected_attrs, fields):
+    """Optional fields to load of a projection"""
+    if not fields or not expected_attrs:
+        return expected_attrs
+    return [attr for attr in expected_attrs if attr in fields]
+
+
+def _local_time(v):
+    if isinstance(v, datetime.datetime):
+        v = utc_to_local(v, CONF.time_zone).isoformat()
+    return v
+
+
+def _ip_address(v):
+    if isinstance(v, netaddr.IPAddress):
+        v = str(v)
+    return v
+
+
+def _sensitive(v):
+    return "***"
+
+
+def _field_converter(field):
+    if isinstance(field, fields.SensitiveStringField):
+        return _sensitive
+    if isinstance(field._type, fields.DateTime):
+        return _local_time
+    if isinstance(field._type, fields.IPAddress):
+        return _ip_address
+    return None
+
+
+# (class, optional) -> serializer
+_dict_serializers = {}
+_unset = object()
+
+
+def _dict_serializer(cls, optional):
+    """to_dict of the objects of the class
+
+    The converter of every field is chosen once by the field type, the
+    serializer only gets the values and converts datetimes, ip addresses
+    and sensitive strings. Values set are read from the attributes of the
+    field properties, the properties are only used to lazy load the others.
+    Objects of a projection, without some fields that can not be lazy
+    loaded, are serialized with the fields set only.
+    """
+    key = (cls, optional)
+    serializer = _dict_serializers.get(key)
+    if serializer:
+        return serializer
+    converters = tuple(
+        (k, base._get_attrname(k), _field_converter(field))
+        for k, field in six.iteritems(cls.fields)
+        if optional or k not in cls.OPTIONAL_FIELDS)
+    required = tuple(base._get_attrname(k) for k in cls.fields
+                     if k not in cls.OPTIONAL_FIELDS)
+
+    def serializer(obj):
+        _obj = {}
+        values = vars(obj)
+        if not all(attrname in values for attrname in required):
+            for k, attrname, converter in converters:
+                if attrname in values:
+                    v = values[attrname]
+                    _obj[k] = converter(v) if converter else v
+            return _obj
+        for k, attrname, converter in converters:
+            v = values.get(attrname, _unset)
+            if v is _unset:
+                v = getattr(obj, k)
+            _obj[k] = converter(v) if converter else v
+        return _obj
+
+    _dict_serializers[key] = serializer
+    return serializer
+
+
+def _db_value(field, value):
+    if isinstance(field, fields.IntegerField):
+        value = value if value is not None else 0
+    return value
+
+
 class StorObjectDictCompat(base.VersionedObjectDictCompat):
     pass
 
@@ -96,20 +197,7 @@ class StorPersistentObject(object):
             raise exception.ProgrammingError(reason=msg)
 
     def to_dict(self, optional=False):
-        _obj = {}
-        for k, field in six.iteritems(self.fields):
-            if k in self.OPTIONAL_FIELDS and not optional:
-                continue
-            v = getattr(self, k)
-            if isinstance(v, datetime.datetime):
-                local_time = utc_to_local(v, CONF.time_zone)
-                v = datetime.datetime.isoformat(local_time)
-            elif isinstance(v, netaddr.IPAddress):
-                v = str(v)
-            elif isinstance(field, fields.SensitiveStringField):
-                v = "***"
-            _obj[k] = v
-        return _obj
+        return _dict_serializer(type(self), optional)(self)
 
     @classmethod
     def _get_expected_attrs(cls, context, *args, **kwargs):
@@ -133,14 +221,15 @@ class StorPersistentObject(object):
                                    expected_attrs)
 
     @classmethod
-    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None):
+    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None,
+                        fields=None):
         for name, field in obj.fields.items():
             if name in cls.OPTIONAL_FIELDS:
                 continue
-            value = db_obj.get(name)
-            if isinstance(field, fields.IntegerField):
-                value = value if value is not None else 0
-            obj[name] = value
+            if fields and name not in fields:
+                # not loaded by the projection
+                continue
+            obj[name] = _db_value(field, db_obj.get(name))
 
         obj._context = context
         obj.obj_reset_changes()
@@ -283,12 +372,18 @@ class StorObjectSerializer(base.VersionedObjectSerializer):
     OBJ_BASE_CLASS = StorObject
 
 
-class JsonEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, StorPersistentObject):
-            return obj.to_dict(optional=True)
+def json_default(obj):
+    """Encodes objects of the json encoders"""
+    if isinstance(obj, StorPersistentObject):
+        return obj.to_dict(optional=True)
 
-        if isinstance(obj, ObjectListBase):
-            return list(obj)
+    if isinstance(obj, ObjectListBase):
+        return list(obj)
 
-        return super(JsonEncoder, self).default(obj)
+    raise TypeError("Object of type %s is not JSON serializable" %
+                    type(obj).__name__)
+
+
+class JsonEncoder(json.JSONEncoder):
+    def default(self, obj):
+        return json_default(obj)
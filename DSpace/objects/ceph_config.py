@@ -12,6 +12,8 @@ from DSpace import objects
 from DSpace.i18n import _
 from DSpace.objects import base
 from DSpace.objects import fields as s_fields
+from DSpace.utils.config_cache import CONFIG_CACHE
+from DSpace.utils.config_cache import cached
 
 
 @base.StorObjectRegistry.register
@@ -36,11 +38,13 @@ class CephConfig(base.StorPersistentObject, base.StorObject,
 
         db_ceph_config = db.ceph_config_create(self._context, updates)
         self._from_db_object(self._context, self, db_ceph_config)
+        CONFIG_CACHE.bump()
 
     def save(self):
         updates = self.stor_obj_get_changes()
         if updates:
             db.ceph_config_update(self._context, self.id, updates)
+            CONFIG_CACHE.bump()
 
         self.obj_reset_changes()
 
@@ -48,6 +52,7 @@ class CephConfig(base.StorPersistentObject, base.StorObject,
         updated_values = db.ceph_config_destroy(self._context, self.id)
         self.update(updated_values)
         self.obj_reset_changes(updated_values.keys())
+        CONFIG_CACHE.bump()
 
     @classmethod
     def get_by_key(cls, ctxt, group, key):
@@ -79,10 +84,10 @@ class CephConfigList(base.ObjectListBase, base.StorObject):
         return count
 
 
-def ceph_config_get(ctxt, group, key, default=None):
+def _ceph_config_load(ctxt, group, key):
     obj = CephConfig.get_by_key(ctxt, group, key)
     if not obj:
-        return default
+        return None
     if obj.value_type == s_fields.ConfigType.STRING:
         return obj.value
     elif obj.value_type == s_fields.ConfigType.INT:
@@ -95,7 +100,13 @@ def ceph_config_get(ctxt, group, key, default=None):
         raise exception.Invalid(msg=_("Invalid config type"))
 
 
-def ceph_config_group_get(ctxt, group):
+def ceph_config_get(ctxt, group, key, default=None):
+    return cached(ctxt, "ceph_config", group, key,
+                  lambda: _ceph_config_load(ctxt, group, key),
+                  default=default)
+
+
+def _ceph_config_group_load(ctxt, group):
     res = {}
     objs = CephConfigList.get_all(ctxt, filters={'group': group})
     for obj in objs:
@@ -103,7 +114,18 @@ def ceph_config_group_get(ctxt, group):
     return res
 
 
+def ceph_config_group_get(ctxt, group):
+    return cached(ctxt, "ceph_config", group, None,
+                  lambda: _ceph_config_group_load(ctxt, group))
+
+
 def ceph_config_content(ctxt, debug_config=True):
+    # group None never exists in ceph_configs, used for the whole content
+    return cached(ctxt, "ceph_config", None, debug_config,
+                  lambda: _ceph_config_content_load(ctxt, debug_config))
+
+
+def _ceph_config_content_load(ctxt, debug_config):
     ignore_section = ["keyring"]
     configer = configparser.ConfigParser()
     configs = objects.CephConfigList.get_all(ctxt)
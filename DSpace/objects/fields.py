@@ -792,6 +792,7 @@ class ConfigKey(BaseStorEnum):
     AUTO_RESTART_IGNORE = 'auto_restart_ignore'  # use ',' when multi services
     PLATFORM_TYPE = 'platform_type'
     INIT_PORTAL_TIME = 'init_portal_time'  # hci portal 完成初始化的时间str
+    LOG_RETENTION = 'log_retention'  # 操作/告警记录保留策略 dict
 
 
 class PlatfromType(BaseStorEnum):
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from oslo_versionedobjects import fields
+
+from DSpace import db
+from DSpace import objects
+from DSpace.objects import base
+
+
+@base.StorObjectRegistry.register
+class LogRollup(base.StorPersistentObject, base.StorObject,
+                base.StorObjectDictCompat, base.StorComparableObject):
+
+    fields = {
+        'id': fields.IntegerField(),
+        'log_type': fields.StringField(),
+        'day': fields.StringField(),
+        'resource_type': fields.StringField(nullable=True),
+        'level': fields.StringField(nullable=True),
+        'count': fields.IntegerField(),
+        'cluster_id': fields.UUIDField(nullable=True),
+    }
+
+    @classmethod
+    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None):
+        return super(LogRollup, cls)._from_db_object(
+            context, obj, dict(db_obj, day=db_obj['day'].isoformat()))
+
+
+@base.StorObjectRegistry.register
+class LogRollupList(base.ObjectListBase, base.StorObject):
+
+    fields = {
+        'objects': fields.ListOfObjectsField('LogRollup'),
+    }
+
+    @classmethod
+    def get_all(cls, context, filters=None, marker=None, limit=None,
+                offset=None, sort_keys=None, sort_dirs=None):
+        log_rollups = db.log_rollup_get_all(
+            context, filters, marker, limit, offset,
+            sort_keys, sort_dirs)
+        return base.obj_make_list(context, cls(context), objects.LogRollup,
+                                  log_rollups)
+
+    @classmethod
+    def refresh(cls, context, log_cls, cluster_id, day):
+        return db.log_rollup_refresh(context, log_cls.obj_name(),
+                                     cluster_id, day)
+
+    @classmethod
+    def get_last_day(cls, context, log_type, cluster_id):
+        return db.log_rollup_last_day_get(context, log_type, cluster_id)
+
+
+# log_cls is objects.ActionLog or objects.AlertLog
+def log_purge_get_all(ctxt, log_cls, cluster_id, before, limit,
+                      deleted_before=None):
+    db_logs = db.log_purge_get_all(ctxt, log_cls.obj_name(), cluster_id,
+                                   before, limit,
+                                   deleted_before=deleted_before)
+    return [log_cls._from_db_object(ctxt, log_cls(ctxt), db_log)
+            for db_log in db_logs]
+
+
+def log_purge(ctxt, log_cls, ids):
+    return db.log_purge(ctxt, log_cls.obj_name(), ids)
+
+
+def log_count_cutoff_get(ctxt, log_cls, cluster_id, keep):
+    return db.log_count_cutoff_get(ctxt, log_cls.obj_name(), cluster_id, keep)
+
+
+def log_first_created_get(ctxt, log_cls, cluster_id, since=None):
+    return db.log_first_created_get(ctxt, log_cls.obj_name(), cluster_id,
+                                    since=since)
@@ -73,8 +73,10 @@ class Node(base.StorPersistentObject, base.StorObject,
         self.obj_reset_changes(updated_values.keys())
 
     @classmethod
-    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None):
-        obj.metrics = {}
+    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None,
+                        fields=None):
+        if not fields or 'metrics' in fields:
+            obj.metrics = {}
         expected_attrs = expected_attrs or []
         if 'disks' in expected_attrs:
             disks = db_obj.get('disks', [])
@@ -100,7 +102,8 @@ class Node(base.StorPersistentObject, base.StorObject,
                 context, objects.Radosgw(context), rgw
             ) for rgw in radosgws]
 
-        return super(Node, cls)._from_db_object(context, obj, db_obj)
+        return super(Node, cls)._from_db_object(context, obj, db_obj,
+                                                fields=fields)
 
 
 @base.StorObjectRegistry.register
@@ -113,12 +116,14 @@ class NodeList(base.ObjectListBase, base.StorObject):
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
                 offset=None, sort_keys=None, sort_dirs=None,
-                expected_attrs=None):
+                expected_attrs=None, fields=None):
+        expected_attrs = base.projected_attrs(expected_attrs, fields)
         nodes = db.node_get_all(context, filters, marker, limit, offset,
                                 sort_keys, sort_dirs,
-                                expected_attrs=expected_attrs)
+                                expected_attrs=expected_attrs, fields=fields)
         return base.obj_make_list(context, cls(context), objects.Node,
-                                  nodes, expected_attrs=expected_attrs)
+                                  nodes, expected_attrs=expected_attrs,
+                                  fields=fields)
 
     @classmethod
     def get_count(cls, context, filters=None):
@@ -98,8 +98,10 @@ class Osd(base.StorPersistentObject, base.StorObject,
                                  expected_attrs=expected_attrs)
 
     @classmethod
-    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None):
-        obj.metrics = {}
+    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None,
+                        fields=None):
+        if not fields or 'metrics' in fields:
+            obj.metrics = {}
         expected_attrs = expected_attrs or []
         if 'node' in expected_attrs:
             node = db_obj.get('node', None)
@@ -127,7 +129,8 @@ class Osd(base.StorPersistentObject, base.StorObject,
                     context, objects.DiskPartition(context), db_partition
                 )
                 setattr(obj, attr, obj_partition)
-        return super(Osd, cls)._from_db_object(context, obj, db_obj)
+        return super(Osd, cls)._from_db_object(context, obj, db_obj,
+                                               fields=fields)
 
 
 @base.StorObjectRegistry.register
@@ -140,12 +143,14 @@ class OsdList(base.ObjectListBase, base.StorObject):
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
                 offset=None, sort_keys=None, sort_dirs=None,
-                expected_attrs=None):
+                expected_attrs=None, fields=None):
+        expected_attrs = base.projected_attrs(expected_attrs, fields)
         osds = db.osd_get_all(
             context, filters, marker, limit, offset,
-            sort_keys, sort_dirs, expected_attrs)
+            sort_keys, sort_dirs, expected_attrs, fields=fields)
         return base.obj_make_list(context, cls(context), objects.Osd,
-                                  osds, expected_attrs=expected_attrs)
+                                  osds, expected_attrs=expected_attrs,
+                                  fields=fields)
 
     @classmethod
     def get_count(cls, context, filters=None):
@@ -163,3 +168,18 @@ class OsdList(base.ObjectListBase, base.StorObject):
     @classmethod
     def get_status(cls, context):
         return db.osd_status_get(context)
+
+    @classmethod
+    def status_update(cls, context, osds, status, expected_status):
+        """Compare-and-swap status of many osds in one transaction
+
+        :return: osds updated, their status is set too
+        """
+        ids = db.osd_status_update(context, [osd.id for osd in osds],
+                                   status, expected_status)
+        ids = set(ids)
+        updated = [osd for osd in osds if osd.id in ids]
+        for osd in updated:
+            osd.status = status
+            osd.obj_reset_changes(['status'])
+        return updated
@@ -22,8 +22,11 @@ class Service(base.StorPersistentObject, base.StorObject,
         'counter': fields.IntegerField(),
         'node_id': fields.IntegerField(),
         'cluster_id': fields.StringField(),
+        'node': fields.ObjectField("Node", nullable=True),
     }
 
+    OPTIONAL_FIELDS = ('node',)
+
     def create(self):
         if self.obj_attr_is_set('id'):
             raise exception.ObjectActionError(action='create',
@@ -45,6 +48,17 @@ class Service(base.StorPersistentObject, base.StorObject,
         self.update(updated_values)
         self.obj_reset_changes(updated_values.keys())
 
+    @classmethod
+    def _from_db_object(cls, context, obj, db_obj, expected_attrs=None):
+        expected_attrs = expected_attrs or []
+        if 'node' in expected_attrs:
+            node = db_obj.get('node', None)
+            if node:
+                node = objects.Node._from_db_object(
+                    context, objects.Node(context), node)
+            obj.node = node
+        return super(Service, cls)._from_db_object(context, obj, db_obj)
+
 
 @base.StorObjectRegistry.register
 class ServiceList(base.ObjectListBase, base.StorObject):
@@ -55,11 +69,13 @@ class ServiceList(base.ObjectListBase, base.StorObject):
 
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
-                offset=None, sort_keys=None, sort_dirs=None):
+                offset=None, sort_keys=None, sort_dirs=None,
+                expected_attrs=None):
         services = db.service_get_all(context, filters, marker, limit, offset,
-                                      sort_keys, sort_dirs)
+                                      sort_keys, sort_dirs,
+                                      expected_attrs=expected_attrs)
         return base.obj_make_list(context, cls(context), objects.Service,
-                                  services)
+                                  services, expected_attrs=expected_attrs)
 
     @classmethod
     def get_count(cls, context, filters=None):
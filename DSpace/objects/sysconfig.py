@@ -11,6 +11,8 @@ from DSpace import objects
 from DSpace.i18n import _
 from DSpace.objects import base
 from DSpace.objects import fields as s_fields
+from DSpace.utils.config_cache import CONFIG_CACHE
+from DSpace.utils.config_cache import cached
 
 
 @base.StorObjectRegistry.register
@@ -34,11 +36,13 @@ class SysConfig(base.StorPersistentObject, base.StorObject,
 
         db_sys_config = db.sys_config_create(self._context, updates)
         self._from_db_object(self._context, self, db_sys_config)
+        CONFIG_CACHE.bump()
 
     def save(self):
         updates = self.stor_obj_get_changes()
         if updates:
             db.sys_config_update(self._context, self.id, updates)
+            CONFIG_CACHE.bump()
 
         self.obj_reset_changes()
 
@@ -46,6 +50,7 @@ class SysConfig(base.StorPersistentObject, base.StorObject,
         updated_values = db.sys_config_destroy(self._context, self.id)
         self.update(updated_values)
         self.obj_reset_changes(updated_values.keys())
+        CONFIG_CACHE.bump()
 
     @classmethod
     def get_by_key(cls, context, key, cluster_id=None):
@@ -72,12 +77,12 @@ class SysConfigList(base.ObjectListBase, base.StorObject):
                                   sys_configs)
 
 
-def sys_config_get(ctxt, key, default=None):
+def _sys_config_load(ctxt, key):
     obj = SysConfig.get_by_key(ctxt, key, cluster_id=ctxt.cluster_id)
     if not obj:
         obj = SysConfig.get_by_key(ctxt, key, cluster_id=None)
     if not obj:
-        return default
+        return None
     if obj.value_type == s_fields.ConfigType.STRING:
         return obj.value
     elif obj.value_type == s_fields.ConfigType.INT:
@@ -90,6 +95,11 @@ def sys_config_get(ctxt, key, default=None):
         raise exception.Invalid(msg=_("Invalid config type"))
 
 
+def sys_config_get(ctxt, key, default=None):
+    return cached(ctxt, "sys_config", None, key,
+                  lambda: _sys_config_load(ctxt, key), default=default)
+
+
 def sys_config_set(ctxt, key, value, value_type=None):
     if not value_type:
         if isinstance(value, bool):
@@ -67,14 +67,14 @@ class TaskList(base.ObjectListBase, base.StorObject):
 
     @classmethod
     def get_all(cls, context, filters=None, marker=None, limit=None,
-                offset=None, sort_keys=None, sort_dirs=None):
+                offset=None, sort_keys=None, sort_dirs=None, cursor=None):
         tasks = db.task_get_all(
             context, filters, marker, limit, offset,
-            sort_keys, sort_dirs)
+            sort_keys, sort_dirs, cursor=cursor)
         return base.obj_make_list(context, cls(context), objects.Task,
                                   tasks)
 
     @classmethod
-    def get_count(cls, context, filters=None):
-        count = db.task_get_count(context, filters)
+    def get_count(cls, context, filters=None, approximate=False):
+        count = db.task_get_count(context, filters, approximate=approximate)
         return count
@@ -4,10 +4,12 @@ from .client import BaseClientManager
 from .client import RPCClient
 from .service import ServiceBase
 from .service import ServiceCell
+from .service import read_only
 
 __all__ = [
     "BaseClientManager",
     "RPCClient",
     "ServiceBase",
     "ServiceCell",
+    "read_only",
 ]
@@ -1,21 +1,53 @@
 from __future__ import print_function
 
-import json
 import logging
+import threading
+from concurrent import futures
 
 import grpc
+from tornado.concurrent import chain_future
 from tornado.gen import Future
 from tornado.ioloop import IOLoop
 
 from DSpace import exception
 from DSpace import objects
+from DSpace.common.config import CONF
 from DSpace.grpc import stor_pb2
 from DSpace.grpc import stor_pb2_grpc
 from DSpace.objects import base as objects_base
 from DSpace.service.serializer import RequestContextSerializer
+from DSpace.utils.coalesce import Coalescer
+from DSpace.utils.coalesce import coalesce_key
 
 logger = logging.getLogger(__name__)
 
+_channels = {}
+_channels_lock = threading.Lock()
+_decoder = None
+
+
+def get_channel(endpoint):
+    """Channels are shared by all clients of an endpoint
+
+    A grpc channel multiplexes concurrent calls and reconnects by itself,
+    one channel per endpoint is enough for the whole process.
+    """
+    with _channels_lock:
+        channel = _channels.get(endpoint)
+        if channel is None:
+            logger.debug("Try connect: %s", endpoint)
+            channel = grpc.insecure_channel(endpoint)
+            _channels[endpoint] = channel
+        return channel
+
+
+def _get_decoder():
+    global _decoder
+    if _decoder is None:
+        _decoder = futures.ThreadPoolExecutor(
+            max_workers=CONF.rpc_decode_workers)
+    return _decoder
+
 
 class BaseClientManager:
     """Client Manager
@@ -94,8 +126,7 @@ class RPCClient(object):
         self.endpoint = endpoint
 
     def get_stub(self, endpoint):
-        logger.debug("Try connect: %s", endpoint)
-        channel = grpc.insecure_channel(endpoint)
+        channel = get_channel(endpoint)
         stub = stor_pb2_grpc.RPCServerStub(channel)
         return stub
 
@@ -104,6 +135,9 @@ class RPCClient(object):
             return self.call(ctxt, name, *args, **kwargs)
         return _wapper
 
+    def coalesced(self):
+        return CoalescedClient(self)
+
     def call(self, context, method, *args, **kwargs):
         logger.info("endpoint(%s) method(%s) args(%s) kwargs(%s)",
                     self.endpoint, method, args, kwargs)
@@ -120,45 +154,71 @@ class RPCClient(object):
             if self._stub is None:
                 self._stub = self.get_stub(self.endpoint)
             response = self._stub.call(stor_pb2.Request(
-                context=json.dumps(_context),
+                context=objects.Json.dumps(_context),
                 method=method,
-                args=json.dumps(_args),
-                kwargs=json.dumps(_kwargs),
+                args=objects.Json.dumps(_args),
+                kwargs=objects.Json.dumps(_kwargs),
                 version="v1.0"
             ))
         except grpc.RpcError as e:
             logger.warning("rpc connect error: %s", e)
             self._stub = None
             raise exception.RPCConnectError()
-        res = json.loads(response.value)
+        redirect, ret = self._decode(context, response.value)
+        if redirect:
+            logger.info("Redirect to %s", redirect)
+            self._stub = self.get_stub(redirect)
+            return self._sync_call(context, method, *args, **kwargs)
+        return ret
+
+    def _decode(self, context, value):
+        """Decode a response
+
+        :return: (redirect endpoint, None) or (None, result)
+        :raise: exception of the remote call
+        """
+        res = objects.Json.loads(value)
         # check redirect
         if isinstance(res, dict) and res.get('__type__') == "Redirect":
-            logger.info("Redirect to %s", res['endpoint'])
-            self._stub = self.get_stub(res['endpoint'])
-            return self._sync_call(context, method, *args, **kwargs)
+            return res['endpoint'], None
         self.serializer.deserialize_exception(context, res)
         ret = self.serializer.deserialize_entity(
             context, res)
-        return ret
+        return None, ret
 
     def _fwrap(self, future, gf, context, method, *args, **kwargs):
         try:
-            response = gf.result()
-            res = json.loads(response.value)
-            # check redirect
-            if isinstance(res, dict) and res.get('__type__') == "Redirect":
-                logger.info("Redirect to %s", res['endpoint'])
-                self._stub = self.get_stub(res['endpoint'])
-                _f = self._async_call(context, method, *args, **kwargs)
-                _f.add_done_callback(lambda f: future.set_result(f.result()))
-            else:
-                self.serializer.deserialize_exception(context, res)
-                ret = self.serializer.deserialize_entity(
-                    context, res)
-                future.set_result(ret)
+            value = gf.result().value
         except Exception as e:
             self._stub = None
             future.set_exception(e)
+            return
+        if len(value) < CONF.rpc_decode_offload_size:
+            self._fset(future, lambda: self._decode(context, value),
+                       context, method, *args, **kwargs)
+            return
+        # decode large responses (e.g. all osds of a cluster) in a thread,
+        # the ioloop keeps serving other requests meanwhile
+        ioloop = IOLoop.current()
+        df = ioloop.run_in_executor(_get_decoder(), self._decode,
+                                    context, value)
+        ioloop.add_future(
+            df, lambda df: self._fset(future, df.result, context, method,
+                                      *args, **kwargs))
+
+    def _fset(self, future, decode, context, method, *args, **kwargs):
+        try:
+            redirect, ret = decode()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        if redirect:
+            logger.info("Redirect to %s", redirect)
+            self._stub = self.get_stub(redirect)
+            _f = self._async_call(context, method, *args, **kwargs)
+            chain_future(_f, future)
+        else:
+            future.set_result(ret)
 
     def _async_call(self, context, method, *args, **kwargs):
         try:
@@ -168,10 +228,10 @@ class RPCClient(object):
             if self._stub is None:
                 self._stub = self.get_stub(self.endpoint)
             gf = self._stub.call.future(stor_pb2.Request(
-                context=json.dumps(_context),
+                context=objects.Json.dumps(_context),
                 method=method,
-                args=json.dumps(_args),
-                kwargs=json.dumps(_kwargs),
+                args=objects.Json.dumps(_args),
+                kwargs=objects.Json.dumps(_kwargs),
                 version="v1.0"
             ))
         except grpc.RpcError as e:
@@ -187,3 +247,24 @@ class RPCClient(object):
                 self._fwrap, f, gf, context, method, *args, **kwargs)
         )
         return f
+
+
+class CoalescedClient(object):
+    """Identical concurrent calls share one in-flight rpc call
+
+    For read calls of an async client only. Callers of the same call get
+    the same result object, it must not be modified.
+    """
+    _coalescer = Coalescer()
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        def _wapper(ctxt, *args, **kwargs):
+            key = coalesce_key(self._client.endpoint, name, ctxt.cluster_id,
+                               ctxt.user_id, ctxt.is_admin,
+                               ctxt.read_deleted, args, kwargs)
+            return self._coalescer.call(key, self._client.call, ctxt, name,
+                                        *args, **kwargs)
+        return _wapper
@@ -1,6 +1,6 @@
-import json
 import logging
 import os
+import threading
 import time
 from concurrent import futures
 from enum import Enum
@@ -18,6 +18,7 @@ from DSpace.grpc import stor_pb2_grpc
 from DSpace.objects import base as objects_base
 from DSpace.service.serializer import RequestContextSerializer
 from DSpace.utils import retry
+from DSpace.utils.profile import StartupProfile
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,12 @@ class Role(Enum):
     Backup = 2
 
 
+def read_only(func):
+    """Decorator, rpc method may be served by a hot standby DSM"""
+    func.read_only = True
+    return func
+
+
 class Dispatcher(stor_pb2_grpc.RPCServerServicer):
     def __init__(self, service, handler, *args, **kwargs):
         super(Dispatcher, self).__init__(*args, **kwargs)
@@ -54,35 +61,40 @@ class Dispatcher(stor_pb2_grpc.RPCServerServicer):
                          request.version,
                      ))
         method = request.method
-        ctxt = self.serializer.deserialize_context(json.loads(request.context))
+        ctxt = self.serializer.deserialize_context(
+            objects.Json.loads(request.context))
         args = self.serializer.deserialize_entity(
-            ctxt, json.loads(request.args))
+            ctxt, objects.Json.loads(request.args))
         kwargs = self.serializer.deserialize_entity(
-            ctxt, json.loads(request.kwargs))
+            ctxt, objects.Json.loads(request.kwargs))
+        func = getattr(self.handler, method, None)
         # check is master
-        if self.service.role != Role.Master:
+        if not self.service.serve_locally(func):
             logger.info("Redirect rpc to: %s", self.service.master_endpoint)
             res = stor_pb2.Response(
-                value=json.dumps(self.serializer.serialize_entity(ctxt, {
-                    "__type__": "Redirect",
-                    "endpoint": self.service.master_endpoint
-                }))
+                value=objects.Json.dumps(self.serializer.serialize_entity(
+                    ctxt, {
+                        "__type__": "Redirect",
+                        "endpoint": self.service.master_endpoint
+                    }))
             )
             return res
         # check method exists
-        if not hasattr(self.handler, method):
+        if func is None:
             raise exception.NoSuchMethod(method=method)
         # run method
-        func = getattr(self.handler, method)
+        priority = getattr(func, 'priority', None)
         try:
-            ret = func(ctxt, *args, **kwargs)
-            logger.debug("%s ret: %s" % (
-                func.__name__,
-                json.dumps(
-                    self.serializer.serialize_entity(ctxt, ret))))
-            res = stor_pb2.Response(
-                value=json.dumps(self.serializer.serialize_entity(ctxt, ret))
-            )
+            if priority and hasattr(self.handler, 'task_run'):
+                # rpc thread waits, the work is queued by its priority
+                ret = self.handler.task_run(priority, func, ctxt,
+                                            *args, **kwargs)
+            else:
+                ret = func(ctxt, *args, **kwargs)
+            value = objects.Json.dumps(
+                self.serializer.serialize_entity(ctxt, ret))
+            logger.debug("%s ret: %s", func.__name__, value)
+            res = stor_pb2.Response(value=value)
         except Exception as e:
             code = getattr(e, 'code', 500)
             if isinstance(e, exception.StorException) and code < 500:
@@ -95,7 +107,8 @@ class Dispatcher(stor_pb2_grpc.RPCServerServicer):
                 if self.debug_mode:
                     os._exit(1)
             res = stor_pb2.Response(
-                value=json.dumps(self.serializer.serialize_exception(ctxt, e))
+                value=objects.Json.dumps(
+                    self.serializer.serialize_exception(ctxt, e))
             )
         return res
 
@@ -113,6 +126,9 @@ class ServiceBase(object):
         logger.info("RPC endpoint: %s", self.endpoint)
         self._executor = self.init_threadpool()
 
+    def serve_locally(self, func):
+        return self.role == Role.Master
+
     def init_threadpool(self):
         return futures.ThreadPoolExecutor(
             max_workers=CONF.task_workers)
@@ -139,11 +155,42 @@ class ServiceBase(object):
 class ServiceCell(ServiceBase):
     master_endpoint = None
     etcd_master_key = "/dspace/dsm_master"
+    # state of the handler is loaded by warm_up, only with dsm_hot_standby
+    standby_ready = False
 
     def __init__(self, *args, **kwargs):
         super(ServiceCell, self).__init__(*args, **kwargs)
         self.role = Role.Backup
         self.etcd = self.init_etcd()
+        self._standby_lock = threading.Lock()
+
+    def serve_locally(self, func):
+        if self.role == Role.Master:
+            return True
+        # read-only calls of a warm standby
+        return self.standby_ready and getattr(func, 'read_only', False)
+
+    def warm_up(self):
+        with self._standby_lock:
+            if self.role == Role.Master:
+                return
+            try:
+                self.handler.warm_up()
+            except Exception:
+                # redirect again instead of serving stale state
+                self.standby_ready = False
+                raise
+            self.standby_ready = True
+
+    def standby(self):
+        """Refresh the state of the handler while it is a backup"""
+        logger.info("Start hot standby")
+        while self.role != Role.Master:
+            try:
+                self.warm_up()
+            except Exception as e:
+                logger.warning("hot standby refresh error: %s", e)
+            time.sleep(CONF.dsm_standby_refresh_interval)
 
     def _wapper(self, fun, *args, **kwargs):
         try:
@@ -217,13 +264,19 @@ class ServiceCell(ServiceBase):
         self.task_submit(self.show_master)
         # watch master
         self.task_submit(self.watch_master)
+        if CONF.dsm_hot_standby:
+            self.task_submit(self.standby)
         super(ServiceCell, self).start()
 
     def to_master(self):
         logger.info("I am to master")
-        self.role = Role.Master
         try:
-            self.handler.bootstrap()
+            # wait for the refresh of the standby
+            with self._standby_lock:
+                self.role = Role.Master
+            profile = StartupProfile()
+            profile.call(self.handler, "bootstrap")
+            logger.info("Handler bootstrap profile:\n%s", profile.report())
         except Exception as e:
             logger.exception("bootstrap error: %s", e)
             os._exit(1)
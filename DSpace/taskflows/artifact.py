@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from concurrent import futures
+
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.objects.fields import ConfigKey
+from DSpace.tools.artifact import Artifact as ArtifactTool
+from DSpace.tools.docker import Docker as DockerTool
+
+logger = logging.getLogger(__name__)
+
+# ip address of a node -> _Copy of an ImageDistributor
+_copies = {}
+_copies_lock = threading.Lock()
+
+
+class _Copy(object):
+    def __init__(self):
+        # set when the copy is done or given up
+        self.event = threading.Event()
+        # sha256 of the copy, None if it failed
+        self.digest = None
+
+
+def wait_image(node):
+    """Wait for the image copy of an ImageDistributor to the node, if any
+
+    :return: sha256 of the tarball copied to the node, None if there is no
+             copy, it failed or it is not done in time
+    """
+    with _copies_lock:
+        copy = _copies.get(str(node.ip_address))
+    if not copy:
+        return None
+    if not copy.event.wait(CONF.artifact_copy_timeout):
+        logger.warning("image copy to node %s timeout, fetch it from the "
+                       "repo", node.hostname)
+        return None
+    return copy.digest
+
+
+class ImageDistributor(object):
+    """Distribute the dspace image tarball to nodes before installation
+
+    Nodes with the image loaded already are skipped. At most
+    CONF.artifact_seed_nodes nodes fetch the tarball from the repo, every
+    node having it then serves it to at most CONF.artifact_peer_fanout
+    peers at the same time, a node starts serving as soon as its own copy
+    is done. Every copy is verified against the sha256 of the first
+    download.
+
+    Installations of the nodes run meanwhile, wait_image(node) waits for
+    the copy of the node only and returns the sha256 to verify it.
+    """
+
+    def __init__(self, ctxt, nodes, get_executor):
+        """:param get_executor: function of a node, returns an ssh executor
+        of it, closed by the distributor
+        """
+        self.ctxt = ctxt
+        self.nodes = nodes
+        self.get_executor = get_executor
+        self.digest = None
+        self._executors = {}
+        self._copies = {}
+        image_namespace = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.IMAGE_NAMESPACE)
+        dspace_version = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.DSPACE_VERSION)
+        self.image = "{}/dspace:{}".format(image_namespace, dspace_version)
+        self.image_name = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.IMAGE_NAME)
+        dspace_repo = objects.sysconfig.sys_config_get(
+            ctxt, ConfigKey.DSPACE_REPO)
+        self.repo_url = '{}/images/{}'.format(dspace_repo, self.image_name)
+
+    def enabled(self):
+        docker_registry = objects.sysconfig.sys_config_get(
+            self.ctxt, ConfigKey.DOCKER_REGISTRY)
+        docker_image_ignore = objects.sysconfig.sys_config_get(
+            self.ctxt, ConfigKey.DOCKER_IMAGE_IGNORE)
+        return not (docker_registry or docker_image_ignore)
+
+    def register(self):
+        """Make wait_image of the nodes wait, call it before installing"""
+        if self._copies or not self.enabled():
+            return
+        with _copies_lock:
+            for node in self.nodes:
+                copy = _Copy()
+                self._copies[id(node)] = copy
+                _copies[str(node.ip_address)] = copy
+
+    def _done(self, node, digest=None):
+        copy = self._copies.get(id(node))
+        if not copy or copy.event.is_set():
+            return
+        copy.digest = digest
+        copy.event.set()
+        with _copies_lock:
+            if _copies.get(str(node.ip_address)) is copy:
+                _copies.pop(str(node.ip_address))
+
+    def _executor(self, node):
+        if id(node) not in self._executors:
+            self._executors[id(node)] = self.get_executor(node)
+        return self._executors[id(node)]
+
+    def _map(self, fun, items, workers):
+        """fun(item) of all items concurrently, [(item, result, error)]"""
+        if not items:
+            return []
+        res = []
+        workers = max(min(workers, len(items)), 1)
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            fs = [(item, executor.submit(fun, item)) for item in items]
+            for item, future in fs:
+                try:
+                    res.append((item, future.result(), None))
+                except Exception as e:
+                    res.append((item, None, e))
+        return res
+
+    def _need_image(self, node):
+        return not DockerTool(self._executor(node)).image_exists(self.image)
+
+    def _fetch(self, node, url):
+        # the tarball is in place only if it matches the first download
+        return ArtifactTool(self._executor(node)).fetch(
+            self.image_name, url, digest=self.digest)
+
+    def _fetch_from_peer(self, node, peer):
+        url = "http://{}:{}/{}".format(peer.ip_address,
+                                       CONF.artifact_peer_port,
+                                       self.image_name)
+        try:
+            return self._fetch(node, url)
+        except Exception as e:
+            logger.warning("node %s fetch image from %s failed, fetch from "
+                           "repo: %s", node.hostname, peer.hostname, e)
+            return self._fetch(node, self.repo_url)
+
+    def _serve(self, source, serving):
+        """Start serving on the source, False if it can not"""
+        try:
+            ArtifactTool(self._executor(source)).serve_start(
+                str(source.ip_address), CONF.artifact_peer_port)
+        except Exception as e:
+            logger.warning("start artifact server on %s error: %s",
+                           source.hostname, e)
+            return False
+        serving.append(source)
+        return True
+
+    def _copy(self, first, pending, serving):
+        """Copy to the pending nodes, a copy starts when a source is free
+
+        :return: nodes having a copy
+        """
+        copied = []
+        # [node, free slots], None is the repo
+        sources = [[None, CONF.artifact_seed_nodes - 1],
+                   [first, CONF.artifact_peer_fanout]]
+        running = {}
+        with futures.ThreadPoolExecutor(
+                max_workers=max(len(pending), 1)) as executor:
+            while True:
+                for source in sources:
+                    while pending and source[1] > 0:
+                        if source[0] is None:
+                            future = executor.submit(
+                                self._fetch, pending[0], self.repo_url)
+                        elif (not any(source[0] is s for s in serving) and
+                                not self._serve(source[0], serving)):
+                            source[1] = 0
+                            break
+                        else:
+                            future = executor.submit(
+                                self._fetch_from_peer, pending[0],
+                                source[0])
+                        source[1] -= 1
+                        running[future] = (pending.pop(0), source)
+                if not running:
+                    # nothing to fetch from, the rest fetch by themselves
+                    return copied
+                done, _ = futures.wait(
+                    running, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    node, source = running.pop(future)
+                    if source[0] is not None:
+                        # the repo is read by seeds only
+                        source[1] += 1
+                    try:
+                        digest = future.result()
+                    except Exception as e:
+                        logger.warning("copy image to node %s error: %s",
+                                       node.hostname, e)
+                        self._done(node)
+                    else:
+                        copied.append(node)
+                        sources.append([node, CONF.artifact_peer_fanout])
+                        self._done(node, digest)
+
+    def distribute(self):
+        """Put the image tarball on all nodes without the image
+
+        :return: nodes which have the tarball at ArtifactTool.path
+        """
+        self.register()
+        if not self._copies:
+            return []
+        serving = []
+        try:
+            results = self._map(self._need_image, self.nodes,
+                                CONF.probe_workers)
+            pending = []
+            for node, need, e in results:
+                if need or e:
+                    pending.append(node)
+                else:
+                    self._done(node)
+            if not pending:
+                return []
+            logger.info("distribute image %s to nodes: %s", self.image,
+                        [node.hostname for node in pending])
+            # the first one decides the checksum
+            first = pending.pop(0)
+            self.digest = self._fetch(first, self.repo_url)
+            self._done(first, self.digest)
+            copied = self._copy(first, pending, serving)
+            return [first] + copied
+        finally:
+            for source in serving:
+                try:
+                    ArtifactTool(self._executor(source)).serve_stop()
+                except Exception as e:
+                    logger.warning("stop artifact server on %s error: %s",
+                                   source.hostname, e)
+            # nodes without a copy fetch from the repo by themselves
+            for node in self.nodes:
+                self._done(node)
+            for executor in self._executors.values():
+                executor.close()
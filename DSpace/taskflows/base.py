@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import contextlib
 import logging
 import sys
+import threading
 import time
 from concurrent import futures
 
@@ -24,6 +26,29 @@ from DSpace.utils.coordination import COORDINATOR
 
 logger = logging.getLogger(__name__)
 
+_stage_limits = {}
+_stage_limits_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def stage_limit(stage):
+    """Bound concurrent nodes in a stage of node installation
+
+    Node flows run in parallel, limits of CONF.install_stage_limits make
+    them a pipeline: a node waits for a free slot of the stage while
+    others are busy in other stages. Stages without a limit are unbounded.
+    """
+    limit = int(CONF.install_stage_limits.get(stage) or 0)
+    if not limit:
+        yield
+        return
+    with _stage_limits_lock:
+        if stage not in _stage_limits:
+            _stage_limits[stage] = threading.BoundedSemaphore(limit)
+        sem = _stage_limits[stage]
+    with sem:
+        yield
+
 
 # TODO: Common Registry
 class TaskflowRegistry(object):
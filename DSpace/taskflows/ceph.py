@@ -16,6 +16,7 @@ from DSpace.objects.fields import ConfigKey
 from DSpace.objects.fields import FaultDomain
 from DSpace.objects.fields import PoolRole
 from DSpace.objects.fields import PoolType
+from DSpace.taskflows.crush import CrushPlanner
 from DSpace.tools.base import Executor
 from DSpace.tools.ceph import EC_POOL_RELATION_RE_POOL as ECP
 from DSpace.tools.ceph import RADOSClient
@@ -411,241 +412,34 @@ class CephTask(object):
         with RADOSClient(self.rados_args(), CONF.rados_timeout) as client:
             self._crush_rule_delete(client, crush_content)
 
-    def _crush_rule_update(self, client, crush_content):
-        logger.info("crush rule useless delete: %s", json.dumps(crush_content))
-        fault_domain = crush_content.get('fault_domain')
-        root_name = crush_content.get('root_name')
-        datacenters = crush_content.get('datacenters')
-        racks = crush_content.get('racks')
-        hosts = crush_content.get('hosts')
-        osds = crush_content.get('osds')
-
-        def _add_dc_to_root():
-            # create datacenter and move to root
-            logger.info("start add datacenter to root")
-            bucket_dcs = client.bucket_get(root_name)
-            logger.debug("get datacenters from crush: %s", bucket_dcs)
-            for name, dc in six.iteritems(datacenters):
-                if dc['crush_name'] not in bucket_dcs:
-                    client.datacenter_add(dc['crush_name'])
-                    client.datacenter_move_to_root(
-                        dc['crush_name'], root_name)
-            # move rack to dc
-            _move_rack_to_dc()
-
-        def _move_rack_to_dc():
-            logger.info("start move rack")
-            for name, dc in six.iteritems(datacenters):
-                dc_racks = [racks.get(rack_id)
-                            for rack_id in dc['racks']]
-                # get racks from ceph
-                bucket_racks = client.bucket_get(dc['crush_name'])
-                logger.debug("get rack from crush(%s): %s",
-                             dc['crush_name'], bucket_racks)
-                for rack in dc_racks:
-                    if rack['crush_name'] in bucket_racks:
-                        continue
-                    client.rack_add(rack['crush_name'])
-                    client.rack_move_to_datacenter(
-                        rack['crush_name'], dc['crush_name'])
-
-        def _add_rack_to_root():
-            logger.info("start add rack to root")
-            bucket_racks = client.bucket_get(root_name)
-            logger.debug("get rack from crush(%s): %s",
-                         root_name, bucket_racks)
-            for name, rack in six.iteritems(crush_content.get('racks')):
-                if rack['crush_name'] not in bucket_racks:
-                    client.rack_add(rack['crush_name'])
-                    client.rack_move_to_root(
-                        rack['crush_name'], root_name)
-            _move_host_to_rack()
-
-        def _move_host_to_rack():
-            logger.info("start update host crush resource")
-            for name, rack in six.iteritems(racks):
-                rack_hosts = [hosts.get(name)
-                              for name in rack['hosts']]
-                # get host from ceph
-                bucket_hosts = client.bucket_get(rack['crush_name'])
-                logger.debug("get host from crush(%s): %s",
-                             rack['crush_name'], bucket_hosts)
-                for host in rack_hosts:
-                    if host['crush_name'] in bucket_hosts:
-                        continue
-                    client.host_add(host['crush_name'])
-                    client.host_move_to_rack(
-                        host['crush_name'], rack['crush_name'])
-
-        def _add_host_to_root():
-            bucket_hosts = client.bucket_get(root_name)
-            logger.debug("get host from crush(%s): %s",
-                         root_name, bucket_hosts)
-            for name, host in six.iteritems(crush_content.get('hosts')):
-                if host['crush_name'] not in bucket_hosts:
-                    client.host_add(host['crush_name'])
-                    client.rack_move_to_root(
-                        host['crush_name'], root_name)
-            _move_osd_to_host()
-
-        def _move_osd_to_host():
-            # add osd
-            logger.info("start update osd crush resource")
-            for name, host in six.iteritems(hosts):
-                host_osds = [osds.get(osd_name) for osd_name in host['osds']]
-                # get host from ceph
-                bucket_osds = client.bucket_get(host['crush_name'])
-                logger.debug("get osd from crush(%s): %s, adjust to osd: %s",
-                             host['crush_name'], bucket_osds, host_osds)
-                for osd in host_osds:
-                    if osd['name'] in bucket_osds:
-                        continue
-                    client.osd_add(osd['id'], osd['size'],
-                                   host['crush_name'])
-
-        if fault_domain == FaultDomain.DATACENTER:
-            _add_dc_to_root()
-            _move_host_to_rack()
-            _move_osd_to_host()
-
-        # move rack to root
-        if fault_domain == FaultDomain.RACK:
-            _add_rack_to_root()
-            _move_osd_to_host()
-
-        # move host to root
-        if fault_domain in [FaultDomain.HOST, FaultDomain.OSD]:
-            _add_host_to_root()
-
-        self._crush_useless_delete(client, crush_content)
-
-    def _crush_useless_delete(self, client, crush_content):
+    @synchronized("crushmap_modify")
+    def _crush_rule_update(self, client, crush_content, dry_run=False):
+        """Reconcile the crush tree of crush_content in one crushmap set
+
+        The crushmap is read once, the tree under the root is rebuilt in
+        memory by CrushPlanner and set back, so all changes land in a
+        single osdmap epoch instead of one epoch per mon command.
+        :return: list of changes, nothing is set if dry_run
+        """
         logger.info("crush rule update: %s", json.dumps(crush_content))
-        fault_domain = crush_content.get('fault_domain')
-        root_name = crush_content.get('root_name')
-        datacenters = crush_content.get('datacenters')
-        racks = crush_content.get('racks')
-        hosts = crush_content.get('hosts')
-        osds = crush_content.get('osds')
-        crush_dcs = []
-        crush_racks = []
-        crush_hosts = []
-        useless_dcs = []
-        useless_racks = []
-        useless_hosts = []
-        useless_osds = []
-
-        def _check_dc_by_root():
-            # check useless datacenters
-            bucket_dcs = client.bucket_get(root_name)
-            crush_dcs.extend(bucket_dcs)
-            for name, dc in six.iteritems(datacenters):
-                if dc['crush_name'] in bucket_dcs:
-                    bucket_dcs.remove(dc['crush_name'])
-            useless_dcs.extend(bucket_dcs)
-
-        def _check_rack_by_dc():
-            logger.info("start check rack")
-            bucket_racks = []
-            for name in crush_dcs:
-                # get racks from ceph
-                _bucket_racks = client.bucket_get(name)
-                logger.debug("get rack from crush(%s): %s",
-                             name, bucket_racks)
-                bucket_racks.extend(_bucket_racks)
-            crush_racks.extend(bucket_racks)
-            for name, rack in six.iteritems(racks):
-                if rack['crush_name'] in bucket_racks:
-                    bucket_racks.remove(rack['crush_name'])
-            # add useless rack to bucket_racks
-            if bucket_racks:
-                useless_racks.extend(bucket_racks)
-
-        def _check_rack_by_root():
-            # check useless racks
-            bucket_racks = client.bucket_get(root_name)
-            crush_racks.extend(bucket_racks)
-            for name, rack in six.iteritems(racks):
-                if rack['crush_name'] in bucket_racks:
-                    bucket_racks.remove(rack['crush_name'])
-            useless_racks.extend(bucket_racks)
-
-        def _check_host_by_rack():
-            logger.info("start check host crush resource")
-            bucket_hosts = []
-            for name in crush_racks:
-                # get host from ceph
-                _bucket_hosts = client.bucket_get(name)
-                logger.debug("get host from crush(%s): %s",
-                             name, _bucket_hosts)
-                bucket_hosts.extend(_bucket_hosts)
-            crush_hosts.extend(bucket_hosts)
-            for name, host in six.iteritems(hosts):
-                if host['crush_name'] in bucket_hosts:
-                    bucket_hosts.remove(host['crush_name'])
-            # add useless host to bucket_hosts
-            if bucket_hosts:
-                useless_hosts.extend(bucket_hosts)
-
-        def _check_host_by_root():
-            # check useless hosts
-            bucket_hosts = client.bucket_get(root_name)
-            crush_hosts.extend(bucket_hosts)
-            for name, host in six.iteritems(hosts):
-                if host['crush_name'] in bucket_hosts:
-                    bucket_hosts.remove(host['crush_name'])
-            useless_hosts.extend(bucket_hosts)
-
-        def _check_osd_by_host():
-            # add osd
-            logger.info("start update osd crush resource")
-            bucket_osds = []
-            for name in crush_hosts:
-                # get host from ceph
-                _bucket_osds = client.bucket_get(name)
-                logger.debug("get osd from crush(%s): %s",
-                             name, _bucket_osds)
-                bucket_osds.extend(_bucket_osds)
-            for name, osd in six.iteritems(osds):
-                if osd['name'] in bucket_osds:
-                    bucket_osds.remove(osd['name'])
-                    continue
-            # add useless host to bucket_hosts
-            if bucket_osds:
-                useless_osds.extend(bucket_osds)
-
-        if fault_domain == FaultDomain.DATACENTER:
-            _check_dc_by_root()
-            _check_rack_by_dc()
-            _check_host_by_rack()
-            _check_osd_by_host()
-
-        # move rack to root
-        if fault_domain == FaultDomain.RACK:
-            _check_rack_by_root()
-            _check_host_by_rack()
-            _check_osd_by_host()
-
-        # move host to root
-        if fault_domain in [FaultDomain.HOST, FaultDomain.OSD]:
-            _check_host_by_root()
-            _check_osd_by_host()
-
-        # clean useless resource
-        logger.info("start clean crush resource")
-        logger.debug("remove osd resource: %s", useless_osds)
-        for osd in useless_osds:
-            client.bucket_remove(osd)
-        logger.debug("remove host resource: %s", useless_hosts)
-        for host in useless_hosts:
-            client.bucket_remove(host)
-        logger.debug("remove rack resource: %s", useless_racks)
-        for rack in useless_racks:
-            client.bucket_remove(rack)
-        logger.debug("remove datacenter resource: %s", useless_dcs)
-        for dc in useless_dcs:
-            client.bucket_remove(dc)
+        crushmap = client.get_crushmap()
+        planner = CrushPlanner(crushmap, crush_content)
+        changes = planner.plan()
+        logger.info("crush changes%s: %s", " (dry run)" if dry_run else "",
+                    json.dumps(changes))
+        if not changes or dry_run:
+            return changes
+        buckets = self._calculate_weight(planner.buckets_by_id())
+        crushmap["buckets"] = list(six.itervalues(buckets))
+        client.set_crushmap(crushmap)
         logger.info("crush update success")
+        return changes
+
+    def crush_plan(self, crush_content):
+        """Changes of crush_content to the current crushmap, not applied"""
+        with RADOSClient(self.rados_args(), CONF.rados_timeout) as client:
+            return self._crush_rule_update(client, crush_content,
+                                           dry_run=True)
 
     def pool_add_disk(self, pool, crush_content):
         logger.info("crush_content: %s", crush_content)
@@ -913,6 +707,14 @@ class CephTask(object):
         with RADOSClient(self.rados_args()) as client:
             return client.osd_new(osd_fsid)
 
+    def osds_new(self, osd_fsids):
+        """Alloc ids of osds with one connection
+
+        :return: {osd_fsid: osd_id}
+        """
+        with RADOSClient(self.rados_args()) as client:
+            return {fsid: client.osd_new(fsid) for fsid in osd_fsids}
+
     def osd_remove_from_cluster(self, osd_name):
         with RADOSClient(self.rados_args()) as client:
             client.osd_down(osd_name)
@@ -7,6 +7,7 @@ import six
 
 from DSpace import exception
 from DSpace import objects
+from DSpace.objects.fields import FaultDomain
 
 logger = logging.getLogger(__name__)
 
@@ -271,3 +272,222 @@ class CrushContentGen(object):
         self._fix_datacenter_name(exists_content)
         logger.info("output content: %s", json.dumps(content))
         return self.content
+
+
+class CrushPlanner(object):
+    """Compute the crushmap of a crush content in memory
+
+    The tree under root_name is rebuilt from the content: missing buckets
+    and osds are added, buckets and osds of the tree which are not in the
+    content any more are removed. Buckets with changed items get weight 0,
+    callers recompute them and set the whole map at once.
+    """
+
+    def __init__(self, crushmap, content):
+        self.crushmap = crushmap
+        self.content = content
+        self.buckets = {}
+        self.changes = []
+        self._touched = set()
+        for bucket in crushmap["buckets"]:
+            self.buckets[bucket["name"]] = bucket
+        self._devices = {int(d["id"]): d for d in crushmap["devices"]}
+        self._types = {t["name"]: t["type_id"] for t in crushmap["types"]}
+        self._osd_weights = {}
+        for bucket in self._real_buckets():
+            for item in bucket["items"]:
+                if item["id"] >= 0:
+                    self._osd_weights[item["id"]] = item["weight"]
+
+    def _real_buckets(self):
+        # buckets end with ~hdd or ~ssd are shadow trees of device classes
+        return [b for b in six.itervalues(self.buckets)
+                if "~" not in b["name"]]
+
+    def _change(self, op, item_type, name, parent=None):
+        change = {"op": op, "type": item_type, "name": name}
+        if parent:
+            change["parent"] = parent
+        self.changes.append(change)
+
+    def _desired_tree(self):
+        """Return {bucket name: (type, [child bucket names or osd ids])}"""
+        content = self.content
+        fault_domain = content['fault_domain']
+        datacenters = content['datacenters']
+        racks = content['racks']
+        hosts = content['hosts']
+        osds = content['osds']
+        tree = {}
+
+        def _host(host):
+            tree[host['crush_name']] = ("host", [
+                osds[name] for name in host['osds']])
+            return host['crush_name']
+
+        def _rack(rack):
+            tree[rack['crush_name']] = ("rack", [
+                _host(hosts[name]) for name in rack['hosts']])
+            return rack['crush_name']
+
+        def _datacenter(dc):
+            tree[dc['crush_name']] = ("datacenter", [
+                _rack(racks[name]) for name in dc['racks']])
+            return dc['crush_name']
+
+        if fault_domain == FaultDomain.DATACENTER:
+            children = [_datacenter(dc) for dc in six.itervalues(datacenters)]
+        elif fault_domain == FaultDomain.RACK:
+            children = [_rack(rack) for rack in six.itervalues(racks)]
+        else:
+            children = [_host(host) for host in six.itervalues(hosts)]
+        tree[content['root_name']] = ("root", children)
+        return tree
+
+    def _current_tree(self, root_name):
+        """Names of buckets and ids of osds under root_name now"""
+        buckets = set()
+        osds = set()
+        names = {b["id"]: b["name"] for b in self._real_buckets()}
+        queue = [root_name]
+        while queue:
+            name = queue.pop(0)
+            bucket = self.buckets.get(name)
+            if not bucket or name in buckets:
+                continue
+            buckets.add(name)
+            for item in bucket["items"]:
+                if item["id"] >= 0:
+                    osds.add(item["id"])
+                elif item["id"] in names:
+                    queue.append(names[item["id"]])
+        return buckets, osds
+
+    def _new_bucket(self, bucket_type, name):
+        template = self.buckets.get(self.content['root_name']) or {}
+        bucket_id = min([b["id"] for b in six.itervalues(self.buckets)] +
+                        [0]) - 1
+        bucket = {
+            "id": bucket_id,
+            "name": name,
+            "type_id": self._types[bucket_type],
+            "type_name": bucket_type,
+            "weight": 0,
+            "alg": template.get("alg", "straw2"),
+            "hash": template.get("hash", "rjenkins1"),
+            "items": [],
+        }
+        self.buckets[name] = bucket
+        self.crushmap["buckets"].append(bucket)
+        self._change("add", bucket_type, name)
+        return bucket
+
+    def _remove_bucket(self, name):
+        self._change("remove", self.buckets[name]["type_name"], name)
+        # shadow buckets are generated again by crushtool
+        for bucket_name in list(self.buckets):
+            if bucket_name == name or bucket_name.startswith(name + "~"):
+                self.buckets.pop(bucket_name)
+        self.crushmap["buckets"] = list(six.itervalues(self.buckets))
+
+    def _unlink(self, item_ids, exclude):
+        """Remove items from every bucket except buckets in exclude"""
+        for bucket in self._real_buckets():
+            if bucket["name"] in exclude:
+                continue
+            items = [i for i in bucket["items"] if i["id"] not in item_ids]
+            if len(items) != len(bucket["items"]):
+                bucket["items"] = items
+                self._touched.add(bucket["name"])
+
+    def _osd_item(self, osd):
+        osd_id = int(osd["id"])
+        if osd_id not in self._devices:
+            device = {
+                "id": osd_id,
+                "name": "osd.{}".format(osd_id),
+                "class": osd["disk_type"],
+            }
+            self._devices[osd_id] = device
+            self.crushmap["devices"].append(device)
+        weight = self._osd_weights.get(osd_id)
+        if weight is None:
+            weight = int(65536 * float(osd['size']) / (2 ** 40))
+        return {"id": osd_id, "weight": weight}
+
+    def _set_items(self, name, items):
+        bucket = self.buckets[name]
+        old_ids = [i["id"] for i in bucket["items"]]
+        new_ids = [i["id"] for i in items]
+        if old_ids == new_ids:
+            return
+        for pos, item in enumerate(items):
+            item["pos"] = pos
+        bucket["items"] = items
+        self._touched.add(name)
+
+    def _reset_weights(self):
+        parents = {}
+        for bucket in self._real_buckets():
+            for item in bucket["items"]:
+                parents.setdefault(item["id"], []).append(bucket["name"])
+        # weights of changed buckets and all their ancestors are stale
+        queue = list(self._touched)
+        done = set()
+        while queue:
+            name = queue.pop(0)
+            bucket = self.buckets.get(name)
+            if not bucket or name in done:
+                continue
+            done.add(name)
+            bucket["weight"] = 0
+            queue.extend(parents.get(bucket["id"], []))
+
+    def plan(self):
+        """Update crushmap in memory, return the changes"""
+        root_name = self.content['root_name']
+        tree = self._desired_tree()
+        current_buckets, current_osds = self._current_tree(root_name)
+
+        for name, (bucket_type, children) in six.iteritems(tree):
+            if name not in self.buckets:
+                self._new_bucket(bucket_type, name)
+        desired_osds = set()
+        desired_children = set()
+        for name, (bucket_type, children) in six.iteritems(tree):
+            items = []
+            for child in children:
+                if isinstance(child, dict):
+                    item = self._osd_item(child)
+                    desired_osds.add(item["id"])
+                    if item["id"] not in current_osds:
+                        self._change("add", "osd", child["name"], name)
+                else:
+                    item = {"id": self.buckets[child]["id"], "weight": 0}
+                    desired_children.add(item["id"])
+                    old = [i for i in self.buckets[name]["items"]
+                           if i["id"] == item["id"]]
+                    if old:
+                        item["weight"] = old[0]["weight"]
+                    else:
+                        self._change("move",
+                                     self.buckets[child]["type_name"],
+                                     child, name)
+                items.append(item)
+            self._set_items(name, items)
+
+        # a bucket or osd is only linked to its parent of the tree
+        self._unlink(desired_children | desired_osds, exclude=set(tree))
+        for osd_id in current_osds - desired_osds:
+            self._change("remove", "osd", "osd.{}".format(osd_id))
+            self._unlink({osd_id}, exclude=set())
+        useless = current_buckets - set(tree)
+        useless_ids = {self.buckets[name]["id"] for name in useless}
+        self._unlink(useless_ids, exclude=useless)
+        for name in useless:
+            self._remove_bucket(name)
+        self._reset_weights()
+        return self.changes
+
+    def buckets_by_id(self):
+        return {b["id"]: b for b in six.itervalues(self.buckets)}
@@ -3,6 +3,7 @@
 
 import re
 import sys
+from concurrent import futures
 
 import six
 import taskflow
@@ -21,6 +22,7 @@ from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
 from DSpace.objects import utils as obj_utils
 from DSpace.objects.fields import ConfigKey
+from DSpace.taskflows.artifact import ImageDistributor
 from DSpace.taskflows.base import BaseTask
 from DSpace.taskflows.base import CompleteTask
 from DSpace.taskflows.base import PrepareTask
@@ -129,6 +131,17 @@ class InstallService(BaseTask):
         sync_version = True
         for node in nodes:
             node.executer = self.get_ssh_executor(node)
+        distributor = None
+        try:
+            distributor = ImageDistributor(ctxt, nodes,
+                                           self.get_ssh_executor)
+            # installations wait for the copy of their node only
+            distributor.register()
+        except Exception as e:
+            logger.warning("distribute image error, nodes will fetch it "
+                           "from the repo: %s", e)
+            distributor = None
+        for node in nodes:
             arg = "node-%s" % node.id
             node_install_flow = lf.Flow('Node Install %s' % node.id)
             node_install_flow.add(SyncNodeInfo(
@@ -166,11 +179,21 @@ class InstallService(BaseTask):
             "ctxt": ctxt,
             'task_info': {}
         })
-        engines.run(all_node_install_wf, store=kwargs,
-                    engine='parallel')
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            if distributor:
+                executor.submit(self._image_distribute, distributor)
+            engines.run(all_node_install_wf, store=kwargs,
+                        engine='parallel')
         logger.info("Install Service flow run success")
         return True
 
+    def _image_distribute(self, distributor):
+        try:
+            distributor.distribute()
+        except Exception as e:
+            logger.warning("distribute image error, nodes will fetch it "
+                           "from the repo: %s", e)
+
     def revert(self, nodes, result, flow_failures):
         if isinstance(result, Failure):
             for node in nodes:
@@ -227,7 +250,8 @@ class SyncCephConfig(BaseTask):
         super(SyncCephConfig, self).execute(task_info)
         for node in nodes:
             tool = ProbeTool(node.executer)
-            ceph_configs = tool.probe_ceph_config()
+            probes = tool.probe(["ceph_config", "ceph_keyring"])
+            ceph_configs = self._probe_result(probes, "ceph_config")
             logger.info(ceph_configs)
             for section in ceph_configs:
                 for key, value in six.iteritems(ceph_configs.get(section)):
@@ -240,7 +264,7 @@ class SyncCephConfig(BaseTask):
                             ctxt, 'enable_cephx', False)
 
                     self._update_config(ctxt, section, key, value)
-            admin_keyring = tool.probe_admin_keyring()
+            admin_keyring = self._probe_result(probes, "ceph_keyring")
             if admin_keyring:
                 logger.info(admin_keyring)
                 key = admin_keyring.get('entity')
@@ -249,6 +273,12 @@ class SyncCephConfig(BaseTask):
         ceph_client = CephTask(ctxt)
         ceph_client.gen_config()
 
+    def _probe_result(self, probes, name):
+        result = probes.get(name)
+        if isinstance(result, dict) and "error" in result:
+            raise exception.ProbeError(probe=name, reason=result["error"])
+        return result
+
     def _update_config(self, ctxt, section, key, value):
         objs = objects.CephConfigList.get_all(
             ctxt, filters={"group": section, "key": key}
@@ -277,9 +307,13 @@ class SyncClusterInfo(BaseTask):
         3. update pool info
         """
         super(SyncClusterInfo, self).execute(task_info)
-        for node in nodes:
-            tool = ProbeTool(node.executer)
-            osd_infos = tool.probe_node_osd()
+        # probe nodes concurrently, update database one by one
+        workers = min(CONF.probe_workers, len(nodes)) or 1
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            all_osd_infos = list(executor.map(
+                lambda node: ProbeTool(node.executer).probe_node_osd(),
+                nodes))
+        for node, osd_infos in zip(nodes, all_osd_infos):
             logger.info(osd_infos)
             for info in osd_infos:
                 self._update_osd(ctxt, info, node)
@@ -19,7 +19,10 @@ from DSpace.common.config import CONF
 from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import ConfigKey
+from DSpace.taskflows.artifact import wait_image
 from DSpace.taskflows.base import BaseTask
+from DSpace.taskflows.base import stage_limit
+from DSpace.tools.artifact import Artifact as ArtifactTool
 from DSpace.tools.base import SSHExecutor
 from DSpace.tools.ceph import CephTool
 from DSpace.tools.docker import Docker as DockerTool
@@ -755,7 +758,8 @@ class InstallDocker(BaseTask):
             repo_content = package_tool.render_repo(
                 "dspace", dspace_repo=dspace_repo)
             package_tool.configure_repo("dspace", repo_content)
-        package_tool.install_docker()
+        with stage_limit("package"):
+            package_tool.install_docker()
 
         # start docker
         service_tool = ServiceTool(ssh)
@@ -778,10 +782,17 @@ class InstallDocker(BaseTask):
             ctxt, ConfigKey.DSPACE_REPO)
         image_name = objects.sysconfig.sys_config_get(
             ctxt, ConfigKey.IMAGE_NAME)
-        tmp_image = '/tmp/{}'.format(image_name)
-        fetch_url = '{}/images/{}'.format(dspace_repo, image_name)
-        file_tool.fetch_from_url(tmp_image, fetch_url)
-        docker_tool.image_load(tmp_image)
+        artifact_tool = ArtifactTool(ssh)
+        digest = wait_image(node)
+        if digest and artifact_tool.checksum(image_name) == digest:
+            # distributed by ImageDistributor already
+            tmp_image = artifact_tool.path(image_name)
+        else:
+            tmp_image = '/tmp/{}'.format(image_name)
+            fetch_url = '{}/images/{}'.format(dspace_repo, image_name)
+            file_tool.fetch_from_url(tmp_image, fetch_url)
+        with stage_limit("image_load"):
+            docker_tool.image_load(tmp_image)
 
 
 class DSpaceAgentUninstall(BaseTask, ContainerUninstallMixin, ServiceMixin,
@@ -820,8 +831,9 @@ class InstallDSpaceTool(BaseTask):
         ssh = node.executer
         package_tool = PackageTool(ssh)
         # install dspace tools
-        package_tool.install(["dspace-disk", "storcli"],
-                             enable_repos="dspace-base")
+        with stage_limit("package"):
+            package_tool.install(["dspace-disk", "storcli"],
+                                 enable_repos="dspace-base")
 
         os_distro = CONF.os_distro
         udev_dir = UDEV_DIR[os_distro]
@@ -911,17 +923,18 @@ class DSpaceAgentInstall(BaseTask, ServiceMixin, PrometheusTargetMixin):
             volumes.append((code_dir, CODE_DIR_CONTAINER))
             restart = False
         docker_tool = DockerTool(ssh)
-        docker_tool.run(
-            name="{}_dsa".format(container_prefix),
-            image="{}/dspace:{}".format(image_namespace, dspace_version),
-            command="dsa",
-            privileged=True,
-            restart=restart,
-            volumes=volumes,
-            registry=docker_registry,
-        )
-        context.agent_manager.add_node(node)
-        self.wait_agent_ready(ctxt, node)
+        with stage_limit("agent"):
+            docker_tool.run(
+                name="{}_dsa".format(container_prefix),
+                image="{}/dspace:{}".format(image_namespace, dspace_version),
+                command="dsa",
+                privileged=True,
+                restart=restart,
+                volumes=volumes,
+                registry=docker_registry,
+            )
+            context.agent_manager.add_node(node)
+            self.wait_agent_ready(ctxt, node)
         self.service_create(ctxt, "DSA", node.id, "base")
         self.target_add(ctxt, node, 'node_exporter')
 
@@ -1,10 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent import futures
+from itertools import groupby
+from operator import attrgetter
+
 from oslo_log import log as logging
 from taskflow.patterns import linear_flow as lf
 
 from DSpace import exception
 from DSpace import objects
+from DSpace.common.config import CONF
 from DSpace.i18n import _
 from DSpace.objects import fields as s_fields
 from DSpace.objects.fields import ConfigKey
@@ -152,6 +159,64 @@ class OsdUpdateTypecode(Task, NodeAgentMixin):
         self.finish_task()
 
 
+class OsdUpWaiter(object):
+    """Waits osds up with one osd tree poller shared by all of them
+
+    Every waiting thread may poll, but the osd tree is read at most once
+    per interval, whoever polls updates osds up of all waiters.
+    """
+
+    def __init__(self, ceph_client, interval=None, timeout=None):
+        self.ceph_client = ceph_client
+        self.interval = interval or CONF.osd_wait_up_interval
+        self.timeout = timeout or CONF.osd_wait_up_timeout
+        self.polls = 0
+        self._cond = threading.Condition()
+        self._polling = False
+        self._next_poll = 0
+        self._up = set()
+
+    def _poll(self):
+        self.polls += 1
+        osd_tree = self.ceph_client.get_osd_tree()
+        return set(node.get('name')
+                   for node in (osd_tree.get("nodes", []) +
+                                osd_tree.get("stray", []))
+                   if node.get('status') == "up")
+
+    def wait(self, osd_name):
+        logger.info("check osd is up: %s", osd_name)
+        deadline = time.time() + self.timeout
+        with self._cond:
+            while osd_name not in self._up:
+                now = time.time()
+                if now >= deadline:
+                    logger.info("osd not up: %s", osd_name)
+                    raise exception.OsdStatusNotUp()
+                if self._polling:
+                    # notified by the poller
+                    self._cond.wait(deadline - now)
+                    continue
+                if now < self._next_poll:
+                    self._cond.wait(min(deadline, self._next_poll) - now)
+                    continue
+                self._polling = True
+                self._cond.release()
+                try:
+                    up = self._poll()
+                except exception.StorException as e:
+                    logger.warning("get osd tree error: %s", e)
+                    up = set()
+                finally:
+                    self._cond.acquire()
+                    self._polling = False
+                    self._next_poll = time.time() + self.interval
+                self._up |= up
+                self._cond.notify_all()
+        logger.info("osd is up: %s", osd_name)
+        return True
+
+
 class OsdWaitUp(Task):
     """Osd wait UP
 
@@ -184,10 +249,13 @@ class OsdWaitUp(Task):
             osd.save()
             logger.info("get osd size: %s %s", osd.osd_name, size)
 
-    def execute(self, ctxt, osd, tf):
+    def execute(self, ctxt, osd, tf, waiter=None):
         logger.info("%s wait up task", osd.osd_name)
         self.prepare_task(ctxt, tf)
-        self.wait_osd_up(ctxt, osd.osd_name)
+        if waiter:
+            waiter.wait(osd.osd_name)
+        else:
+            self.wait_osd_up(ctxt, osd.osd_name)
         self.update_size(ctxt, osd)
         self.finish_task()
 
@@ -215,9 +283,11 @@ class OsdTaskflowMixin(object):
 
 @TaskflowRegistry.register
 class OsdCreateTaskflow(Taskflow, OsdTaskflowMixin):
-    def taskflow(self, osd=None):
+    def taskflow(self, osd=None, **kwargs):
         wf = lf.Flow('OsdCreateTaskflow')
-        wf.add(OsdAllocId())
+        # osds created in batch have ids already
+        if not osd.osd_id:
+            wf.add(OsdAllocId())
         wf.add(OsdConfigSet())
         wf.add(OsdDiskPrepare())
         wf.add(OsdActive())
@@ -225,7 +295,7 @@ class OsdCreateTaskflow(Taskflow, OsdTaskflowMixin):
         wf.add(OsdUpdateTypecode())
         return wf
 
-    def format_args(self, osd=None):
+    def format_args(self, osd=None, **kwargs):
         return self._format_args(osd)
 
     def failed(self, **kwargs):
@@ -235,6 +305,68 @@ class OsdCreateTaskflow(Taskflow, OsdTaskflowMixin):
         super(OsdCreateTaskflow, self).failed(**kwargs)
 
 
+class OsdBatchCreate(object):
+    """Create osds of many nodes together
+
+    Ids of all osds are allocated with one mon connection, osds of a node
+    are prepared in parallel, at most node_concurrency of them at the same
+    time (disks of a node share the disk controller), and all of them wait
+    up with one OsdUpWaiter.
+    """
+
+    def __init__(self, ctxt, node_concurrency=None, ceph_client=None):
+        self.ctxt = ctxt
+        self.node_concurrency = (node_concurrency or
+                                 CONF.osd_create_node_concurrency)
+        self.ceph_client = ceph_client or CephTask(ctxt)
+
+    def alloc_ids(self, osds):
+        """Osds failed to alloc id here alloc it in their own taskflow"""
+        osds = [osd for osd in osds if not osd.osd_id]
+        if not osds:
+            return
+        try:
+            osd_ids = self.ceph_client.osds_new([osd.fsid for osd in osds])
+        except exception.StorException as e:
+            logger.error("alloc osd ids error: %s", e)
+            return
+        for osd in osds:
+            osd.osd_id = osd_ids.get(osd.fsid)
+            logger.info("Alloc osd id %s with osd fsid %s from ceph.",
+                        osd.osd_id, osd.fsid)
+
+    def run(self, osds, create):
+        """Create osds
+
+        :param create: fun(osd, waiter) creating an osd, errors of an osd
+                       are handled by it
+        """
+        self.alloc_ids(osds)
+        waiter = OsdUpWaiter(self.ceph_client)
+        osds = sorted(osds, key=attrgetter('node_id'))
+        executors = []
+        fs = {}
+        try:
+            for node_id, group in groupby(osds, attrgetter('node_id')):
+                node_osds = list(group)
+                executor = futures.ThreadPoolExecutor(
+                    max_workers=min(self.node_concurrency, len(node_osds)))
+                executors.append(executor)
+                for osd in node_osds:
+                    fs[executor.submit(create, osd, waiter)] = osd
+            for f in futures.as_completed(fs):
+                try:
+                    f.result()
+                except Exception as e:
+                    logger.exception("osd(db_id=%s) create error: %s",
+                                     fs[f].id, e)
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+        logger.info("%s osds created, osd tree polled %s times",
+                    len(osds), waiter.polls)
+
+
 class OsdMarkOut(Task):
     def execute(self, ctxt, osd, tf):
         logger.info("%s osd mark out", osd.osd_name)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+from concurrent import futures
+from itertools import groupby
+from operator import attrgetter
+
+from DSpace import exception
+from DSpace.objects import fields as s_fields
+
+logger = logging.getLogger(__name__)
+
+OsdStatus = s_fields.OsdStatus
+
+
+class Transition(object):
+    """A status change of osds
+
+    :param expected: statuses the change applies to, osds changed by
+                     others in the meantime are left alone
+    :param alert: (level, op_type) of the service alert, None for none
+    """
+
+    def __init__(self, name, status, expected, alert=None):
+        self.name = name
+        self.status = status
+        self.expected = expected
+        self.alert = alert
+
+
+# up and in again
+ACTIVE = Transition("active", OsdStatus.ACTIVE,
+                    [OsdStatus.OFFLINE, OsdStatus.RESTARTING,
+                     OsdStatus.ERROR],
+                    alert=("INFO", "OSD_ACTIVE"))
+# in but down, marked to restarting after offline
+DOWN = Transition("down", OsdStatus.OFFLINE, [OsdStatus.ACTIVE],
+                  alert=("WARN", "OSD_OFFLINE"))
+RESTART = Transition("restart", OsdStatus.RESTARTING, [OsdStatus.OFFLINE])
+# out of the cluster
+OUT = Transition("out", OsdStatus.OFFLINE,
+                 [OsdStatus.ACTIVE, OsdStatus.WARNING],
+                 alert=("WARN", "OSD_OFFLINE"))
+# in db but not in the osd tree
+MISSING = Transition("missing", OsdStatus.ERROR,
+                     [s for s in OsdStatus.ALL
+                      if s not in (OsdStatus.DELETING, OsdStatus.CREATING,
+                                   OsdStatus.ERROR)])
+
+
+class OsdChecker(object):
+    """One pass osd status reconciliation of a cluster
+
+    The osd tree and osd stat are read once, the agents are asked only
+    if too many osds are down in ceph (ceph may not mark them down then),
+    all of them at the same time. plan() is computed in memory from osds
+    loaded once, the caller applies every transition in one batch.
+
+    :param ceph_client: CephTask of the cluster
+    :param agent_status: fun(node_id, osds) -> {"osd.<id>": "up"|"down"}
+    :param min_up_ratio: agents are asked if up osds are not more than it
+    """
+
+    def __init__(self, ceph_client, agent_status, min_up_ratio=0.3,
+                 workers=16):
+        self.ceph_client = ceph_client
+        self.agent_status = agent_status
+        self.min_up_ratio = min_up_ratio
+        self.workers = workers
+
+    def osd_tree(self):
+        osd_tree = self.ceph_client.get_osd_tree()
+        return osd_tree.get("nodes", []) + osd_tree.get("stray", [])
+
+    def _need_agents(self):
+        osd_stat = self.ceph_client.get_osd_stat()
+        num_osds = osd_stat.get("num_osds")
+        if not num_osds:
+            return False
+        return osd_stat.get("num_up_osds") / num_osds <= self.min_up_ratio
+
+    def agents_status(self, osds):
+        """Ask agents of all nodes in parallel, failed nodes are ignored"""
+        osds = sorted(osds, key=attrgetter('node_id'))
+        nodes = [(node_id, list(group))
+                 for node_id, group in groupby(osds, attrgetter('node_id'))]
+        res = {}
+        if not nodes:
+            return res
+        workers = min(self.workers, len(nodes))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            fs = [executor.submit(self.agent_status, node_id, node_osds)
+                  for node_id, node_osds in nodes]
+            for f in fs:
+                try:
+                    res.update(f.result() or {})
+                except exception.StorException as e:
+                    logger.error(e)
+        return res
+
+    def osd_states(self, osds):
+        """osd_id -> "in&up", "in&down", "out&up" or "out&down"
+
+        osds without state are not in ceph, osds with unknown up/down
+        state are left out.
+        """
+        services_status = {}
+        if self._need_agents():
+            services_status = self.agents_status(osds)
+        states = {}
+        for node in self.osd_tree():
+            osd_id = node.get('id')
+            if osd_id is None or osd_id < 0:
+                continue
+            if services_status:
+                up_down = services_status.get("osd.{}".format(osd_id))
+            else:
+                up_down = node.get('status')
+            in_out = "in" if node.get('reweight') else "out"
+            # None: in the tree, but state unknown
+            states[str(osd_id)] = (
+                "{}&{}".format(in_out, up_down) if up_down else None)
+        return states
+
+    def plan(self, osds, states):
+        """Transitions of osds
+
+        :param osds: {osd_id: Osd} to check
+        :param states: result of osd_states()
+        :return: {Transition: [Osd]}
+        """
+        plan = {}
+        for osd_id, osd in osds.items():
+            if osd_id not in states:
+                if osd.status not in (OsdStatus.DELETING,
+                                      OsdStatus.CREATING,
+                                      OsdStatus.ERROR):
+                    logger.error("Osd.%s is not in cluster", osd_id)
+                    plan.setdefault(MISSING, []).append(osd)
+                continue
+            state = states[osd_id]
+            if not state or \
+                    osd.status in OsdStatus.OSD_CHECK_IGNORE_STATUS:
+                continue
+            node = osd.node if osd.obj_attr_is_set('node') else None
+            if node and node.status in (s_fields.NodeStatus.CREATING,
+                                        s_fields.NodeStatus.DELETING):
+                continue
+            transition = None
+            if state == "in&up":
+                transition = ACTIVE
+            elif state == "in&down":
+                transition = DOWN
+            elif state in ("out&up", "out&down"):
+                transition = OUT
+            if transition and osd.status in transition.expected:
+                if transition is not ACTIVE:
+                    logger.warning("osd.%s status is %s", osd_id, state)
+                plan.setdefault(transition, []).append(osd)
+        return plan
@@ -1,8 +1,10 @@
 import logging
+from concurrent import futures
 from pathlib import Path
 
 import paramiko
 
+from DSpace.common.config import CONF
 from DSpace.tools.base import SSHExecutor
 from DSpace.tools.probe import ProbeTool
 
@@ -23,6 +25,14 @@ class ProbeTask(object):
         return SSHExecutor(hostname=str(self.node.ip_address),
                            password=self.node.password)
 
+    def probe(self, probes, checks=None):
+        ssh = self.get_ssh_executor()
+        probe_tool = ProbeTool(ssh)
+        try:
+            return probe_tool.probe(probes, checks=checks)
+        finally:
+            ssh.close()
+
     def get_ssh_key(self):
         home = str(Path.home())
         pk = paramiko.RSAKey.from_private_key(open('%s/.ssh/id_rsa' % home))
@@ -45,3 +55,47 @@ class ProbeTask(object):
         probe_tool = ProbeTool(ssh)
         result = probe_tool.check(checks)
         return result
+
+
+class ProbeEngine(object):
+    """Probe many nodes concurrently
+
+    At most CONF.probe_workers nodes are probed at the same time, every
+    node runs all probes in one ssh command. on_result(node, result, err)
+    is called as soon as a node is done, e.g. to report progress.
+    """
+
+    def __init__(self, ctxt, probes, checks=None, on_result=None,
+                 workers=None):
+        self.ctxt = ctxt
+        self.probes = probes
+        self.checks = checks
+        self.on_result = on_result
+        self.workers = workers or CONF.probe_workers
+
+    def _probe(self, node):
+        return ProbeTask(self.ctxt, node).probe(self.probes,
+                                                checks=self.checks)
+
+    def run(self, nodes):
+        """Return [(node, result, error)] in order of nodes"""
+        if not nodes:
+            return []
+        results = {}
+        workers = min(self.workers, len(nodes))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            fs = {executor.submit(self._probe, node): i
+                  for i, node in enumerate(nodes)}
+            for future in futures.as_completed(fs):
+                i = fs[future]
+                node = nodes[i]
+                try:
+                    result, err = future.result(), None
+                except Exception as e:
+                    logger.warning("probe node %s error: %s",
+                                   node.ip_address, e)
+                    result, err = None, str(e)
+                results[i] = (node, result, err)
+                if self.on_result:
+                    self.on_result(node, result, err)
+        return [results[i] for i in range(len(nodes))]
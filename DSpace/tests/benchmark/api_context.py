@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Concurrency benchmark of the request context of the API.
+
+Serves a cluster API handler whose auth and cluster lookup sleep for the
+simulated sso and db latencies, and sends concurrent requests to it with
+the context built on the ioloop, by the context executor, and by the
+executor with the context cache.
+
+    python -m DSpace.tests.benchmark.api_context --requests 500
+"""
+from __future__ import print_function
+
+import argparse
+import logging
+import time
+
+import mock
+from tornado import gen
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.testing import bind_unused_port
+from tornado.web import Application
+
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.DSI.handlers import base
+
+
+class FakeAuth(object):
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def validate(self, ctxt, handler):
+        # the user of a ticket, validated by the sso
+        key = ("bench", handler.request.headers.get("X-Ticket"))
+        user = base.CONTEXT_CACHE.get(key)
+        if not user:
+            time.sleep(self.latency / 1000.0)
+            user = objects.User(id=1, name="admin")
+            base.CONTEXT_CACHE.set(key, user)
+        handler.current_user = user
+
+
+def _handler(auth):
+
+    class ContextHandler(base.ClusterAPIHandler):
+
+        def initialize(self):
+            self.session = {}
+            self.auth = auth
+
+        def get(self):
+            self.write({"cluster_id": self.ctxt.cluster_id})
+
+    return ContextHandler
+
+
+@gen.coroutine
+def _requests(args):
+    sock, port = bind_unused_port()
+    app = Application([(r"/context/", _handler(FakeAuth(args.sso_latency)))])
+    server = HTTPServer(app)
+    server.add_sockets([sock])
+    url = "http://127.0.0.1:{}/context/".format(port)
+    client = AsyncHTTPClient(max_clients=args.concurrency)
+    latencies = []
+
+    @gen.coroutine
+    def _one(i):
+        start = time.time()
+        yield client.fetch(url, headers={
+            "X-Cluster-Id": "c1", "X-Ticket": str(i % args.users)})
+        latencies.append(time.time() - start)
+
+    start = time.time()
+    yield [_one(i) for i in range(args.requests)]
+    elapsed = time.time() - start
+    server.stop()
+    client.close()
+    raise gen.Return((elapsed, sorted(latencies)))
+
+
+def run(name, args, workers, cache_ttl):
+    CONF.set_override("api_context_workers", workers)
+    CONF.set_override("api_context_cache_ttl", cache_ttl)
+    base._context_executor = None
+    base.CONTEXT_CACHE._data.clear()
+
+    def _get_cluster(ctxt, cluster_id):
+        time.sleep(args.db_latency / 1000.0)
+
+    loop = IOLoop()
+    with mock.patch.object(objects.Cluster, "get_by_id", _get_cluster):
+        elapsed, latencies = loop.run_sync(lambda: _requests(args))
+    loop.close(all_fds=True)
+    print("{:<16} {:>8.3f}s  {:>8.1f} req/s  p50 {:>7.1f}ms  "
+          "p99 {:>7.1f}ms".format(
+              name, elapsed, args.requests / elapsed,
+              latencies[len(latencies) // 2] * 1000,
+              latencies[int(len(latencies) * 0.99)] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API context benchmark.')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--users', type=int, default=10,
+                        help='different tickets of the requests')
+    parser.add_argument('--sso-latency', type=float, default=20,
+                        help='ms of a ticket validation')
+    parser.add_argument('--db-latency', type=float, default=2,
+                        help='ms of a cluster lookup')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+    logging.getLogger("DSpace").setLevel(logging.ERROR)
+    logging.getLogger("tornado").setLevel(logging.ERROR)
+    objects.register_all()
+    print("{} requests, {} concurrent".format(args.requests,
+                                              args.concurrency))
+    run("ioloop", args, 0, 0)
+    run("executor", args, args.workers, 0)
+    run("executor+cache", args, args.workers, 5)
+
+
+if __name__ == '__main__':
+    main()
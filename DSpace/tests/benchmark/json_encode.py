@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Json encoding benchmark of node and osd list responses.
+
+Encodes a node list and an osd list (with their nodes and disks) the same
+as the API handlers, with json and the generic to_dict, with json and the
+per class serializers, and with objects.Json (orjson if it is installed).
+The osd list is encoded with the fields of the list page only too.
+
+    python -m DSpace.tests.benchmark.json_encode --nodes 100 --osds 1000
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import json
+import timeit
+
+import mock
+import netaddr
+import six
+from oslo_versionedobjects import fields
+
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.objects import base
+from DSpace.utils import utc_to_local
+
+NOW = datetime.datetime(2020, 6, 1, 12, 0, 0)
+
+
+def generic_to_dict(self, optional=False):
+    # to_dict checking every value
+    _obj = {}
+    for k, field in six.iteritems(self.fields):
+        if k in self.OPTIONAL_FIELDS and not optional:
+            continue
+        v = getattr(self, k)
+        if isinstance(v, datetime.datetime):
+            local_time = utc_to_local(v, CONF.time_zone)
+            v = datetime.datetime.isoformat(local_time)
+        elif isinstance(v, netaddr.IPAddress):
+            v = str(v)
+        elif isinstance(field, fields.SensitiveStringField):
+            v = "***"
+        _obj[k] = v
+    return _obj
+
+
+def _fill(obj, **kwargs):
+    for k, v in kwargs.items():
+        setattr(obj, k, v)
+    for k in obj.fields:
+        if not obj.obj_attr_is_set(k):
+            setattr(obj, k, None)
+    return obj
+
+
+def _node(i):
+    return _fill(
+        objects.Node(), id=i, hostname="node-%03d" % i,
+        ip_address=netaddr.IPAddress("10.0.%d.%d" % (i // 250, i % 250)),
+        cluster_ip=netaddr.IPAddress("10.1.%d.%d" % (i // 250, i % 250)),
+        public_ip=netaddr.IPAddress("10.2.%d.%d" % (i // 250, i % 250)),
+        password="password", status="active", role_admin=i == 0,
+        role_monitor=i < 3, role_storage=True, role_block_gateway=False,
+        role_object_gateway=False, role_file_gateway=False,
+        vendor="Sugon", model="I620-G30", cpu_num=2, cpu_core_num=32,
+        cpu_model="Intel(R) Xeon(R) Gold 6130 CPU @ 2.10GHz",
+        mem_size=256 * 1024 ** 3, sys_type="centos", sys_version="7.6",
+        rack_id=i // 10, time_diff=0,
+        cluster_id="3fc66dde-6c6b-42d2-983b-930198d0c2f5",
+        created_at=NOW, updated_at=NOW, deleted=False, disks=[], networks=[],
+        osds=[], radosgws=[],
+        metrics={"cpu_rate": 12.5, "memory_rate": 40.2,
+                 "network_rate": {"eth0": 1024, "eth1": 2048}})
+
+
+def _disk(i, node):
+    return _fill(
+        objects.Disk(), id=i, name="sd%s" % chr(ord("a") + i % 12),
+        status="inuse", type="hdd", size=8 * 1024 ** 4, role="data",
+        slot="0:%d" % (i % 12), node_id=node.id, partition_num=0,
+        serial="ZA1%07d" % i, wwid="0x5000c500%08x" % i,
+        cluster_id=node.cluster_id, created_at=NOW, updated_at=NOW,
+        deleted=False, node=None, partitions=[])
+
+
+def _osd(i, node):
+    return _fill(
+        objects.Osd(), id=i, osd_id=str(i), size=8 * 1024 ** 4,
+        used=1024 ** 4, status="active", type="bluestore", disk_type="hdd",
+        fsid="c2b5f2c4-9c1b-4ef0-8f9c-%012x" % i, mem_read_cache=0,
+        node_id=node.id, disk_id=i, crush_rule_id=1,
+        cluster_id=node.cluster_id, created_at=NOW, updated_at=NOW,
+        deleted=False, node=node, disk=_disk(i, node), pools=[],
+        metrics={"osd_pg_num": 128, "osd_read_bytes": 1024.5,
+                 "osd_write_bytes": 2048.5, "osd_read_lat": 0.3})
+
+
+def _project(obj, fields):
+    projected = type(obj)()
+    for k in fields:
+        setattr(projected, k, getattr(obj, k))
+    return projected
+
+
+def payloads(node_num, osd_num):
+    nodes = [_node(i) for i in range(node_num)]
+    osds = [_osd(i, nodes[i % node_num]) for i in range(osd_num)]
+    # columns of the osd list page, ?fields=osd_id,status,size,used,node_id
+    fields = base.projection(["osd_id", "status", "size", "used", "node_id"])
+    return {
+        "nodes": {"nodes": objects.NodeList(objects=nodes),
+                  "total": node_num},
+        "osds": {"osds": objects.OsdList(objects=osds), "total": osd_num},
+        "osds(fields)": {
+            "osds": objects.OsdList(
+                objects=[_project(osd, fields) for osd in osds]),
+            "total": osd_num},
+    }
+
+
+def json_dumps(obj):
+    return json.dumps(obj, cls=base.JsonEncoder)
+
+
+def run(name, payload, number):
+    modes = [("json+compiled", json_dumps, False)]
+    if "fields" not in name:
+        # the generic to_dict can not encode objects of projections
+        modes.insert(0, ("json+generic", json_dumps, True))
+    if objects.orjson:
+        modes.append(("orjson+compiled", objects.Json.dumps, False))
+    size = len(json_dumps(payload))
+    for mode, dumps, generic in modes:
+        with mock.patch.object(base.StorPersistentObject, "to_dict",
+                               generic_to_dict if generic else
+                               base.StorPersistentObject.to_dict):
+            elapsed = timeit.timeit(lambda: dumps(payload),
+                                    number=number) / number
+        print("{:<12} {:>8} bytes  {:<16} {:>8.2f}ms".format(
+            name, size, mode, elapsed * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Json encoding benchmark.')
+    parser.add_argument('--nodes', type=int, default=100)
+    parser.add_argument('--osds', type=int, default=1000)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+    objects.register_all()
+    for name, payload in sorted(payloads(args.nodes, args.osds).items()):
+        run(name, payload, args.number)
+
+
+if __name__ == '__main__':
+    main()
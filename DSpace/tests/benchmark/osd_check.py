@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Simulated cluster benchmark of the osd status check.
+
+Compares the calls and time of one osd check tick done per osd (as the
+cron did before) and in one pass (OsdChecker), with simulated latencies
+of mon commands, agent rpc calls and db queries.
+
+    python -m DSpace.tests.benchmark.osd_check --osds 600 --nodes 30
+    python -m DSpace.tests.benchmark.osd_check --degraded
+"""
+from __future__ import print_function
+
+import argparse
+import collections
+import logging
+import time
+
+from DSpace import objects
+from DSpace.objects import fields as s_fields
+from DSpace.taskflows.osd_check import OsdChecker
+
+
+class Backend(object):
+    """Counts and delays every call of a simulated cluster"""
+
+    def __init__(self, args):
+        self.args = args
+        self.calls = collections.Counter()
+        self.down = set(range(0, args.osds, 4)) if args.degraded else set()
+
+    def _call(self, kind, latency):
+        self.calls[kind] += 1
+        time.sleep(latency / 1000.0)
+
+    def get_osd_tree(self):
+        self._call("mon", self.args.mon_latency)
+        return {"nodes": [{"id": i, "type": "osd", "reweight": 1.0,
+                           "status": "down" if self.args.degraded else "up"}
+                          for i in range(self.args.osds)],
+                "stray": []}
+
+    def get_osd_stat(self):
+        self._call("mon", self.args.mon_latency)
+        up = 0 if self.args.degraded else self.args.osds
+        return {"num_osds": self.args.osds, "num_up_osds": up}
+
+    def agent_status(self, node_id, osds):
+        self._call("rpc", self.args.rpc_latency)
+        return {"osd.{}".format(osd.osd_id):
+                "down" if int(osd.osd_id) in self.down else "up"
+                for osd in osds}
+
+    def db(self):
+        self._call("db", self.args.db_latency)
+
+
+def _osds(args):
+    per_node = args.osds // args.nodes
+    return [objects.Osd(id=i, osd_id=str(i),
+                        status=s_fields.OsdStatus.ACTIVE,
+                        node_id=i // per_node)
+            for i in range(args.osds)]
+
+
+def per_osd(backend, osds):
+    """Call pattern of the check before, one osd after another"""
+    backend.db()
+    for node in backend.get_osd_tree()["nodes"]:
+        # osd of the node
+        backend.db()
+        # osd tree and osd stat again
+        backend.get_osd_tree()
+        stat = backend.get_osd_stat()
+        if stat["num_up_osds"] / stat["num_osds"] <= 0.3:
+            backend.db()
+            nodes = sorted(set(osd.node_id for osd in osds))
+            for node_id in nodes:
+                backend.agent_status(
+                    node_id, [o for o in osds if o.node_id == node_id])
+        # node of the osd
+        backend.db()
+
+
+def one_pass(backend, osds, workers):
+    backend.db()
+    checker = OsdChecker(backend, backend.agent_status, workers=workers)
+    states = checker.osd_states(osds)
+    plan = checker.plan({osd.osd_id: osd for osd in osds}, states)
+    # one batched update per transition
+    for _ in plan:
+        backend.db()
+
+
+def run(name, fun, args):
+    backend = Backend(args)
+    osds = _osds(args)
+    start = time.time()
+    fun(backend, osds)
+    elapsed = time.time() - start
+    print("{:<8} {:>8.3f}s  mon {:>6}  rpc {:>6}  db {:>6}".format(
+        name, elapsed, backend.calls["mon"], backend.calls["rpc"],
+        backend.calls["db"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Osd check benchmark.')
+    parser.add_argument('--osds', type=int, default=600)
+    parser.add_argument('--nodes', type=int, default=30)
+    parser.add_argument('--degraded', action='store_true',
+                        help='most osds down, agents are asked')
+    parser.add_argument('--mon-latency', type=float, default=1,
+                        help='ms of a mon command')
+    parser.add_argument('--rpc-latency', type=float, default=0.5,
+                        help='ms of an agent rpc call')
+    parser.add_argument('--db-latency', type=float, default=0.5,
+                        help='ms of a db query')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--skip-per-osd', action='store_true')
+    args = parser.parse_args()
+    logging.getLogger("DSpace").setLevel(logging.ERROR)
+    objects.register_all()
+    print("{} osds on {} nodes{}".format(
+        args.osds, args.nodes, ", degraded" if args.degraded else ""))
+    if not args.skip_per_osd:
+        run("per-osd", per_osd, args)
+    run("one-pass", lambda b, o: one_pass(b, o, args.workers), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import context
+from DSpace import test
+from DSpace.DSM.cluster import ClusterHandler
+
+
+class TestDashboard(test.TestCase):
+
+    def setUp(self):
+        super(TestDashboard, self).setUp()
+        self.handler = ClusterHandler()
+        self.ctxt = context.get_context(cluster_id="c1", user_id="admin")
+        self.status = {"health": "HEALTH_OK"}
+        parts = {
+            "service_status_get": [],
+            "cluster_host_status_get": {"active": 1},
+            "cluster_pool_status_get": {"active": 2},
+            "cluster_osd_status_get": {"active": 3},
+            "cluster_capacity_status_get": {"total": 10},
+            "cluster_pg_status_get": {"active+clean": 64},
+            "cluster_status": self.status,
+        }
+        for name, value in parts.items():
+            patcher = mock.patch.object(ClusterHandler, name,
+                                        return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(ClusterHandler, "send_websocket")
+        self.send_websocket = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot_part_error(self):
+        ClusterHandler.cluster_osd_status_get.side_effect = \
+            Exception("prometheus down")
+        snapshot = self.handler._dashboard_snapshot(self.ctxt)
+        self.assertIsNone(snapshot["osd_status"])
+        self.assertEqual({"active": 2}, snapshot["pool_status"])
+        self.assertEqual(self.status, snapshot["cluster"])
+        self.assertEqual(7, len(snapshot))
+
+    def test_collect_push_on_change(self):
+        self.handler._dashboard_collect(self.ctxt)
+        self.assertEqual(1, self.send_websocket.call_count)
+        # unchanged, not pushed again
+        self.handler._dashboard_collect(self.ctxt)
+        self.assertEqual(1, self.send_websocket.call_count)
+
+        self.status["health"] = "HEALTH_WARN"
+        self.handler._dashboard_collect(self.ctxt)
+        self.assertEqual(2, self.send_websocket.call_count)
+        _ctxt, snapshot, op_type, _msg = \
+            self.send_websocket.call_args[0]
+        self.assertEqual("DASHBOARD_SNAPSHOT", op_type)
+        self.assertEqual({"health": "HEALTH_WARN"}, snapshot["cluster"])
+        self.assertEqual(
+            "dashboard",
+            self.send_websocket.call_args[1]["resource_type"])
+
+    def test_snapshot_get(self):
+        # not collected yet, built on the fly
+        snapshot = self.handler.dashboard_snapshot_get(self.ctxt)
+        self.assertEqual({"active": 1}, snapshot["host_status"])
+        self.assertEqual(1, ClusterHandler.cluster_host_status_get.call_count)
+        self.send_websocket.assert_not_called()
+
+        self.handler._dashboard_collect(self.ctxt)
+        ClusterHandler.cluster_host_status_get.reset_mock()
+        snapshot = self.handler.dashboard_snapshot_get(self.ctxt)
+        self.assertEqual({"active": 1}, snapshot["host_status"])
+        ClusterHandler.cluster_host_status_get.assert_not_called()
+
+        other = context.get_context(cluster_id="c2", user_id="admin")
+        self.handler.dashboard_snapshot_get(other)
+        self.assertEqual(1, ClusterHandler.cluster_host_status_get.call_count)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+
+import mock
+
+from DSpace import context
+from DSpace import objects
+from DSpace import test
+from DSpace.DSM.pool import PoolHandler
+from DSpace.objects import fields as s_fields
+from DSpace.tools.prometheus import pg_state_summary
+
+
+def _pool(ctxt, id, status=s_fields.PoolStatus.ACTIVE):
+    pool = objects.Pool(
+        ctxt, id=id, pool_id=id, pool_name="pool%s" % id, status=status,
+        updated_at=datetime.datetime(2020, 1, 1), metrics={})
+    pool.obj_reset_changes()
+    return pool
+
+
+class TestPoolStatus(test.TestCase):
+
+    def setUp(self):
+        super(TestPoolStatus, self).setUp()
+        self.handler = PoolHandler()
+        self.ctxt = context.get_context(cluster_id="c1", user_id="admin")
+        self.pools = [
+            _pool(self.ctxt, 1),
+            _pool(self.ctxt, 2),
+            _pool(self.ctxt, 3, status=s_fields.PoolStatus.CREATING),
+        ]
+        patcher = mock.patch.object(objects.PoolList, "get_all",
+                                    return_value=self.pools)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("DSpace.DSM.pool.PrometheusTool")
+        self.prometheus = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.prometheus.pools_get_capacity.return_value = {
+            "max_avail": {"1": [0, "100"], "2": [0, "200"]},
+        }
+        self.prometheus.pools_get_pg_state.return_value = {
+            "1": pg_state_summary(["active+clean"]),
+            "2": pg_state_summary(["active+clean", "stale+active+clean"]),
+        }
+        patcher = mock.patch.object(objects.Pool, "conditional_update",
+                                    return_value=True)
+        self.conditional_update = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pool_status(self):
+        pool = self.pools[0]
+        self.assertIsNone(self.handler._pool_status(pool, None))
+        self.assertEqual(
+            s_fields.PoolStatus.ACTIVE,
+            self.handler._pool_status(pool, pg_state_summary(
+                ["active+clean"])))
+        self.assertEqual(
+            s_fields.PoolStatus.DEGRADED,
+            self.handler._pool_status(pool, pg_state_summary(
+                ["active+clean", "active+undersized+degraded"])))
+        self.assertEqual(
+            s_fields.PoolStatus.RECOVERING,
+            self.handler._pool_status(pool, pg_state_summary(
+                ["active+clean", "active+recovering"])))
+        self.assertIsNone(self.handler._pool_status(
+            self.pools[2], pg_state_summary(["active+clean"])))
+
+    def test_collect(self):
+        self.handler._pool_status_collect(self.ctxt)
+        metrics = self.handler._pool_metrics["c1"]
+        # creating pools have no metrics
+        self.assertEqual([1, 2], sorted(metrics))
+        self.assertEqual([0, "100"], metrics[1]["max_avail"])
+        self.assertEqual(1, metrics[1]["pg_state"]["healthy"])
+        self.assertEqual(0.5, metrics[2]["pg_state"]["unactive"])
+        # only the changed status is saved, if nobody changed it meanwhile
+        self.conditional_update.assert_called_once_with(
+            {"status": s_fields.PoolStatus.WARNING},
+            {"status": s_fields.PoolStatus.ACTIVE})
+
+    def test_collect_exporter_not_ready(self):
+        self.prometheus.pools_get_pg_state.return_value = {}
+        self.handler._pool_status_collect(self.ctxt)
+        metrics = self.handler._pool_metrics["c1"]
+        self.assertIsNone(metrics[1]["pg_state"])
+        self.conditional_update.assert_not_called()
+
+    def test_collect_no_pg(self):
+        del self.prometheus.pools_get_pg_state.return_value["2"]
+        self.handler._pool_status_collect(self.ctxt)
+        metrics = self.handler._pool_metrics["c1"]
+        self.assertEqual(0, metrics[2]["pg_state"]["healthy"])
+        self.conditional_update.assert_called_once_with(
+            {"status": s_fields.PoolStatus.WARNING},
+            {"status": s_fields.PoolStatus.ACTIVE})
+
+    def test_collect_no_pool(self):
+        self.handler._pool_metrics["c1"] = {1: {}}
+        del self.pools[:]
+        self.handler._pool_status_collect(self.ctxt)
+        self.assertNotIn("c1", self.handler._pool_metrics)
+        self.prometheus.pools_get_capacity.assert_not_called()
+
+    def test_get_metrics(self):
+        self.handler._pool_status_collect(self.ctxt)
+        pool = _pool(self.ctxt, 1)
+        self.handler._pool_get_metrics(self.ctxt, pool)
+        self.assertEqual([0, "100"], pool.metrics["max_avail"])
+        self.prometheus.pool_get_capacity.assert_not_called()
+
+        # not collected yet, asked per pool
+        pool = _pool(self.ctxt, 4)
+        self.handler._pool_get_metrics(self.ctxt, pool)
+        self.prometheus.pool_get_capacity.assert_called_once_with(pool)
+        self.prometheus.pool_get_pg_state.assert_called_once_with(pool)
+
+    @mock.patch.object(objects.ClusterList, "get_all")
+    def test_collect_all_clusters(self, get_all):
+        get_all.return_value = [objects.Cluster(id="c1"),
+                                objects.Cluster(id="c2")]
+        self.prometheus.pools_get_capacity.side_effect = [
+            Exception("prometheus down"), {}]
+        self.handler.pool_status_collect()
+        # an error of one cluster does not stop the others
+        self.assertNotIn("c1", self.handler._pool_metrics)
+        self.assertIn("c2", self.handler._pool_metrics)
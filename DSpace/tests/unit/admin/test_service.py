@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.DSM.service import ServiceManager
+
+
+def _service(id, name, node_id):
+    node = objects.Node(id=node_id, hostname="node%s" % node_id,
+                        deleted=False)
+    return objects.Service(id=id, name=name, role="base", status="active",
+                           cluster_id="c1", node_id=node_id, node=node)
+
+
+class TestServiceManager(test.TestCase):
+
+    @mock.patch.object(objects.sysconfig, "sys_config_get",
+                       return_value="dspace")
+    @mock.patch.object(objects.ServiceList, "get_all")
+    def test_reload(self, get_all, sys_config_get):
+        get_all.return_value = [_service(1, "DSA", 1),
+                                _service(2, "CHRONY", 1)]
+        manager = ServiceManager()
+        self.assertEqual([1, 2], sorted(manager._services["base"]))
+
+        # the service 2 is removed, the node 2 added
+        get_all.return_value = [_service(1, "DSA", 1),
+                                _service(3, "CHRONY", 2)]
+        manager.reload()
+        self.assertEqual([1, 3], sorted(manager._services["base"]))
+        self.assertEqual(
+            "node2", manager._services["base"][3].node.hostname)
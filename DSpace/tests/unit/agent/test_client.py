@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.DSA.client import AgentClientManager
+
+
+class TestAgentClientManager(test.TestCase):
+
+    def setUp(self):
+        super(TestAgentClientManager, self).setUp()
+        # a singleton, every test has its own
+        self.addCleanup(delattr, AgentClientManager, "_inst")
+        patcher = mock.patch.object(AgentClientManager, "client_cls")
+        self.client_cls = patcher.start()
+        self.client_cls.side_effect = lambda endpoint: mock.Mock()
+        self.addCleanup(patcher.stop)
+        self.manager = AgentClientManager(None, 2082)
+
+    def _nodes(self, *ids):
+        return [objects.Node(id=i, hostname="node%s" % i,
+                             ip_address="10.0.0.%s" % i) for i in ids]
+
+    def test_sync_nodes(self):
+        self.manager.sync_nodes(self._nodes(1, 2))
+        client = self.manager.get_client(1)
+        self.assertEqual([1, 2], sorted(self.manager._clients))
+
+        # node 2 is gone, node 3 is new
+        self.manager.sync_nodes(self._nodes(1, 3))
+        self.assertEqual([1, 3], sorted(self.manager._nodes))
+        self.assertEqual([1, 3], sorted(self.manager._clients))
+        # the client of a kept node is not rebuilt
+        self.assertIs(client, self.manager.get_client(1))
+        self.client_cls.assert_called_with("10.0.0.3:2082")
+        self.assertEqual(3, self.client_cls.call_count)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import test
+from DSpace.DSI import session
+
+
+class TestRedisSession(test.TestCase):
+
+    def setUp(self):
+        super(TestRedisSession, self).setUp()
+        self.client = mock.Mock()
+        self.client.hgetall.return_value = {b"sessoin": b"True",
+                                            b"user_id": b"1",
+                                            b"username": b"admin"}
+        p = mock.patch.object(session.RedisSession, 'get_client',
+                              return_value=self.client)
+        p.start()
+        self.addCleanup(p.stop)
+        p = mock.patch.object(session, 'SESSION_CACHE',
+                              session.SessionCache())
+        p.start()
+        self.addCleanup(p.stop)
+
+    def _handler(self, sid=b"sid1"):
+        handler = mock.Mock()
+        handler.get_secure_cookie.return_value = sid
+        return handler
+
+    def test_get(self):
+        s = session.RedisSession(self._handler())
+        self.assertEqual("1", s['user_id'])
+        self.assertEqual("admin", s['username'])
+        self.assertIsNone(s['ticket'])
+        # the next request is served from cache
+        s = session.RedisSession(self._handler())
+        self.assertEqual("admin", s['username'])
+        self.client.hgetall.assert_called_once_with("sid1")
+
+    def test_get_no_cookie(self):
+        s = session.RedisSession(self._handler(sid=None))
+        self.assertIsNone(s['user_id'])
+        self.client.hgetall.assert_not_called()
+
+    def test_set(self):
+        s = session.RedisSession(self._handler())
+        s['user_id'] = None
+        s['callback'] = "/"
+        self.client.hdel.assert_called_once_with("sid1", "user_id")
+        self.client.hset.assert_called_once_with("sid1", "callback", "/")
+        s = session.RedisSession(self._handler())
+        self.assertIsNone(s['user_id'])
+        self.assertEqual("/", s['callback'])
+        self.client.hgetall.assert_called_once_with("sid1")
+
+    def test_set_login(self):
+        handler = self._handler()
+        s = session.RedisSession(handler)
+        s['username'] = "root"
+        s['ticket'] = "t1"
+        # moved to a new id once
+        sid = s.random_index_str
+        self.assertNotEqual("sid1", sid)
+        self.client.rename.assert_called_once_with("sid1", sid)
+        self.client.hset.assert_any_call(sid, "username", "root")
+        self.client.hset.assert_any_call(sid, "ticket", "t1")
+        handler.set_secure_cookie.assert_called_with('__sson__', sid)
+        self.assertIsNone(session.SESSION_CACHE.get("sid1"))
+        s = session.RedisSession(self._handler(sid.encode("utf-8")))
+        self.assertEqual("1", s['user_id'])
+        self.assertEqual("t1", s['ticket'])
+
+    def test_set_new_session(self):
+        self.client.hgetall.return_value = {}
+        handler = self._handler()
+        s = session.RedisSession(handler)
+        s['user_id'] = 2
+        sid = s.random_index_str
+        self.assertNotEqual("sid1", sid)
+        self.client.hset.assert_any_call(sid, "user_id", "2")
+        handler.set_secure_cookie.assert_called_with('__sson__', sid)
+
+
+class TestTTLCache(test.TestCase):
+
+    @mock.patch.object(session.time, 'time')
+    def test_ttl(self, mock_time):
+        session.CONF.set_override('api_context_cache_ttl', 5)
+        self.addCleanup(session.CONF.clear_override, 'api_context_cache_ttl')
+        session.CONF.set_override('api_context_cache_size', 2)
+        self.addCleanup(session.CONF.clear_override,
+                        'api_context_cache_size')
+        cache = session.TTLCache('api_context_cache_ttl',
+                                 'api_context_cache_size')
+        mock_time.return_value = 100
+        cache.set(("cluster", "c1"), True)
+        cache.set(("cluster", "c2"), True)
+        cache.set(("cluster", "c3"), True)
+        # the oldest is dropped
+        self.assertIsNone(cache.get(("cluster", "c1")))
+        self.assertTrue(cache.get(("cluster", "c2")))
+        cache.pop(("cluster", "c2"))
+        self.assertIsNone(cache.get(("cluster", "c2")))
+        mock_time.return_value = 106
+        self.assertIsNone(cache.get(("cluster", "c3")))
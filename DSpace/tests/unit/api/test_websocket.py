@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from DSpace import test
+from DSpace.common.config import CONF
+from DSpace.DSI.websocket import LEGACY_ROOM
+from DSpace.DSI.websocket import MessageQueue
+from DSpace.DSI.websocket import WebSocketBroadcaster
+from DSpace.DSI.websocket import cluster_room
+
+
+class FakeSocketIO(object):
+
+    def __init__(self):
+        self.emitted = []
+        self._rooms = {}
+
+    def rooms(self, sid):
+        return [sid] + list(self._rooms.get(sid, []))
+
+    def enter_room(self, sid, room):
+        self._rooms.setdefault(sid, set()).add(room)
+
+    def leave_room(self, sid, room):
+        self._rooms[sid].discard(room)
+
+    async def emit(self, event, data, room=None):
+        self.emitted.append((event, data, room))
+
+
+class TestWebSocketBroadcaster(test.TestCase):
+
+    def setUp(self):
+        super(TestWebSocketBroadcaster, self).setUp()
+        self.loop = IOLoop()
+        self.addCleanup(self.loop.close)
+        self.sio = FakeSocketIO()
+        self.broadcaster = WebSocketBroadcaster(self.loop, self.sio)
+        CONF.set_override('websocket_batch_interval', 10)
+        self.addCleanup(CONF.clear_override, 'websocket_batch_interval')
+
+    def _message(self, obj_id, status, resource_type="osd",
+                 op_type="OSD_UPDATE"):
+        return {'msg': "", 'cluster_id': "c1", 'refresh': True,
+                'payload': {"id": obj_id, "status": status, "name": "a"},
+                'resource_type': resource_type, 'operation_type': op_type}
+
+    def _run(self, messages):
+        async def _send():
+            for message in messages:
+                self.broadcaster._enqueue(message)
+            await self.broadcaster._flush()
+        self.loop.run_sync(_send)
+
+    def test_subscribe(self):
+        async def _subscribe():
+            await self.broadcaster._connect("s1", {})
+            await self.broadcaster._connect(
+                "s2", {"QUERY_STRING": "cluster_id=c1&resource_types=osd"})
+            await self.broadcaster._subscribe("s1", {"cluster_id": "c1"})
+        self.loop.run_sync(_subscribe)
+        self.assertEqual({cluster_room("c1")}, self.sio._rooms["s1"])
+        self.assertEqual({cluster_room("c1", "osd")}, self.sio._rooms["s2"])
+        self.assertEqual(0, self.broadcaster._members[LEGACY_ROOM])
+
+    def test_batch(self):
+        self.loop.run_sync(lambda: self.broadcaster._subscribe(
+            "s1", {"cluster_id": "c1", "resource_types": ["osd"]}))
+        self._run([self._message(1, "creating"),
+                   self._message(1, "active"),
+                   self._message(2, "active"),
+                   self._message(3, "active", resource_type="pool",
+                                 op_type="POOL_UPDATE")])
+        # no member of the cluster room and the pool room
+        self.assertEqual(1, len(self.sio.emitted))
+        event, data, room = self.sio.emitted[0]
+        self.assertEqual("ASYNC_RESPONSE_BATCH", event)
+        self.assertEqual(cluster_room("c1", "osd"), room)
+        self.assertEqual([1, 2], [m['payload']['id']
+                                  for m in data['messages']])
+        self.assertEqual("active", data['messages'][0]['payload']['status'])
+
+    def test_trim(self):
+        self.loop.run_sync(lambda: self.broadcaster._subscribe(
+            "s1", {"cluster_id": "c1"}))
+        self._run([self._message(1, "creating")])
+        self._run([self._message(1, "active")])
+        first = self.sio.emitted[0][1]['messages'][0]
+        second = self.sio.emitted[1][1]['messages'][0]
+        self.assertNotIn('partial', first)
+        self.assertEqual({"id": 1, "status": "active"}, second['payload'])
+        self.assertTrue(second['partial'])
+
+    def test_late_subscriber(self):
+        self.loop.run_sync(lambda: self.broadcaster._subscribe(
+            "s1", {"cluster_id": "c1"}))
+        self._run([self._message(1, "creating")])
+        # a new member of the room, and the first of the osd room
+        self.loop.run_sync(lambda: self.broadcaster._subscribe(
+            "s2", {"cluster_id": "c1"}))
+        self.loop.run_sync(lambda: self.broadcaster._subscribe(
+            "s3", {"cluster_id": "c1", "resource_types": ["osd"]}))
+        self._run([self._message(1, "active")])
+        frames = {room: data['messages'][0]
+                  for _, data, room in self.sio.emitted[1:]}
+        for room in (cluster_room("c1"), cluster_room("c1", "osd")):
+            self.assertNotIn('partial', frames[room])
+            self.assertEqual("a", frames[room]['payload']['name'])
+        # no new members
+        self._run([self._message(1, "error")])
+        frames = {room: data['messages'][0]
+                  for _, data, room in self.sio.emitted[3:]}
+        self.assertTrue(frames[cluster_room("c1")]['partial'])
+        self.assertTrue(frames[cluster_room("c1", "osd")]['partial'])
+
+    def test_legacy(self):
+        self.loop.run_sync(lambda: self.broadcaster._connect("s1", {}))
+        self._run([self._message(1, "active")])
+        # let the per message emit run
+        self.loop.run_sync(lambda: gen.sleep(0.01))
+        self.assertEqual([("ASYNC_RESPONSE", self._message(1, "active"),
+                           LEGACY_ROOM)], self.sio.emitted)
+
+
+class TestMessageQueue(test.TestCase):
+
+    def test_forward(self):
+        client = mock.Mock()
+        broadcaster = mock.Mock()
+        queue = MessageQueue(client, broadcaster)
+        payload = {"id": 1, "hostname": "node1"}
+        message = {"cluster_id": "c1", "resource_type": "Node",
+                   "operation_type": "UPDATE", "payload": payload}
+        queue.publish(message)
+        channel, data = client.publish.call_args[0]
+        self.assertEqual(MessageQueue.CHANNEL, channel)
+        pubsub = client.pubsub.return_value
+        pubsub.listen.return_value = iter([
+            {"type": "subscribe", "data": 1},
+            {"type": "message", "data": data.encode("utf-8")},
+        ])
+        queue._consume()
+        pubsub.subscribe.assert_called_once_with(MessageQueue.CHANNEL)
+        sent = broadcaster.send.call_args[0][0]
+        self.assertEqual("c1", sent["cluster_id"])
+        self.assertEqual(payload, sent["payload"])
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from DSpace import test
+from DSpace.common import sqlalchemyutils
+from DSpace.db.sqlalchemy import models
+
+T1 = datetime.datetime(2020, 3, 1, 8, 0, 0)
+T2 = datetime.datetime(2020, 3, 1, 9, 0, 0)
+
+
+class TestKeysetPagination(test.TestCase):
+
+    def setUp(self):
+        super(TestKeysetPagination, self).setUp()
+        engine = create_engine(
+            "sqlite://", poolclass=StaticPool,
+            connect_args={"check_same_thread": False})
+        models.BASE.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.addCleanup(self.session.close)
+        # ids 1-3 share a created_at, the tie is broken on id
+        for id, created_at in ((1, T1), (2, T1), (3, T1), (4, T2), (5, T2)):
+            self.session.add(models.ActionLog(id=id, created_at=created_at))
+        self.session.commit()
+
+    def _ids(self, limit, cursor=None, sort_dir='desc'):
+        query = sqlalchemyutils.keyset_paginate_query(
+            self.session.query(models.ActionLog), models.ActionLog, limit,
+            cursor=cursor, sort_dir=sort_dir)
+        return [log.id for log in query]
+
+    def test_desc(self):
+        self.assertEqual([5, 4], self._ids(2))
+        self.assertEqual([3, 2], self._ids(2, {'created_at': T2, 'id': 4}))
+        self.assertEqual([1], self._ids(2, {'created_at': T1, 'id': 2}))
+        self.assertEqual([], self._ids(2, {'created_at': T1, 'id': 1}))
+
+    def test_asc(self):
+        self.assertEqual([1, 2], self._ids(2, sort_dir='asc'))
+        self.assertEqual([3, 4], self._ids(
+            2, {'created_at': T1, 'id': 2}, sort_dir='asc'))
+        self.assertEqual([5], self._ids(
+            2, {'created_at': T2, 'id': 4}, sort_dir='asc'))
+
+    def test_walk_pages(self):
+        ids = []
+        cursor = None
+        while True:
+            query = sqlalchemyutils.keyset_paginate_query(
+                self.session.query(models.ActionLog), models.ActionLog, 2,
+                cursor=cursor)
+            page = query.all()
+            if not page:
+                break
+            ids.extend(log.id for log in page)
+            cursor = {'created_at': page[-1].created_at, 'id': page[-1].id}
+        self.assertEqual([5, 4, 3, 2, 1], ids)
+
+    def test_bad_sort_dir(self):
+        self.assertRaises(ValueError, self._ids, 2, sort_dir='up')
+
+    def test_bounded_count(self):
+        query = self.session.query(models.ActionLog)
+        # under the cap, the real count
+        self.assertEqual(5, sqlalchemyutils.bounded_count(query, 10))
+        self.assertEqual(5, sqlalchemyutils.bounded_count(query, 5))
+        # at the cap, one more than the limit means "more than limit"
+        self.assertEqual(4, sqlalchemyutils.bounded_count(query, 3))
+        self.assertEqual(5, sqlalchemyutils.bounded_count(query, 0))
+        self.assertEqual(2, sqlalchemyutils.bounded_count(
+            query.filter(models.ActionLog.created_at == T2), 2))
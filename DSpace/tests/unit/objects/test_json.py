@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+import json
+
+import mock
+from netaddr import IPAddress
+
+from DSpace import objects
+from DSpace.common.config import CONF
+from DSpace.objects import JsonEncoder
+from DSpace.tests.unit import objects as test_objects
+
+
+def _node(id):
+    node = objects.Node(
+        id=id, hostname="node%s" % id, ip_address=IPAddress("10.0.0.%s" % id),
+        cluster_ip=IPAddress("10.1.0.1"), public_ip=IPAddress("10.2.0.1"),
+        password="secret", status="active", role_admin=False,
+        role_monitor=True, role_storage=True, role_block_gateway=False,
+        role_object_gateway=False, role_file_gateway=False,
+        cluster_id="3fc66dde-6c6b-42d2-983b-930198d0c2f5", metrics={},
+        created_at=datetime.datetime(2020, 1, 1, 8, 0, 0), disks=[],
+        networks=[], osds=[], radosgws=[])
+    for k in node.fields:
+        if not node.obj_attr_is_set(k):
+            setattr(node, k, None)
+    return node
+
+
+class TestJson(test_objects.BaseObjectsTestCase):
+
+    def test_to_dict(self):
+        CONF.set_override("time_zone", "Asia/Shanghai")
+        self.addCleanup(CONF.clear_override, "time_zone")
+        node = _node(1)
+        res = node.to_dict()
+        self.assertEqual("10.0.0.1", res["ip_address"])
+        self.assertIsNone(res["object_gateway_ip_address"])
+        self.assertEqual("***", res["password"])
+        self.assertEqual("2020-01-01T16:00:00+08:00", res["created_at"])
+        self.assertNotIn("disks", res)
+        self.assertEqual([], node.to_dict(optional=True)["disks"])
+
+    def test_dumps(self):
+        payload = {"nodes": objects.NodeList(objects=[_node(1), _node(2)]),
+                   1: "int key", "name": u"节点"}
+        res = objects.Json.dumps(payload)
+        self.assertEqual(
+            json.loads(json.dumps(payload, cls=JsonEncoder)),
+            json.loads(res))
+        self.assertEqual(payload["name"], objects.Json.loads(res)["name"])
+        # socket.io packets
+        self.assertEqual('{"id":1}', objects.Json.dumps(
+            {"id": 1}, separators=(",", ":")))
+
+    def test_dumps_fallback(self):
+        # out of the integers of orjson
+        self.assertEqual("[18446744073709551616]",
+                         objects.Json.dumps([2 ** 64]))
+        self.assertEqual('{"a": 1}', objects.Json.dumps({"a": 1},
+                                                        sort_keys=True))
+        self.assertRaises(TypeError, objects.Json.dumps,
+                          {"time": datetime.datetime.now()})
+
+    @mock.patch.object(objects, "orjson", None)
+    def test_dumps_json(self):
+        self.assertEqual('{"node": {"id": 1}}', objects.Json.dumps(
+            {"node": {"id": 1}}))
+        self.assertEqual({"id": 1}, objects.Json.loads('{"id": 1}'))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+import datetime
+
+import mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from DSpace import objects
+from DSpace.db.sqlalchemy import api
+from DSpace.db.sqlalchemy import models
+from DSpace.tests.unit import objects as test_objects
+from DSpace.utils.profile import QueryCounter
+
+fake_log_rollup = {
+    'id': 1,
+    'log_type': "alert_log",
+    'day': datetime.date(2020, 1, 1),
+    'resource_type': "osd",
+    'level': "WARN",
+    'count': 10,
+    'cluster_id': "8466c699-42c4-4abb-bae2-19b3ef0d8b90",
+    'created_at': None,
+    'updated_at': None,
+    'deleted_at': None,
+    'deleted': False,
+}
+
+
+class TestLogRollupList(test_objects.BaseObjectsTestCase):
+
+    @mock.patch('DSpace.db.log_rollup_get_all',
+                return_value=[fake_log_rollup])
+    def test_get_all(self, log_rollup_get_all):
+        log_rollups = objects.LogRollupList.get_all(self.context)
+        log_rollup_get_all.assert_called_once_with(
+            self.context, None, None, None, None, None, None)
+        self.assertEqual(1, len(log_rollups))
+        self.assertEqual("2020-01-01", log_rollups[0].day)
+        self.assertEqual(10, log_rollups[0].count)
+
+    @mock.patch('DSpace.db.log_rollup_refresh')
+    def test_refresh(self, log_rollup_refresh):
+        day = datetime.date(2020, 1, 1)
+        objects.LogRollupList.refresh(
+            self.context, objects.AlertLog,
+            fake_log_rollup['cluster_id'], day)
+        log_rollup_refresh.assert_called_once_with(
+            self.context, "AlertLog", fake_log_rollup['cluster_id'], day)
+
+    @mock.patch('DSpace.db.log_purge', return_value=2)
+    def test_log_purge(self, log_purge):
+        count = objects.log_rollup.log_purge(
+            self.context, objects.ActionLog, [1, 2])
+        self.assertEqual(2, count)
+        log_purge.assert_called_once_with(
+            self.context, "ActionLog", [1, 2])
+
+
+class TestLogCountCutoff(test_objects.BaseObjectsTestCase):
+
+    def setUp(self):
+        super(TestLogCountCutoff, self).setUp()
+        engine = create_engine(
+            "sqlite://", poolclass=StaticPool,
+            connect_args={"check_same_thread": False})
+        models.BASE.metadata.create_all(engine)
+        self.maker = sessionmaker(bind=engine, expire_on_commit=False)
+        patcher = mock.patch.object(api, "get_session",
+                                    lambda *a, **k: self.maker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cluster = objects.Cluster(self.context, display_name="cluster",
+                                  status="active")
+        cluster.create()
+        self.cluster_id = self.context.cluster_id = cluster.id
+        # 3 logs a day of 2020-01-01 .. 2020-01-04, 2 logs on 2020-01-05
+        self.created = []
+        session = self.maker()
+        with session.begin():
+            for day in range(1, 6):
+                for hour in range(3 if day < 5 else 2):
+                    created_at = datetime.datetime(2020, 1, day, hour)
+                    self.created.append(created_at)
+                    models.ActionLog(
+                        user_id="admin", status="success",
+                        resource_type="osd", cluster_id=self.cluster_id,
+                        created_at=created_at).save(session)
+        self.created.sort(reverse=True)
+
+    def _cutoff(self, keep):
+        return objects.log_rollup.log_count_cutoff_get(
+            self.context, objects.ActionLog, self.cluster_id, keep)
+
+    def _rollup(self, days):
+        for day in days:
+            objects.LogRollupList.refresh(
+                self.context, objects.ActionLog, self.cluster_id,
+                datetime.date(2020, 1, day))
+
+    def test_cutoff(self):
+        self._rollup(range(1, 5))
+        for keep in range(1, 15):
+            self.assertEqual(self.created[keep - 1], self._cutoff(keep))
+        self.assertIsNone(self._cutoff(15))
+
+    def test_cutoff_not_rolled_up(self):
+        for keep in (1, 5, 14):
+            self.assertEqual(self.created[keep - 1], self._cutoff(keep))
+        self.assertIsNone(self._cutoff(15))
+
+    def test_cutoff_purged_after_rollup(self):
+        self._rollup(range(1, 5))
+        # purged by age after the rollup, the rollups still count them
+        before = datetime.datetime(2020, 1, 2, 1)
+        session = self.maker()
+        with session.begin():
+            session.query(models.ActionLog).filter(
+                models.ActionLog.created_at < before).delete()
+        self.created = [c for c in self.created if c >= before]
+        for keep in range(1, 11):
+            self.assertEqual(self.created[keep - 1], self._cutoff(keep))
+        self.assertIsNone(self._cutoff(11))
+
+    def test_cutoff_deleted_purged(self):
+        self._rollup(range(1, 5))
+        # users delete logs of rolled up days, some are purged since
+        session = self.maker()
+        with session.begin():
+            logs = session.query(models.ActionLog).filter(
+                models.ActionLog.created_at.in_([
+                    datetime.datetime(2020, 1, 4, 1),
+                    datetime.datetime(2020, 1, 3, 0),
+                    datetime.datetime(2020, 1, 3, 2),
+                    datetime.datetime(2020, 1, 2, 1)])).all()
+            for log in logs:
+                log.deleted = True
+        purged = [log for log in logs if log.created_at.day > 2]
+        objects.log_rollup.log_purge(
+            self.context, objects.ActionLog, [log.id for log in purged])
+        for log in purged:
+            self.created.remove(log.created_at)
+        rollups = objects.LogRollupList.get_all(
+            self.context, filters={"day": datetime.date(2020, 1, 3)})
+        self.assertEqual(1, rollups[0].count)
+        # deleted logs not purged yet still count, as they are walked
+        for keep in range(1, 12):
+            self.assertEqual(self.created[keep - 1], self._cutoff(keep))
+        self.assertIsNone(self._cutoff(12))
+
+    def test_cutoff_queries(self):
+        self._rollup(range(1, 5))
+        with QueryCounter() as counter:
+            self.assertEqual(self.created[7], self._cutoff(8))
+        # oldest log, rollups, the days not rolled up (walked and counted)
+        # and the cutoff day
+        self.assertEqual(5, counter.count)
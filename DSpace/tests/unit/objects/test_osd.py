@@ -80,3 +80,38 @@ class TestOsdList(test_objects.BaseObjectsTestCase):
         self.assertEqual(1, len(osds))
         self.assertIsInstance(osds[0], objects.Osd)
         self._compare(self, fake_osd, osds[0])
+
+    @mock.patch('DSpace.db.osd_get_all',
+                return_value=[fake_osd])
+    def test_get_all_fields(self, osd_get_all):
+        fields = ['created_at', 'id', 'osd_id', 'status']
+        osds = objects.OsdList.get_all(
+            self.context, expected_attrs=['node', 'pools'], fields=fields)
+        # relations not in the fields are not loaded
+        osd_get_all.assert_called_once_with(
+            self.context, None, None, None, None, None, None, [],
+            fields=fields)
+        osd = osds[0]
+        self.assertFalse(osd.obj_attr_is_set('type'))
+        self.assertFalse(osd.obj_attr_is_set('metrics'))
+        self.assertEqual({'id': 1, 'osd_id': "2", 'status': "active",
+                          'created_at': None},
+                         osd.to_dict(optional=True))
+        primitive = osds.obj_to_primitive()['versioned_object.data']
+        self.assertEqual(set(fields), set(
+            primitive['objects'][0]['versioned_object.data']))
+
+    @mock.patch('DSpace.db.osd_status_update', return_value=[2])
+    def test_status_update(self, osd_status_update):
+        osds = [objects.Osd(context=self.context, id=i, status="active")
+                for i in (1, 2)]
+        for osd in osds:
+            osd.obj_reset_changes()
+        updated = objects.OsdList.status_update(
+            self.context, osds, "offline", ["active"])
+        osd_status_update.assert_called_once_with(
+            self.context, [1, 2], "offline", ["active"])
+        self.assertEqual([osds[1]], updated)
+        self.assertEqual("active", osds[0].status)
+        self.assertEqual("offline", osds[1].status)
+        self.assertEqual(set(), osds[1].obj_what_changed())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from DSpace import objects
+from DSpace.db.sqlalchemy import api
+from DSpace.db.sqlalchemy import models
+from DSpace.tests.unit import objects as test_objects
+from DSpace.utils.profile import QueryCounter
+
+
+class TestServiceList(test_objects.BaseObjectsTestCase):
+
+    def setUp(self):
+        super(TestServiceList, self).setUp()
+        engine = create_engine(
+            "sqlite://", poolclass=StaticPool,
+            connect_args={"check_same_thread": False})
+        models.BASE.metadata.create_all(engine)
+        maker = sessionmaker(bind=engine, expire_on_commit=False)
+        patcher = mock.patch.object(api, "get_session",
+                                    lambda *a, **k: maker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create(self, node_num):
+        cluster = objects.Cluster(self.context, display_name="cluster",
+                                  status="active")
+        cluster.create()
+        self.context.cluster_id = cluster.id
+        for i in range(node_num):
+            node = objects.Node(
+                self.context, hostname="node%s" % i, cluster_id=cluster.id,
+                ip_address="10.0.0.%s" % i, cluster_ip="10.1.0.%s" % i,
+                public_ip="10.2.0.%s" % i, status="active")
+            node.create()
+            for name in ("DSA", "NODE_EXPORTER", "CHRONY"):
+                objects.Service(
+                    self.context, name=name, node_id=node.id,
+                    cluster_id=cluster.id, status="active", role="base",
+                    counter=0).create()
+
+    def test_get_all_node_queries(self):
+        # the service map of the DSM startup, of all clusters
+        self._create(20)
+        with QueryCounter() as counter:
+            services = objects.ServiceList.get_all(
+                self.context, filters={'cluster_id': '*'},
+                expected_attrs=['node'])
+            hostnames = set(service.node.hostname for service in services)
+        self.assertEqual(60, len(services))
+        self.assertEqual(set("node%s" % i for i in range(20)), hostnames)
+        self.assertEqual(1, counter.count)
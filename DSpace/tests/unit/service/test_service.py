@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+
+import mock
+
+from DSpace import context
+from DSpace import objects
+from DSpace import test
+from DSpace.grpc import stor_pb2
+from DSpace.objects import base as objects_base
+from DSpace.service import read_only
+from DSpace.service.serializer import RequestContextSerializer
+from DSpace.service.service import Dispatcher
+from DSpace.service.service import Role
+from DSpace.service.service import ServiceCell
+
+
+class FakeHandler(object):
+
+    def __init__(self):
+        self.warm_up = mock.Mock()
+        self.bootstrap = mock.Mock()
+
+    @read_only
+    def thing_get(self, ctxt):
+        return "local"
+
+    def thing_update(self, ctxt):
+        return "updated"
+
+
+class TestServiceCell(test.TestCase):
+
+    def setUp(self):
+        super(TestServiceCell, self).setUp()
+        with mock.patch.object(ServiceCell, "init_etcd"):
+            self.cell = ServiceCell("127.0.0.1", 2080)
+        self.addCleanup(self.cell._executor.shutdown)
+        self.cell.master_endpoint = "10.0.0.1:2080"
+        self.handler = self.cell.handler = FakeHandler()
+        self.dispatcher = Dispatcher(self.cell, self.handler)
+        self.serializer = RequestContextSerializer(
+            objects_base.StorObjectSerializer())
+
+    def _call(self, method):
+        ctxt = context.get_context()
+        response = self.dispatcher.call(stor_pb2.Request(
+            context=objects.Json.dumps(
+                self.serializer.serialize_context(ctxt)),
+            method=method,
+            args=objects.Json.dumps([]),
+            kwargs=objects.Json.dumps({}),
+            version="v1.0"), None)
+        value = objects.Json.loads(response.value)
+        if isinstance(value, dict) and value.get("__type__") == "Redirect":
+            return "redirect %s" % value["endpoint"]
+        return value
+
+    def test_backup_redirects(self):
+        self.assertEqual("redirect 10.0.0.1:2080", self._call("thing_get"))
+        self.assertEqual("redirect 10.0.0.1:2080",
+                         self._call("thing_update"))
+
+    def test_warm_standby(self):
+        self.cell.warm_up()
+        self.assertTrue(self.cell.standby_ready)
+        self.assertEqual("local", self._call("thing_get"))
+        self.assertEqual("redirect 10.0.0.1:2080",
+                         self._call("thing_update"))
+
+    def test_refresh_error(self):
+        self.cell.warm_up()
+        self.handler.warm_up.side_effect = Exception("db gone")
+        self.assertRaises(Exception, self.cell.warm_up)
+        # stale state is not served
+        self.assertFalse(self.cell.standby_ready)
+        self.assertEqual("redirect 10.0.0.1:2080", self._call("thing_get"))
+
+    def test_master(self):
+        self.cell.role = Role.Master
+        self.assertEqual("local", self._call("thing_get"))
+        self.assertEqual("updated", self._call("thing_update"))
+        # no refresh on the master
+        self.cell.warm_up()
+        self.handler.warm_up.assert_not_called()
+
+    def test_to_master_waits_refresh(self):
+        refreshing = threading.Event()
+        release = threading.Event()
+
+        def warm_up():
+            refreshing.set()
+            release.wait(5)
+
+        self.handler.warm_up.side_effect = warm_up
+        refresh = threading.Thread(target=self.cell.warm_up)
+        refresh.start()
+        self.assertTrue(refreshing.wait(5))
+        failover = threading.Thread(target=self.cell.to_master)
+        failover.start()
+        failover.join(0.2)
+        # bootstrap waits for the refresh
+        self.assertTrue(failover.is_alive())
+        self.assertEqual(Role.Backup, self.cell.role)
+        self.handler.bootstrap.assert_not_called()
+        release.set()
+        refresh.join(5)
+        failover.join(5)
+        self.assertEqual(Role.Master, self.cell.role)
+        self.handler.bootstrap.assert_called_once_with()
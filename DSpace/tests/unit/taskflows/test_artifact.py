@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.common.config import CONF
+from DSpace.taskflows import artifact
+from DSpace.taskflows.artifact import ImageDistributor
+
+
+class TestImageDistributor(test.TestCase):
+
+    @mock.patch.object(objects.sysconfig, 'sys_config_get')
+    def _distributor(self, nodes, sys_config_get):
+        sys_config_get.return_value = "v"
+        distributor = ImageDistributor(None, nodes,
+                                       lambda node: mock.Mock())
+        distributor.repo_url = "repo"
+        distributor.enabled = mock.Mock(return_value=True)
+        return distributor
+
+    def test_distribute(self):
+        for name in ('artifact_seed_nodes', 'artifact_peer_fanout'):
+            CONF.set_override(name, 2)
+            self.addCleanup(CONF.clear_override, name)
+        nodes = [objects.Node(hostname="node%s" % i,
+                              ip_address="192.168.0.%s" % i)
+                 for i in range(1, 10)]
+        distributor = self._distributor(nodes)
+        # node9 has the image already
+        distributor._need_image = mock.Mock(
+            side_effect=lambda node: node.hostname != "node9")
+        fetched = {}
+
+        def _fetch(node, url):
+            fetched[node.hostname] = url
+            return "digest"
+
+        distributor._fetch = mock.Mock(side_effect=_fetch)
+        with mock.patch('DSpace.taskflows.artifact.ArtifactTool') as tool:
+            targets = distributor.distribute()
+        self.assertEqual(nodes[:8], sorted(
+            targets, key=lambda node: node.hostname))
+        self.assertEqual("digest", distributor.digest)
+        repo = [name for name, url in fetched.items() if url == "repo"]
+        self.assertEqual(["node1", "node2"], sorted(repo))
+        self.assertEqual(8, len(fetched))
+        # served on the ip address peers fetch from only
+        tool.return_value.serve_start.assert_any_call(
+            "192.168.0.1", CONF.artifact_peer_port)
+        # every serving node is stopped
+        self.assertEqual(tool.return_value.serve_start.call_count,
+                         tool.return_value.serve_stop.call_count)
+
+    def test_distribute_nothing(self):
+        nodes = [objects.Node(hostname="node1", ip_address="192.168.0.1")]
+        distributor = self._distributor(nodes)
+        distributor._need_image = mock.Mock(return_value=False)
+        distributor._fetch = mock.Mock()
+        self.assertEqual([], distributor.distribute())
+        distributor._fetch.assert_not_called()
+
+    def test_wait_own_copy(self):
+        for name in ('artifact_seed_nodes', 'artifact_peer_fanout'):
+            CONF.set_override(name, 1 if name == 'artifact_seed_nodes'
+                              else 2)
+            self.addCleanup(CONF.clear_override, name)
+        nodes = [objects.Node(hostname="node%s" % i,
+                              ip_address="192.168.0.%s" % i)
+                 for i in range(1, 4)]
+        distributor = self._distributor(nodes)
+        distributor._need_image = mock.Mock(return_value=True)
+        hung = threading.Event()
+
+        def _fetch(node, url):
+            if node.hostname == "node2":
+                # a slow copy
+                hung.wait(10)
+            return "digest"
+
+        distributor._fetch = mock.Mock(side_effect=_fetch)
+        distributor.register()
+        with mock.patch('DSpace.taskflows.artifact.ArtifactTool'):
+            t = threading.Thread(target=distributor.distribute)
+            t.start()
+            # node3 is not held by the copy to node2
+            self.assertEqual("digest", artifact.wait_image(nodes[2]))
+            self.assertFalse(hung.is_set())
+            self.assertIn("192.168.0.2", artifact._copies)
+            hung.set()
+            t.join(10)
+        self.assertEqual({}, artifact._copies)
+        # a node without a copy waits for nothing
+        self.assertIsNone(artifact.wait_image(nodes[0]))
+
+    def test_wait_failed_copy(self):
+        nodes = [objects.Node(hostname="node%s" % i,
+                              ip_address="192.168.0.%s" % i)
+                 for i in range(1, 3)]
+        distributor = self._distributor(nodes)
+        distributor._need_image = mock.Mock(return_value=True)
+
+        def _fetch(node, url):
+            if node.hostname == "node2":
+                raise Exception("checksum mismatch")
+            return "digest"
+
+        distributor._fetch = mock.Mock(side_effect=_fetch)
+        distributor.register()
+        with mock.patch('DSpace.taskflows.artifact.ArtifactTool'):
+            t = threading.Thread(target=distributor.distribute)
+            t.start()
+            self.assertEqual("digest", artifact.wait_image(nodes[0]))
+            # the file on node2 is not to be trusted
+            self.assertIsNone(artifact.wait_image(nodes[1]))
+            t.join(10)
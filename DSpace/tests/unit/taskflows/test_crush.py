@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import copy
+
+import mock
+
+from DSpace import test
+from DSpace.taskflows.ceph import CephTask
+from DSpace.taskflows.crush import CrushPlanner
+from DSpace.utils import coordination
+
+TB = 65536
+
+
+def _bucket(id, name, type_name, type_id, items, weight=0):
+    return {
+        "id": id, "name": name, "type_id": type_id, "type_name": type_name,
+        "weight": weight, "alg": "straw2", "hash": "rjenkins1",
+        "items": [{"id": i, "weight": w, "pos": p}
+                  for p, (i, w) in enumerate(items)],
+    }
+
+
+crushmap = {
+    "devices": [
+        {"id": 0, "name": "osd.0", "class": "hdd"},
+        {"id": 1, "name": "osd.1", "class": "hdd"},
+        {"id": 2, "name": "osd.2", "class": "hdd"},
+    ],
+    "types": [
+        {"type_id": 0, "name": "osd"},
+        {"type_id": 1, "name": "host"},
+        {"type_id": 3, "name": "rack"},
+        {"type_id": 8, "name": "datacenter"},
+        {"type_id": 10, "name": "root"},
+    ],
+    "buckets": [
+        _bucket(-1, "pool1", "root", 10, [(-2, TB), (-3, TB)], 2 * TB),
+        _bucket(-2, "pool1-node1", "host", 1, [(0, TB)], TB),
+        _bucket(-3, "pool1-node2", "host", 1, [(1, TB)], TB),
+        _bucket(-4, "pool1-node2~hdd", "host", 1, [(1, TB)], TB),
+    ],
+    "rules": [],
+}
+
+
+def _content(hosts, racks=None, fault_domain="host"):
+    osds = {}
+    for host in hosts.values():
+        for name in host["osds"]:
+            osds[name] = {"id": name.split(".")[1], "name": name,
+                          "size": 2 ** 40, "disk_type": "hdd"}
+    return {
+        "fault_domain": fault_domain,
+        "root_name": "pool1",
+        "crush_rule_name": "pool1",
+        "crush_rule_type": "replicated",
+        "datacenters": {},
+        "racks": racks or {},
+        "hosts": hosts,
+        "osds": osds,
+    }
+
+
+class TestCrushPlanner(test.TestCase):
+
+    def _plan(self, content):
+        planner = CrushPlanner(copy.deepcopy(crushmap), content)
+        changes = planner.plan()
+        buckets = CephTask(None)._calculate_weight(planner.buckets_by_id())
+        return changes, {b["name"]: b for b in buckets.values()}
+
+    def test_nothing_changed(self):
+        content = _content({
+            "node1": {"crush_name": "pool1-node1", "osds": ["osd.0"]},
+            "node2": {"crush_name": "pool1-node2", "osds": ["osd.1"]},
+        })
+        changes, buckets = self._plan(content)
+        self.assertEqual([], changes)
+        self.assertEqual(2 * TB, buckets["pool1"]["weight"])
+
+    def test_add_osd_and_remove_host(self):
+        content = _content({
+            "node1": {"crush_name": "pool1-node1",
+                      "osds": ["osd.0", "osd.2"]},
+        })
+        changes, buckets = self._plan(content)
+        self.assertEqual([
+            {"op": "add", "type": "osd", "name": "osd.2",
+             "parent": "pool1-node1"},
+            {"op": "remove", "type": "osd", "name": "osd.1"},
+            {"op": "remove", "type": "host", "name": "pool1-node2"},
+        ], changes)
+        self.assertNotIn("pool1-node2", buckets)
+        self.assertNotIn("pool1-node2~hdd", buckets)
+        self.assertEqual([0, 2], [
+            i["id"] for i in buckets["pool1-node1"]["items"]])
+        self.assertEqual(2 * TB, buckets["pool1-node1"]["weight"])
+        self.assertEqual([(-2, 2 * TB)], [
+            (i["id"], i["weight"]) for i in buckets["pool1"]["items"]])
+        self.assertEqual(2 * TB, buckets["pool1"]["weight"])
+
+    def test_move_hosts_to_rack(self):
+        content = _content({
+            "node1": {"crush_name": "pool1-node1", "osds": ["osd.0"]},
+            "node2": {"crush_name": "pool1-node2", "osds": ["osd.1"]},
+        }, racks={
+            "1": {"crush_name": "pool1-rack1",
+                  "hosts": ["node1", "node2"]},
+        }, fault_domain="rack")
+        changes, buckets = self._plan(content)
+        self.assertEqual([
+            {"op": "add", "type": "rack", "name": "pool1-rack1"},
+            {"op": "move", "type": "host", "name": "pool1-node1",
+             "parent": "pool1-rack1"},
+            {"op": "move", "type": "host", "name": "pool1-node2",
+             "parent": "pool1-rack1"},
+            {"op": "move", "type": "rack", "name": "pool1-rack1",
+             "parent": "pool1"},
+        ], sorted(changes, key=lambda c: (c["op"], c["name"])))
+        rack = buckets["pool1-rack1"]
+        self.assertEqual(-5, rack["id"])
+        self.assertEqual(2 * TB, rack["weight"])
+        self.assertEqual([-5], [i["id"] for i in buckets["pool1"]["items"]])
+        self.assertEqual(2 * TB, buckets["pool1"]["weight"])
+
+    @mock.patch.object(coordination.COORDINATOR, "get_lock")
+    @mock.patch("DSpace.taskflows.ceph.RADOSClient")
+    def test_crush_plan(self, rados_client, get_lock):
+        client = rados_client.return_value.__enter__.return_value
+        client.get_crushmap.return_value = copy.deepcopy(crushmap)
+        content = _content({
+            "node1": {"crush_name": "pool1-node1",
+                      "osds": ["osd.0", "osd.2"]},
+            "node2": {"crush_name": "pool1-node2", "osds": ["osd.1"]},
+        })
+        task = CephTask(None)
+        with mock.patch.object(CephTask, "rados_args", return_value={}):
+            changes = task.crush_plan(content)
+        self.assertEqual([
+            {"op": "add", "type": "osd", "name": "osd.2",
+             "parent": "pool1-node1"},
+        ], changes)
+        client.set_crushmap.assert_not_called()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.taskflows import artifact
+from DSpace.taskflows.artifact import ImageDistributor
+from DSpace.taskflows.include import InstallService
+
+
+class TestInstallService(test.TestCase):
+
+    @mock.patch.object(ImageDistributor, "enabled", return_value=True)
+    @mock.patch.object(objects.sysconfig, "sys_config_get", return_value="v")
+    @mock.patch("DSpace.taskflows.include.SSHExecutor")
+    @mock.patch("DSpace.taskflows.include.engines")
+    def test_image_distribute(self, engines, ssh_executor, sys_config_get,
+                              enabled):
+        nodes = [objects.Node(id=i, hostname="node%s" % i,
+                              ip_address="192.168.0.%s" % i,
+                              password="p")
+                 for i in range(1, 3)]
+        digests = {}
+
+        def run(flow, store, engine):
+            # the node flows start with the copies registered, and the
+            # distribution runs meanwhile
+            for node in nodes:
+                digests[node.hostname] = artifact.wait_image(node)
+
+        engines.run.side_effect = run
+        with mock.patch("DSpace.taskflows.artifact.DockerTool") as docker, \
+                mock.patch.object(ImageDistributor, "_fetch",
+                                  return_value="digest"), \
+                mock.patch("DSpace.taskflows.artifact.ArtifactTool"):
+            docker.return_value.image_exists.return_value = False
+            self.assertTrue(InstallService("Install Service").execute(
+                None, nodes, {}))
+        self.assertEqual({"node1": "digest", "node2": "digest"}, digests)
+        self.assertEqual({}, artifact._copies)
+        # the distributor has ssh executors of its own, closed when done
+        ssh_executor.assert_any_call(hostname="192.168.0.2", password="p")
+        self.assertEqual(2, ssh_executor.return_value.close.call_count)
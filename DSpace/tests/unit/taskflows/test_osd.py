@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import mock
+
+from DSpace import exception
+from DSpace import objects
+from DSpace import test
+from DSpace.taskflows.osd import OsdBatchCreate
+from DSpace.taskflows.osd import OsdUpWaiter
+
+
+def _tree(up):
+    return {"nodes": [{"id": -1, "type": "root"}],
+            "stray": [{"id": i, "name": "osd.%s" % i, "status": "up"}
+                      for i in up]}
+
+
+class TestOsdUpWaiter(test.TestCase):
+
+    def test_wait_shared_poll(self):
+        ceph_client = mock.Mock()
+        polls = []
+
+        def _get_osd_tree():
+            polls.append(time.time())
+            # all osds up at the second poll
+            return _tree(range(8) if len(polls) > 1 else [0])
+
+        ceph_client.get_osd_tree.side_effect = _get_osd_tree
+        waiter = OsdUpWaiter(ceph_client, interval=0.05, timeout=5)
+        threads = [threading.Thread(target=waiter.wait,
+                                    args=("osd.%s" % i,))
+                   for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(2, waiter.polls)
+        self.assertGreaterEqual(polls[1] - polls[0], 0.05)
+
+    def test_wait_timeout(self):
+        ceph_client = mock.Mock()
+        ceph_client.get_osd_tree.return_value = _tree([])
+        waiter = OsdUpWaiter(ceph_client, interval=0.01, timeout=0.05)
+        self.assertRaises(exception.OsdStatusNotUp, waiter.wait, "osd.1")
+
+
+class TestOsdBatchCreate(test.TestCase):
+
+    def test_run(self):
+        ceph_client = mock.Mock()
+        ceph_client.osds_new.side_effect = lambda fsids: {
+            fsid: int(fsid[-1]) for fsid in fsids}
+        osds = [objects.Osd(id=i, osd_id=None, fsid="fsid%s" % i,
+                            node_id=i % 2)
+                for i in range(6)]
+        running = {0: 0, 1: 0}
+        max_running = {0: 0, 1: 0}
+        lock = threading.Lock()
+        created = []
+
+        def _create(osd, waiter):
+            with lock:
+                running[osd.node_id] += 1
+                max_running[osd.node_id] = max(max_running[osd.node_id],
+                                               running[osd.node_id])
+            time.sleep(0.02)
+            with lock:
+                running[osd.node_id] -= 1
+                created.append((osd.osd_id, waiter))
+            if osd.id == 5:
+                raise exception.StorException("error")
+
+        batch = OsdBatchCreate(None, node_concurrency=2,
+                               ceph_client=ceph_client)
+        batch.run(osds, _create)
+        ceph_client.osds_new.assert_called_once_with(
+            ["fsid%s" % i for i in range(6)])
+        self.assertEqual(["0", "1", "2", "3", "4", "5"],
+                         sorted(osd_id for osd_id, _ in created))
+        # one waiter shared by all osds
+        self.assertEqual(1, len(set(waiter for _, waiter in created)))
+        self.assertEqual({0: 2, 1: 2}, max_running)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.objects import fields as s_fields
+from DSpace.taskflows import osd_check
+
+OsdStatus = s_fields.OsdStatus
+
+
+def _osd(id, status, node_id=1, node_status=s_fields.NodeStatus.ACTIVE):
+    node = objects.Node(id=node_id, status=node_status)
+    return objects.Osd(id=id, osd_id=str(id), status=status,
+                       node_id=node_id, node=node)
+
+
+def _tree_node(id, status="up", reweight=1.0):
+    return {"id": id, "name": "osd.%s" % id, "type": "osd",
+            "status": status, "reweight": reweight}
+
+
+class TestOsdChecker(test.TestCase):
+
+    def _checker(self, tree, num_up_osds=10, agent_status=None):
+        ceph_client = mock.Mock()
+        ceph_client.get_osd_tree.return_value = {
+            "nodes": [{"id": -1, "type": "root"}] + tree, "stray": []}
+        ceph_client.get_osd_stat.return_value = {
+            "num_osds": 10, "num_up_osds": num_up_osds}
+        return osd_check.OsdChecker(ceph_client, agent_status or mock.Mock())
+
+    def test_plan(self):
+        osds = [_osd(0, OsdStatus.OFFLINE),
+                _osd(1, OsdStatus.ACTIVE),
+                _osd(2, OsdStatus.ACTIVE),
+                _osd(3, OsdStatus.ACTIVE),
+                _osd(4, OsdStatus.ACTIVE),
+                _osd(5, OsdStatus.CREATING),
+                _osd(6, OsdStatus.RESTARTING),
+                _osd(7, OsdStatus.OFFLINE,
+                     node_status=s_fields.NodeStatus.DELETING)]
+        checker = self._checker([
+            _tree_node(0), _tree_node(1), _tree_node(2, status="down"),
+            _tree_node(3, reweight=0), _tree_node(6, status="down"),
+            _tree_node(7)])
+        states = checker.osd_states(osds)
+        plan = checker.plan({osd.osd_id: osd for osd in osds}, states)
+        self.assertEqual({
+            osd_check.ACTIVE: [osds[0]],
+            osd_check.DOWN: [osds[2]],
+            osd_check.OUT: [osds[3]],
+            osd_check.MISSING: [osds[4]],
+        }, plan)
+        checker.ceph_client.get_osd_tree.assert_called_once_with()
+        checker.agent_status.assert_not_called()
+
+    def test_osd_states_from_agents(self):
+        osds = [_osd(0, OsdStatus.ACTIVE, node_id=1),
+                _osd(1, OsdStatus.ACTIVE, node_id=2),
+                _osd(2, OsdStatus.ACTIVE, node_id=2)]
+
+        def _agent_status(node_id, node_osds):
+            if node_id == 1:
+                return {"osd.0": "down"}
+            return {"osd.{}".format(osd.osd_id): "up" for osd in node_osds}
+
+        agent_status = mock.Mock(side_effect=_agent_status)
+        checker = self._checker(
+            [_tree_node(0), _tree_node(1, status="down"), _tree_node(2)],
+            num_up_osds=1, agent_status=agent_status)
+        self.assertEqual({"0": "in&down", "1": "in&up", "2": "in&up"},
+                         checker.osd_states(osds))
+        # one call per node
+        self.assertEqual(2, agent_status.call_count)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import objects
+from DSpace import test
+from DSpace.taskflows.probe import ProbeEngine
+from DSpace.taskflows.probe import ProbeTask
+
+
+class TestProbeEngine(test.TestCase):
+
+    def test_run(self):
+        def _probe(task, probes, checks=None):
+            if str(task.node.ip_address) == "192.168.0.2":
+                raise Exception("auth failed")
+            return {"collect_nodes": str(task.node.ip_address)}
+
+        nodes = [objects.Node(ip_address="192.168.0.%s" % i)
+                 for i in range(1, 4)]
+        on_result = mock.Mock()
+        with mock.patch.object(ProbeTask, 'probe', autospec=True,
+                               side_effect=_probe):
+            engine = ProbeEngine(None, ["collect_nodes"],
+                                 on_result=on_result, workers=2)
+            res = engine.run(nodes)
+        self.assertEqual([
+            (nodes[0], {"collect_nodes": "192.168.0.1"}, None),
+            (nodes[1], None, "auth failed"),
+            (nodes[2], {"collect_nodes": "192.168.0.3"}, None),
+        ], res)
+        self.assertEqual(3, on_result.call_count)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+
+from DSpace import exception
+from DSpace import test
+from DSpace.tools.admin_socket import AdminSocket
+from DSpace.tools.base import Executor
+
+
+class FakeDaemon(object):
+    """Answers admin socket commands like a ceph daemon"""
+
+    def __init__(self, path, outputs):
+        self.path = path
+        self.outputs = outputs
+        self.commands = []
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen(8)
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except (socket.error, OSError):
+                return
+            data = b""
+            while not data.endswith(b"\0"):
+                data += conn.recv(1024)
+            cmd = json.loads(data[:-1].decode("utf-8"))
+            self.commands.append(cmd)
+            out = json.dumps(self.outputs[cmd["prefix"]]).encode("utf-8")
+            conn.sendall(struct.pack(">I", len(out)) + out)
+            conn.close()
+
+    def close(self):
+        try:
+            # wakes up accept
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except (socket.error, OSError):
+            pass
+        self.sock.close()
+
+
+class TestAdminSocket(test.TestCase):
+
+    def setUp(self):
+        super(TestAdminSocket, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.asok_dir = os.path.join(self.root, "var/run/ceph")
+        os.makedirs(self.asok_dir)
+        self.tool = AdminSocket(Executor(host_prefix=self.root))
+
+    def _daemon(self, name, outputs):
+        daemon = FakeDaemon(
+            os.path.join(self.asok_dir, "ceph-{}.asok".format(name)),
+            outputs)
+        self.addCleanup(daemon.close)
+        return daemon
+
+    def test_sockets(self):
+        self._daemon("osd.1", {})
+        self._daemon("mon.node1", {})
+        self.assertEqual(["mon.node1", "osd.1"],
+                         sorted(self.tool.sockets()))
+        self.assertEqual(["osd.1"], list(self.tool.sockets("osd")))
+
+    def test_command(self):
+        daemon = self._daemon("osd.1", {"status": {"state": "active"}})
+        self.assertEqual({"state": "active"},
+                         self.tool.command("osd.1", "status"))
+        self.assertEqual([{"prefix": "status", "format": "json"}],
+                         daemon.commands)
+        self.assertRaises(exception.AdminSocketError,
+                          self.tool.command, "osd.2", "status")
+
+    def test_command_all(self):
+        for i in range(3):
+            self._daemon("osd.{}".format(i),
+                         {"perf dump": {"osd": {"op": i}}})
+        # a dead daemon leaves its socket
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(os.path.join(self.asok_dir, "ceph-osd.3.asok"))
+        dead.close()
+        res = self.tool.perf_dump(["osd.0", "osd.1", "osd.2", "osd.3",
+                                   "osd.4"])
+        for i in range(3):
+            self.assertEqual({"osd": {"op": i}}, res["osd.{}".format(i)])
+        self.assertIsInstance(res["osd.3"], exception.AdminSocketError)
+        self.assertIsInstance(res["osd.4"], exception.AdminSocketError)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+import mock
+
+from DSpace import exception
+from DSpace import test
+from DSpace.tools.artifact import Artifact
+from DSpace.tools.base import Executor
+
+PATH = "/tmp/dspace_artifacts/image.tar"
+
+
+class TestArtifactTool(test.TestCase):
+
+    def _run(self, results):
+        def run_command(cmd, **kwargs):
+            return results.get(cmd[0], (0, "", ""))
+        return run_command
+
+    @mock.patch.object(Executor, 'run_command')
+    def test_fetch(self, run_command):
+        run_command.side_effect = self._run(
+            {"sha256sum": (0, "abc  %s.part\n" % PATH, "")})
+        tool = Artifact(Executor())
+        self.assertEqual("abc", tool.fetch("image.tar", "url", "abc"))
+        # downloaded aside, moved into place once verified
+        run_command.assert_any_call(
+            ["curl", "-f", "-s", "-S", "-o", PATH + ".part", "url"])
+        run_command.assert_called_with(["mv", "-f", PATH + ".part", PATH])
+
+    @mock.patch.object(Executor, 'run_command')
+    def test_fetch_mismatch(self, run_command):
+        run_command.side_effect = self._run(
+            {"sha256sum": (0, "bad  %s.part\n" % PATH, "")})
+        tool = Artifact(Executor())
+        self.assertRaises(exception.InvalidInput, tool.fetch,
+                          "image.tar", "url", "abc")
+        run_command.assert_called_with(["rm", "-f", PATH + ".part"])
+        self.assertNotIn(mock.call(["mv", "-f", PATH + ".part", PATH]),
+                         run_command.call_args_list)
+
+    @mock.patch.object(Executor, 'run_command')
+    def test_fetch_error(self, run_command):
+        # curl stopped partway
+        run_command.side_effect = self._run({"curl": (18, "", "partial")})
+        tool = Artifact(Executor())
+        self.assertRaises(exception.RunCommandError, tool.fetch,
+                          "image.tar", "url")
+        run_command.assert_called_with(["rm", "-f", PATH + ".part"])
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import mock
+
+from DSpace import test
+from DSpace.tools import iscsi
+
+
+@mock.patch.object(iscsi, '_save_config')
+@mock.patch.object(iscsi, 'RTSRoot')
+class TestIscsiTransaction(test.TestCase):
+
+    def test_save_once(self, rts_root, save_config):
+        with iscsi.transaction():
+            iscsi.save_config()
+            with iscsi.transaction():
+                iscsi.save_config()
+        save_config.assert_called_once_with(iscsi.DEFAULT_SAVE_FILE)
+
+    def test_rollback(self, rts_root, save_config):
+        rts_root.return_value.dump.return_value = {"targets": []}
+
+        def _change():
+            with iscsi.transaction():
+                iscsi.save_config()
+                raise ValueError()
+
+        self.assertRaises(ValueError, _change)
+        rts_root.return_value.restore.assert_called_once_with(
+            {"targets": []}, clear_existing=True)
+        save_config.assert_not_called()
+        self.assertIsNone(iscsi._current_transaction())
+
+    def test_backstore_index(self, rts_root, save_config):
+        so = mock.Mock()
+        so.name = "vol1"
+        rts_root.return_value.storage_objects = [so]
+        with iscsi.transaction():
+            self.assertIs(so, iscsi.get_user_backstore("vol1"))
+            self.assertIsNone(iscsi.get_user_backstore("vol2"))
+        # index built once, besides the snapshot
+        self.assertEqual(2, rts_root.call_count)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+
+import mock
+
+from DSpace import test
+from DSpace.tools.base import Executor
+from DSpace.tools.probe import ProbeTool
+
+
+class TestProbeTool(test.TestCase):
+
+    @mock.patch.object(Executor, 'write')
+    @mock.patch.object(Executor, 'run_command')
+    def test_probe(self, run_command, write):
+        result = {"collect_nodes": [], "ceph_osd": {"error": "failed"}}
+        run_command.return_value = (0, json.dumps(result), "")
+        tool = ProbeTool(Executor())
+        self.assertEqual(result, tool.probe(["collect_nodes", "ceph_osd"],
+                                            checks=["hostname"]))
+        run_command.assert_called_once_with(
+            ['python', '/tmp/ceph_collect.py', 'probe',
+             '--probes', 'collect_nodes', 'ceph_osd',
+             '--checks', 'hostname'])
+        tool.probe_node_osd()
+        # the collector is uploaded only once
+        self.assertEqual(1, write.call_count)
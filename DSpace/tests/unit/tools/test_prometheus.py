@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+
+import mock
+
+from DSpace import context
+from DSpace import test
+from DSpace.tools.prometheus import PrometheusTool
+from DSpace.tools.prometheus import pg_state_summary
+
+
+def _result(*items):
+    return json.dumps({"status": "success", "data": {"result": [
+        {"metric": metric, "value": value} for metric, value in items]}})
+
+
+class TestPgStateSummary(test.TestCase):
+
+    def test_summary(self):
+        res = pg_state_summary([
+            "active+clean", "active+clean", "stale+active+clean",
+            "active+recovering", "active+undersized+degraded"])
+        self.assertEqual({"healthy": 0.4, "recovering": 0.2,
+                          "degraded": 0.2, "unactive": 0.2}, res)
+
+    def test_empty(self):
+        self.assertEqual({"healthy": 0, "recovering": 0, "degraded": 0,
+                          "unactive": 0}, pg_state_summary([]))
+
+
+@mock.patch.object(PrometheusTool, "prometheus_url", "http://127.0.0.1:9090")
+@mock.patch("DSpace.tools.prometheus.PrometheusClient")
+class TestPrometheusPools(test.TestCase):
+
+    def setUp(self):
+        super(TestPrometheusPools, self).setUp()
+        self.ctxt = context.get_context(cluster_id="c1", user_id="admin")
+
+    def test_pools_get_capacity(self, client):
+        queries = []
+
+        def query(metric, filter=None):
+            queries.append(metric)
+            if metric.startswith("ceph_pool_max_avail"):
+                return _result(({"pool_id": "1"}, [0, "100"]),
+                               ({"pool_id": "2"}, [0, "200"]))
+            return _result()
+        client.return_value.query.side_effect = query
+
+        res = PrometheusTool(self.ctxt).pools_get_capacity()
+        self.assertEqual({"1": [0, "100"], "2": [0, "200"]},
+                         res["max_avail"])
+        self.assertEqual({}, res["bytes_used"])
+        self.assertEqual({}, res["total_bytes"])
+        # one vector query per metric, every series filtered by cluster
+        self.assertEqual(5, len(queries))
+        self.assertIn('ceph_pool_max_avail{cluster_id="c1"}', queries)
+        self.assertIn('ceph_pool_read_bytes_sec{cluster_id="c1"} + '
+                      'ceph_pool_write_bytes_sec{cluster_id="c1"}', queries)
+
+    def test_pools_get_pg_state(self, client):
+        client.return_value.query.return_value = _result(
+            ({"pool_id": "1", "state": "active+clean"}, [0, "1"]),
+            ({"pool_id": "1", "state": "stale+active+clean"}, [0, "1"]),
+            ({"pool_id": "2", "state": "active+clean"}, [0, "1"]))
+
+        res = PrometheusTool(self.ctxt).pools_get_pg_state()
+        client.return_value.query.assert_called_once_with(
+            metric="ceph_pg_metadata", filter={"cluster_id": "c1"})
+        self.assertEqual(0.5, res["1"]["healthy"])
+        self.assertEqual(0.5, res["1"]["unactive"])
+        self.assertEqual(1, res["2"]["healthy"])
+
+    def test_pools_get_pg_state_error(self, client):
+        client.return_value.query.side_effect = Exception("timeout")
+        tool = PrometheusTool(self.ctxt)
+        self.assertRaises(Exception, tool.pools_get_pg_state)
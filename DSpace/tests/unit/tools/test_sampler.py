@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+
+import mock
+
+from DSpace import test
+from DSpace.tools import sampler
+from DSpace.tools.base import Executor
+from DSpace.tools.sampler import ResourceSampler
+
+MEMINFO = "MemTotal:        1000000 kB\nMemFree:          500000 kB\n"
+
+
+class TestResourceSampler(test.TestCase):
+
+    def setUp(self):
+        super(TestResourceSampler, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.addCleanup(sampler._history_clear)
+        self.tool = ResourceSampler(Executor(host_prefix=self.root))
+        self._write("proc/meminfo", MEMINFO)
+        self.system(0)
+
+    def _write(self, path, content):
+        path = os.path.join(self.root, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write(content)
+
+    def system(self, ticks):
+        self._write("proc/stat", "cpu  {} 0 0 0 0 0 0 0 0 0\n".format(ticks))
+
+    def process(self, pid, name, ticks, rss_pages):
+        self._write("proc/{}/cmdline".format(pid),
+                    "/usr/bin/radosgw\0-n\0client.{}\0".format(name))
+        fields = ["S"] + ["0"] * 40
+        fields[11] = str(ticks)
+        fields[21] = str(rss_pages)
+        self._write("proc/{}/stat".format(pid),
+                    "{} (radosgw x) {}".format(pid, " ".join(fields)))
+
+    def test_container_v2(self):
+        self._write("sys/fs/cgroup/cgroup.controllers", "cpu memory")
+        cgroup = "sys/fs/cgroup/system.slice/docker-c1.scope/"
+        self._write(cgroup + "memory.current", "3000\n")
+        self._write(cgroup + "memory.stat",
+                    "anon 1000\nactive_file 500\ninactive_file 500\n")
+        self._write(cgroup + "cpu.stat", "usage_usec 1000\n")
+
+        def _sleep(seconds):
+            # one cpu second of all 4 cpu seconds
+            self.system(4 * sampler.CLK_TCK)
+            self._write(cgroup + "cpu.stat", "usage_usec 1001000\n")
+
+        with mock.patch.object(sampler.time, "sleep", _sleep):
+            res = self.tool.sample(containers={"haproxy": "c1",
+                                               "missing": "c2"})
+        self.assertEqual({"haproxy"}, set(res["containers"]))
+        usage = res["containers"]["haproxy"]
+        self.assertAlmostEqual(25.0, usage["cpu_percent"])
+        self.assertEqual(2000, usage["memory_bytes"])
+        self.assertAlmostEqual(2000 * 100.0 / 1024000000,
+                               usage["memory_percent"])
+
+    def test_container_v1(self):
+        self._write("sys/fs/cgroup/cpuacct/docker/c1/cpuacct.usage", "5\n")
+        memory = "sys/fs/cgroup/memory/docker/c1/"
+        self._write(memory + "memory.usage_in_bytes", "3000\n")
+        self._write(memory + "memory.stat", "inactive_file 1000\n")
+        with mock.patch.object(sampler.time, "sleep"):
+            res = self.tool.sample(containers={"haproxy": "c1"})
+        self.assertEqual(2000, res["containers"]["haproxy"]["memory_bytes"])
+
+    @mock.patch.object(sampler.time, "time")
+    def test_process_history(self, mock_time):
+        mock_time.return_value = 100
+        self.process(10, "rgw.node1", 0, 10)
+        self.process(11, "rgw.node2", 0, 10)
+        with mock.patch.object(sampler.time, "sleep") as sleep:
+            self.tool.sample(processes=["rgw.node1", "rgw.node2"])
+            self.assertEqual(1, sleep.call_count)
+            # known processes are not sampled again
+            mock_time.return_value = 110
+            self.system(100)
+            self.process(10, "rgw.node1", 5 * sampler.CLK_TCK, 20)
+            res = self.tool.sample(processes=["rgw.node1", "rgw.node2",
+                                              "rgw.node3"])
+            self.assertEqual(1, sleep.call_count)
+        processes = res["processes"]
+        self.assertEqual({"rgw.node1", "rgw.node2"}, set(processes))
+        # 5s of cpu time in 10s
+        self.assertAlmostEqual(50.0, processes["rgw.node1"]["cpu_percent"])
+        self.assertEqual(0.0, processes["rgw.node2"]["cpu_percent"])
+        self.assertEqual(20 * sampler.PAGE_SIZE,
+                         processes["rgw.node1"]["memory_bytes"])
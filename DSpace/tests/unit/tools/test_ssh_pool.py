@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+
+import mock
+
+from DSpace import test
+from DSpace.tools.ssh_pool import SSHConnectionPool
+
+
+def fake_ssh(active=True):
+    ssh = mock.Mock()
+    ssh.get_transport.return_value.is_active.return_value = active
+    return ssh
+
+
+class TestSSHConnectionPool(test.TestCase):
+
+    def setUp(self):
+        super(TestSSHConnectionPool, self).setUp()
+        self.pool = SSHConnectionPool()
+        self.pool._reaper = True
+        self.key = self.pool.make_key("10.0.0.1", 22, "root", "pw", None)
+
+    def test_reuse(self):
+        connect = mock.Mock(side_effect=[fake_ssh(), fake_ssh()])
+        conn1 = self.pool.acquire(self.key, connect)
+        conn2 = self.pool.acquire(self.key, connect)
+        self.assertIs(conn1, conn2)
+        self.assertEqual(2, conn1.users)
+        connect.assert_called_once_with()
+
+    def test_reconnect(self):
+        ssh = fake_ssh()
+        connect = mock.Mock(side_effect=[ssh, fake_ssh()])
+        conn1 = self.pool.acquire(self.key, connect)
+        self.pool.release(conn1)
+        ssh.get_transport.return_value.is_active.return_value = False
+        conn2 = self.pool.acquire(self.key, connect)
+        self.assertIsNot(conn1, conn2)
+        ssh.close.assert_called_once_with()
+
+    def test_release_holding_lock(self):
+        conn = self.pool.acquire(self.key, mock.Mock(return_value=fake_ssh()))
+
+        def finalizer_in_lock():
+            # e.g. SSHExecutor.__del__ run by gc inside acquire
+            with self.pool._lock:
+                self.pool.release(conn)
+
+        t = threading.Thread(target=finalizer_in_lock)
+        t.daemon = True
+        t.start()
+        t.join(5)
+        self.assertFalse(t.is_alive())
+        self.assertEqual(0, conn.users)
+
+    def test_reap(self):
+        connect = mock.Mock(side_effect=[fake_ssh(), fake_ssh()])
+        conn1 = self.pool.acquire(self.key, connect)
+        conn2 = self.pool.acquire(
+            self.pool.make_key("10.0.0.2", 22, "root", "pw", None), connect)
+        self.pool.release(conn1)
+        conn1.last_used = 0
+        self.pool.reap()
+        conn1.ssh.close.assert_called_once_with()
+        conn2.ssh.close.assert_not_called()
+        self.assertEqual([conn2.key], list(self.pool._conns))
+
+    def test_sftp_cached(self):
+        conn = self.pool.acquire(self.key, fake_ssh)
+        with conn.sftp():
+            pass
+        with conn.sftp():
+            pass
+        conn.ssh.open_sftp.assert_called_once_with()
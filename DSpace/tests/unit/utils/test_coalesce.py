@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
+
+from DSpace import test
+from DSpace.utils.coalesce import Coalescer
+from DSpace.utils.coalesce import coalesce_key
+
+
+class TestCoalescer(test.TestCase):
+
+    def setUp(self):
+        super(TestCoalescer, self).setUp()
+        self.loop = IOLoop()
+        self.addCleanup(self.loop.close)
+
+    def test_coalesce(self):
+        coalescer = Coalescer()
+        calls = []
+
+        def _call(value):
+            f = Future()
+            calls.append((f, value))
+            return f
+
+        async def _run():
+            key = coalesce_key("cluster_status", "c1")
+            f1 = coalescer.call(key, _call, 1)
+            f2 = coalescer.call(key, _call, 1)
+            f3 = coalescer.call(coalesce_key("cluster_status", "c2"),
+                                _call, 2)
+            self.assertEqual(2, coalescer.inflight())
+            for f, value in calls:
+                f.set_result(value)
+            res = [(await f1), (await f2), (await f3)]
+            # a finished call is not shared with later callers
+            coalescer.call(key, _call, 1)
+            return res
+
+        self.assertEqual([1, 1, 2], self.loop.run_sync(_run))
+        self.assertEqual(3, len(calls))
+        self.assertEqual(1, coalescer.coalesced)
+
+    def test_coalesce_exception(self):
+        coalescer = Coalescer()
+        inflight = Future()
+
+        async def _run():
+            f1 = coalescer.call("k", lambda: inflight)
+            f2 = coalescer.call("k", lambda: inflight)
+            inflight.set_exception(ValueError("error"))
+            for f in (f1, f2):
+                with self.assertRaises(ValueError):
+                    await f
+            return coalescer.inflight()
+
+        self.assertEqual(0, self.loop.run_sync(_run))
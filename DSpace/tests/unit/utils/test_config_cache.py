@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import test
+from DSpace.utils import config_cache
+
+
+class TestConfigCache(test.TestCase):
+
+    def setUp(self):
+        super(TestConfigCache, self).setUp()
+        self.cache = config_cache.ConfigCache()
+        self.cache.watching = True
+        self.ctxt = mock.Mock(cluster_id="c1")
+
+    def test_read_through(self):
+        loader = mock.Mock(return_value={"a": 1})
+        value = self.cache.get(self.ctxt, "sys_config", None, "k", loader)
+        value["a"] = 2
+        value = self.cache.get(self.ctxt, "sys_config", None, "k", loader)
+        self.assertEqual({"a": 1}, value)
+        self.assertEqual(1, loader.call_count)
+        self.assertEqual({"sys_config": {"hits": 1, "misses": 1}},
+                         self.cache.stats())
+
+    def test_bump(self):
+        loader = mock.Mock(side_effect=[1, 2])
+        self.cache.get(self.ctxt, "ceph_config", "global", "k", loader)
+        self.cache.bump()
+        self.assertEqual(
+            2, self.cache.get(self.ctxt, "ceph_config", "global", "k", loader))
+
+    def test_changed_while_loading(self):
+        def loader():
+            self.cache.bump()
+            return 1
+
+        self.cache.get(self.ctxt, "sys_config", None, "k", loader)
+        self.assertEqual({}, self.cache._entries)
+
+    def test_not_watching(self):
+        self.cache.watching = False
+        loader = mock.Mock(return_value=1)
+        self.cache.get(self.ctxt, "sys_config", None, "k", loader)
+        self.cache.get(self.ctxt, "sys_config", None, "k", loader)
+        self.assertEqual(2, loader.call_count)
+        self.assertEqual({}, self.cache.stats())
+
+    @mock.patch.object(config_cache, "CONFIG_CACHE")
+    def test_cached_default(self, cache):
+        cache.get.side_effect = lambda c, t, g, k, loader: loader()
+        self.assertEqual(
+            "d", config_cache.cached(self.ctxt, "sys_config", None, "k",
+                                     lambda: None, default="d"))
+
+    @mock.patch.object(config_cache.threading, "Thread")
+    @mock.patch.object(config_cache.os, "getpid")
+    def test_start_per_process(self, getpid, thread):
+        etcd3 = mock.Mock()
+        self.cache.watching = False
+        with mock.patch.dict("sys.modules", {"etcd3": etcd3}):
+            getpid.return_value = 100
+            self.cache.start()
+            self.cache.start()
+            self.assertEqual(1, thread.call_count)
+            # api workers forked after the parent started it
+            getpid.return_value = 101
+            self.cache.start()
+        self.assertEqual(2, thread.call_count)
+        self.assertEqual(2, etcd3.client.call_count)
+        self.assertEqual(101, self.cache.pid)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import datetime
+
+from DSpace import exception
+from DSpace import test
+from DSpace.utils import pagination
+
+
+class TestPagination(test.TestCase):
+
+    def test_cursor(self):
+        created_at = datetime.datetime(2020, 3, 1, 8, 7, 6, 123000)
+        cursor = pagination.encode_cursor({
+            'created_at': created_at,
+            'id': 12
+        })
+        self.assertEqual({'created_at': created_at, 'id': 12},
+                         pagination.decode_cursor(cursor))
+
+    def test_invalid_cursor(self):
+        self.assertRaises(exception.InvalidInput,
+                          pagination.decode_cursor, "not-a-cursor")
+
+    def test_next_cursor(self):
+        created_at = datetime.datetime(2020, 3, 1)
+        items = [{'created_at': created_at, 'id': i} for i in (3, 2, 1)]
+        self.assertIsNone(pagination.next_cursor(items, 10))
+        cursor = pagination.next_cursor(items, 3)
+        self.assertEqual(1, pagination.decode_cursor(cursor)['id'])
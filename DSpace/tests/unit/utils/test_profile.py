@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+from sqlalchemy import create_engine
+from sqlalchemy import text
+
+from DSpace import test
+from DSpace.common.config import CONF
+from DSpace.utils.profile import QueryCounter
+from DSpace.utils.profile import StartupProfile
+
+
+class BaseMixin(object):
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.query(1)
+
+    def query(self, num):
+        with self.engine.connect() as conn:
+            for _ in range(num):
+                conn.execute(text("select 1"))
+
+    def bootstrap(self):
+        self.query(1)
+
+
+class FooMixin(BaseMixin):
+
+    def __init__(self, *args, **kwargs):
+        super(FooMixin, self).__init__(*args, **kwargs)
+        self.query(2)
+
+
+class BarMixin(BaseMixin):
+
+    def __init__(self, *args, **kwargs):
+        super(BarMixin, self).__init__(*args, **kwargs)
+
+    def bootstrap(self):
+        super(BarMixin, self).bootstrap()
+        self.query(3)
+
+
+class Handler(FooMixin, BarMixin):
+    pass
+
+
+class TestStartupProfile(test.TestCase):
+
+    def setUp(self):
+        super(TestStartupProfile, self).setUp()
+        self.engine = create_engine("sqlite://")
+        self.addCleanup(self.engine.dispose)
+
+    def _mixins(self):
+        CONF.set_override("startup_profile_mixins", True)
+        self.addCleanup(CONF.clear_override, "startup_profile_mixins")
+
+    def test_construct(self):
+        self._mixins()
+        init = FooMixin.__init__
+        profile = StartupProfile()
+        handler = profile.construct(Handler, self.engine)
+        self.assertIsInstance(handler, Handler)
+        self.assertIs(init, FooMixin.__init__)
+        queries = {k: v[1] for k, v in profile.records.items()}
+        self.assertEqual({"FooMixin.__init__": 2, "BarMixin.__init__": 0,
+                          "BaseMixin.__init__": 1}, queries)
+        self.assertIn("3 queries", profile.report().splitlines()[-1])
+
+        profile = StartupProfile()
+        profile.call(handler, "bootstrap")
+        queries = {k: v[1] for k, v in profile.records.items()}
+        self.assertEqual({"BarMixin.bootstrap": 3, "BaseMixin.bootstrap": 1},
+                         queries)
+
+    def test_construct_error(self):
+        self._mixins()
+        profile = StartupProfile()
+        with mock.patch.object(BaseMixin, "query", side_effect=ValueError):
+            self.assertRaises(ValueError, profile.construct, Handler,
+                              self.engine)
+        self.assertEqual({"BaseMixin.__init__", "BarMixin.__init__",
+                          "FooMixin.__init__"}, set(profile.records))
+        # the mixins are restored
+        self.assertEqual(FooMixin.__init__.__qualname__, "FooMixin.__init__")
+        self.assertFalse(hasattr(FooMixin.__init__, "__wrapped__"))
+
+    def test_construct_no_mixins(self):
+        init = FooMixin.__init__
+        query = BaseMixin.query
+        seen = []
+
+        def _query(handler, num):
+            seen.append(FooMixin.__init__)
+            query(handler, num)
+
+        profile = StartupProfile()
+        with mock.patch.object(BaseMixin, "query", _query):
+            handler = profile.construct(Handler, self.engine)
+        # the mixins are not patched meanwhile
+        self.assertEqual([init, init], seen)
+        self.assertIsInstance(handler, Handler)
+        self.assertEqual({"Handler.__init__": 3},
+                         {k: v[1] for k, v in profile.records.items()})
+
+        profile.call(handler, "bootstrap")
+        self.assertEqual(4, profile.records["Handler.bootstrap"][1])
+
+    def test_query_counter(self):
+        with QueryCounter() as counter:
+            with self.engine.connect() as conn:
+                conn.execute(text("select 1"))
+        with self.engine.connect() as conn:
+            conn.execute(text("select 1"))
+        self.assertEqual(1, counter.count)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import mock
+
+from DSpace import test
+from DSpace.utils.scheduler import OverlapPolicy
+from DSpace.utils.scheduler import PeriodicJob
+from DSpace.utils.scheduler import Scheduler
+
+
+class TestScheduler(test.TestCase):
+
+    def setUp(self):
+        super(TestScheduler, self).setUp()
+        self.scheduler = Scheduler(max_workers=1)
+        self.scheduler._executor = mock.Mock()
+
+    def test_skip_overlap(self):
+        job = PeriodicJob("job", mock.Mock(), 10)
+        self.scheduler._dispatch(job, 0)
+        self.assertTrue(job.running)
+        self.scheduler._dispatch(job, 0)
+        self.assertEqual(1, job.skipped)
+        self.scheduler._executor.submit.assert_called_once_with(
+            self.scheduler._execute, job, 0)
+
+    def test_queue_overlap(self):
+        job = PeriodicJob("job", None, 10, overlap=OverlapPolicy.QUEUE)
+        job.running = True
+
+        def func():
+            if job.runs == 0:
+                # next tick comes while the first run
+                self.scheduler._dispatch(job, 0)
+                self.assertTrue(job.queued)
+
+        job.func = func
+        self.scheduler._execute(job, 0)
+        self.assertEqual(2, job.runs)
+        self.assertEqual(0, job.skipped)
+        self.assertFalse(job.running)
+
+    def test_failure_and_metrics(self):
+        job = PeriodicJob("job", mock.Mock(side_effect=ValueError()), 10)
+        self.scheduler._jobs["job"] = job
+        self.scheduler._execute(job, 0)
+        self.assertEqual(1, job.failures)
+        metrics = {m.name: m for m in self.scheduler.metrics()}
+        self.assertEqual(
+            {("job",): 1}, metrics['periodic_job_failures_total'].value)
+
+    def test_add_job(self):
+        with mock.patch.object(self.scheduler, "_start"):
+            job = self.scheduler.add_job(mock.Mock(__name__="check"), 5)
+            self.scheduler.add_job(mock.Mock(__name__="check"), 5)
+        self.assertTrue(job.removed)
+        self.assertEqual(2, len(self.scheduler._heap))
+        self.assertEqual(1, len(self.scheduler.jobs()))
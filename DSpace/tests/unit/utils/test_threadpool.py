@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+
+from DSpace import test
+from DSpace.utils.threadpool import Priority
+from DSpace.utils.threadpool import PriorityThreadPool
+
+
+class TestPriorityThreadPool(test.TestCase):
+
+    def test_submit(self):
+        pool = PriorityThreadPool(max_workers=2)
+        future = pool.submit(lambda x: x + 1, 1, priority=Priority.BULK)
+        self.assertEqual(2, future.result(timeout=5))
+        future = pool.submit(lambda: 1 / 0)
+        self.assertRaises(ZeroDivisionError, future.result, 5)
+
+    def test_burst(self):
+        pool = PriorityThreadPool(max_workers=10)
+        pool.submit(lambda: None).result(timeout=5)
+        # a burst while one worker is idle runs concurrently
+        barrier = threading.Barrier(6, timeout=5)
+        fs = [pool.submit(barrier.wait) for i in range(6)]
+        for future in fs:
+            future.result(timeout=5)
+
+    def test_reserved(self):
+        pool = PriorityThreadPool(max_workers=2, reserved=1)
+        event = threading.Event()
+        bg1 = pool.submit(event.wait, priority=Priority.BACKGROUND)
+        bg2 = pool.submit(event.wait, priority=Priority.BACKGROUND)
+        # only one background task runs, the other worker is reserved
+        interactive = pool.submit(lambda: "done")
+        self.assertEqual("done", interactive.result(timeout=5))
+        stats = pool.stats()
+        self.assertEqual(1, stats[Priority.BACKGROUND]['running'])
+        self.assertEqual(1, stats[Priority.BACKGROUND]['depth'])
+        event.set()
+        bg1.result(timeout=5)
+        bg2.result(timeout=5)
+
+    def test_weighted_pick(self):
+        pool = PriorityThreadPool(max_workers=1)
+        picks = [pool._pick(list(Priority.ALL)) for i in range(10)]
+        self.assertEqual(6, picks.count(Priority.INTERACTIVE))
+        self.assertEqual(3, picks.count(Priority.BACKGROUND))
+        self.assertEqual(1, picks.count(Priority.BULK))
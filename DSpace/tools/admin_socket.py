@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Client of ceph daemon admin sockets.
+
+Talks to /var/run/ceph/<cluster>-<daemon>.asok directly instead of forking
+"ceph daemon" for every daemon: a command is a json object terminated by
+"\\0", the reply is a 4 bytes big-endian length followed by the json
+output. Only usable on the node of the daemons (local executor).
+"""
+import glob
+import json
+import logging
+import os
+import socket
+import struct
+from concurrent import futures
+
+from DSpace import exception
+from DSpace.tools.base import ToolBase
+
+logger = logging.getLogger(__name__)
+
+ASOK_DIR = "/var/run/ceph"
+ASOK_TIMEOUT = 5
+MAX_WORKERS = 32
+
+
+def _recv(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise socket.error("connection closed")
+        data += chunk
+    return data
+
+
+def asok_command(path, prefix, timeout=ASOK_TIMEOUT, **kwargs):
+    """Run a command on an admin socket
+
+    :param prefix: command, e.g. "perf dump", "status"
+    :param kwargs: arguments of the command
+    :return: output of the command, json decoded
+    """
+    cmd = dict(kwargs, prefix=prefix, format="json")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(cmd).encode("utf-8") + b"\0")
+        size = struct.unpack(">I", _recv(sock, 4))[0]
+        out = _recv(sock, size)
+    except (socket.error, socket.timeout) as e:
+        raise exception.AdminSocketError(path=path, reason=e)
+    finally:
+        sock.close()
+    if not out:
+        return None
+    try:
+        return json.loads(out.decode("utf-8"))
+    except ValueError:
+        raise exception.AdminSocketError(path=path, reason=out)
+
+
+class AdminSocket(ToolBase):
+
+    def sockets(self, daemon_type=None):
+        """Admin sockets of local daemons
+
+        :param daemon_type: osd, mon, mgr..., None for all
+        :return: {daemon name (e.g. osd.1): socket path}
+        """
+        res = {}
+        for path in glob.glob(os.path.join(self._wapper(ASOK_DIR),
+                                           "*.asok")):
+            # <cluster>-<type>.<id>.asok
+            name = os.path.basename(path)[:-len(".asok")]
+            name = name.split("-", 1)[-1]
+            if daemon_type and not name.startswith(daemon_type + "."):
+                continue
+            res[name] = path
+        return res
+
+    def command(self, name, prefix, **kwargs):
+        path = self.sockets().get(name)
+        if not path:
+            raise exception.AdminSocketError(
+                path=os.path.join(ASOK_DIR, name), reason="not found")
+        return asok_command(path, prefix, **kwargs)
+
+    def command_all(self, names, prefix, **kwargs):
+        """Run a command on many daemons at the same time
+
+        :param names: daemon names, e.g. ["osd.1", "osd.2"]
+        :return: {name: output}, {name: AdminSocketError} for failed ones
+        """
+        sockets = self.sockets()
+        res = {}
+        fs = {}
+        workers = max(min(len(names), MAX_WORKERS), 1)
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for name in names:
+                path = sockets.get(name)
+                if not path:
+                    res[name] = exception.AdminSocketError(
+                        path=os.path.join(ASOK_DIR, name),
+                        reason="not found")
+                    continue
+                fs[name] = executor.submit(asok_command, path, prefix,
+                                           **kwargs)
+            for name, f in fs.items():
+                try:
+                    res[name] = f.result()
+                except exception.AdminSocketError as e:
+                    logger.warning(e)
+                    res[name] = e
+        return res
+
+    def perf_dump(self, names):
+        return self.command_all(names, "perf dump")
+
+    def dump_historic_ops(self, names):
+        return self.command_all(names, "dump_historic_ops")
+
+    def dump_historic_slow_ops(self, names):
+        return self.command_all(names, "dump_historic_slow_ops")
+
+    def status(self, names):
+        return self.command_all(names, "status")
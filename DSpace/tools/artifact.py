@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import logging
+import shlex
+from os import path
+
+from DSpace.exception import InvalidInput
+from DSpace.exception import RunCommandError
+from DSpace.tools.base import ToolBase
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = "/tmp/dspace_artifacts"
+SERVER_TOOL = "artifact_server.py"
+SERVER_TOOL_PATH = "/tmp/artifact_server.py"
+
+
+def _get_tool_path(name):
+    root = path.dirname(path.dirname(__file__))
+    return path.join(root, "tools", "remote", "%s" % name)
+
+
+class Artifact(ToolBase):
+    """Files of node installation shared between nodes"""
+
+    def _shell(self, script):
+        # run as one command, so sudo of non-root users covers all of it
+        return "sh -c {}".format(shlex.quote(script))
+
+    def _run(self, cmd):
+        rc, stdout, stderr = self.run_command(cmd)
+        if rc:
+            raise RunCommandError(cmd=cmd, return_code=rc,
+                                  stdout=stdout, stderr=stderr)
+        return stdout
+
+    def path(self, name):
+        return "{}/{}".format(ARTIFACT_DIR, name)
+
+    def checksum(self, name):
+        """sha256 of the artifact, None if not exists"""
+        cmd = ["sha256sum", self.path(name)]
+        rc, stdout, stderr = self.run_command(cmd)
+        if rc:
+            return None
+        return stdout.split()[0]
+
+    def fetch(self, name, url, digest=None):
+        """Download the artifact to a temporary file, moved into place once
+        it is verified, nothing is left behind if it fails
+
+        :param digest: sha256 the download must match, not checked if None
+        :return: sha256 of the artifact
+        """
+        self._run(["mkdir", "-p", ARTIFACT_DIR])
+        tmp = "{}.part".format(self.path(name))
+        try:
+            self._run(["curl", "-f", "-s", "-S", "-o", tmp, url])
+            checksum = self._run(["sha256sum", tmp]).split()[0]
+            if digest and checksum != digest:
+                raise InvalidInput(
+                    "checksum mismatch of {} from {}: {}".format(
+                        name, url, checksum))
+            self._run(["mv", "-f", tmp, self.path(name)])
+        except Exception:
+            self.run_command(["rm", "-f", tmp])
+            raise
+        return checksum
+
+    def serve_start(self, bind_ip, port, timeout=3600):
+        """Serve ARTIFACT_DIR by http in background
+
+        :param bind_ip: the ip address of the node peers fetch from, not
+                        served on other interfaces
+        """
+        with open(_get_tool_path(SERVER_TOOL)) as f:
+            self.executor.write(SERVER_TOOL_PATH, f.read())
+        script = (
+            "nohup python {tool} --dir {dir} --bind {ip} --port {port} "
+            "--timeout {timeout} >/dev/null 2>&1 & "
+            # wait until the server is listening
+            "for i in $(seq 20); do "
+            "curl -s -o /dev/null http://{ip}:{port}/ && exit 0; "
+            "sleep 0.5; done; exit 1"
+        ).format(tool=SERVER_TOOL_PATH, dir=ARTIFACT_DIR, ip=bind_ip,
+                 port=port, timeout=timeout)
+        self._run(self._shell(script))
+
+    def serve_stop(self):
+        pid_file = "{}/.server.pid".format(ARTIFACT_DIR)
+        script = "test -f {0} && kill $(cat {0}); rm -f {0}".format(pid_file)
+        self.run_command(self._shell(script))
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import contextlib
 import logging
 import os
 import subprocess
@@ -10,6 +11,7 @@ import six
 from DSpace import exception
 from DSpace.common.config import CONF
 from DSpace.exception import RunCommandArgsError
+from DSpace.tools.ssh_pool import SSH_POOL
 from DSpace.utils import retry
 
 logger = logging.getLogger(__name__)
@@ -49,6 +51,7 @@ class Executor(object):
 class SSHExecutor(Executor):
     ssh = None
     host_prefix = None
+    conn = None
 
     def __init__(self, hostname=None, port=None, user=None,
                  password=None, pkey=None, timeout=5):
@@ -65,10 +68,9 @@ class SSHExecutor(Executor):
                      password=self.password, pkey=self.pkey, timeout=timeout)
         self.host_prefix = None
 
-    @retry(exception.SSHException, interval=0.2, retries=5)
     def connect(self, hostname=None, port=22, user='root',
                 password=None, pkey=None, timeout=None):
-        """connect remote host
+        """connect remote host, reuse pooled connection if possible
 
         :param hostname: the host to connect
         :param port: ssh port
@@ -77,11 +79,23 @@ class SSHExecutor(Executor):
         :param pkey: the file-like object to read from
         :param timeout: connect timeout
         """
+        if not CONF.ssh_pool_enabled:
+            self.ssh = self._connect(hostname, port, user, password, pkey,
+                                     timeout)
+            return
+        key = SSH_POOL.make_key(hostname, port, user, password, pkey)
+        self.conn = SSH_POOL.acquire(key, lambda: self._connect(
+            hostname, port, user, password, pkey, timeout))
+        self.ssh = self.conn.ssh
+        self._connect_args = (hostname, port, user, password, pkey, timeout)
+
+    @retry(exception.SSHException, interval=0.2, retries=5)
+    def _connect(self, hostname, port, user, password, pkey, timeout):
         logger.info("try ssh connect: ip(%s), port(%s), user(%s), "
                     "password(%s), pkey(%s)",
                     hostname, port, user, password, pkey)
-        self.ssh = paramiko.SSHClient()
-        self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         kwargs = {}
         if password:
             kwargs['password'] = password
@@ -93,8 +107,8 @@ class SSHExecutor(Executor):
             kwargs['pkey'] = pkey
 
         try:
-            self.ssh.connect(hostname, port=port, username=user,
-                             timeout=timeout, **kwargs)
+            ssh.connect(hostname, port=port, username=user,
+                        timeout=timeout, **kwargs)
         except paramiko.ssh_exception.AuthenticationException as e:
             logger.warning(e)
             raise exception.SSHAuthInvalid(ip=hostname, password=password)
@@ -129,22 +143,47 @@ class SSHExecutor(Executor):
             logger.warning(e)
             # 无法连接
             raise exception.SSHConnectException(ip=hostname)
+        return ssh
 
     def close(self):
-        if self.ssh:
+        if self.conn:
+            SSH_POOL.release(self.conn)
+            self.conn = None
+            self.ssh = None
+        elif self.ssh:
             self.ssh.close()
             self.ssh = None
 
     def __del__(self):
         self.close()
 
+    def _reconnect(self):
+        """Replace a broken pooled connection"""
+        logger.warning("ssh connection to %s broken, reconnect",
+                       self._connect_args[0])
+        SSH_POOL.discard(self.conn)
+        SSH_POOL.release(self.conn)
+        self.conn = None
+        self.connect(*self._connect_args)
+
+    @contextlib.contextmanager
+    def _channel(self):
+        if not self.conn:
+            yield self.ssh
+            return
+        if not self.conn.is_active():
+            self._reconnect()
+        with self.conn.channel() as ssh:
+            yield ssh
+
     def _run_cmd(self, cmd_args, timeout=None):
-        stdin, stdout, stderr = self.ssh.exec_command(
-            cmd_args, timeout=timeout)
-        # TODO timeout is not working, blocked here
-        rc = stdout.channel.recv_exit_status()
-        # TODO: Need a better way.
-        stdout, stderr = stdout.read(), stderr.read()
+        with self._channel() as ssh:
+            stdin, stdout, stderr = ssh.exec_command(
+                cmd_args, timeout=timeout)
+            # TODO timeout is not working, blocked here
+            rc = stdout.channel.recv_exit_status()
+            # TODO: Need a better way.
+            stdout, stderr = stdout.read(), stderr.read()
         return rc, _bytes2str(stdout), _bytes2str(stderr)
 
     def _run_root_command(self, cmd_args, timeout=None):
@@ -190,11 +229,18 @@ class SSHExecutor(Executor):
         name = filename[-1]
         # Write file to /tmp/
         tmp_path = "/tmp/" + name + ".tmp"
-        ftp = self.ssh.open_sftp()
-        f = ftp.file(tmp_path, "w", -1)
-        f.write(content)
-        f.flush()
-        ftp.close()
+        if self.conn:
+            if not self.conn.is_active():
+                self._reconnect()
+            with self.conn.sftp() as ftp:
+                with ftp.file(tmp_path, "w", -1) as f:
+                    f.write(content)
+        else:
+            ftp = self.ssh.open_sftp()
+            f = ftp.file(tmp_path, "w", -1)
+            f.write(content)
+            f.flush()
+            ftp.close()
         # Copy file to destination
         self.run_command(["cp", tmp_path, full_path])
         if chmod:
@@ -438,35 +438,6 @@ class CephTool(ToolBase):
             else:
                 return True
 
-    def slow_request_get(self, osds):
-        res = []
-        for osd in osds:
-            if not osd.osd_id:
-                continue
-            logger.debug("Osd.{} slow request get start.".format(osd.osd_id))
-            cmd = ["ceph", "daemon", "osd.%s" % osd.osd_id,
-                   "dump_historic_slow_ops", '-f', 'json']
-            rc, stdout, stderr = self.run_command(cmd, timeout=5)
-            if rc == 22:
-                logger.warning("osd.%s not found." % osd.osd_id)
-                continue
-            elif rc:
-                logger.error("Command: %(cmd)s ReturnCode: %(return_code)s "
-                             "Stderr: %(stderr)s Stdout: %(stdout)s.".format(
-                                 cmd=cmd, return_code=rc,
-                                 stdout=stdout, stderr=stderr
-                             ))
-                continue
-            res.append({
-                "id": osd.id,
-                "osd_id": osd.osd_id,
-                "osd_name": osd.osd_name,
-                "node_id": osd.node_id,
-                "hostname": osd.node.hostname,
-                "ops": json.loads(encodeutils.safe_decode(stdout)).get("Ops")
-            })
-        return res
-
     def osd_stop(self, osd_id):
         # check command
         check_cmd = ["ps", "-ef", "|", "grep", "osd", "|", "grep", "--",
@@ -1,12 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import contextlib
 import datetime
 import filecmp
+import functools
 import json
 import logging
 import os
 import shutil
+import threading
 from glob import glob
 
 from rtslib_fb import LUN
@@ -27,6 +30,87 @@ DEFAULT_SAVE_FILE = "/etc/target/saveconfig.json"
 
 SIZE_SUFFIXES = ['M', 'G', 'T']
 
+_local = threading.local()
+_transaction_lock = threading.RLock()
+
+
+class Transaction(object):
+    """A batch of configfs changes
+
+    Config is saved once at commit instead of after every change, the
+    configfs state dumped at begin is restored if the batch fails. Lookups
+    inside a transaction use indexes built once, creations keep them up to
+    date and deletions drop them.
+    """
+
+    def __init__(self, savefile=DEFAULT_SAVE_FILE):
+        self.savefile = savefile
+        self.dirty = False
+        self.snapshot = RTSRoot().dump()
+        self.invalidate()
+
+    def invalidate(self):
+        self.targets = None
+        self.tpgs = {}
+        self.backstores = None
+        # iqn -> {disk_name: lun_id}
+        self.luns = {}
+        # (iqn, iqn_initiator) -> next free mapped lun index
+        self.mapped_luns = {}
+
+    def commit(self):
+        if self.dirty:
+            _save_config(self.savefile)
+
+    def rollback(self):
+        logger.warning("rollback iscsi config")
+        errors = RTSRoot().restore(self.snapshot, clear_existing=True)
+        if errors:
+            logger.error("rollback iscsi config error: %s", errors)
+
+
+def _current_transaction():
+    return getattr(_local, 'transaction', None)
+
+
+@contextlib.contextmanager
+def transaction(savefile=DEFAULT_SAVE_FILE):
+    """Run a batch of changes in one transaction
+
+    Transactions are serialized, a nested one joins the outer.
+    """
+    with _transaction_lock:
+        txn = _current_transaction()
+        if txn:
+            yield txn
+            return
+        txn = Transaction(savefile)
+        _local.transaction = txn
+        try:
+            yield txn
+        except Exception:
+            txn.rollback()
+            raise
+        else:
+            txn.commit()
+        finally:
+            _local.transaction = None
+
+
+def transactional(func):
+    """Decorator, run func in a transaction"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with transaction():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _invalidate_index():
+    txn = _current_transaction()
+    if txn:
+        txn.invalidate()
+
 
 def convert_2_bytes(disk_size):
     try:
@@ -51,11 +135,16 @@ def current_targets():
     """
     Returns list of iqn's of currently defined iscsi targets.
     """
+    txn = _current_transaction()
+    if txn and txn.targets is not None:
+        return list(txn.targets)
     existing_targets = []
     for target in FabricModule('iscsi').targets:
         existing_targets.append(
             target.wwn,
         )
+    if txn:
+        txn.targets = set(existing_targets)
 
     return existing_targets
 
@@ -71,6 +160,9 @@ def create_target(iqn):
         try:
             Target(FabricModule("iscsi"), wwn=iqn)
             logger.debug("Creating iscsi-target %s", iqn)
+            txn = _current_transaction()
+            if txn and txn.targets is not None:
+                txn.targets.add(iqn)
         except RTSLibError as e:
             logger.error("Creating iscsi-target %s error: %s", iqn, e)
             raise exc.IscsiTargetError(action="create")
@@ -90,6 +182,7 @@ def delete_target(iqn):
         logger.warning('iscsi-target %s not found', iqn)
     else:
         Target(FabricModule('iscsi'), wwn=iqn).delete()
+        _invalidate_index()
     logger.info('delete target %s success', iqn)
     save_config()
 
@@ -198,6 +291,7 @@ def delete_acl(iqn_target, iqn_initiator):
             logger.debug('delete %s for acl %s', ml, iqn_initiator)
             ml.delete()
         acl.delete()
+        _invalidate_index()
     logger.info("delete acl %s success", iqn_initiator)
 
     # if tpg lun not used by any acl, delete it
@@ -218,9 +312,7 @@ def create_user_backstore(pool_name, disk_name, disk_size, osd_op_timeout=30,
     """
     logger.info("create user backstore %s/%s:%s, wwn: %s",
                 pool_name, disk_name, disk_size, disk_wwn)
-    bs = list(filter(lambda x: x['name'] == disk_name,
-                     current_user_backstores()))
-    if bs:
+    if get_user_backstore(disk_name):
         logger.debug('backstore %s already exists', disk_name)
         raise exc.IscsiBackstoreExists(disk_name=disk_name)
     logger.info("trying to create user backstore %s/%s",
@@ -232,6 +324,9 @@ def create_user_backstore(pool_name, disk_name, disk_size, osd_op_timeout=30,
         so = UserBackedStorageObject(
             name=disk_name, config=cfgstring, size=size, wwn=disk_wwn,
             hw_max_sectors=1024, control=control_string)
+        txn = _current_transaction()
+        if txn and txn.backstores is not None:
+            txn.backstores[disk_name] = so
         save_config()
         return so
     except RTSLibError as e:
@@ -246,6 +341,7 @@ def _delete_free_backstore(so):
     if not attached_luns:
         logger.error("will delete free backstore: %s", so)
         so.delete()
+        _invalidate_index()
         save_config()
 
 
@@ -264,6 +360,13 @@ def delete_free_backstore():
 
 
 def get_user_backstore(disk_name):
+    txn = _current_transaction()
+    if txn:
+        if txn.backstores is None:
+            txn.backstores = {
+                so.name: so for so in RTSRoot().storage_objects
+            }
+        return txn.backstores.get(disk_name)
     for so in RTSRoot().storage_objects:
         if so.name == disk_name:
             return so
@@ -289,7 +392,11 @@ def current_user_backstores():
 
 def create_lun(iqn, so):
     tpg = _get_single_tpg(iqn)
-    return LUN(tpg, storage_object=so)
+    lun = LUN(tpg, storage_object=so)
+    txn = _current_transaction()
+    if txn and iqn in txn.luns:
+        txn.luns[iqn][so.name] = lun.lun
+    return lun
 
 
 def current_mapped_luns(iqn_target, iqn_initiator):
@@ -335,6 +442,7 @@ def remove_acl_mapped_lun(iqn_target, iqn_initiator, disk_name):
         for ml in acl.mapped_luns:
             if ml.mapped_lun == disk_mapped_lun_id:
                 ml.delete()
+        _invalidate_index()
     # If acl no mapped_lun, delete acl and user backstore
     if not list(acl.mapped_luns):
         logger.error("will remove acl: %s, and user backstore: %s",
@@ -374,12 +482,15 @@ def create_mapped_lun(iqn, iqn_initiator, lun):
     """
     logger.info("trying to map LUN %s for %s", lun, iqn)
     tpg = _get_single_tpg(iqn)
+    index = _next_free_mapped_lun_index(iqn, iqn_initiator)
     try:
-        MappedLUN(tpg.node_acl(iqn_initiator, mode='lookup'),
-                  _next_free_mapped_lun_index(iqn, iqn_initiator), lun)
+        MappedLUN(tpg.node_acl(iqn_initiator, mode='lookup'), index, lun)
     except RTSLibError as e:
         logger.error("create mapped lun %s error: %s", lun, e)
         raise exc.IscsiTargetError(action="create mapped lun")
+    txn = _current_transaction()
+    if txn:
+        txn.mapped_luns[(iqn, iqn_initiator)] = index + 1
     save_config()
 
 
@@ -435,6 +546,14 @@ def chap_enable(iqn, username, password):
 
 
 def get_lun_id(iqn, disk_name):
+    txn = _current_transaction()
+    if txn:
+        if iqn not in txn.luns:
+            txn.luns[iqn] = {
+                curlun['disk_name']: curlun['lun_id']
+                for curlun in current_attached_luns(iqn)
+            }
+        return txn.luns[iqn].get(disk_name)
     for curlun in current_attached_luns(iqn):
         if disk_name == curlun['disk_name']:
             return curlun.get('lun_id')
@@ -444,6 +563,9 @@ def _next_free_mapped_lun_index(iqn, iqn_initiator):
     """
     Returns a non-allocated mapped_lun index.
     """
+    txn = _current_transaction()
+    if txn and (iqn, iqn_initiator) in txn.mapped_luns:
+        return txn.mapped_luns[(iqn, iqn_initiator)]
     mapped_luns = current_mapped_luns(iqn, iqn_initiator)
     mapped_lun_indices = [
         mapped_lun['mapped_lun'] for mapped_lun in mapped_luns
@@ -461,15 +583,28 @@ def _get_single_tpg(iqn):
     Returns TPG object for given iqn, assuming that each Target
     has a single TPG.
     """
+    txn = _current_transaction()
+    if txn and iqn in txn.tpgs:
+        return txn.tpgs[iqn]
     tpg = TPG(Target(FabricModule('iscsi'), iqn, mode="lookup"), 1)
+    if txn:
+        txn.tpgs[iqn] = tpg
     return tpg
 
 
 def save_config(savefile=DEFAULT_SAVE_FILE):
     '''
     Saves the current configuration to a file so that it can be restored
-    on next boot.
+    on next boot. Inside a transaction it is deferred to the commit.
     '''
+    txn = _current_transaction()
+    if txn:
+        txn.dirty = True
+        return
+    _save_config(savefile)
+
+
+def _save_config(savefile):
     if not savefile:
         savefile = DEFAULT_SAVE_FILE
     savefile = os.path.expanduser(savefile)
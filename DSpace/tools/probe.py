@@ -9,6 +9,9 @@ from DSpace.tools.base import ToolBase
 
 logger = logging.getLogger(__name__)
 
+PROBE_TOOL = "ceph_collect.py"
+PROBE_TOOL_PATH = "/tmp/ceph_collect.py"
+
 
 def _get_tool_path(name):
     root = path.dirname(path.dirname(__file__))
@@ -16,24 +19,20 @@ def _get_tool_path(name):
 
 
 class ProbeTool(ToolBase):
-    def probe_cluster_nodes(self):
-        tool = "ceph_collect.py"
-        ssh = self.executor
-        ssh.write("/tmp/ceph_collect.py", open(_get_tool_path(tool)).read())
-        cmd = ['python', "/tmp/ceph_collect.py", "collect_nodes"]
-        rc, out, err = ssh.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+    _uploaded = False
 
-    def probe_node_services(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "ceph_services"]
+    def _upload(self):
+        # upload once, all probes of this tool reuse it
+        if self._uploaded:
+            return
+        with open(_get_tool_path(PROBE_TOOL)) as f:
+            self.executor.write(PROBE_TOOL_PATH, f.read())
+        self._uploaded = True
+
+    def _run(self, action, *args):
+        self._upload()
+        cmd = ['python', PROBE_TOOL_PATH, action]
+        cmd.extend(args)
         rc, out, err = self.executor.run_command(cmd)
         if not rc:
             logger.info(out)
@@ -41,82 +40,39 @@ class ProbeTool(ToolBase):
         raise RunCommandError(cmd=cmd, return_code=rc,
                               stdout=out, stderr=err)
 
+    def probe(self, probes, checks=None):
+        """Run probes in one invocation
+
+        :param probes: names of probes, e.g. collect_nodes, ceph_osd
+        :param checks: names of checks, same as check()
+        :return: {probe name: result}, result of a failed probe is
+                 {"error": message}, checks are under "check"
+        """
+        args = ["--probes"] + list(probes)
+        if checks:
+            args += ["--checks"] + list(checks)
+        return self._run("probe", *args)
+
+    def probe_cluster_nodes(self):
+        return self._run("collect_nodes")
+
+    def probe_node_services(self):
+        return self._run("ceph_services")
+
     def probe_node_osd(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "ceph_osd"]
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("ceph_osd")
 
     def probe_ceph_config(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "ceph_config"]
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("ceph_config")
 
     def probe_admin_keyring(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "ceph_keyring"]
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("ceph_keyring")
 
     def check_planning(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "check_planning"]
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("check_planning")
 
     def check(self, checks):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        args = ["--" + check for check in checks]
-        cmd = ['python', "/tmp/ceph_collect.py", "check"]
-        cmd.extend(args)
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("check", *["--" + check for check in checks])
 
     def cluster_check(self):
-        tool = "ceph_collect.py"
-        self.executor.write(
-            "/tmp/ceph_collect.py", open(_get_tool_path(tool)).read()
-        )
-        cmd = ['python', "/tmp/ceph_collect.py", "cluster_check"]
-        rc, out, err = self.executor.run_command(cmd)
-        if not rc:
-            logger.info(out)
-            return json.loads(out)
-        raise RunCommandError(cmd=cmd, return_code=rc,
-                              stdout=out, stderr=err)
+        return self._run("cluster_check")
@@ -1,5 +1,6 @@
 import json
 import logging
+import re
 
 import six
 from prometheus_http_client import NodeExporter
@@ -96,6 +97,31 @@ rgw_gateway_perf_attrs = ['rgw_put', 'rgw_get', 'rgw_put_b', 'rgw_get_b']
 rgw_router_cpu_memory_attrs = [MeK.ROUTER_CPU, MeK.ROUTER_MEMORY]
 
 
+def pg_state_summary(states):
+    """Ratios of healthy/recovering/degraded/unactive of pg states"""
+    healthy = 0
+    degraded = 0
+    recovering = 0
+    unactive = 0
+    pg_total = float(len(states))
+    for state in states:
+        if 'active+clean' == state:
+            healthy += 1
+        elif ('unactive' in state) or ('stale' in state) or (
+                'down' in state) or ('unknown' in state):
+            unactive += 1
+        elif ('recover' in state) or ('backfill' in state) or (
+                'peer' in state) or ('remapped' in state):
+            recovering += 1
+        elif ('degraded' in state) or ('undersized' in state):
+            degraded += 1
+    return {
+        'healthy': round(healthy / pg_total, 3) if pg_total else 0,
+        'recovering': round(recovering / pg_total, 3) if pg_total else 0,
+        'degraded': round(degraded / pg_total, 3) if pg_total else 0,
+        'unactive': round(unactive / pg_total, 3) if pg_total else 0}
+
+
 class PrometheusTool(object):
     prometheus_url = None
 
@@ -529,6 +555,43 @@ class PrometheusTool(object):
                                              'cluster_id': pool.cluster_id})
             pool.metrics.update({pool_key: value})
 
+    def _pools_vector(self, metric):
+        datas = self.prometheus_get_list_metrics(metric) or []
+        return {data['metric'].get('pool_id'): data['value']
+                for data in datas}
+
+    def pools_get_capacity(self):
+        """Capacity metrics of all pools of the cluster
+
+        One vector query per metric instead of one query per pool.
+        Returns {metric: {pool_id: value}}, pool_id is a string label.
+        """
+        cluster_filter = '{{cluster_id="{}"}}'.format(self.ctxt.cluster_id)
+        res = {}
+        for m in pool_capacity:
+            res[m] = self._pools_vector("ceph_pool_" + m + cluster_filter)
+        for pool_key, expr in six.iteritems(pool_total_perf_map):
+            expr = re.sub(r'(ceph_\w+)', r'\1' + cluster_filter, expr)
+            res[pool_key] = self._pools_vector(expr)
+        return res
+
+    def pools_get_pg_state(self):
+        """PG state of all pools of the cluster by one query
+
+        Returns {pool_id: pg_state}, pool_id is a string label. Errors are
+        raised, an empty dict means prometheus has no pg of the cluster.
+        """
+        prometheus = PrometheusClient(url=self.prometheus_url)
+        pgs = json.loads(prometheus.query(
+            metric='ceph_pg_metadata',
+            filter={'cluster_id': self.ctxt.cluster_id}))['data']['result']
+        states = {}
+        for pg in pgs:
+            states.setdefault(pg['metric']['pool_id'], []).append(
+                pg['metric']['state'])
+        return {pool_id: pg_state_summary(pool_states)
+                for pool_id, pool_states in six.iteritems(states)}
+
     def pool_get_histroy_capacity(self, pool, start, end, metrics):
         for m in pool_capacity:
             metric = "ceph_pool_" + m
@@ -548,31 +611,8 @@ class PrometheusTool(object):
                         'pool_id': pool.pool_id,
                         'cluster_id': pool.cluster_id
                     }))['data']['result']
-            healthy = 0
-            degraded = 0
-            recovering = 0
-            unactive = 0
-            pg_total = 0.0
-            for pg in pg_value:
-                state = pg['metric']['state']
-                pg_total += 1
-                if 'active+clean' == state:
-                    healthy += 1
-                elif ('unactive' in state) or ('stale' in state) or (
-                        'down' in state) or ('unknown' in state):
-                    unactive += 1
-                elif ('recover' in state) or ('backfill' in state) or (
-                        'peer' in state) or ('remapped' in state):
-                    recovering += 1
-                elif ('degraded' in state) or ('undersized' in state):
-                    degraded += 1
-
-            pool.metrics.update({'pg_state': {
-                'healthy': round(healthy / pg_total, 3) if pg_total else 0,
-                'recovering': round(recovering / pg_total,
-                                    3) if pg_total else 0,
-                'degraded': round(degraded / pg_total, 3) if pg_total else 0,
-                'unactive': round(unactive / pg_total, 3) if pg_total else 0}})
+            pool.metrics.update({'pg_state': pg_state_summary(
+                [pg['metric']['state'] for pg in pg_value])})
         except exception.StorException as e:
             logger.error(e)
         except Exception as e:
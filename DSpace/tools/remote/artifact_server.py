@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Serve a directory over http for peers of a node installation
+
+Runs in background until killed or no request is served for --timeout
+seconds, its pid is written to <dir>/.server.pid.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+try:
+    from http.server import HTTPServer
+    from http.server import SimpleHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer
+    from SimpleHTTPServer import SimpleHTTPRequestHandler
+
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from SocketServer import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    last_request = time.time()
+
+
+class Handler(SimpleHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.last_request = time.time()
+        return SimpleHTTPRequestHandler.do_GET(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _idle_check(server, timeout):
+    while True:
+        time.sleep(5)
+        if time.time() - server.last_request > timeout:
+            server.shutdown()
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Artifact server.')
+    parser.add_argument('--dir', required=True)
+    parser.add_argument('--bind', required=True,
+                        help='ip address the peers fetch from')
+    parser.add_argument('--port', type=int, required=True)
+    parser.add_argument('--timeout', type=int, default=3600)
+    args = parser.parse_args()
+    os.chdir(args.dir)
+    server = ThreadingHTTPServer((args.bind, args.port), Handler)
+    with open(os.path.join(args.dir, '.server.pid'), 'w') as f:
+        f.write(str(os.getpid()))
+    t = threading.Thread(target=_idle_check, args=(server, args.timeout))
+    t.daemon = True
+    t.start()
+    server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
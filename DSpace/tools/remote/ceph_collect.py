@@ -624,6 +624,38 @@ def cluster_check(args):
     return response
 
 
+PROBES = {
+    "collect_nodes": collect_nodes,
+    "ceph_services": collect_ceph_services,
+    "ceph_osd": collect_osd_info,
+    "ceph_config": collect_ceph_config,
+    "ceph_keyring": collect_ceph_keyring,
+    "check_planning": check_planning,
+}
+
+
+def probe(args):
+    """Run many probes in one invocation
+
+    Result of every probe is keyed by its name, a failed probe returns
+    {"error": message} and doesn't stop the others.
+    """
+    response = {}
+    for name in args.probes:
+        if name not in PROBES:
+            response[name] = {"error": "probe %s not supported" % name}
+            continue
+        try:
+            response[name] = PROBES[name]()
+        except Exception as e:
+            response[name] = {"error": str(e)}
+    if args.checks:
+        for check_name in args.checks:
+            setattr(args, check_name, True)
+        response["check"] = check(args)
+    return response
+
+
 def stdout_print(data):
     print(json.dumps(data), file=sys.__stdout__)
 
@@ -653,6 +685,10 @@ def main():
                         help='get ceph service')
     parser.add_argument('--ssh_local', action='store_true',
                         help='check ssh to local')
+    parser.add_argument('--probes', nargs='*', default=[],
+                        help='probes to run by probe action')
+    parser.add_argument('--checks', nargs='*', default=[],
+                        help='checks to run by probe action')
     args = parser.parse_args()
     action = args.action
     if action == "collect_nodes":
@@ -682,6 +718,9 @@ def main():
         # TODO: move all cluster check to check function
         data = cluster_check(args)
         stdout_print(data)
+    elif action == "probe":
+        data = probe(args)
+        stdout_print(data)
 
 
 if __name__ == '__main__':
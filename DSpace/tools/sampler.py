@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Cpu and memory usage of containers and processes of the node.
+
+Counters are read from cgroup files (v1 or v2) of containers and
+/proc/<pid>/stat of processes, no docker stats or ps is run. A few previous
+samples of every target are kept, the cpu rate is computed against the
+last one, targets sampled for the first time are sampled again after
+FIRST_INTERVAL seconds.
+"""
+import collections
+import logging
+import os
+import threading
+import time
+
+from DSpace.tools.base import ToolBase
+
+logger = logging.getLogger(__name__)
+
+CGROUP_DIR = "/sys/fs/cgroup"
+HISTORY_SIZE = 4
+# samples of targets not seen for it are dropped
+HISTORY_TTL = 600
+FIRST_INTERVAL = 0.2
+
+# target -> deque of (time, cpu ns, system cpu ns, pids)
+_history = {}
+_history_lock = threading.Lock()
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def _read_kv(path):
+    res = {}
+    for line in _read(path).splitlines():
+        # "key value" or "key: value kB"
+        fields = line.split()
+        if len(fields) > 1 and fields[1].isdigit():
+            res[fields[0].rstrip(":")] = int(fields[1])
+    return res
+
+
+def _history_clear():
+    with _history_lock:
+        _history.clear()
+
+
+class ResourceSampler(ToolBase):
+
+    def _system_cpu(self):
+        """ns of cpu time of all cpus"""
+        line = _read(self._wapper("/proc/stat")).splitlines()[0]
+        ticks = sum(int(v) for v in line.split()[1:9])
+        return ticks * 10 ** 9 // CLK_TCK
+
+    def memory_total(self):
+        """bytes"""
+        return _read_kv(self._wapper("/proc/meminfo"))["MemTotal"] * 1024
+
+    def _cgroup_dirs(self, subsystem, container_id):
+        v2 = os.path.exists(self._wapper(
+            os.path.join(CGROUP_DIR, "cgroup.controllers")))
+        base = CGROUP_DIR if v2 else os.path.join(CGROUP_DIR, subsystem)
+        for path in ("docker/{}".format(container_id),
+                     "system.slice/docker-{}.scope".format(container_id)):
+            path = self._wapper(os.path.join(base, path))
+            if os.path.isdir(path):
+                return v2, path
+        return v2, None
+
+    def _container_counters(self, container_id):
+        """(cpu ns, memory bytes), None if the cgroup is not found"""
+        v2, cpu_dir = self._cgroup_dirs("cpuacct", container_id)
+        _, memory_dir = self._cgroup_dirs("memory", container_id)
+        if not cpu_dir or not memory_dir:
+            return None
+        memory_stat = _read_kv(os.path.join(memory_dir, "memory.stat"))
+        if v2:
+            cpu = _read_kv(os.path.join(cpu_dir, "cpu.stat"))[
+                "usage_usec"] * 1000
+            memory = int(_read(os.path.join(memory_dir, "memory.current")))
+        else:
+            cpu = int(_read(os.path.join(cpu_dir, "cpuacct.usage")))
+            memory = int(_read(
+                os.path.join(memory_dir, "memory.usage_in_bytes")))
+        # page cache is not used memory, the same as docker stats
+        memory -= (memory_stat.get("active_file", 0) +
+                   memory_stat.get("inactive_file", 0))
+        return cpu, memory
+
+    def _pids(self, names):
+        """pids of processes with the names in their command line"""
+        res = collections.defaultdict(list)
+        proc = self._wapper("/proc")
+        me = str(os.getpid())
+        for pid in os.listdir(proc):
+            if not pid.isdigit() or pid == me:
+                continue
+            try:
+                cmdline = _read(os.path.join(proc, pid, "cmdline"))
+            except (IOError, OSError):
+                # exited
+                continue
+            cmdline = cmdline.replace("\0", " ")
+            for name in names:
+                if name in cmdline:
+                    res[name].append(pid)
+        return res
+
+    def _process_counters(self, pids):
+        """(cpu ns, rss bytes) of the processes"""
+        cpu = 0
+        memory = 0
+        for pid in pids:
+            try:
+                stat = _read(self._wapper("/proc/{}/stat".format(pid)))
+            except (IOError, OSError):
+                continue
+            # the command in "()" may have spaces
+            fields = stat[stat.rindex(")") + 2:].split()
+            # utime, stime: fields 14, 15; rss: field 24
+            cpu += (int(fields[11]) + int(fields[12])) * 10 ** 9 // CLK_TCK
+            memory += int(fields[21]) * PAGE_SIZE
+        return cpu, memory
+
+    def _counters(self, containers, processes):
+        """target -> (cpu ns, memory bytes, pids)"""
+        res = {}
+        for name, container_id in containers.items():
+            try:
+                counters = self._container_counters(container_id)
+            except (IOError, OSError, KeyError, ValueError) as e:
+                logger.warning("container %s cgroup read error: %s", name, e)
+                continue
+            if counters:
+                res[("containers", name)] = counters + (container_id,)
+        if processes:
+            pids = self._pids(processes)
+            for name in processes:
+                if not pids.get(name):
+                    continue
+                res[("processes", name)] = self._process_counters(
+                    pids[name]) + (tuple(sorted(pids[name])),)
+        return res
+
+    def _rates(self, now, system_cpu, counters):
+        """Cpu rates against the previous samples, kept in the history
+
+        :return: target -> cpu percent, None for targets without a
+                 previous sample
+        """
+        rates = {}
+        with _history_lock:
+            for target, (cpu, _, ident) in counters.items():
+                history = _history.setdefault(
+                    target, collections.deque(maxlen=HISTORY_SIZE))
+                prev = history[-1] if history else None
+                history.append((now, cpu, system_cpu, ident))
+                # restarted: counters are reset
+                if not prev or prev[3] != ident or cpu < prev[1] or \
+                        system_cpu <= prev[2]:
+                    rates[target] = None
+                    continue
+                if target[0] == "containers":
+                    # of all cpus, the same as docker stats
+                    rates[target] = (
+                        (cpu - prev[1]) * 100.0 / (system_cpu - prev[2]))
+                else:
+                    # of a cpu, the same as ps and top
+                    rates[target] = (
+                        (cpu - prev[1]) / 10.0 ** 7 / (now - prev[0]))
+            for target in list(_history):
+                if now - _history[target][-1][0] > HISTORY_TTL:
+                    _history.pop(target)
+        return rates
+
+    def _sweep(self, containers, processes):
+        now = time.time()
+        system_cpu = self._system_cpu()
+        counters = self._counters(containers, processes)
+        return counters, self._rates(now, system_cpu, counters)
+
+    def sample(self, containers=None, processes=None):
+        """Sample all targets at the same time
+
+        :param containers: {container name: container id}
+        :param processes: process names, matched in command lines
+        :return: {"containers": {name: usage}, "processes": {name: usage}},
+                 usage: {"cpu_percent", "memory_bytes", "memory_percent"},
+                 targets not found are left out
+        """
+        containers = containers or {}
+        processes = processes or []
+        counters, rates = self._sweep(containers, processes)
+        first = [target for target, rate in rates.items() if rate is None]
+        if first:
+            time.sleep(FIRST_INTERVAL)
+            again, again_rates = self._sweep(
+                {name: containers[name]
+                 for kind, name in first if kind == "containers"},
+                [name for kind, name in first if kind == "processes"])
+            counters.update(again)
+            rates.update(again_rates)
+        memory_total = self.memory_total()
+        res = {"containers": {}, "processes": {}}
+        for (kind, name), (_, memory, _) in counters.items():
+            res[kind][name] = {
+                "cpu_percent": rates.get((kind, name)) or 0.0,
+                "memory_bytes": memory,
+                "memory_percent": memory * 100.0 / memory_total,
+            }
+        return res
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import contextlib
+import logging
+import threading
+import time
+
+from DSpace.common.config import CONF
+
+logger = logging.getLogger(__name__)
+
+
+class SSHConnection(object):
+    """A shared paramiko SSHClient
+
+    Commands of all executors on the same connection run in their own
+    channels of one transport, at most CONF.ssh_pool_max_channels at the
+    same time (sshd MaxSessions is 10 by default).
+    """
+
+    def __init__(self, key, ssh):
+        self.key = key
+        self.ssh = ssh
+        self.users = 0
+        self.last_used = time.time()
+        self._sftp = None
+        self._sftp_lock = threading.Lock()
+        self._channels = threading.BoundedSemaphore(
+            CONF.ssh_pool_max_channels)
+        transport = ssh.get_transport()
+        if transport and CONF.ssh_keepalive_interval:
+            transport.set_keepalive(CONF.ssh_keepalive_interval)
+
+    def is_active(self):
+        transport = self.ssh.get_transport()
+        return bool(transport and transport.is_active())
+
+    @contextlib.contextmanager
+    def channel(self):
+        with self._channels:
+            self.last_used = time.time()
+            yield self.ssh
+
+    @contextlib.contextmanager
+    def sftp(self):
+        """Cached sftp session, sftp requests are serialized"""
+        with self._sftp_lock:
+            if self._sftp is None:
+                self._sftp = self.ssh.open_sftp()
+            self.last_used = time.time()
+            yield self._sftp
+
+    def close(self):
+        with self._sftp_lock:
+            if self._sftp is not None:
+                self._sftp.close()
+                self._sftp = None
+        self.ssh.close()
+
+
+class SSHConnectionPool(object):
+    """Connections keyed by (hostname, port, user, credential)"""
+
+    def __init__(self):
+        # reentrant, SSHExecutor.__del__ releases its connection and the
+        # garbage collector may run it while this thread holds the lock
+        self._lock = threading.RLock()
+        self._conns = {}
+        self._reaper = None
+
+    @staticmethod
+    def make_key(hostname, port, user, password, pkey):
+        # credentials are part of the key, a connection authenticated by
+        # an old password is never reused by a new one
+        return (hostname, port, user, password, pkey)
+
+    def acquire(self, key, connect):
+        """Get a connection of key, connect() returns a new SSHClient
+
+        Dead connections are dropped and connected again.
+        """
+        self._start_reaper()
+        with self._lock:
+            conn = self._conns.get(key)
+            if conn and not conn.is_active():
+                logger.info("ssh connection to %s lost, reconnect", key[0])
+                self._conns.pop(key)
+                conn.close()
+                conn = None
+            if conn:
+                conn.users += 1
+                conn.last_used = time.time()
+                return conn
+        # connect without lock, handshake may take seconds
+        conn = SSHConnection(key, connect())
+        with self._lock:
+            exist = self._conns.get(key)
+            if exist and exist.is_active():
+                # connected by others at the same time
+                conn.close()
+                conn = exist
+            else:
+                self._conns[key] = conn
+            conn.users += 1
+            conn.last_used = time.time()
+        return conn
+
+    def release(self, conn):
+        with self._lock:
+            conn.users -= 1
+            conn.last_used = time.time()
+            if self._conns.get(conn.key) is not conn and conn.users <= 0:
+                # removed from pool already
+                conn.close()
+
+    def discard(self, conn):
+        """Remove a broken connection, it is closed after the last user"""
+        with self._lock:
+            if self._conns.get(conn.key) is conn:
+                self._conns.pop(conn.key)
+
+    def reap(self):
+        now = time.time()
+        with self._lock:
+            idle = [
+                key for key, conn in self._conns.items()
+                if conn.users <= 0 and (
+                    now - conn.last_used > CONF.ssh_pool_idle_timeout or
+                    not conn.is_active())
+            ]
+            conns = [self._conns.pop(key) for key in idle]
+        for conn in conns:
+            logger.debug("close idle ssh connection to %s", conn.key[0])
+            conn.close()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(CONF.ssh_pool_idle_timeout / 2, 1))
+            try:
+                self.reap()
+            except Exception as e:
+                logger.exception("reap ssh connections error: %s", e)
+
+    def _start_reaper(self):
+        if self._reaper:
+            return
+        with self._lock:
+            if self._reaper:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop,
+                                            name="ssh-pool-reaper")
+            self._reaper.daemon = True
+            self._reaper.start()
+
+
+SSH_POOL = SSHConnectionPool()
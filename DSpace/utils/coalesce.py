@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Coalescing of identical concurrent async calls.
+
+Callers asking for a key which is already in flight wait for the same
+call instead of starting a new one, e.g. many dashboards polling
+cluster_status cost one rpc call per round instead of one per dashboard.
+"""
+import json
+import logging
+
+from tornado.concurrent import Future
+from tornado.concurrent import chain_future
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce_key(*parts):
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class Coalescer(object):
+    """Share in-flight futures of the same key
+
+    Only used in the ioloop thread, no lock needed.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def call(self, key, fn, *args, **kwargs):
+        """Return a future of fn(*args, **kwargs) or of the same call
+
+        :param key: calls with equal keys are identical
+        :param fn: returns a tornado Future
+        """
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.calls += 1
+            inflight = fn(*args, **kwargs)
+            self._inflight[key] = inflight
+            inflight.add_done_callback(
+                lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            logger.debug("coalesce call: %s", key)
+        # every caller gets its own future, cancel of one doesn't
+        # affect the others
+        f = Future()
+        chain_future(inflight, f)
+        return f
+
+    def inflight(self):
+        return len(self._inflight)
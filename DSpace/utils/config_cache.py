@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Read-through cache of sys_configs and ceph_configs.
+
+Every cached value is stamped with the generation it was read at. Writes
+bump the generation locally and through an etcd key, every process
+watching the key bumps its own generation too, so stale entries are never
+served once the change is seen. The cache is only used while the etcd
+watch is alive, processes which never start it always read the database.
+"""
+import copy
+import os
+import threading
+import time
+
+from oslo_log import log as logging
+
+from DSpace.common.config import CONF
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigCache(object):
+    etcd_generation_key = "/dspace/config_generation"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.generation = 0
+        self.watching = False
+        self.etcd = None
+        # process of the watch thread
+        self.pid = None
+        self.hits = {}
+        self.misses = {}
+
+    @property
+    def enabled(self):
+        return CONF.config_cache_enabled and self.watching
+
+    def _count(self, counter, table):
+        counter[table] = counter.get(table, 0) + 1
+
+    def get(self, ctxt, table, group, key, loader):
+        """Return the cached value or call loader() to fill it
+
+        :param table: sys_config or ceph_config, also the metrics label
+        :param loader: function without args, reads value from database
+        """
+        if not self.enabled:
+            return loader()
+        cache_key = (table, ctxt.cluster_id, group, key)
+        now = time.time()
+        with self._lock:
+            generation = self.generation
+            entry = self._entries.get(cache_key)
+            if entry and entry[0] == generation and entry[1] > now:
+                self._count(self.hits, table)
+                return copy.deepcopy(entry[2])
+            self._count(self.misses, table)
+        value = loader()
+        with self._lock:
+            # generation changed while loading, value may be stale already
+            if generation == self.generation:
+                self._entries[cache_key] = (
+                    generation, now + CONF.config_cache_ttl,
+                    copy.deepcopy(value))
+        return value
+
+    def _invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries = {}
+
+    def bump(self):
+        """Invalidate caches of all processes, called after every write"""
+        self._invalidate()
+        if not self.etcd:
+            return
+        try:
+            self.etcd.put(self.etcd_generation_key, str(self.generation))
+        except Exception as e:
+            # others fall back on config_cache_ttl
+            logger.warning("config cache: publish generation failed: %s", e)
+
+    def _watch(self):
+        events_iterator, cancel = self.etcd.watch(self.etcd_generation_key)
+        # changes before the watch is created are not delivered
+        self._invalidate()
+        self.watching = True
+        for event in events_iterator:
+            self._invalidate()
+
+    def watch(self):
+        while True:
+            try:
+                self._watch()
+            except Exception as e:
+                logger.warning("config cache: watch etcd failed: %s", e)
+            self.watching = False
+            self._invalidate()
+            time.sleep(CONF.config_cache_ttl)
+
+    def start(self):
+        """Start watching generation changes of other processes
+
+        A forked process starts its own watch, the thread and the etcd
+        channel of the parent are not usable in it.
+        """
+        if not CONF.config_cache_enabled or self.pid == os.getpid():
+            return
+        import etcd3
+        self.watching = False
+        self._invalidate()
+        self.pid = os.getpid()
+        self.etcd = etcd3.client(host=CONF.etcd.host, port=CONF.etcd.port)
+        t = threading.Thread(target=self.watch, name="config-cache-watch")
+        t.daemon = True
+        t.start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                table: {
+                    "hits": self.hits.get(table, 0),
+                    "misses": self.misses.get(table, 0),
+                } for table in set(self.hits) | set(self.misses)
+            }
+
+
+CONFIG_CACHE = ConfigCache()
+
+
+def cached(ctxt, table, group, key, loader, default=None):
+    """Cached loader(), loader returns None if the config not exists"""
+    def _loader():
+        value = loader()
+        return (value is not None, value)
+
+    found, value = CONFIG_CACHE.get(ctxt, table, group, key, _loader)
+    return value if found else default
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import base64
+import json
+
+import six
+from oslo_utils import timeutils
+
+from DSpace import exception
+from DSpace.i18n import _
+
+# Keyset pagination always walks (created_at, id), which is also the default
+# sort order of _generate_paginate_query.
+CURSOR_KEYS = ('created_at', 'id')
+
+
+def encode_cursor(obj):
+    """Build an opaque cursor pointing after obj.
+
+    obj may be a versioned object, a db model or a dict, it only needs
+    created_at and id.
+    """
+    created_at = obj['created_at']
+    if created_at is not None:
+        created_at = timeutils.normalize_time(created_at).isoformat()
+    value = json.dumps([created_at, obj['id']])
+    cursor = base64.urlsafe_b64encode(value.encode('utf-8'))
+    return cursor.decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode cursor to a dict of created_at and id.
+
+    :raises InvalidInput: if cursor is not produced by encode_cursor
+    """
+    try:
+        if isinstance(cursor, six.text_type):
+            cursor = cursor.encode('ascii')
+        cursor += b'=' * (-len(cursor) % 4)
+        created_at, id = json.loads(
+            base64.urlsafe_b64decode(cursor).decode('utf-8'))
+        if created_at is not None:
+            created_at = timeutils.normalize_time(
+                timeutils.parse_isotime(created_at))
+        return {'created_at': created_at, 'id': int(id)}
+    except (TypeError, ValueError, UnicodeError):
+        raise exception.InvalidInput(reason=_("Invalid cursor"))
+
+
+def next_cursor(items, limit):
+    """Return the cursor of the next page, None if items is the last page"""
+    if not items or not limit or len(items) < int(limit):
+        return None
+    return encode_cursor(items[-1])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Startup profile of the handler mixins.
+
+The time and the sql queries of building the handler (or of its bootstrap)
+are recorded, e.g.
+
+    handler = profile.construct(AdminHandler)
+    logger.info("Handler init profile:\n%s", profile.report())
+
+With startup_profile_mixins, the __init__ (or bootstrap) of every class of
+the handler's mro is wrapped meanwhile, and every class is recorded without
+those it calls through super(). The classes are shared by every thread, so
+this is a debug option.
+
+Only the thread building the handler is counted.
+"""
+import functools
+import inspect
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from DSpace.common.config import CONF
+
+
+class QueryCounter(object):
+    """Count sql statements executed by the current thread"""
+
+    def __init__(self):
+        self.count = 0
+        self._thread = None
+
+    def _before_execute(self, conn, cursor, statement, parameters, context,
+                        executemany):
+        if threading.current_thread() is self._thread:
+            self.count += 1
+
+    def __enter__(self):
+        self._thread = threading.current_thread()
+        event.listen(Engine, "before_cursor_execute", self._before_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._before_execute)
+
+
+class StartupProfile(object):
+
+    def __init__(self):
+        self.mixins = CONF.startup_profile_mixins
+        # "Class.method" -> [seconds, queries]
+        self.records = {}
+        self._stack = []
+        self._counter = None
+
+    def _wrap(self, cls, name, fn):
+        key = "%s.%s" % (cls.__name__, name)
+
+        @functools.wraps(fn)
+        def _wrapper(*args, **kwargs):
+            # start time, start queries, time and queries of callees
+            frame = [time.time(), self._counter.count, 0.0, 0]
+            self._stack.append(frame)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._stack.pop()
+                elapsed = time.time() - frame[0]
+                queries = self._counter.count - frame[1]
+                record = self.records.setdefault(key, [0.0, 0])
+                record[0] += elapsed - frame[2]
+                record[1] += queries - frame[3]
+                if self._stack:
+                    self._stack[-1][2] += elapsed
+                    self._stack[-1][3] += queries
+        return _wrapper
+
+    def _profile(self, cls, name, fn, *args, **kwargs):
+        if not self.mixins:
+            with QueryCounter() as self._counter:
+                return self._wrap(cls, name, fn)(*args, **kwargs)
+        patched = []
+        for klass in cls.__mro__:
+            method = vars(klass).get(name)
+            if not inspect.isfunction(method):
+                continue
+            setattr(klass, name, self._wrap(klass, name, method))
+            patched.append((klass, method))
+        try:
+            with QueryCounter() as self._counter:
+                return fn(*args, **kwargs)
+        finally:
+            for klass, method in patched:
+                setattr(klass, name, method)
+
+    def construct(self, cls, *args, **kwargs):
+        """Build cls(*args, **kwargs), profiling its __init__"""
+        return self._profile(cls, "__init__", cls, *args, **kwargs)
+
+    def call(self, obj, name, *args, **kwargs):
+        """Call obj.name(*args, **kwargs), profiling it"""
+        return self._profile(type(obj), name,
+                             lambda: getattr(obj, name)(*args, **kwargs))
+
+    def report(self):
+        records = sorted(self.records.items(), key=lambda r: -r[1][0])
+        lines = ["{:<48} {:>8.3f}s {:>6} queries".format(k, seconds, queries)
+                 for k, (seconds, queries) in records]
+        lines.append("{:<48} {:>8.3f}s {:>6} queries".format(
+            "total", sum(r[0] for _, r in records),
+            sum(r[1] for _, r in records)))
+        return "\n".join(lines)
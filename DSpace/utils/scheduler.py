@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Scheduler of periodic jobs.
+
+One timer thread keeps all jobs in a heap ordered by their next run time
+and dispatches due jobs to a worker pool of its own, so periodic jobs
+never occupy the task_submit pool and never sleep in a worker thread.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent import futures
+
+from oslo_log import log as logging
+
+from DSpace.utils.metrics import Metric
+
+logger = logging.getLogger(__name__)
+
+
+class OverlapPolicy(object):
+    # drop the run if the previous one is still running
+    SKIP = 'skip'
+    # run once more right after the previous one finished
+    QUEUE = 'queue'
+
+
+class PeriodicJob(object):
+
+    def __init__(self, name, func, interval, jitter=0,
+                 overlap=OverlapPolicy.SKIP, deadline=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.overlap = overlap
+        # a run longer than deadline is reported as overrun, python
+        # threads can not be killed, the run is not interrupted
+        self.deadline = deadline or interval
+        self.running = False
+        self.queued = False
+        self.removed = False
+        self.started_at = None
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.last_duration = 0
+        self.last_lag = 0
+
+    def next_delay(self):
+        delay = self.interval
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        return delay
+
+
+class Scheduler(object):
+
+    def __init__(self, max_workers):
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition()
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self._thread = None
+
+    def add_job(self, func, interval, name=None, jitter=0,
+                overlap=OverlapPolicy.SKIP, deadline=None, delay=0):
+        """Run func every interval seconds
+
+        :param jitter: random extra seconds (0 - jitter) of every interval
+        :param overlap: OverlapPolicy, when the previous run is not done
+        :param deadline: seconds, longer runs are reported as overrun,
+                         default is interval
+        :param delay: seconds before the first run
+        """
+        name = name or getattr(func, '__name__', repr(func))
+        job = PeriodicJob(name, func, interval, jitter=jitter,
+                          overlap=overlap, deadline=deadline)
+        with self._cond:
+            if name in self._jobs:
+                self._jobs[name].removed = True
+            self._jobs[name] = job
+            self._push(job, time.time() + delay)
+            self._cond.notify()
+        self._start()
+        logger.info("periodic job %s added, interval %ss", name, interval)
+        return job
+
+    def remove_job(self, name):
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job:
+                job.removed = True
+
+    def _push(self, job, when):
+        heapq.heappush(self._heap, (when, next(self._seq), job))
+
+    def _start(self):
+        with self._cond:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._loop,
+                                            name="periodic-scheduler")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                when, _, job = self._heap[0]
+                now = time.time()
+                if when > now:
+                    # woken up early by add_job
+                    self._cond.wait(when - now)
+                    continue
+                heapq.heappop(self._heap)
+                if job.removed:
+                    continue
+                # next run is relative to the schedule, not to the end of
+                # this run, so a slow job doesn't drift the others
+                self._push(job, max(when + job.next_delay(), now))
+                self._dispatch(job, when)
+
+    def _dispatch(self, job, scheduled):
+        if job.running:
+            if job.overlap == OverlapPolicy.QUEUE:
+                job.queued = True
+            else:
+                job.skipped += 1
+                logger.debug("periodic job %s is still running, skip",
+                             job.name)
+            overrun = time.time() - (job.started_at or scheduled)
+            if overrun > job.deadline:
+                logger.warning("periodic job %s is running for %.1fs, "
+                               "deadline %ss", job.name, overrun,
+                               job.deadline)
+            return
+        job.running = True
+        self._executor.submit(self._execute, job, scheduled)
+
+    def _execute(self, job, scheduled):
+        while True:
+            job.started_at = time.time()
+            job.last_lag = job.started_at - scheduled
+            try:
+                job.func()
+            except Exception as e:
+                job.failures += 1
+                logger.exception("periodic job %s error: %s", job.name, e)
+            job.runs += 1
+            job.last_duration = time.time() - job.started_at
+            if job.last_duration > job.deadline:
+                job.overruns += 1
+            with self._cond:
+                if not job.queued or job.removed:
+                    job.running = False
+                    job.started_at = None
+                    return
+                job.queued = False
+                scheduled = time.time()
+
+    def jobs(self):
+        with self._cond:
+            return list(self._jobs.values())
+
+    def metrics(self):
+        metrics = [
+            ('periodic_job_runs_total', 'counter', 'Runs', 'runs'),
+            ('periodic_job_failures_total', 'counter', 'Failed Runs',
+             'failures'),
+            ('periodic_job_skipped_total', 'counter', 'Skipped Runs',
+             'skipped'),
+            ('periodic_job_overruns_total', 'counter',
+             'Runs Longer Than Deadline', 'overruns'),
+            ('periodic_job_duration_seconds', 'gauge',
+             'Duration Of Last Run', 'last_duration'),
+            ('periodic_job_lag_seconds', 'gauge',
+             'Start Delay Of Last Run', 'last_lag'),
+        ]
+        res = []
+        jobs = self.jobs()
+        for name, mtype, desc, attr in metrics:
+            metric = Metric(mtype, name, desc, ('job',))
+            for job in jobs:
+                metric.set(getattr(job, attr), (job.name,))
+            res.append(metric)
+        return res
@@ -1,19 +1,202 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import collections
+import threading
+import time
 from concurrent import futures
 
 from oslo_log import log as logging
 
 from DSpace.common.config import CONF
 from DSpace.context import RequestContext
+from DSpace.utils.metrics import Metric
+from DSpace.utils.scheduler import OverlapPolicy
+from DSpace.utils.scheduler import Scheduler
 
 logger = logging.getLogger(__name__)
 
 
+class Priority(object):
+    # operations a user is waiting for
+    INTERACTIVE = 'interactive'
+    # housekeeping, reports from agents
+    BACKGROUND = 'background'
+    # large batches
+    BULK = 'bulk'
+
+    ALL = (INTERACTIVE, BACKGROUND, BULK)
+
+
+def task_priority(priority):
+    """Decorator, rpc method runs in the queue of priority"""
+    def decorator(func):
+        func.priority = priority
+        return func
+    return decorator
+
+
+class _WorkItem(object):
+
+    def __init__(self, future, fn, args, kwargs):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.enqueued_at = time.time()
+
+    def run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class PriorityThreadPool(object):
+    """Thread pool with a bounded queue per priority
+
+    Idle workers take work from the queues by smooth weighted round robin,
+    so no class starves the others. Background and bulk work together never
+    occupy the last CONF.task_interactive_reserved workers.
+    """
+    weights = {
+        Priority.INTERACTIVE: 6,
+        Priority.BACKGROUND: 3,
+        Priority.BULK: 1,
+    }
+
+    def __init__(self, max_workers, queue_size=0, reserved=0):
+        self.max_workers = max_workers
+        self.reserved = min(reserved, max_workers - 1)
+        self._cond = threading.Condition()
+        self._queues = {p: collections.deque() for p in Priority.ALL}
+        self._queue_size = queue_size
+        self._credits = {p: 0 for p in Priority.ALL}
+        self._running = {p: 0 for p in Priority.ALL}
+        self._threads = []
+        self._idle = 0
+        self._wait_total = {p: 0.0 for p in Priority.ALL}
+        self._wait_max = {p: 0.0 for p in Priority.ALL}
+        self._done = {p: 0 for p in Priority.ALL}
+
+    def submit(self, fn, *args, **kwargs):
+        priority = kwargs.pop('priority', Priority.INTERACTIVE)
+        future = futures.Future()
+        item = _WorkItem(future, fn, args, kwargs)
+        with self._cond:
+            queue = self._queues[priority]
+            # bounded queue, the producer waits until there is room
+            while self._queue_size and len(queue) >= self._queue_size:
+                self._cond.wait()
+            queue.append(item)
+            # an idle worker takes one item, start more for a burst
+            queued = sum(len(q) for q in self._queues.values())
+            if (queued > self._idle and
+                    len(self._threads) < self.max_workers):
+                self._start_worker()
+            self._cond.notify_all()
+        return future
+
+    def _start_worker(self):
+        t = threading.Thread(target=self._worker,
+                             name="task-worker-%s" % len(self._threads))
+        t.daemon = True
+        self._threads.append(t)
+        t.start()
+
+    def _eligible(self):
+        eligible = []
+        low_running = (self._running[Priority.BACKGROUND] +
+                       self._running[Priority.BULK])
+        for priority in Priority.ALL:
+            if not self._queues[priority]:
+                continue
+            if (priority != Priority.INTERACTIVE and
+                    low_running >= self.max_workers - self.reserved):
+                continue
+            eligible.append(priority)
+        return eligible
+
+    def _pick(self, eligible):
+        # smooth weighted round robin, as nginx upstream
+        total = 0
+        best = None
+        for priority in eligible:
+            self._credits[priority] += self.weights[priority]
+            total += self.weights[priority]
+            if best is None or self._credits[priority] > \
+                    self._credits[best]:
+                best = priority
+        self._credits[best] -= total
+        return best
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._idle += 1
+                eligible = self._eligible()
+                while not eligible:
+                    self._cond.wait()
+                    eligible = self._eligible()
+                self._idle -= 1
+                priority = self._pick(eligible)
+                item = self._queues[priority].popleft()
+                wait = time.time() - item.enqueued_at
+                self._wait_total[priority] += wait
+                self._wait_max[priority] = max(self._wait_max[priority], wait)
+                self._running[priority] += 1
+                # room in the queue for blocked producers
+                self._cond.notify_all()
+            try:
+                item.run()
+            finally:
+                with self._cond:
+                    self._running[priority] -= 1
+                    self._done[priority] += 1
+                    self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                p: {
+                    "depth": len(self._queues[p]),
+                    "running": self._running[p],
+                    "done": self._done[p],
+                    "wait_seconds_total": self._wait_total[p],
+                    "wait_seconds_max": self._wait_max[p],
+                } for p in Priority.ALL
+            }
+
+    def metrics(self):
+        metrics = [
+            ('task_queue_depth', 'gauge', 'Queued Tasks', 'depth'),
+            ('task_running', 'gauge', 'Running Tasks', 'running'),
+            ('task_done_total', 'counter', 'Started Tasks', 'done'),
+            ('task_wait_seconds_total', 'counter',
+             'Total Queue Wait Time', 'wait_seconds_total'),
+            ('task_wait_seconds_max', 'gauge',
+             'Max Queue Wait Time', 'wait_seconds_max'),
+        ]
+        stats = self.stats()
+        res = []
+        for name, mtype, desc, key in metrics:
+            metric = Metric(mtype, name, desc, ('priority',))
+            for priority, stat in stats.items():
+                metric.set(stat[key], (priority,))
+            res.append(metric)
+        return res
+
+
 class TheadPoolMixin(object):
     def __init__(self, *args, **kwargs):
-        self._executor = futures.ThreadPoolExecutor(
-            max_workers=CONF.task_workers)
+        self._executor = PriorityThreadPool(
+            max_workers=CONF.task_workers,
+            queue_size=CONF.task_queue_size,
+            reserved=CONF.task_interactive_reserved)
+        self.scheduler = Scheduler(max_workers=CONF.periodic_workers)
 
     def _wapper(self, fun, *args, **kwargs):
         permanent = kwargs.pop("permanent", False)
@@ -32,4 +215,22 @@ class TheadPoolMixin(object):
                 break
 
     def task_submit(self, fun, *args, **kwargs):
-        self._executor.submit(self._wapper, fun, *args, **kwargs)
+        """Run fun in background
+
+        :param priority: Priority, default is Priority.INTERACTIVE
+        """
+        priority = kwargs.pop("priority", Priority.INTERACTIVE)
+        self._executor.submit(self._wapper, fun, *args, priority=priority,
+                              **kwargs)
+
+    def task_run(self, priority, fun, *args, **kwargs):
+        """Run fun in the queue of priority and wait the result"""
+        return self._executor.submit(fun, *args, priority=priority,
+                                     **kwargs).result()
+
+    def periodic_submit(self, fun, interval, name=None, jitter=0,
+                        overlap=OverlapPolicy.SKIP, deadline=None, delay=0):
+        """Run fun every interval seconds in the periodic worker pool"""
+        return self.scheduler.add_job(
+            fun, interval, name=name, jitter=jitter, overlap=overlap,
+            deadline=deadline, delay=delay)